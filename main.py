@@ -9,12 +9,17 @@ This is the main entry point for the VRS Manager application.
 It launches the GUI interface for processing VRS files.
 """
 
-print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
-print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
-print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
-print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
-
-from src.ui.main_window import create_gui
+import multiprocessing
 
 if __name__ == "__main__":
+    # Must run first: pool workers in the packaged .exe re-execute this module
+    # and must not print the banner or import the GUI.
+    multiprocessing.freeze_support()
+
+    print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
+    print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
+    print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
+    print("- VRS Manager - Version : 12242254 - By Neil Schmitt -")
+
+    from src.ui.main_window import create_gui
     create_gui()
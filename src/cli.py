@@ -0,0 +1,364 @@
+"""
+Headless command-line runner for VRS Manager.
+
+Runs the four processes without tkinter dialogs or message boxes, so they can
+be scheduled on a build server:
+
+    python vrsmanager.py raw --previous PREV.xlsx --current CURR.xlsx -o OUT_DIR
+    python vrsmanager.py working --previous PREV.xlsx --current CURR.xlsx -o OUT_DIR
+    python vrsmanager.py alllang --input-dir DIR -o OUT_DIR
+    python vrsmanager.py alllang --curr-kr A_KR.xlsx --curr-en A_EN.xlsx --curr-cn A_CN.xlsx [--prev-kr ...]
+    python vrsmanager.py master --source WORKING_OUT.xlsx --target MASTER.xlsx -o OUT_DIR
+    python vrsmanager.py manifest jobs.json
+    python vrsmanager.py manifest jobs.json --workers 4 --memory-budget-mb 16000
+    python vrsmanager.py --formats parquet raw --previous PREV.xlsx --current CURR.xlsx
+
+--formats selects the outputs of a run: the formatted workbook ("xlsx", the
+default) and/or plain data files of the result frames ("parquet", "csv",
+"jsonl"). A job or manifest may also set "formats" itself.
+
+--trace-dir (or "trace_dir" in a job or manifest) writes a JSON trace of
+the run's stage timings (wall time, CPU time, peak memory) to that folder.
+
+A manifest is a JSON file listing many jobs, run back to back in one process
+so the frame cache and the loaded BERT model stay warm between jobs:
+
+    {
+        "output_dir": "out",
+        "jobs": [
+            {"process": "raw", "previous": "prev.xlsx", "current": "curr.xlsx"},
+            {"process": "master", "source": "out/curr_WorkTransform.xlsx",
+             "target": "master.xlsx", "output_dir": "out/master"},
+            {"process": "raw", "previous": "a.xlsx", "current": "b.xlsx", "formats": ["csv"]}
+        ]
+    }
+
+Relative paths in a manifest are resolved against the manifest's folder.
+With --workers above 1, jobs run in parallel through src/scheduler.py and a
+consolidated batch report is written to the manifest's output_dir.
+
+Exit codes:
+    0 - every job completed
+    1 - at least one job failed
+    2 - invalid arguments or manifest
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# No tkinter on the build server: processors must not import it
+os.environ.setdefault('HEADLESS', '1')
+
+from src.config import VERSION
+from src.io.data_export import parse_output_formats
+from src.utils.helpers import log
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# Process name → (processor class name, {job key: processor attribute})
+PROCESS_INPUTS = {
+    "raw": ("RawProcessor", {"previous": "prev_file", "current": "curr_file"}),
+    "working": ("WorkingProcessor", {"previous": "prev_file", "current": "curr_file"}),
+    "alllang": ("AllLangProcessor", {
+        "input_dir": "input_dir",
+        "curr_kr": "curr_kr", "curr_en": "curr_en", "curr_cn": "curr_cn",
+        "prev_kr": "prev_kr", "prev_en": "prev_en", "prev_cn": "prev_cn",
+    }),
+    "master": ("MasterProcessor", {"source": "source_file", "target": "target_file"}),
+}
+
+# Inputs every job of a process must provide
+REQUIRED_INPUTS = {
+    "raw": ("previous", "current"),
+    "working": ("previous", "current"),
+    "alllang": (),
+    "master": ("source", "target"),
+}
+
+ALLLANG_CURRENT_INPUTS = ("curr_kr", "curr_en", "curr_cn")
+
+
+class ManifestError(ValueError):
+    """Raised when a job or manifest is invalid."""
+
+
+def validate_job(job):
+    """
+    Check that a job names a known process and provides its inputs.
+
+    Args:
+        job: Job dictionary ({"process": ..., input keys..., "output_dir": ...})
+
+    Raises:
+        ManifestError: If the job is invalid
+    """
+    process = job.get("process")
+    if process not in PROCESS_INPUTS:
+        raise ManifestError(f"Unknown process: {process!r} (expected one of {', '.join(PROCESS_INPUTS)})")
+
+    allowed = set(PROCESS_INPUTS[process][1]) | {"process", "output_dir", "formats", "trace_dir"}
+    unknown = sorted(set(job) - allowed)
+    if unknown:
+        raise ManifestError(f"Unknown keys for {process} job: {', '.join(unknown)}")
+
+    missing = [key for key in REQUIRED_INPUTS[process] if not job.get(key)]
+    if missing:
+        raise ManifestError(f"{process} job is missing: {', '.join(missing)}")
+
+    try:
+        parse_output_formats(job.get("formats"))
+    except ValueError as e:
+        raise ManifestError(str(e))
+
+    if process == "alllang":
+        given = [key for key in ALLLANG_CURRENT_INPUTS if job.get(key)]
+        if given and len(given) != len(ALLLANG_CURRENT_INPUTS):
+            raise ManifestError("alllang job needs all of curr_kr, curr_en, curr_cn (or none to auto-detect)")
+
+
+def load_manifest(manifest_path):
+    """
+    Read and validate a job manifest.
+
+    Args:
+        manifest_path: Path to the JSON manifest
+
+    Returns:
+        list: Job dictionaries with absolute paths and an output_dir each
+
+    Raises:
+        ManifestError: If the manifest cannot be read or a job is invalid
+    """
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ManifestError(f"Cannot read manifest {manifest_path}: {e}")
+
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise ManifestError("Manifest must be a list of jobs or an object with a 'jobs' list")
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    default_output_dir = manifest.get("output_dir")
+    default_formats = manifest.get("formats")
+    default_trace_dir = manifest.get("trace_dir")
+
+    jobs = []
+    for number, job in enumerate(manifest["jobs"], 1):
+        if not isinstance(job, dict):
+            raise ManifestError(f"Job {number} is not an object")
+        job = dict(job)
+        job.setdefault("output_dir", default_output_dir)
+        if default_formats and not job.get("formats"):
+            job["formats"] = default_formats
+        if default_trace_dir and not job.get("trace_dir"):
+            job["trace_dir"] = default_trace_dir
+        try:
+            validate_job(job)
+        except ManifestError as e:
+            raise ManifestError(f"Job {number}: {e}")
+        for key, value in job.items():
+            if key not in ("process", "formats") and value:
+                job[key] = os.path.join(base_dir, value)
+        jobs.append(job)
+    return jobs
+
+
+def load_manifest_output_dir(manifest_path):
+    """
+    Get the folder for batch reports of a manifest.
+
+    Args:
+        manifest_path: Path to a manifest already accepted by load_manifest()
+
+    Returns:
+        str: The manifest's output_dir, or the manifest's folder if none is set
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    output_dir = manifest.get("output_dir") if isinstance(manifest, dict) else None
+    return os.path.join(base_dir, output_dir) if output_dir else base_dir
+
+
+def create_processor(job):
+    """
+    Create a headless processor with its inputs preset from a job.
+
+    Args:
+        job: Validated job dictionary
+
+    Returns:
+        BaseProcessor: Processor ready for process()
+    """
+    import src.processors as processors
+
+    class_name, attributes = PROCESS_INPUTS[job["process"]]
+    processor = getattr(processors, class_name)()
+    processor.headless = True
+    processor.output_dir = job.get("output_dir")
+    processor.output_formats = parse_output_formats(job.get("formats"))
+    processor.trace_dir = job.get("trace_dir")
+    for key, attribute in attributes.items():
+        if job.get(key):
+            setattr(processor, attribute, job[key])
+    return processor
+
+
+def run_job(job):
+    """
+    Run one job.
+
+    Args:
+        job: Validated job dictionary
+
+    Returns:
+        tuple: (success, output_path or None)
+    """
+    if job.get("output_dir"):
+        os.makedirs(job["output_dir"], exist_ok=True)
+    processor = create_processor(job)
+    success = processor.process()
+    return success, processor.output_path if success else None
+
+
+def run_jobs(jobs):
+    """
+    Run jobs back to back in this process, sharing warm caches and models.
+
+    A failed job does not stop the remaining ones.
+
+    Args:
+        jobs: List of validated job dictionaries
+
+    Returns:
+        int: EXIT_OK if every job completed, EXIT_FAILED otherwise
+    """
+    results = []
+    for number, job in enumerate(jobs, 1):
+        log(f"\n[{number}/{len(jobs)}] {job['process']}")
+        results.append(run_job(job))
+
+    if len(jobs) > 1:
+        log("\n" + "=" * 70)
+        log("BATCH SUMMARY")
+        log("=" * 70)
+        for number, (job, (success, output_path)) in enumerate(zip(jobs, results), 1):
+            status = f"✓ {output_path}" if success else "✗ FAILED"
+            log(f"  [{number}] {job['process']}: {status}")
+
+    return EXIT_OK if all(success for success, _ in results) else EXIT_FAILED
+
+
+def build_parser():
+    """
+    Build the command-line parser.
+
+    Returns:
+        argparse.ArgumentParser: Parser with one subcommand per process plus manifest
+    """
+    parser = argparse.ArgumentParser(
+        prog="vrsmanager",
+        description="Run VRS Manager processes without the GUI."
+    )
+    parser.add_argument("--version", action="version", version=f"VRS Manager {VERSION}")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write the parsed-workbook frame cache")
+    parser.add_argument("--formats",
+                        help="Comma-separated outputs: xlsx, parquet, csv, jsonl (default: xlsx); "
+                             "applies to manifest jobs that do not set their own")
+    parser.add_argument("--trace-dir", dest="trace_dir",
+                        help="Write a JSON trace of each run's stage timings to this directory")
+    subparsers = parser.add_subparsers(dest="process", required=True)
+
+    def add_output_dir(subparser):
+        subparser.add_argument("-o", "--output-dir", dest="output_dir",
+                               help="Directory for output files (default: application folder)")
+
+    for process, label in (("raw", "RAW VRS CHECK"), ("working", "WORKING VRS CHECK")):
+        sub = subparsers.add_parser(process, help=f"Run the {label}")
+        sub.add_argument("--previous", required=True, help="PREVIOUS Excel file")
+        sub.add_argument("--current", required=True, help="CURRENT Excel file")
+        add_output_dir(sub)
+
+    sub = subparsers.add_parser("alllang", help="Run the ALL LANGUAGE CHECK")
+    sub.add_argument("--input-dir", dest="input_dir",
+                     help="Folder holding Previous/ and Current/ (default: application folder)")
+    for lang in ("kr", "en", "cn"):
+        sub.add_argument(f"--curr-{lang}", dest=f"curr_{lang}", help=f"CURRENT _{lang.upper()} file")
+        sub.add_argument(f"--prev-{lang}", dest=f"prev_{lang}", help=f"PREVIOUS _{lang.upper()} file (optional)")
+    add_output_dir(sub)
+
+    sub = subparsers.add_parser("master", help="Run the MASTER FILE UPDATE")
+    sub.add_argument("--source", required=True, help="SOURCE file (Working Process output)")
+    sub.add_argument("--target", required=True, help="TARGET Master File")
+    add_output_dir(sub)
+
+    sub = subparsers.add_parser("manifest", help="Run every job of a JSON manifest")
+    sub.add_argument("manifest", help="Path to the manifest file")
+    sub.add_argument("-j", "--workers", type=int, default=1,
+                     help="Run up to N jobs in parallel worker processes (default: 1, in this process)")
+    sub.add_argument("--memory-budget-mb", dest="memory_budget_mb", type=int,
+                     help="Memory all parallel jobs may use together (default: share of available RAM)")
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Arguments (default: sys.argv[1:])
+
+    Returns:
+        int: Exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        from src.io.frame_cache import get_frame_cache
+        get_frame_cache().enabled = False
+
+    try:
+        if args.process == "manifest":
+            jobs = load_manifest(args.manifest)
+        else:
+            keys = set(PROCESS_INPUTS[args.process][1]) | {"output_dir"}
+            job = {key: os.path.abspath(value) for key, value in vars(args).items() if key in keys and value}
+            job["process"] = args.process
+            jobs = [job]
+        for job in jobs:
+            if args.formats and not job.get("formats"):
+                job["formats"] = args.formats
+            if args.trace_dir and not job.get("trace_dir"):
+                job["trace_dir"] = os.path.abspath(args.trace_dir)
+            validate_job(job)
+    except ManifestError as e:
+        log(f"Error: {e}")
+        return EXIT_USAGE
+
+    if args.process == "manifest" and args.workers > 1:
+        from src.scheduler import JobScheduler, OutputConflictError
+        memory_budget = args.memory_budget_mb * 1024 * 1024 if args.memory_budget_mb else None
+        scheduler = JobScheduler(workers=args.workers, memory_budget=memory_budget, use_cache=not args.no_cache)
+        report_dir = load_manifest_output_dir(args.manifest)
+        try:
+            results = scheduler.run(jobs, report_dir=report_dir)
+        except OutputConflictError as e:
+            log(f"Error: {e}")
+            return EXIT_USAGE
+        return EXIT_OK if all(result["success"] for result in results) else EXIT_FAILED
+
+    return run_jobs(jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
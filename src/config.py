@@ -129,6 +129,62 @@ WORKING_HISTORY_FILE = "working_update_history.json"
 MASTER_HISTORY_FILE = "master_update_history.json"
 ALLLANG_HISTORY_FILE = "alllang_update_history.json"
 
+# ===========================================================================
+# FRAME CACHE
+# ===========================================================================
+# Parsed workbooks are cached next to the history files and reused while the
+# source file is unchanged. Least recently used entries are evicted once the
+# cache grows beyond the size cap.
+FRAME_CACHE_DIR = ".vrs_cache"
+FRAME_CACHE_MAX_MB = 512
+
+# ===========================================================================
+# STRORIGIN ANALYSIS (BERT)
+# ===========================================================================
+# Unique texts are sorted by length and encoded this many at a time, so
+# padding stays small and each forward pass is large.
+BERT_BATCH_SIZE = 64
+
+# Faster inference backends ("int8", "onnx" - see the bert_backend setting)
+# are only used while their similarity scores stay within this tolerance of
+# the torch backend (0.005 = 0.5 percentage points).
+BERT_BACKEND_TOLERANCE = 0.005
+
+# Embeddings of StrOrigin texts are kept on disk (float16, next to the frame
+# cache) and reused across runs. Least recently used texts are dropped once
+# the embedding matrix exceeds the size cap (0 disables the cache).
+EMBEDDING_CACHE_MAX_MB = 256
+
+# Word-level diffs ("Diff Detail") of batches with at least this many distinct
+# pairs run in a process pool, this many pairs per task. Recent single diffs
+# are memoized.
+WORD_DIFF_PARALLEL_MIN_PAIRS = 5000
+WORD_DIFF_CHUNK_SIZE = 1000
+WORD_DIFF_MEMO_SIZE = 65536
+
+# ===========================================================================
+# OUTPUT FORMATS
+# ===========================================================================
+# Each run writes its result frames in one or more of these formats. "xlsx"
+# is the formatted workbook; the others are plain data files (one per frame)
+# for automated pipelines. Parquet needs pyarrow or fastparquet.
+OUTPUT_FORMATS = ("xlsx", "parquet", "csv", "jsonl")
+DEFAULT_OUTPUT_FORMATS = ("xlsx",)
+
+# ===========================================================================
+# BATCH SCHEDULER
+# ===========================================================================
+# A job is admitted to the worker pool only while the estimated memory of all
+# running jobs fits the budget. A job's footprint is estimated from the size
+# of its input workbooks (.xlsx is compressed; parsed DataFrames plus
+# comparison results are roughly this many times larger).
+SCHEDULER_MEMORY_FACTOR = 12
+# Fixed cost of every job on top of that: the worker's interpreter with
+# pandas/numpy loaded. RAW and WORKING jobs of the FULL build also load the
+# KR-SBERT model, which is added at its on-disk size.
+SCHEDULER_JOB_OVERHEAD_MB = 100
+SCHEDULER_MEMORY_FRACTION = 0.75  # Share of available RAM used as default budget
+
 # ===========================================================================
 # VERSION INFORMATION
 # ===========================================================================
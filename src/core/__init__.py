@@ -2,8 +2,13 @@
 Core VRS Manager processing modules.
 """
 
-from src.core.casting import generate_casting_key
-from src.core.lookups import build_lookups
+from src.core.casting import (
+    generate_casting_key,
+    generate_casting_key_column,
+    generate_casting_keys,
+    build_speaker_group_lookup
+)
+from src.core.lookups import TenKeyIndex, build_lookups
 from src.core.comparison import (
     compare_rows,
     classify_working_change,
@@ -12,11 +17,13 @@ from src.core.comparison import (
 )
 from src.core.import_logic import (
     apply_import_logic,
-    apply_import_logic_alllang_lang
+    apply_import_logic_alllang_lang,
+    apply_import_rules
 )
 from src.core.working_comparison import process_working_comparison
 from src.core.alllang_helpers import (
     find_alllang_files,
+    current_file_requests,
     merge_current_files,
     process_alllang_comparison_twopass
 )
@@ -27,6 +34,10 @@ from src.core.working_helpers import (
 
 __all__ = [
     'generate_casting_key',
+    'generate_casting_key_column',
+    'generate_casting_keys',
+    'build_speaker_group_lookup',
+    'TenKeyIndex',
     'build_lookups',
     'build_working_lookups',
     'compare_rows',
@@ -36,8 +47,10 @@ __all__ = [
     'find_working_deleted_rows',
     'apply_import_logic',
     'apply_import_logic_alllang_lang',
+    'apply_import_rules',
     'process_working_comparison',
     'find_alllang_files',
+    'current_file_requests',
     'merge_current_files',
     'process_alllang_comparison_twopass'
 ]
@@ -6,26 +6,32 @@ including file finding, merging, and comparison logic with the 4-tier key system
 """
 
 import os
-import pandas as pd
+from collections import Counter
+
+import numpy as np
 from src.config import (
-    COL_SEQUENCE, COL_EVENTNAME, COL_STRORIGIN, COL_CASTINGKEY,
-    COL_TEXT, COL_STATUS, COL_FREEMEMO, COL_CHARACTERNAME, COL_CHARACTERKEY,
-    COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY,
-    COL_CHANGES, COL_DETAILED_CHANGES, COL_PREVIOUS_EVENTNAME, COL_PREVIOUS_TEXT
+    COL_SEQUENCE, COL_EVENTNAME, COL_STRORIGIN,
+    COL_TEXT, COL_STATUS, COL_FREEMEMO, COL_CHARACTERNAME
 )
-from src.utils.helpers import safe_str, log, get_script_dir, generate_previous_data
+from src.utils.helpers import safe_str_series, log, get_script_dir
 from src.utils.progress import print_progress, finalize_progress
-from src.io.excel_reader import safe_read_excel
-from src.utils.data_processing import normalize_dataframe_status, remove_full_duplicates
-from src.core.casting import generate_casting_key
-from src.core.change_detection import detect_all_field_changes, get_priority_change
-from src.settings import get_use_priority_change
+from src.utils.profiling import profile_stage
+from src.io.frame_cache import load_vrs_frames
+from src.core.change_detection import RowComparator
+from src.core.import_logic import (
+    ALLLANG_IMPORT_RULES, apply_import_rules, previous_data_values, add_change_columns
+)
+from src.core.lookups import PASS2_KEY_ORDER, KOREAN_FILTER_KEYS
+from src.settings import get_use_priority_change, get_settings_snapshot
 
 
-def find_alllang_files():
+def find_alllang_files(base_dir=None):
     """
     Auto-detect All Language files from Previous/ and Current/ folders.
 
+    Args:
+        base_dir: Folder holding Previous/ and Current/ (default: script directory)
+
     Returns:
         tuple: (curr_kr, curr_en, curr_cn, prev_kr, prev_en, prev_cn)
             Current files are required, previous files are optional (can be None)
@@ -33,7 +39,7 @@ def find_alllang_files():
     Raises:
         FileNotFoundError: If required folders or current files are missing
     """
-    script_dir = get_script_dir()
+    script_dir = base_dir or get_script_dir()
     previous_folder = os.path.join(script_dir, "Previous")
     current_folder = os.path.join(script_dir, "Current")
 
@@ -80,9 +86,9 @@ def find_alllang_files():
     return curr_kr, curr_en, curr_cn, prev_kr, prev_en, prev_cn
 
 
-def merge_current_files(curr_kr_path, curr_en_path, curr_cn_path):
+def current_file_requests(curr_kr_path, curr_en_path, curr_cn_path):
     """
-    Merge current KR, EN, CN files into a unified tri-lingual structure.
+    load_vrs_frames() requests for the three CURRENT files.
 
     Args:
         curr_kr_path: Path to current Korean file
@@ -90,166 +96,108 @@ def merge_current_files(curr_kr_path, curr_en_path, curr_cn_path):
         curr_cn_path: Path to current Chinese file
 
     Returns:
-        DataFrame: Merged DataFrame with tri-lingual columns
+        list: (filepath, label, with_casting_key) for KR, EN, CN
     """
-    log("\n" + "="*70)
-    log("PHASE 1: MERGING CURRENT FILES")
-    log("="*70)
-
-    log(f"Reading KR Current: {os.path.basename(curr_kr_path)}")
-    df_kr = safe_read_excel(curr_kr_path, header=0, dtype=str)
-    df_kr = normalize_dataframe_status(df_kr)
-    log(f"  → {len(df_kr):,} rows")
-    df_kr = remove_full_duplicates(df_kr, "KR CURRENT")
-
-    log(f"Reading EN Current: {os.path.basename(curr_en_path)}")
-    df_en = safe_read_excel(curr_en_path, header=0, dtype=str)
-    df_en = normalize_dataframe_status(df_en)
-    log(f"  → {len(df_en):,} rows")
-    df_en = remove_full_duplicates(df_en, "EN CURRENT")
-
-    log(f"Reading CN Current: {os.path.basename(curr_cn_path)}")
-    df_cn = safe_read_excel(curr_cn_path, header=0, dtype=str)
-    df_cn = normalize_dataframe_status(df_cn)
-    log(f"  → {len(df_cn):,} rows")
-    df_cn = remove_full_duplicates(df_cn, "CN CURRENT")
-
-    log("Generating CastingKey for current files...")
-    for df in [df_kr, df_en, df_cn]:
-        casting_keys = []
-        for idx, row in df.iterrows():
-            casting_key = generate_casting_key(
-                row.get(COL_CHARACTERKEY, ""),
-                row.get(COL_DIALOGVOICE, ""),
-                row.get(COL_SPEAKER_GROUPKEY, ""),
-                row.get("DialogType", "")
-            )
-            casting_keys.append(casting_key)
-        df[COL_CASTINGKEY] = casting_keys
-    log(f"  → Generated CastingKey for KR/EN/CN current files")
-
-    log("Building EN/CN lookup dictionaries...")
-    lookup_en = {}
-    lookup_cn = {}
-
-    for _, row in df_en.iterrows():
-        key = (row[COL_SEQUENCE], row[COL_EVENTNAME])
-        lookup_en[key] = row.to_dict()
+    return [
+        (curr_kr_path, "KR CURRENT", True),
+        (curr_en_path, "EN CURRENT", True),
+        (curr_cn_path, "CN CURRENT", True),
+    ]
+
+
+# Key of the tri-lingual merge, and the per-language columns it renames
+# (Text → Text_KR / Text_EN / Text_CN, ...)
+MERGE_KEY_COLUMNS = [COL_SEQUENCE, COL_EVENTNAME]
+LANGUAGE_COLUMNS = (
+    (COL_TEXT, "Text"),
+    (COL_FREEMEMO, "FREEMEMO"),
+    (COL_STATUS, "STATUS"),
+    (COL_CHARACTERNAME, "CharacterName"),
+)
 
-    for _, row in df_cn.iterrows():
-        key = (row[COL_SEQUENCE], row[COL_EVENTNAME])
-        lookup_cn[key] = row.to_dict()
 
-    log(f"  → EN: {len(lookup_en):,} rows indexed")
-    log(f"  → CN: {len(lookup_cn):,} rows indexed")
+def _language_columns(df, lang):
+    """
+    Per-language columns of one current file as clean strings.
 
-    log("Merging data into unified structure...")
-    merged_rows = []
-    total = len(df_kr)
-
-    for idx, kr_row in df_kr.iterrows():
-        merged = kr_row.to_dict()
-        key = (kr_row[COL_SEQUENCE], kr_row[COL_EVENTNAME])
-
-        merged["Text_KR"] = safe_str(merged.pop(COL_TEXT, ""))
-        merged["FREEMEMO_KR"] = safe_str(merged.pop(COL_FREEMEMO, ""))
-        merged["STATUS_KR"] = safe_str(merged.pop(COL_STATUS, ""))
-        merged["CharacterName_KR"] = safe_str(merged.pop(COL_CHARACTERNAME, ""))
-
-        if key in lookup_en:
-            en_row = lookup_en[key]
-            merged["Text_EN"] = safe_str(en_row.get(COL_TEXT, ""))
-            merged["FREEMEMO_EN"] = safe_str(en_row.get(COL_FREEMEMO, ""))
-            merged["STATUS_EN"] = safe_str(en_row.get(COL_STATUS, ""))
-            merged["CharacterName_EN"] = safe_str(en_row.get(COL_CHARACTERNAME, ""))
-        else:
-            merged["Text_EN"] = ""
-            merged["FREEMEMO_EN"] = ""
-            merged["STATUS_EN"] = ""
-            merged["CharacterName_EN"] = ""
-
-        if key in lookup_cn:
-            cn_row = lookup_cn[key]
-            merged["Text_CN"] = safe_str(cn_row.get(COL_TEXT, ""))
-            merged["FREEMEMO_CN"] = safe_str(cn_row.get(COL_FREEMEMO, ""))
-            merged["STATUS_CN"] = safe_str(cn_row.get(COL_STATUS, ""))
-            merged["CharacterName_CN"] = safe_str(cn_row.get(COL_CHARACTERNAME, ""))
-        else:
-            merged["Text_CN"] = ""
-            merged["FREEMEMO_CN"] = ""
-            merged["STATUS_CN"] = ""
-            merged["CharacterName_CN"] = ""
-
-        merged_rows.append(merged)
-
-        if (idx + 1) % 500 == 0 or idx == total - 1:
-            print_progress(idx + 1, total, "Merging")
-
-    finalize_progress()
-
-    df_merged = pd.DataFrame(merged_rows)
-    log(f"✓ Unified structure created: {len(df_merged):,} rows with tri-lingual columns")
+    Args:
+        df: Current file DataFrame
+        lang: Language suffix ("KR", "EN" or "CN")
 
-    return df_merged
+    Returns:
+        dict: Column name (e.g. "Text_EN") → object array ("" where the
+              source column is missing)
+    """
+    return {
+        f"{prefix}_{lang}": (safe_str_series(df[col]).to_numpy() if col in df.columns
+                             else np.full(len(df), "", dtype=object))
+        for col, prefix in LANGUAGE_COLUMNS
+    }
 
 
-def apply_import_logic_alllang_lang(curr_row, prev_row, change_type, lang_suffix):
+def merge_current_files(curr_kr_path, curr_en_path, curr_cn_path, current_frames=None):
     """
-    Apply import logic for a specific language in All Language process.
+    Merge current KR, EN, CN files into a unified tri-lingual structure.
 
     Args:
-        curr_row: Current row dictionary
-        prev_row: Previous row dictionary (or None)
-        change_type: Type of change detected
-        lang_suffix: Language suffix ("KR", "EN", or "CN")
+        curr_kr_path: Path to current Korean file
+        curr_en_path: Path to current English file
+        curr_cn_path: Path to current Chinese file
+        current_frames: Optional (KR, EN, CN) frames already read with
+                        current_file_requests() (default: read the files
+                        here, concurrently)
 
     Returns:
-        dict: Dictionary of column values to import
+        DataFrame: Merged DataFrame with tri-lingual columns
     """
-    result = {}
-
-    text_col = f"Text_{lang_suffix}"
-    status_col = f"STATUS_{lang_suffix}"
-    freememo_col = f"FREEMEMO_{lang_suffix}"
-
-    if prev_row:
-        result[freememo_col] = safe_str(prev_row.get(COL_FREEMEMO, ""))
-
-    if change_type == "New Row":
-        return result
+    log("\n" + "="*70)
+    log("PHASE 1: MERGING CURRENT FILES")
+    log("="*70)
 
-    prev_status = safe_str(prev_row.get(COL_STATUS, "")) if prev_row else ""
+    if current_frames is None:
+        log("Reading KR/EN/CN Current files...")
+        current_frames = load_vrs_frames(current_file_requests(curr_kr_path, curr_en_path, curr_cn_path))
+    df_kr, df_en, df_cn = current_frames
+    for lang, path, df in (("KR", curr_kr_path, df_kr), ("EN", curr_en_path, df_en), ("CN", curr_cn_path, df_cn)):
+        log(f"{lang} Current: {os.path.basename(path)} → {len(df):,} rows")
+
+    log("Building EN/CN lookup tables...")
+    # Last row wins for duplicate (SequenceName, EventName) keys
+    lookup_en = df_en.drop_duplicates(subset=MERGE_KEY_COLUMNS, keep="last")
+    lookup_cn = df_cn.drop_duplicates(subset=MERGE_KEY_COLUMNS, keep="last")
+    log(f"  → EN: {len(lookup_en):,} rows indexed")
+    log(f"  → CN: {len(lookup_cn):,} rows indexed")
 
-    if "StrOrigin" in change_type:
-        if prev_status:
-            # ANY status exists: preserve previous translation + StrOrigin
-            result[text_col] = safe_str(prev_row.get(COL_TEXT, "")) if prev_row else ""
-            result[status_col] = prev_status
-            result[COL_STRORIGIN] = safe_str(prev_row.get(COL_STRORIGIN, "")) if prev_row else ""
-        else:
-            # No status: use current/mainline translation
-            result[text_col] = safe_str(curr_row.get(text_col, ""))
+    log("Merging data into unified structure...")
+    df_merged = df_kr.drop(columns=[col for col, _ in LANGUAGE_COLUMNS if col in df_kr.columns])
+    df_merged = df_merged.reset_index(drop=True)
+    for col, value in _language_columns(df_kr, "KR").items():
+        df_merged[col] = value
+
+    for lang, lookup in (("EN", lookup_en), ("CN", lookup_cn)):
+        lang_columns = lookup[MERGE_KEY_COLUMNS].reset_index(drop=True)
+        for col, value in _language_columns(lookup, lang).items():
+            lang_columns[col] = value
+        df_merged = df_merged.merge(lang_columns, on=MERGE_KEY_COLUMNS, how="left",
+                                    suffixes=("", f"_{lang}"))
+        for col in (f"{prefix}_{lang}" for _, prefix in LANGUAGE_COLUMNS):
+            df_merged[col] = df_merged[col].fillna("")
 
-    elif "TimeFrame" in change_type:
-        result[text_col] = safe_str(prev_row.get(COL_TEXT, "")) if prev_row else ""
-        result[status_col] = prev_status
+    log(f"✓ Unified structure created: {len(df_merged):,} rows with tri-lingual columns")
 
-    elif change_type in ["No Change", "No Relevant Change", "EventName Change", "SequenceName Change"]:
-        result[text_col] = safe_str(prev_row.get(COL_TEXT, "")) if prev_row else ""
-        result[status_col] = prev_status
+    return df_merged
 
-    else:
-        result[text_col] = safe_str(prev_row.get(COL_TEXT, "")) if prev_row else ""
-        result[status_col] = prev_status
 
-    return result
+def _language_import_columns(lang):
+    """Result columns of one language's imported fields (Text → Text_KR, ...)."""
+    return {
+        COL_TEXT: f"Text_{lang}",
+        COL_STATUS: f"STATUS_{lang}",
+        COL_FREEMEMO: f"FREEMEMO_{lang}",
+    }
 
 
-def process_alllang_comparison_twopass(df_curr, df_kr, prev_lookup_se, prev_lookup_so, prev_lookup_sc,
-                               prev_lookup_eo, prev_lookup_ec, prev_lookup_oc,
-                               prev_lookup_seo, prev_lookup_sec, prev_lookup_soc, prev_lookup_eoc,
-                               lookup_en, lookup_cn,
-                               has_kr, has_en, has_cn):
+def process_alllang_comparison_twopass(df_curr, df_kr, prev_index, has_kr, has_en, has_cn, settings=None):
     """
     Compare and import data for All Language process using TWO-PASS 10-key system.
 
@@ -260,21 +208,11 @@ def process_alllang_comparison_twopass(df_curr, df_kr, prev_lookup_se, prev_look
     Args:
         df_curr: Current merged DataFrame
         df_kr: KR Previous DataFrame (needed for TWO-PASS, can be None if not has_kr)
-        prev_lookup_se: KR Previous lookup for (Sequence, Event) → DataFrame index
-        prev_lookup_so: KR Previous lookup for (Sequence, StrOrigin) → DataFrame index
-        prev_lookup_sc: KR Previous lookup for (Sequence, CastingKey) → DataFrame index
-        prev_lookup_eo: KR Previous lookup for (Event, StrOrigin) → DataFrame index
-        prev_lookup_ec: KR Previous lookup for (Event, CastingKey) → DataFrame index
-        prev_lookup_oc: KR Previous lookup for (StrOrigin, CastingKey) → DataFrame index
-        prev_lookup_seo: KR Previous lookup for (Sequence, Event, StrOrigin) → DataFrame index
-        prev_lookup_sec: KR Previous lookup for (Sequence, Event, CastingKey) → DataFrame index
-        prev_lookup_soc: KR Previous lookup for (Sequence, StrOrigin, CastingKey) → DataFrame index
-        prev_lookup_eoc: KR Previous lookup for (Event, StrOrigin, CastingKey) → DataFrame index
-        lookup_en: English lookup dictionary (key: (SequenceName, EventName)) → DataFrame index
-        lookup_cn: Chinese lookup dictionary (key: (SequenceName, EventName)) → DataFrame index
+        prev_index: TenKeyIndex of df_kr (can be None if not has_kr)
         has_kr: Whether Korean should be updated
         has_en: Whether English should be updated
         has_cn: Whether Chinese should be updated
+        settings: Optional SettingsSnapshot of the run (default: current snapshot)
 
     Returns:
         tuple: (df_result, counter, marked_prev_indices) where:
@@ -289,9 +227,7 @@ def process_alllang_comparison_twopass(df_curr, df_kr, prev_lookup_se, prev_look
 
     marked_prev_indices = set()
     total_rows = len(df_curr)
-
-    # Import apply_import_logic_alllang_lang here to avoid circular import
-    from src.core.alllang_helpers import apply_import_logic_alllang_lang
+    curr_labels = df_curr.index.tolist()
 
     # ========================================
     # PASS 1: Detect No Change and New rows (KR only if has_kr)
@@ -299,335 +235,119 @@ def process_alllang_comparison_twopass(df_curr, df_kr, prev_lookup_se, prev_look
     pass1_results = {}  # curr_idx → (change_type, prev_idx_or_none)
 
     if has_kr:
-        log("PASS 1: Detecting certainties for KR...")
-        progress_count = 0
-        for curr_idx, curr_row in df_curr.iterrows():
-            S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-            E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-            O = safe_str(curr_row.get(COL_STRORIGIN, ""))
-            C = safe_str(curr_row.get(COL_CASTINGKEY, ""))
-
-            # Defensive check: ensure all values are strings
-            if isinstance(S, dict) or isinstance(E, dict) or isinstance(O, dict) or isinstance(C, dict):
-                log(f"ERROR at row {curr_idx}: Found dict value in keys!")
-                raise TypeError(f"Row {curr_idx} contains dict value in key columns. Check Excel file for corrupted data.")
-
-            # Generate all 10 keys
-            key_se = (S, E)
-            key_so = (S, O)
-            key_sc = (S, C)
-            key_eo = (E, O)
-            key_ec = (E, C)
-            key_oc = (O, C)
-            key_seo = (S, E, O)
-            key_sec = (S, E, C)
-            key_soc = (S, O, C)
-            key_eoc = (E, O, C)
-
-            # Check for perfect 4-key match (No Change)
-            if key_seo in prev_lookup_seo:
-                prev_idx = prev_lookup_seo[key_seo]
-                if prev_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[prev_idx]
-                    prev_S = safe_str(prev_row.get(COL_SEQUENCE, ""))
-                    prev_E = safe_str(prev_row.get(COL_EVENTNAME, ""))
-                    prev_O = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                    prev_C = safe_str(prev_row.get(COL_CASTINGKEY, ""))
-
-                    # Perfect match: All 4 keys identical
-                    if S == prev_S and E == prev_E and O == prev_O and C == prev_C:
-                        # Use universal detection for consistent labeling
-                        change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-
-                        marked_prev_indices.add(prev_idx)
-                        pass1_results[curr_idx] = (change_type, prev_idx)
-
-            # Check if NEW row (all 10 keys missing)
-            if curr_idx not in pass1_results:
-                if (key_se not in prev_lookup_se) and \
-                   (key_so not in prev_lookup_so) and \
-                   (key_sc not in prev_lookup_sc) and \
-                   (key_eo not in prev_lookup_eo) and \
-                   (key_ec not in prev_lookup_ec) and \
-                   (key_oc not in prev_lookup_oc) and \
-                   (key_seo not in prev_lookup_seo) and \
-                   (key_sec not in prev_lookup_sec) and \
-                   (key_soc not in prev_lookup_soc) and \
-                   (key_eoc not in prev_lookup_eoc):
+        # Encode all 10 keys of every current row once and extract the compared
+        # columns of both files, so rows are accessed by integer position
+        curr_keys = prev_index.encode(df_curr)
+        comparator = RowComparator(df_curr, df_kr)
+        curr_strorigins = comparator.curr_column(COL_STRORIGIN)
+
+        with profile_stage("PASS 1"):
+            log("PASS 1: Detecting certainties for KR...")
+            # Perfect 4-key matches and rows with all 10 keys missing, vectorized
+            certainties = prev_index.match_certainties(curr_keys)
+            matched = [(curr_pos, prev_pos) for curr_pos, prev_pos in certainties if prev_pos is not None]
+            # Use universal detection for consistent labeling (one batch for all matches)
+            labels, _ = comparator.compare_batch(
+                [curr_pos for curr_pos, _ in matched], [prev_pos for _, prev_pos in matched]
+            )
+            detections = dict(zip((curr_pos for curr_pos, _ in matched), labels))
+
+            for curr_pos, prev_pos in certainties:
+                curr_idx = curr_labels[curr_pos]
+                if prev_pos is None:
                     pass1_results[curr_idx] = ("New Row", None)
+                    continue
 
-            progress_count += 1
-            if progress_count % 500 == 0 or progress_count == total_rows:
-                print_progress(progress_count, total_rows, "PASS 1: Detecting certainties")
+                prev_idx = prev_index.labels[prev_pos]
+                change_type = detections[curr_pos]
 
-        finalize_progress()
+                marked_prev_indices.add(prev_idx)
+                pass1_results[curr_idx] = (change_type, prev_idx)
+
+            print_progress(total_rows, total_rows, "PASS 1: Detecting certainties")
+            finalize_progress()
 
         # ========================================
         # PASS 2: Detect partial changes using UNMARKED rows (KR only)
         # ========================================
-        log("PASS 2: Detecting changes for KR...")
-        progress_count = 0
-        for curr_idx, curr_row in df_curr.iterrows():
-            # Skip if already classified in PASS 1
-            if curr_idx in pass1_results:
-                progress_count += 1
-                if progress_count % 500 == 0 or progress_count == total_rows:
-                    print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
-                continue
-
-            S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-            E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-            O = safe_str(curr_row.get(COL_STRORIGIN, ""))
-            C = safe_str(curr_row.get(COL_CASTINGKEY, ""))
-
-            # Defensive check: ensure all values are strings
-            if isinstance(S, dict) or isinstance(E, dict) or isinstance(O, dict) or isinstance(C, dict):
-                log(f"ERROR at row {curr_idx}: Found dict value in keys!")
-                raise TypeError(f"Row {curr_idx} contains dict value in key columns. Check Excel file for corrupted data.")
-
-            # Generate all 10 keys
-            key_se = (S, E)
-            key_so = (S, O)
-            key_sc = (S, C)
-            key_eo = (E, O)
-            key_ec = (E, C)
-            key_oc = (O, C)
-            key_seo = (S, E, O)
-            key_sec = (S, E, C)
-            key_soc = (S, O, C)
-            key_eoc = (E, O, C)
-
-            matched = False
-            change_type = None
-            prev_idx = None
-
-            # ========================================
-            # LEVEL 1: 3-Key Matches (One core field changed)
-            # ========================================
-
-            # SEO Match: Same Sequence + Event + StrOrigin
-            if not matched and key_seo in prev_lookup_seo:
-                candidate_idx = prev_lookup_seo[key_seo]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # SEC Match: Same Sequence + Event + CastingKey
-            if not matched and key_sec in prev_lookup_sec:
-                candidate_idx = prev_lookup_sec[key_sec]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # SOC Match: Same Sequence + StrOrigin + CastingKey
-            if not matched and key_soc in prev_lookup_soc:
-                candidate_idx = prev_lookup_soc[key_soc]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection with Korean relevance filter
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr, require_korean=O)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # EOC Match: Same Event + StrOrigin + CastingKey
-            if not matched and key_eoc in prev_lookup_eoc:
-                candidate_idx = prev_lookup_eoc[key_eoc]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # ========================================
-            # LEVEL 2: 2-Key Matches (Two+ core fields changed)
-            # ========================================
-
-            # SE Match: Same Sequence + Event
-            if not matched and key_se in prev_lookup_se:
-                candidate_idx = prev_lookup_se[key_se]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # OC Match: Same StrOrigin + CastingKey
-            if not matched and key_oc in prev_lookup_oc:
-                candidate_idx = prev_lookup_oc[key_oc]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # EC Match: Same Event + CastingKey
-            if not matched and key_ec in prev_lookup_ec:
-                candidate_idx = prev_lookup_ec[key_ec]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # SC Match: Same Sequence + CastingKey
-            if not matched and key_sc in prev_lookup_sc:
-                candidate_idx = prev_lookup_sc[key_sc]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # SO Match: Same Sequence + StrOrigin
-            if not matched and key_so in prev_lookup_so:
-                candidate_idx = prev_lookup_so[key_so]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection with Korean relevance filter
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr, require_korean=O)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # EO Match: Same Event + StrOrigin
-            if not matched and key_eo in prev_lookup_eo:
-                candidate_idx = prev_lookup_eo[key_eo]
-                if candidate_idx not in marked_prev_indices:
-                    prev_row = df_kr.loc[candidate_idx]
-                    # Use universal detection
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_kr)
-                    prev_idx = candidate_idx
-                    marked_prev_indices.add(candidate_idx)
-                    matched = True
-
-            # If no match found in PASS 2, it's a NEW row
-            if not matched:
+        with profile_stage("PASS 2"):
+            log("PASS 2: Detecting changes for KR...")
+            progress_count = 0
+            for curr_pos, curr_idx in enumerate(curr_labels):
+                # Skip if already classified in PASS 1
+                if curr_idx in pass1_results:
+                    progress_count += 1
+                    if progress_count % 500 == 0 or progress_count == total_rows:
+                        print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
+                    continue
+
+                O = curr_strorigins[curr_pos]
+
+                # 3-key matches first (one core field changed), then 2-key matches
                 change_type = "New Row"
                 prev_idx = None
+                for key_name in PASS2_KEY_ORDER:
+                    candidate_idx = prev_index.first_unmarked(key_name, curr_keys[key_name][curr_pos], marked_prev_indices)
+                    if candidate_idx is None:
+                        continue
+                    # Use universal detection (StrOrigin-based matches need Korean relevance)
+                    require_korean = O if key_name in KOREAN_FILTER_KEYS else None
+                    change_type = comparator.detect(curr_pos, prev_index.position(candidate_idx), require_korean=require_korean)
+                    prev_idx = candidate_idx
+                    marked_prev_indices.add(candidate_idx)
+                    break
 
-            # Store PASS 2 result
-            pass1_results[curr_idx] = (change_type, prev_idx)
+                # Store PASS 2 result (no match found → New Row)
+                pass1_results[curr_idx] = (change_type, prev_idx)
 
-            progress_count += 1
-            if progress_count % 500 == 0 or progress_count == total_rows:
-                print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
+                progress_count += 1
+                if progress_count % 500 == 0 or progress_count == total_rows:
+                    print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
 
-        finalize_progress()
+            finalize_progress()
 
     # ========================================
     # Apply import logic to all rows
     # ========================================
     log("Applying tri-lingual import logic...")
-    results = []
-    counter = {}
-
-    for curr_idx, curr_row in df_curr.iterrows():
-        curr_dict = curr_row.to_dict()
-
-        S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-        E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-
-        # Get KR detection result
-        if has_kr and curr_idx in pass1_results:
-            change_type, prev_idx = pass1_results[curr_idx]
-            prev_kr_dict = df_kr.loc[prev_idx].to_dict() if prev_idx is not None else None
-        elif has_kr:
-            # Shouldn't happen
-            change_type = "ERROR: Missing Classification"
-            prev_kr_dict = None
-        else:
-            change_type = "No Change"
-            prev_kr_dict = None
-
-        # Apply KR import logic
-        if has_kr:
-            import_kr = apply_import_logic_alllang_lang(curr_dict, prev_kr_dict, change_type, "KR")
-            for col, value in import_kr.items():
-                curr_dict[col] = value
-
-            curr_dict["PreviousData_KR"] = generate_previous_data(
-                prev_kr_dict, COL_TEXT, COL_STATUS, COL_FREEMEMO
-            ) if prev_kr_dict else ""
-        else:
-            curr_dict["PreviousData_KR"] = ""
-
-        # Apply EN import logic (simple SE lookup)
-        if has_en:
-            key_se = (S, E)
-            prev_en_idx = lookup_en.get(key_se)
-            # Note: lookup_en should also store indices, but for now assume it stores dict
-            # This will need updating when EN/CN lookups are converted to indices
-            prev_en_dict = prev_en_idx if isinstance(prev_en_idx, dict) else None
-
-            import_en = apply_import_logic_alllang_lang(curr_dict, prev_en_dict, change_type, "EN")
-            for col, value in import_en.items():
-                curr_dict[col] = value
-
-            curr_dict["PreviousData_EN"] = generate_previous_data(
-                prev_en_dict, COL_TEXT, COL_STATUS, COL_FREEMEMO
-            ) if prev_en_dict else ""
-        else:
-            curr_dict["PreviousData_EN"] = ""
-
-        # Apply CN import logic (simple SE lookup)
-        if has_cn:
-            key_se = (S, E)
-            prev_cn_idx = lookup_cn.get(key_se)
-            # Note: lookup_cn should also store indices, but for now assume it stores dict
-            prev_cn_dict = prev_cn_idx if isinstance(prev_cn_idx, dict) else None
-
-            import_cn = apply_import_logic_alllang_lang(curr_dict, prev_cn_dict, change_type, "CN")
-            for col, value in import_cn.items():
-                curr_dict[col] = value
-
-            curr_dict["PreviousData_CN"] = generate_previous_data(
-                prev_cn_dict, COL_TEXT, COL_STATUS, COL_FREEMEMO
-            ) if prev_cn_dict else ""
-        else:
-            curr_dict["PreviousData_CN"] = ""
-
-        # Phase 4: Set change type columns (respects Priority Change setting)
-        actual_change = change_type if has_kr else "No Change"
-        curr_dict[COL_DETAILED_CHANGES] = actual_change
-        if get_use_priority_change():
-            curr_dict[COL_CHANGES] = get_priority_change(actual_change)
-        else:
-            curr_dict[COL_CHANGES] = actual_change  # Legacy mode: show full composite
-
-        # Phase 4.1: PreviousEventName - only when EventName changed
-        if prev_kr_dict and "EventName" in actual_change:
-            curr_dict[COL_PREVIOUS_EVENTNAME] = safe_str(prev_kr_dict.get(COL_EVENTNAME, ""))
-        else:
-            curr_dict[COL_PREVIOUS_EVENTNAME] = ""
-
-        # Phase 4.3: PreviousText - always for matched rows (not New Row)
-        # For ALLLANG, store KR previous text
-        if prev_kr_dict and actual_change != "New Row":
-            curr_dict[COL_PREVIOUS_TEXT] = safe_str(prev_kr_dict.get(COL_TEXT, ""))
-        else:
-            curr_dict[COL_PREVIOUS_TEXT] = ""
-
-        results.append(curr_dict)
-        counter[actual_change] = counter.get(actual_change, 0) + 1
-
-    import pandas as pd
-    return pd.DataFrame(results), counter, marked_prev_indices
+    if settings is None:
+        settings = get_settings_snapshot()
+    use_priority_change = get_use_priority_change(settings)
+
+    df_result = df_curr.reset_index(drop=True)
+    no_previous = np.full(total_rows, -1, dtype=np.int64)
+
+    # KR detection result of every row
+    if has_kr:
+        detections = [pass1_results.get(curr_idx, ("ERROR: Missing Classification", None)) for curr_idx in curr_labels]
+        change_types = [change_type for change_type, _ in detections]
+        kr_positions = np.array([-1 if prev_idx is None else prev_index.position(prev_idx)
+                                 for _, prev_idx in detections], dtype=np.int64)
+    else:
+        change_types = ["No Change"] * total_rows
+        kr_positions = no_previous
+
+    # Apply KR import logic
+    if has_kr:
+        apply_import_rules(df_result, change_types, df_kr, kr_positions, ALLLANG_IMPORT_RULES,
+                           _language_import_columns("KR"))
+        df_result["PreviousData_KR"] = previous_data_values(df_kr, kr_positions)
+    else:
+        df_result["PreviousData_KR"] = ""
+
+    # Apply EN/CN import logic. No EN/CN PREVIOUS row is matched, so each row
+    # gets the rule's no-previous result (its Text/STATUS are cleared unless the
+    # row is new or its StrOrigin changed).
+    for lang, has_lang in (("EN", has_en), ("CN", has_cn)):
+        if has_lang:
+            apply_import_rules(df_result, change_types, None, no_previous, ALLLANG_IMPORT_RULES,
+                               _language_import_columns(lang))
+        df_result[f"PreviousData_{lang}"] = ""
+
+    # Phase 4: Change type columns (respects Priority Change setting),
+    # PreviousEventName and PreviousText (for ALLLANG, from KR previous)
+    actual_changes = change_types if has_kr else ["No Change"] * total_rows
+    add_change_columns(df_result, actual_changes, df_kr, kr_positions, use_priority_change)
+
+    counter = dict(Counter(actual_changes))
+    return df_result, counter, marked_prev_indices
@@ -5,8 +5,13 @@ This module provides functionality to generate casting keys based on
 character information, dialog voice, and speaker group keys.
 """
 
-from src.utils.helpers import safe_str, log
-from src.config import COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY, COL_DIALOGTYPE
+import numpy as np
+
+from src.utils.helpers import safe_str, safe_str_series, log
+from src.config import (
+    COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY, COL_DIALOGTYPE,
+    COL_SEQUENCE, COL_EVENTNAME
+)
 
 # Required columns for CastingKey generation
 # BOTH files need: CharacterKey, DialogVoice, DialogType
@@ -89,3 +94,116 @@ def generate_casting_key(character_key, dialog_voice, speaker_groupkey, dialog_t
         return char_key.lower()
 
     return "Not Found"
+
+
+def generate_casting_key_column(character_keys, dialog_voices, speaker_groupkeys, dialog_types):
+    """
+    Generate casting keys for whole columns at once.
+
+    Column-wise equivalent of generate_casting_key (which remains the
+    reference implementation): the aidialog/questdialog, "unique_",
+    speaker-group containment and CharacterKey fallback rules are evaluated
+    with vectorized string operations and give identical results.
+
+    Args:
+        character_keys: CharacterKey values
+        dialog_voices: DialogVoice values
+        speaker_groupkeys: Speaker|CharacterGroupKey values
+        dialog_types: DialogType values
+
+    Returns:
+        list: Casting keys in row order
+    """
+    char_key = safe_str_series(character_keys)
+    dialog_v = safe_str_series(dialog_voices)
+    speaker_gk = safe_str_series(speaker_groupkeys)
+    dtype = safe_str_series(dialog_types)
+
+    char_lower = char_key.str.lower()
+    voice_lower = dialog_v.str.lower()
+    speaker_lower = speaker_gk.str.lower()
+
+    has_char = (char_key != "").to_numpy(dtype=bool)
+    has_voice = (dialog_v != "").to_numpy(dtype=bool)
+    has_speaker = (speaker_gk != "").to_numpy(dtype=bool)
+
+    is_dialog = dtype.str.lower().isin(["aidialog", "questdialog"]).to_numpy(dtype=bool)
+    is_unique = has_voice & voice_lower.str.contains("unique_", regex=False).to_numpy(dtype=bool)
+
+    # Containment is pairwise between two columns, so only test candidate rows
+    in_group = np.zeros(len(char_key), dtype=bool)
+    candidates = np.flatnonzero(has_char & has_speaker)
+    if len(candidates):
+        in_group[candidates] = [
+            c in g for c, g in zip(char_lower.to_numpy()[candidates], speaker_lower.to_numpy()[candidates])
+        ]
+
+    result = np.select(
+        [
+            is_dialog & has_voice,
+            is_dialog,
+            is_unique,
+            in_group,
+            has_char,
+        ],
+        [
+            voice_lower.to_numpy(),
+            "Not Found",
+            voice_lower.to_numpy(),
+            speaker_lower.to_numpy(),
+            char_lower.to_numpy(),
+        ],
+        default="Not Found",
+    )
+    return result.tolist()
+
+
+def _column(df, name):
+    """Column values as an object array ("" for every row if the column is missing)."""
+    return df[name].to_numpy(dtype=object) if name in df.columns else [""] * len(df)
+
+
+def build_speaker_group_lookup(df_curr):
+    """
+    Index CURRENT's Speaker|CharacterGroupKey by (SequenceName, EventName).
+
+    Built once per run and passed to generate_casting_keys() for every
+    PREVIOUS file compared against this CURRENT file.
+
+    Args:
+        df_curr: CURRENT DataFrame
+
+    Returns:
+        dict: {(SequenceName, EventName): Speaker|CharacterGroupKey} as clean
+              strings (the last row wins for duplicate keys)
+    """
+    keys = zip(safe_str_series(_column(df_curr, COL_SEQUENCE)), safe_str_series(_column(df_curr, COL_EVENTNAME)))
+    return dict(zip(keys, safe_str_series(_column(df_curr, COL_SPEAKER_GROUPKEY))))
+
+
+def generate_casting_keys(df, speaker_gk_lookup=None):
+    """
+    Generate the CastingKey value for every row of a DataFrame.
+
+    Args:
+        df: DataFrame with CastingKey source columns
+        speaker_gk_lookup: Optional {(SequenceName, EventName): Speaker|CharacterGroupKey}
+                           lookup from CURRENT (see build_speaker_group_lookup).
+                           When given, it replaces the DataFrame's own
+                           Speaker|CharacterGroupKey column (used for PREVIOUS files).
+
+    Returns:
+        list: CastingKey values in row order
+    """
+    if speaker_gk_lookup is not None:
+        keys = zip(safe_str_series(_column(df, COL_SEQUENCE)), safe_str_series(_column(df, COL_EVENTNAME)))
+        speaker_gk = [speaker_gk_lookup.get(key, "") for key in keys]
+    else:
+        speaker_gk = _column(df, COL_SPEAKER_GROUPKEY)
+
+    return generate_casting_key_column(
+        _column(df, COL_CHARACTERKEY),
+        _column(df, COL_DIALOGVOICE),
+        speaker_gk,
+        _column(df, COL_DIALOGTYPE)
+    )
@@ -16,7 +16,9 @@ from src.config import (
     COL_STARTFRAME, COL_DESC, COL_DIALOGTYPE, COL_GROUP,
     CHAR_GROUP_COLS
 )
-from src.utils.helpers import safe_str, contains_korean
+import numpy as np
+
+from src.utils.helpers import safe_str, safe_str_series, contains_korean
 
 
 # ===========================================================================
@@ -96,6 +98,63 @@ def get_priority_change(change_label: str) -> str:
     return change_label
 
 
+# ===========================================================================
+# CHANGE MASKS AND LABEL TABLE
+# ===========================================================================
+# A change mask records which label-relevant fields differ between two rows.
+# Bit 0 is CharacterGroup (any CHAR_GROUP_COLS column differs); bit i is
+# LABEL_FIELDS[i - 1]. Fields are listed in CANONICAL label order:
+# CharacterGroup → EventName → StrOrigin → SequenceName → CastingKey → Desc → TimeFrame → DialogType → Group
+CHARACTER_GROUP_BIT = 1
+
+LABEL_FIELDS = (
+    (COL_EVENTNAME, "EventName"),
+    (COL_STRORIGIN, "StrOrigin"),
+    (COL_SEQUENCE, "SequenceName"),
+    (COL_CASTINGKEY, "CastingKey"),
+    (COL_DESC, "Desc"),
+    (COL_STARTFRAME, "TimeFrame"),
+    (COL_DIALOGTYPE, "DialogType"),
+    (COL_GROUP, "Group"),
+)
+
+LABEL_FIELD_BITS = {col: 1 << bit for bit, (col, _) in enumerate(LABEL_FIELDS, start=1)}
+
+
+def _build_label_table():
+    """Precompute the change label of every possible change mask."""
+    table = []
+    for mask in range(1 << (len(LABEL_FIELDS) + 1)):
+        important_changes = []
+        if mask & CHARACTER_GROUP_BIT:
+            important_changes.append("CharacterGroup")
+        for bit, (_, name) in enumerate(LABEL_FIELDS, start=1):
+            if mask & (1 << bit):
+                important_changes.append(name)
+        table.append("+".join(important_changes) + " Change" if important_changes else "No Change")
+    return tuple(table)
+
+
+CHANGE_LABELS = _build_label_table()
+
+
+def label_for_mask(mask, require_korean=None):
+    """
+    Get the change label for a change mask.
+
+    Args:
+        mask: Change mask (see CHANGE_LABELS)
+        require_korean: If provided (StrOrigin value), return "No Relevant Change"
+                       if changes were found but no Korean content
+
+    Returns:
+        str: Change label
+    """
+    if mask and require_korean is not None and not contains_korean(str(require_korean)):
+        return "No Relevant Change"
+    return CHANGE_LABELS[mask]
+
+
 def detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korean=None):
     """
     Universal change detection - detects ALL field differences.
@@ -128,55 +187,16 @@ def detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korea
         >>> change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
         >>> # Returns: "EventName+StrOrigin+TimeFrame Change"
     """
-    # 1. Find ALL differences between current and previous rows
-    common_cols = [col for col in df_curr.columns if col in df_prev.columns]
-    differences = [
-        col for col in common_cols
-        if safe_str(curr_row.get(col, "") if hasattr(curr_row, 'get') else curr_row[col]) !=
-           safe_str(prev_row.get(col, "") if hasattr(prev_row, 'get') else prev_row[col])
-    ]
-
-    # 2. Build change list from ACTUAL differences (CANONICAL ORDER)
-    #    Order: CharacterGroup → EventName → StrOrigin → SequenceName → CastingKey → Desc → TimeFrame → DialogType → Group
-    important_changes = []
-
-    # Character Groups (checked first, but INCLUDED in composite - not early return!)
-    existing_char_cols = [col for col in CHAR_GROUP_COLS if col in df_curr.columns]
-    char_group_diffs = [col for col in differences if col in existing_char_cols]
-    if char_group_diffs:
-        important_changes.append("CharacterGroup")
-
-    # Core keys (in canonical order)
-    if COL_EVENTNAME in differences:
-        important_changes.append("EventName")
-    if COL_STRORIGIN in differences:
-        important_changes.append("StrOrigin")
-    if COL_SEQUENCE in differences:
-        important_changes.append("SequenceName")
-    if COL_CASTINGKEY in differences:
-        important_changes.append("CastingKey")
-
-    # Metadata fields (in canonical order)
-    if COL_DESC in differences:
-        important_changes.append("Desc")
-    if COL_STARTFRAME in differences:
-        important_changes.append("TimeFrame")
-    if COL_DIALOGTYPE in differences:
-        important_changes.append("DialogType")
-    if COL_GROUP in differences:
-        important_changes.append("Group")
-
-    # 4. No important changes found
-    if not important_changes:
-        return "No Change"
-
-    # 5. Korean relevance filter (optional)
-    # Used when we want to filter out rows that don't have Korean content
-    if require_korean is not None and not contains_korean(str(require_korean)):
-        return "No Relevant Change"
-
-    # 6. Build and return the change label
-    return "+".join(important_changes) + " Change"
+    # Only columns that appear in labels are compared; other differences
+    # never change the result
+    mask = 0
+    for col, bit in LABEL_FIELD_BITS.items():
+        if col in df_curr.columns and col in df_prev.columns and \
+                _row_value(curr_row, col) != _row_value(prev_row, col):
+            mask |= bit
+    if get_changed_char_cols(curr_row, prev_row, df_curr, df_prev):
+        mask |= CHARACTER_GROUP_BIT
+    return label_for_mask(mask, require_korean)
 
 
 def get_changed_char_cols(curr_row, prev_row, df_curr, df_prev):
@@ -194,15 +214,185 @@ def get_changed_char_cols(curr_row, prev_row, df_curr, df_prev):
     Returns:
         list: List of column names that changed (e.g., ['Tribe', 'Age'])
     """
-    common_cols = [col for col in df_curr.columns if col in df_prev.columns]
-    differences = [
-        col for col in common_cols
-        if safe_str(curr_row.get(col, "") if hasattr(curr_row, 'get') else curr_row[col]) !=
-           safe_str(prev_row.get(col, "") if hasattr(prev_row, 'get') else prev_row[col])
+    return [
+        col for col in _common_char_cols(df_curr, df_prev)
+        if _row_value(curr_row, col) != _row_value(prev_row, col)
     ]
 
-    existing_char_cols = [col for col in CHAR_GROUP_COLS if col in df_curr.columns]
-    return [col for col in differences if col in existing_char_cols]
+
+def _row_value(row, col):
+    """Clean value of a column in a row (Series, dict or sequence)."""
+    return safe_str(row.get(col, "") if hasattr(row, 'get') else row[col])
+
+
+def _common_char_cols(df_curr, df_prev):
+    """Character group columns present in both files, in current-file order."""
+    return [col for col in df_curr.columns if col in CHAR_GROUP_COLS and col in df_prev.columns]
+
+
+class RowComparator:
+    """
+    Batch change detection engine for a CURRENT/PREVIOUS DataFrame pair.
+
+    The label-relevant columns of both files are cleaned with safe_str once.
+    Aligned row positions are then diffed a whole column at a time into
+    change masks (see CHANGE_LABELS) and per-row character group masks, and
+    labels and changed column lists are read from precomputed tables.
+    Results are identical to detect_all_field_changes() and
+    get_changed_char_cols() for the same rows.
+    """
+
+    def __init__(self, df_curr, df_prev):
+        """
+        Extract the compared columns of both DataFrames.
+
+        Args:
+            df_curr: Current DataFrame
+            df_prev: Previous DataFrame
+        """
+        self.df_curr = df_curr
+        self.df_prev = df_prev
+        self.char_cols = _common_char_cols(df_curr, df_prev)
+        self.label_cols = [
+            col for col in LABEL_FIELD_BITS if col in df_curr.columns and col in df_prev.columns
+        ]
+        self._curr_values = {}
+        self._prev_values = {}
+        for col in self.char_cols + self.label_cols:
+            self._curr_values[col] = _clean_column(df_curr, col)
+            self._prev_values[col] = _clean_column(df_prev, col)
+
+        # Changed character group column lists for every character group mask
+        self._char_col_lists = tuple(
+            tuple(col for slot, col in enumerate(self.char_cols) if mask & (1 << slot))
+            for mask in range(1 << len(self.char_cols))
+        )
+
+        # Row tuples and per-slot mask bits for single-pair comparisons
+        compared = self.char_cols + self.label_cols
+        self._slot_bits = [(CHARACTER_GROUP_BIT, 1 << slot) for slot in range(len(self.char_cols))]
+        self._slot_bits += [(LABEL_FIELD_BITS[col], 0) for col in self.label_cols]
+        self._curr_rows = _row_tuples(self._curr_values, compared, len(df_curr))
+        self._prev_rows = _row_tuples(self._prev_values, compared, len(df_prev))
+
+    def curr_column(self, col, default=""):
+        """Clean values of a CURRENT column by position (default if missing)."""
+        return _column_list(self._curr_values, self.df_curr, col, default)
+
+    def prev_column(self, col, default=""):
+        """Clean values of a PREVIOUS column by position (default if missing)."""
+        return _column_list(self._prev_values, self.df_prev, col, default)
+
+    def change_masks(self, curr_positions, prev_positions):
+        """
+        Diff aligned row pairs a whole column at a time.
+
+        Args:
+            curr_positions: Row positions in the current DataFrame
+            prev_positions: Matched row positions in the previous DataFrame
+
+        Returns:
+            tuple: (label_masks, char_masks) int64 arrays, one entry per pair
+        """
+        curr_positions = np.asarray(curr_positions, dtype=np.intp)
+        prev_positions = np.asarray(prev_positions, dtype=np.intp)
+        char_masks = np.zeros(len(curr_positions), dtype=np.int64)
+        for slot, col in enumerate(self.char_cols):
+            differs = self._curr_values[col][curr_positions] != self._prev_values[col][prev_positions]
+            char_masks |= differs.astype(np.int64) << slot
+
+        label_masks = (char_masks != 0).astype(np.int64) * CHARACTER_GROUP_BIT
+        for col in self.label_cols:
+            differs = self._curr_values[col][curr_positions] != self._prev_values[col][prev_positions]
+            label_masks |= differs.astype(np.int64) * LABEL_FIELD_BITS[col]
+        return label_masks, char_masks
+
+    def compare_batch(self, curr_positions, prev_positions):
+        """
+        Batch equivalent of detect_all_field_changes() and get_changed_char_cols().
+
+        Args:
+            curr_positions: Row positions in the current DataFrame
+            prev_positions: Matched row positions in the previous DataFrame
+
+        Returns:
+            tuple: (labels, changed_char_cols) lists, one entry per pair
+        """
+        label_masks, char_masks = self.change_masks(curr_positions, prev_positions)
+        labels = [CHANGE_LABELS[mask] for mask in label_masks.tolist()]
+        char_lists = [list(self._char_col_lists[mask]) for mask in char_masks.tolist()]
+        return labels, char_lists
+
+    def masks(self, curr_pos, prev_pos):
+        """
+        Change mask and character group mask of a single row pair.
+
+        Args:
+            curr_pos: Row position in the current DataFrame
+            prev_pos: Row position in the previous DataFrame
+
+        Returns:
+            tuple: (label_mask, char_mask)
+        """
+        curr = self._curr_rows[curr_pos]
+        prev = self._prev_rows[prev_pos]
+        label_mask = 0
+        char_mask = 0
+        if curr != prev:
+            for (label_bit, char_bit), curr_value, prev_value in zip(self._slot_bits, curr, prev):
+                if curr_value != prev_value:
+                    label_mask |= label_bit
+                    char_mask |= char_bit
+        return label_mask, char_mask
+
+    def detect(self, curr_pos, prev_pos, require_korean=None):
+        """
+        Positional equivalent of detect_all_field_changes().
+
+        Args:
+            curr_pos: Row position in the current DataFrame
+            prev_pos: Row position in the previous DataFrame
+            require_korean: If provided (StrOrigin value), return "No Relevant Change"
+                           if no Korean content found
+
+        Returns:
+            str: Change label
+        """
+        return label_for_mask(self.masks(curr_pos, prev_pos)[0], require_korean)
+
+    def changed_char_cols(self, curr_pos, prev_pos):
+        """
+        Positional equivalent of get_changed_char_cols().
+
+        Args:
+            curr_pos: Row position in the current DataFrame
+            prev_pos: Row position in the previous DataFrame
+
+        Returns:
+            list: Character group columns that changed
+        """
+        return list(self._char_col_lists[self.masks(curr_pos, prev_pos)[1]])
+
+
+def _clean_column(df, col):
+    """Clean values of one column as an object array of strings."""
+    return safe_str_series(df[col].to_numpy(dtype=object)).to_numpy(dtype=object)
+
+
+def _column_list(cache, df, col, default):
+    """Return a cleaned column as a list, extracting it on first use."""
+    if col not in df.columns:
+        return [default] * len(df)
+    if col not in cache:
+        cache[col] = _clean_column(df, col)
+    return cache[col].tolist()
+
+
+def _row_tuples(values, columns, length):
+    """Zip cleaned columns into one tuple per row."""
+    if not columns:
+        return [()] * length
+    return list(zip(*(values[col].tolist() for col in columns)))
 
 
 def detect_dict_field_changes(curr_dict, prev_dict, require_korean=None):
@@ -227,44 +417,14 @@ def detect_dict_field_changes(curr_dict, prev_dict, require_korean=None):
     prev_keys = set(prev_dict.keys()) if prev_dict else set()
     common_keys = curr_keys & prev_keys
 
-    # Find differences
-    differences = [
-        key for key in common_keys
-        if safe_str(curr_dict.get(key, "")) != safe_str(prev_dict.get(key, ""))
-    ]
-
-    # Build change list from ACTUAL differences (CANONICAL ORDER)
-    #    Order: CharacterGroup → EventName → StrOrigin → SequenceName → CastingKey → Desc → TimeFrame → DialogType → Group
-    important_changes = []
-
-    # Character Groups (INCLUDED in composite - not early return!)
-    char_group_diffs = [col for col in differences if col in CHAR_GROUP_COLS]
-    if char_group_diffs:
-        important_changes.append("CharacterGroup")
-
-    if COL_EVENTNAME in differences:
-        important_changes.append("EventName")
-    if COL_STRORIGIN in differences:
-        important_changes.append("StrOrigin")
-    if COL_SEQUENCE in differences:
-        important_changes.append("SequenceName")
-    if COL_CASTINGKEY in differences:
-        important_changes.append("CastingKey")
-    if COL_DESC in differences:
-        important_changes.append("Desc")
-    if COL_STARTFRAME in differences:
-        important_changes.append("TimeFrame")
-    if COL_DIALOGTYPE in differences:
-        important_changes.append("DialogType")
-    if COL_GROUP in differences:
-        important_changes.append("Group")
-
-    # No important changes found
-    if not important_changes:
-        return "No Change"
-
-    # Korean relevance filter
-    if require_korean is not None and not contains_korean(str(require_korean)):
-        return "No Relevant Change"
-
-    return "+".join(important_changes) + " Change"
+    # Build the change mask from label-relevant differences
+    mask = 0
+    for key in common_keys:
+        if key in CHAR_GROUP_COLS:
+            bit = CHARACTER_GROUP_BIT
+        else:
+            bit = LABEL_FIELD_BITS.get(key)
+        if bit and safe_str(curr_dict.get(key, "")) != safe_str(prev_dict.get(key, "")):
+            mask |= bit
+
+    return label_for_mask(mask, require_korean)
@@ -7,17 +7,17 @@ TWO-PASS 10-key system.
 """
 
 from src.config import (
-    COL_SEQUENCE, COL_EVENTNAME, COL_STRORIGIN, COL_CASTINGKEY,
+    COL_STRORIGIN,
     COL_DESC, COL_STARTFRAME, COL_GROUP, COL_DIALOGTYPE, CHAR_GROUP_COLS
 )
-from src.utils.helpers import safe_str, contains_korean
+from src.utils.helpers import contains_korean
 from src.utils.progress import print_progress, finalize_progress
-from src.core.change_detection import detect_all_field_changes, get_changed_char_cols
+from src.utils.profiling import profile_stage
+from src.core.change_detection import RowComparator
+from src.core.lookups import PASS2_KEY_ORDER, KOREAN_FILTER_KEYS
 
 
-def compare_rows(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_sc, prev_lookup_eo,
-                 prev_lookup_ec, prev_lookup_oc, prev_lookup_seo, prev_lookup_sec,
-                 prev_lookup_soc, prev_lookup_eoc):
+def compare_rows(df_curr, df_prev, prev_index):
     """
     Compare rows using TWO-PASS algorithm with 10-key pattern matching.
 
@@ -28,16 +28,7 @@ def compare_rows(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_s
     Args:
         df_curr: Current DataFrame
         df_prev: Previous DataFrame (needed to retrieve rows by index)
-        prev_lookup_se: Previous lookup for (Sequence, Event) → DataFrame index
-        prev_lookup_so: Previous lookup for (Sequence, StrOrigin) → DataFrame index
-        prev_lookup_sc: Previous lookup for (Sequence, CastingKey) → DataFrame index
-        prev_lookup_eo: Previous lookup for (Event, StrOrigin) → DataFrame index
-        prev_lookup_ec: Previous lookup for (Event, CastingKey) → DataFrame index
-        prev_lookup_oc: Previous lookup for (StrOrigin, CastingKey) → DataFrame index
-        prev_lookup_seo: Previous lookup for (Sequence, Event, StrOrigin) → DataFrame index
-        prev_lookup_sec: Previous lookup for (Sequence, Event, CastingKey) → DataFrame index
-        prev_lookup_soc: Previous lookup for (Sequence, StrOrigin, CastingKey) → DataFrame index
-        prev_lookup_eoc: Previous lookup for (Event, StrOrigin, CastingKey) → DataFrame index
+        prev_index: TenKeyIndex of df_prev (from build_lookups)
 
     Returns:
         tuple: (changes, previous_strorigins, changed_columns_map, counter, marked_prev_indices, group_analysis, pass1_results)
@@ -50,288 +41,91 @@ def compare_rows(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_s
     group_analysis = {}  # NEW: Track word counts per group
     total_rows = len(df_curr)
 
+    # Encode all 10 keys of every current row once and extract the compared
+    # columns of both files, so rows are accessed by integer position
+    curr_keys = prev_index.encode(df_curr)
+    comparator = RowComparator(df_curr, df_prev)
+    curr_strorigins = comparator.curr_column(COL_STRORIGIN)
+    prev_strorigin_values = comparator.prev_column(COL_STRORIGIN)
+    curr_labels = df_curr.index.tolist()
+
     # ========================================
     # PASS 1: Detect No Change and New rows
     # ========================================
     pass1_results = {}  # curr_idx → (change_label, prev_idx_or_none, prev_strorigin, char_cols)
 
-    progress_count = 0
-    for curr_idx, curr_row in df_curr.iterrows():
-        S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-        E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-        O = safe_str(curr_row.get(COL_STRORIGIN, ""))
-        C = safe_str(curr_row.get(COL_CASTINGKEY, ""))
-
-        # Defensive check: ensure all values are strings
-        if isinstance(S, dict) or isinstance(E, dict) or isinstance(O, dict) or isinstance(C, dict):
-            log(f"ERROR at row {curr_idx}: Found dict value in keys!")
-            if isinstance(S, dict):
-                log(f"  SequenceName is dict: {S}")
-            if isinstance(E, dict):
-                log(f"  EventName is dict: {E}")
-            if isinstance(O, dict):
-                log(f"  StrOrigin is dict: {O}")
-            if isinstance(C, dict):
-                log(f"  CastingKey is dict: {C}")
-            raise TypeError(f"Row {curr_idx} contains dict value in key columns. Check Excel file for corrupted data.")
-
-        # Generate all 10 keys
-        key_se = (S, E)
-        key_so = (S, O)
-        key_sc = (S, C)
-        key_eo = (E, O)
-        key_ec = (E, C)
-        key_oc = (O, C)
-        key_seo = (S, E, O)
-        key_sec = (S, E, C)
-        key_soc = (S, O, C)
-        key_eoc = (E, O, C)
-
-        # Check for perfect 4-key match (No Change or metadata-only changes)
-        if key_seo in prev_lookup_seo:
-            prev_idx = prev_lookup_seo[key_seo]
-            if prev_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[prev_idx]
-                prev_S = safe_str(prev_row.get(COL_SEQUENCE, ""))
-                prev_E = safe_str(prev_row.get(COL_EVENTNAME, ""))
-                prev_O = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                prev_C = safe_str(prev_row.get(COL_CASTINGKEY, ""))
-
-                # Perfect match: All 4 keys identical
-                if S == prev_S and E == prev_E and O == prev_O and C == prev_C:
-                    # Use universal detection for consistent labeling
-                    change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                    changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-
-                    marked_prev_indices.add(prev_idx)
-                    pass1_results[curr_idx] = (change_label, prev_idx, safe_str(prev_O), changed_char_cols)
-
-        # Check if NEW row (all 10 keys missing)
-        if curr_idx not in pass1_results:
-            if (key_se not in prev_lookup_se) and \
-               (key_so not in prev_lookup_so) and \
-               (key_sc not in prev_lookup_sc) and \
-               (key_eo not in prev_lookup_eo) and \
-               (key_ec not in prev_lookup_ec) and \
-               (key_oc not in prev_lookup_oc) and \
-               (key_seo not in prev_lookup_seo) and \
-               (key_sec not in prev_lookup_sec) and \
-               (key_soc not in prev_lookup_soc) and \
-               (key_eoc not in prev_lookup_eoc):
+    with profile_stage("PASS 1"):
+        # Perfect 4-key matches and rows with all 10 keys missing, vectorized
+        certainties = prev_index.match_certainties(curr_keys)
+        matched = [(curr_pos, prev_pos) for curr_pos, prev_pos in certainties if prev_pos is not None]
+        # Use universal detection for consistent labeling (one batch for all matches)
+        labels, char_col_lists = comparator.compare_batch(
+            [curr_pos for curr_pos, _ in matched], [prev_pos for _, prev_pos in matched]
+        )
+        detections = dict(zip((curr_pos for curr_pos, _ in matched), zip(labels, char_col_lists)))
+
+        for curr_pos, prev_pos in certainties:
+            curr_idx = curr_labels[curr_pos]
+            if prev_pos is None:
                 pass1_results[curr_idx] = ("New Row", None, "", [])
+                continue
+
+            prev_idx = prev_index.labels[prev_pos]
+            change_label, changed_char_cols = detections[curr_pos]
 
-        progress_count += 1
-        if progress_count % 500 == 0 or progress_count == total_rows:
-            print_progress(progress_count, total_rows, "PASS 1: Detecting certainties")
+            marked_prev_indices.add(prev_idx)
+            pass1_results[curr_idx] = (change_label, prev_idx, prev_strorigin_values[prev_pos], changed_char_cols)
 
-    finalize_progress()
+        print_progress(total_rows, total_rows, "PASS 1: Detecting certainties")
+        finalize_progress()
 
     # ========================================
     # PASS 2: Detect partial changes using UNMARKED rows
     # ========================================
-    progress_count = 0
-    for curr_idx, curr_row in df_curr.iterrows():
-        # Skip if already classified in PASS 1
-        if curr_idx in pass1_results:
-            progress_count += 1
-            if progress_count % 500 == 0 or progress_count == total_rows:
-                print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
-            continue
-
-        S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-        E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-        O = safe_str(curr_row.get(COL_STRORIGIN, ""))
-        C = safe_str(curr_row.get(COL_CASTINGKEY, ""))
-
-        # Defensive check: ensure all values are strings
-        if isinstance(S, dict) or isinstance(E, dict) or isinstance(O, dict) or isinstance(C, dict):
-            log(f"ERROR at row {curr_idx}: Found dict value in keys!")
-            if isinstance(S, dict):
-                log(f"  SequenceName is dict: {S}")
-            if isinstance(E, dict):
-                log(f"  EventName is dict: {E}")
-            if isinstance(O, dict):
-                log(f"  StrOrigin is dict: {O}")
-            if isinstance(C, dict):
-                log(f"  CastingKey is dict: {C}")
-            raise TypeError(f"Row {curr_idx} contains dict value in key columns. Check Excel file for corrupted data.")
-
-        # Generate all 10 keys
-        key_se = (S, E)
-        key_so = (S, O)
-        key_sc = (S, C)
-        key_eo = (E, O)
-        key_ec = (E, C)
-        key_oc = (O, C)
-        key_seo = (S, E, O)
-        key_sec = (S, E, C)
-        key_soc = (S, O, C)
-        key_eoc = (E, O, C)
-
-        matched = False
-        change_label = None
-        prev_idx = None
-        prev_strorigin = ""
-        changed_char_cols = []
-
-        # ========================================
-        # LEVEL 1: 3-Key Matches (One core field changed)
-        # ========================================
-
-        # SEO Match: Same Sequence + Event + StrOrigin
-        if not matched and key_seo in prev_lookup_seo:
-            candidate_idx = prev_lookup_seo[key_seo]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SEC Match: Same Sequence + Event + CastingKey
-        if not matched and key_sec in prev_lookup_sec:
-            candidate_idx = prev_lookup_sec[key_sec]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SOC Match: Same Sequence + StrOrigin + CastingKey
-        if not matched and key_soc in prev_lookup_soc:
-            candidate_idx = prev_lookup_soc[key_soc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection with Korean relevance filter
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korean=O)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # EOC Match: Same Event + StrOrigin + CastingKey
-        if not matched and key_eoc in prev_lookup_eoc:
-            candidate_idx = prev_lookup_eoc[key_eoc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # ========================================
-        # LEVEL 2: 2-Key Matches (Two+ core fields changed)
-        # ========================================
-
-        # SE Match: Same Sequence + Event
-        if not matched and key_se in prev_lookup_se:
-            candidate_idx = prev_lookup_se[key_se]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # OC Match: Same StrOrigin + CastingKey
-        if not matched and key_oc in prev_lookup_oc:
-            candidate_idx = prev_lookup_oc[key_oc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # EC Match: Same Event + CastingKey
-        if not matched and key_ec in prev_lookup_ec:
-            candidate_idx = prev_lookup_ec[key_ec]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SC Match: Same Sequence + CastingKey
-        if not matched and key_sc in prev_lookup_sc:
-            candidate_idx = prev_lookup_sc[key_sc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SO Match: Same Sequence + StrOrigin
-        if not matched and key_so in prev_lookup_so:
-            candidate_idx = prev_lookup_so[key_so]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection with Korean relevance filter
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korean=O)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # EO Match: Same Event + StrOrigin
-        if not matched and key_eo in prev_lookup_eo:
-            candidate_idx = prev_lookup_eo[key_eo]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                # Use universal detection
-                change_label = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # If no match found in PASS 2, it's a NEW row
-        if not matched:
+    with profile_stage("PASS 2"):
+        progress_count = 0
+        for curr_pos, curr_idx in enumerate(curr_labels):
+            # Skip if already classified in PASS 1
+            if curr_idx in pass1_results:
+                progress_count += 1
+                if progress_count % 500 == 0 or progress_count == total_rows:
+                    print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
+                continue
+
+            O = curr_strorigins[curr_pos]
+
+            # 3-key matches first (one core field changed), then 2-key matches
             change_label = "New Row"
             prev_idx = None
             prev_strorigin = ""
             changed_char_cols = []
+            for key_name in PASS2_KEY_ORDER:
+                candidate_idx = prev_index.first_unmarked(key_name, curr_keys[key_name][curr_pos], marked_prev_indices)
+                if candidate_idx is None:
+                    continue
+                prev_pos = prev_index.position(candidate_idx)
+                prev_strorigin = prev_strorigin_values[prev_pos]
+                # Use universal detection (StrOrigin-based matches need Korean relevance)
+                require_korean = O if key_name in KOREAN_FILTER_KEYS else None
+                change_label = comparator.detect(curr_pos, prev_pos, require_korean=require_korean)
+                changed_char_cols = comparator.changed_char_cols(curr_pos, prev_pos)
+                prev_idx = candidate_idx
+                marked_prev_indices.add(candidate_idx)
+                break
 
-        # Store PASS 2 result
-        pass1_results[curr_idx] = (change_label, prev_idx, prev_strorigin, changed_char_cols)
+            # Store PASS 2 result (no match found → New Row)
+            pass1_results[curr_idx] = (change_label, prev_idx, prev_strorigin, changed_char_cols)
 
-        progress_count += 1
-        if progress_count % 500 == 0 or progress_count == total_rows:
-            print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
+            progress_count += 1
+            if progress_count % 500 == 0 or progress_count == total_rows:
+                print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
 
-    finalize_progress()
+        finalize_progress()
 
     # ========================================
     # Consolidate results from both passes
     # ========================================
-    for curr_idx in df_curr.index:
+    for curr_idx in curr_labels:
         if curr_idx in pass1_results:
             change_label, prev_idx, prev_strorigin, char_cols = pass1_results[curr_idx]
             changes.append(change_label)
@@ -363,10 +157,13 @@ def compare_rows(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_s
             "migrated_out_words": 0
         }
 
+    curr_groups = comparator.curr_column(COL_GROUP, "Unknown")
+    prev_groups = comparator.prev_column(COL_GROUP, "Unknown")
+
     # Process current rows for group analysis
-    for curr_idx, curr_row in df_curr.iterrows():
-        curr_group = safe_str(curr_row.get(COL_GROUP, "Unknown"))
-        curr_strorigin = safe_str(curr_row.get(COL_STRORIGIN, ""))
+    for curr_pos, curr_idx in enumerate(curr_labels):
+        curr_group = curr_groups[curr_pos]
+        curr_strorigin = curr_strorigins[curr_pos]
         curr_words = len(curr_strorigin.split()) if curr_strorigin else 0
 
         # Initialize group if not exists
@@ -383,9 +180,9 @@ def compare_rows(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_s
 
         elif prev_idx is not None:
             # Row matched to previous
-            prev_row = df_prev.loc[prev_idx]
-            prev_group = safe_str(prev_row.get(COL_GROUP, "Unknown"))
-            prev_strorigin_text = safe_str(prev_row.get(COL_STRORIGIN, ""))
+            prev_pos = prev_index.position(prev_idx)
+            prev_group = prev_groups[prev_pos]
+            prev_strorigin_text = prev_strorigin_values[prev_pos]
             prev_words = len(prev_strorigin_text.split()) if prev_strorigin_text else 0
 
             # Initialize previous group if needed
@@ -410,11 +207,11 @@ def compare_rows(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_s
                 group_analysis[curr_group]["migrated_in_words"] += curr_words
 
     # Process deleted rows for group analysis
-    deleted_indices = [idx for idx in df_prev.index if idx not in marked_prev_indices]
-    for del_idx in deleted_indices:
-        del_row = df_prev.loc[del_idx]
-        del_group = safe_str(del_row.get(COL_GROUP, "Unknown"))
-        del_strorigin = safe_str(del_row.get(COL_STRORIGIN, ""))
+    for del_pos, del_idx in enumerate(df_prev.index):
+        if del_idx in marked_prev_indices:
+            continue
+        del_group = prev_groups[del_pos]
+        del_strorigin = prev_strorigin_values[del_pos]
         del_words = len(del_strorigin.split()) if del_strorigin else 0
 
         # Initialize group if needed
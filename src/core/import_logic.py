@@ -3,12 +3,22 @@ Import logic for VRS data processing.
 
 This module handles the logic for importing data from previous files,
 determining which fields to preserve based on change type and recording status.
+
+apply_import_logic() and apply_import_logic_alllang_lang() decide for one row.
+The comparison processes apply the same decisions to a whole result frame at
+once with apply_import_rules() and a declarative rule table
+(WORKING_IMPORT_RULES, ALLLANG_IMPORT_RULES).
 """
 
+import numpy as np
+import pandas as pd
+
 from src.config import (
-    COL_TEXT, COL_DESC, COL_STATUS, COL_FREEMEMO, COL_STRORIGIN
+    COL_TEXT, COL_DESC, COL_STATUS, COL_FREEMEMO, COL_STRORIGIN, COL_STARTFRAME,
+    COL_EVENTNAME, COL_CHANGES, COL_DETAILED_CHANGES, COL_PREVIOUS_EVENTNAME, COL_PREVIOUS_TEXT
 )
-from src.utils.helpers import safe_str
+from src.utils.helpers import safe_str, safe_str_series
+from src.core.change_detection import get_priority_change
 
 
 def apply_import_logic(curr_row, prev_row, change_type):
@@ -149,3 +159,225 @@ def apply_import_logic_alllang_lang(curr_row, prev_row, change_type, lang_suffix
         result[status_col] = prev_status
 
     return result
+
+
+# ============================================================
+# Column-wise import rules
+# ============================================================
+
+# Where an imported field's value comes from
+PREV = "previous"  # The matched previous row ("" if there is none)
+CURR = "current"   # The current row itself (cleaned)
+
+# Rule condition that matches every row
+ANY = None
+
+# Fields imported from every matched previous row, whatever the change
+MATCHED_ROW_IMPORTS = (COL_FREEMEMO,)
+
+# Working Process (same decisions as apply_import_logic).
+# First matching rule wins:
+# (change category, previous STATUS set, previous Text is "NO TRANSLATION") → {field: source}
+WORKING_IMPORT_RULES = (
+    # New rows don't import any other data
+    (("New Row", ANY, ANY), {}),
+    # NO TRANSLATION override: always bring current text (nothing to preserve)
+    ((ANY, ANY, True), {COL_TEXT: CURR, COL_DESC: PREV}),
+    # StrOrigin Change with ANY status: preserve previous text, use NEW strorigin
+    (("StrOrigin", True, ANY), {COL_TEXT: PREV, COL_DESC: PREV, COL_STATUS: PREV, COL_STRORIGIN: CURR}),
+    # StrOrigin Change without status: keep previous text
+    (("StrOrigin", False, ANY), {COL_TEXT: PREV, COL_DESC: PREV}),
+    (("Desc", ANY, ANY), {COL_TEXT: PREV, COL_DESC: CURR, COL_STATUS: PREV}),
+    # TimeFrame, no/irrelevant change and everything else: preserve all previous data
+    ((ANY, ANY, ANY), {COL_TEXT: PREV, COL_DESC: PREV, COL_STATUS: PREV}),
+)
+
+# All Language Process, applied once per language (fields map to Text_KR,
+# STATUS_KR, ...). These are the rules process_alllang_comparison_twopass has
+# always applied; unlike apply_import_logic_alllang_lang there is no
+# NO TRANSLATION override, and StrOrigin changes with a status keep the
+# previous StrOrigin.
+ALLLANG_IMPORT_RULES = (
+    (("New Row", ANY, ANY), {}),
+    # ANY status exists: preserve previous translation + StrOrigin
+    (("StrOrigin", True, ANY), {COL_TEXT: PREV, COL_STATUS: PREV, COL_STRORIGIN: PREV}),
+    # No status: use current/mainline translation
+    (("StrOrigin", False, ANY), {COL_TEXT: CURR}),
+    ((ANY, ANY, ANY), {COL_TEXT: PREV, COL_STATUS: PREV}),
+)
+
+
+def import_category(change_type):
+    """
+    Import rule category of a change label.
+
+    Args:
+        change_type: Change label (e.g. "EventName+StrOrigin Change")
+
+    Returns:
+        str: "New Row", "StrOrigin", "Desc" or "Other"
+    """
+    if change_type == "New Row":
+        return "New Row"
+    if "StrOrigin" in change_type:
+        return "StrOrigin"
+    if change_type == "Desc Change":
+        return "Desc"
+    return "Other"
+
+
+def previous_values(df_prev, prev_positions, col):
+    """
+    Values of one previous column aligned to the current rows.
+
+    Args:
+        df_prev: Previous DataFrame (None if there are no previous rows)
+        prev_positions: Row position in df_prev for each current row (-1: no match)
+        col: Previous column name
+
+    Returns:
+        ndarray: Clean strings ("" where there is no previous row or column)
+    """
+    positions = np.asarray(prev_positions, dtype=np.int64)
+    values = np.full(len(positions), "", dtype=object)
+    if df_prev is None or col not in df_prev.columns:
+        return values
+    matched = positions >= 0
+    gathered = df_prev[col].to_numpy(dtype=object)[positions[matched]]
+    values[matched] = safe_str_series(gathered).to_numpy(dtype=object)
+    return values
+
+
+def previous_data_values(df_prev, prev_positions, text_col=COL_TEXT, status_col=COL_STATUS,
+                         freememo_col=COL_FREEMEMO):
+    """
+    Column-wise generate_previous_data() for every current row.
+
+    Args:
+        df_prev: Previous DataFrame (None if there are no previous rows)
+        prev_positions: Row position in df_prev for each current row (-1: no match)
+        text_col, status_col, freememo_col: Previous columns to include
+
+    Returns:
+        ndarray: "StrOrigin|Text|STATUS|FREEMEMO|StartFrame" ("" without a previous row)
+    """
+    positions = np.asarray(prev_positions, dtype=np.int64)
+    matched = positions >= 0
+    values = np.full(len(positions), "", dtype=object)
+    if df_prev is None or not matched.any():
+        return values
+    parts = [previous_values(df_prev, positions, col)[matched]
+             for col in (COL_STRORIGIN, text_col, status_col, freememo_col, COL_STARTFRAME)]
+    values[matched] = ["|".join(row) for row in zip(*parts)]
+    return values
+
+
+def apply_import_rules(df, change_types, df_prev, prev_positions, rules, columns=None):
+    """
+    Apply an import rule table to a whole result frame.
+
+    Every row gets the field values of the first rule matching its change
+    category, whether its previous row has a STATUS and whether its previous
+    Text is "NO TRANSLATION"; MATCHED_ROW_IMPORTS are imported for every row
+    with a previous row. Fields a row's rule does not list keep their value.
+
+    Args:
+        df: Result DataFrame, one row per entry of change_types (updated in place)
+        change_types: Change label of each row
+        df_prev: Previous DataFrame (None if there are no previous rows)
+        prev_positions: Row position in df_prev for each row (-1: no match)
+        rules: Rule table (WORKING_IMPORT_RULES or ALLLANG_IMPORT_RULES)
+        columns: Optional {field: result column} for fields stored under
+                 another name (e.g. {COL_TEXT: "Text_KR"})
+    """
+    columns = columns or {}
+    row_count = len(df)
+    positions = np.asarray(prev_positions, dtype=np.int64)
+
+    previous = {}
+
+    def previous_field(field):
+        """Cleaned previous-row values of a field, looked up once per field."""
+        if field not in previous:
+            previous[field] = previous_values(df_prev, positions, field)
+        return previous[field]
+
+    def current_field(field):
+        """Cleaned current values of a field ("" if the frame lacks its column)."""
+        col = columns.get(field, field)
+        if col in df.columns:
+            return safe_str_series(df[col].to_numpy(dtype=object)).to_numpy(dtype=object)
+        return np.full(row_count, "", dtype=object)
+
+    updates = {}
+
+    def update(field, mask, values):
+        """Stage values for the masked rows of a field's result column."""
+        if not mask.any():
+            return
+        col = columns.get(field, field)
+        if col not in updates:
+            # np.array() copies: to_numpy(copy=True) may hand out the backing
+            # array of a str column, which is shared with the caller's frame
+            updates[col] = (np.array(df[col].to_numpy(dtype=object), dtype=object) if col in df.columns
+                            else np.full(row_count, np.nan, dtype=object))
+        updates[col][mask] = values[mask]
+
+    has_previous = positions >= 0
+    for field in MATCHED_ROW_IMPORTS:
+        update(field, has_previous, previous_field(field))
+
+    # Few distinct labels: categorize each once
+    codes, labels = pd.factorize(pd.Series(change_types, dtype=object))
+    categories = np.array([import_category(label) for label in labels], dtype=object)[codes]
+    has_status = previous_field(COL_STATUS) != ""
+    no_translation = previous_field(COL_TEXT) == "NO TRANSLATION"
+
+    remaining = np.ones(row_count, dtype=bool)
+    for (category, status, translation_missing), sources in rules:
+        mask = remaining.copy()
+        if category is not ANY:
+            mask &= categories == category
+        if status is not ANY:
+            mask &= has_status == status
+        if translation_missing is not ANY:
+            mask &= no_translation == translation_missing
+        remaining &= ~mask
+        for field, source in sources.items():
+            update(field, mask, previous_field(field) if source == PREV else current_field(field))
+
+    for col, values in updates.items():
+        df[col] = values
+
+
+def add_change_columns(df, change_types, df_prev, prev_positions, use_priority_change):
+    """
+    Add the change columns of a comparison result as whole columns.
+
+    DETAILED_CHANGES holds the full label and CHANGES the priority label
+    (or the full composite in legacy mode). PreviousEventName is filled
+    only when EventName changed, PreviousText for every matched row that is
+    not a New Row.
+
+    Args:
+        df: Result DataFrame, one row per entry of change_types (updated in place)
+        change_types: Change label of each row
+        df_prev: Previous DataFrame (None if there are no previous rows)
+        prev_positions: Row position in df_prev for each row (-1: no match)
+        use_priority_change: Show the priority label in CHANGES
+    """
+    df[COL_DETAILED_CHANGES] = change_types
+    if use_priority_change:
+        priority = {label: get_priority_change(label) for label in set(change_types)}
+        df[COL_CHANGES] = [priority[label] for label in change_types]
+    else:
+        df[COL_CHANGES] = change_types  # Legacy mode: show full composite
+
+    positions = np.asarray(prev_positions, dtype=np.int64)
+    matched = positions >= 0
+    eventname_changed = np.array(["EventName" in label for label in change_types], dtype=bool)
+    df[COL_PREVIOUS_EVENTNAME] = np.where(
+        matched & eventname_changed, previous_values(df_prev, positions, COL_EVENTNAME), ""
+    )
+    not_new = np.array([label != "New Row" for label in change_types], dtype=bool)
+    df[COL_PREVIOUS_TEXT] = np.where(matched & not_new, previous_values(df_prev, positions, COL_TEXT), "")
@@ -1,8 +1,8 @@
 """
-Lookup dictionary building module.
+Lookup index building module.
 
-This module provides functionality to build lookup dictionaries for
-efficient row matching using the 10-key system:
+This module provides the TenKeyIndex used for efficient row matching with
+the 10-key system:
 1. (S, E) - Sequence + Event
 2. (S, O) - Sequence + StrOrigin
 3. (S, C) - Sequence + CastingKey
@@ -13,96 +13,335 @@ efficient row matching using the 10-key system:
 8. (S, E, C) - Sequence + Event + CastingKey
 9. (S, O, C) - Sequence + StrOrigin + CastingKey
 10. (E, O, C) - Event + StrOrigin + CastingKey
+
+S/E/O/C values are factorized into integer codes once per DataFrame and each
+key combination is packed into a single integer, so the index holds ten
+int → row maps instead of ten dicts of string tuples.
 """
 
+import numpy as np
+import pandas as pd
+
 from src.config import (
     COL_SEQUENCE, COL_EVENTNAME, COL_STRORIGIN, COL_CASTINGKEY
 )
-from src.utils.progress import print_progress, finalize_progress
-from src.utils.data_processing import safe_str
+from src.utils.helpers import safe_str_series
+
+# Key field letter → source column
+KEY_FIELDS = {
+    "S": COL_SEQUENCE,
+    "E": COL_EVENTNAME,
+    "O": COL_STRORIGIN,
+    "C": COL_CASTINGKEY,
+}
+
+# All 10 key combinations (2-key, then 3-key)
+TEN_KEYS = ("SE", "SO", "SC", "EO", "EC", "OC", "SEO", "SEC", "SOC", "EOC")
+
+# PASS 2 matching priority: 3-key matches first (one core field changed),
+# then 2-key matches (two+ core fields changed)
+PASS2_KEY_ORDER = ("SEO", "SEC", "SOC", "EOC", "SE", "OC", "EC", "SC", "SO", "EO")
+
+# Matches on Sequence + StrOrigin use the Korean relevance filter
+# (detect_all_field_changes(..., require_korean=StrOrigin))
+KOREAN_FILTER_KEYS = ("SOC", "SO")
+
+
+class TenKeyIndex:
+    """
+    Integer-encoded 10-key index over one DataFrame.
+
+    Each key combination maps to the FIRST row holding that key (TWO-PASS
+    algorithm: later duplicates are never candidates). Queries use keys
+    encoded with encode(), so the same index answers lookups for any
+    DataFrame compared against it.
+
+    Row references returned by queries are DataFrame INDEX labels; use
+    df.loc[label] to retrieve the row.
+    """
+
+    def __init__(self, df):
+        """
+        Build the index.
+
+        Args:
+            df: DataFrame to index (missing key columns are treated as "")
+        """
+        self.labels = df.index.tolist()
+        index = df.index
+        if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+            self._label_positions = None  # Labels are row positions
+        else:
+            self._label_positions = {label: pos for pos, label in enumerate(self.labels)}
+        self._vocab = {}
+        self._codes = {}
+        for field, col in KEY_FIELDS.items():
+            values = _column_values(df, col)
+            codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+            self._vocab[field] = pd.Index(uniques, dtype=object)
+            self._codes[field] = codes.astype(np.int64)
+
+        self._pairs = {}   # 2-field prefix → Index of packed pairs (3-key packing)
+        self._keys = {}    # combo → sorted unique packed keys
+        self._first_rows = {}  # combo → first row position per sorted key
+        self._first = {}   # combo → {packed key: first row position}
+        for combo in TEN_KEYS:
+            packed = self._pack(combo, self._codes, build=True)
+            keys, first_positions = np.unique(packed, return_index=True)
+            self._keys[combo] = keys
+            self._first_rows[combo] = first_positions.astype(np.int64)
+            self._first[combo] = dict(zip(keys.tolist(), first_positions.tolist()))
+
+    def __len__(self):
+        """Number of indexed rows."""
+        return len(self.labels)
+
+    def _pack(self, combo, codes, build=False):
+        """
+        Pack per-field codes of a key combination into one integer per row.
+
+        Rows where any field value is unknown to this index get -1.
+        3-key combinations are packed via the code of their 2-field prefix,
+        which keeps packed values below rows² and avoids overflow.
+        """
+        first, second = combo[0], combo[1]
+        pair = codes[first] * len(self._vocab[second]) + codes[second]
+        pair[(codes[first] < 0) | (codes[second] < 0)] = -1
+        if len(combo) == 2:
+            return pair
+
+        prefix = combo[:2]
+        if build:
+            if prefix not in self._pairs:
+                self._pairs[prefix] = pd.Index(np.unique(pair))
+        pair_codes = self._pairs[prefix].get_indexer(pair).astype(np.int64)
+        third = combo[2]
+        packed = pair_codes * len(self._vocab[third]) + codes[third]
+        packed[(pair_codes < 0) | (codes[third] < 0) | (pair < 0)] = -1
+        return packed
+
+    def encode(self, df):
+        """
+        Encode the 10 keys of every row of a DataFrame against this index.
+
+        Args:
+            df: DataFrame whose rows will be looked up
+
+        Returns:
+            dict: combo → list of packed keys (one per row, -1 if unknown),
+                  plus "S"/"E"/"O"/"C" → list of field codes
+        """
+        codes = {}
+        for field, col in KEY_FIELDS.items():
+            values = _column_values(df, col)
+            codes[field] = self._vocab[field].get_indexer(values).astype(np.int64)
+
+        encoded = {field: field_codes.tolist() for field, field_codes in codes.items()}
+        for combo in TEN_KEYS:
+            encoded[combo] = self._pack(combo, codes).tolist()
+        return encoded
+
+    def encode_values(self, combo, values):
+        """
+        Encode a single key tuple, e.g. ("Seq1", "Event1") for "SE".
+
+        Args:
+            combo: Key combination name (e.g., "SE")
+            values: Tuple of field values in combo order
+
+        Returns:
+            int: Packed key (-1 if unknown to this index)
+        """
+        codes = {field: np.array([-1], dtype=np.int64) for field in KEY_FIELDS}
+        for field, value in zip(combo, values):
+            codes[field] = self._vocab[field].get_indexer([value]).astype(np.int64)
+        return int(self._pack(combo, codes)[0])
+
+    def contains(self, combo, key):
+        """Return True if the packed key exists in this index."""
+        return key in self._first[combo]
+
+    def contains_any(self, encoded, pos):
+        """Return True if any of the 10 keys of encoded row `pos` exists."""
+        for combo in TEN_KEYS:
+            if encoded[combo][pos] in self._first[combo]:
+                return True
+        return False
+
+    def isin(self, combo, keys):
+        """
+        Vectorized membership test for packed keys.
+
+        Args:
+            combo: Key combination name
+            keys: Array-like of packed keys
+
+        Returns:
+            ndarray: Boolean mask
+        """
+        return np.isin(np.asarray(keys, dtype=np.int64), self._keys[combo])
+
+    def first(self, combo, key):
+        """
+        Get the first row holding a key.
+
+        Args:
+            combo: Key combination name
+            key: Packed key
+
+        Returns:
+            DataFrame index label, or None if the key does not exist
+        """
+        pos = self._first[combo].get(key)
+        return None if pos is None else self.labels[pos]
+
+    def first_unmarked(self, combo, key, marked):
+        """
+        Get the first row holding a key if it is not yet marked.
+
+        Only the first occurrence is ever a candidate; if it is already
+        matched, the key yields no candidate.
+
+        Args:
+            combo: Key combination name
+            key: Packed key
+            marked: Set of already matched DataFrame index labels
+
+        Returns:
+            DataFrame index label, or None
+        """
+        pos = self._first[combo].get(key)
+        if pos is None:
+            return None
+        label = self.labels[pos]
+        return None if label in marked else label
+
+    def first_positions(self, combo, keys):
+        """
+        Vectorized first-occurrence lookup.
+
+        Args:
+            combo: Key combination name
+            keys: Array-like of packed keys
+
+        Returns:
+            ndarray: Row positions (-1 where the key does not exist)
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        table = self._keys[combo]
+        positions = np.full(len(keys), -1, dtype=np.int64)
+        if len(table):
+            slots = np.searchsorted(table, keys).clip(max=len(table) - 1)
+            found = table[slots] == keys
+            positions[found] = self._first_rows[combo][slots[found]]
+        return positions
+
+    def match_certainties(self, encoded, combo="SEO"):
+        """
+        Vectorized PASS 1 of the TWO-PASS algorithm.
+
+        Equivalent to walking the encoded rows in order with an initially empty
+        marked set: a row is a perfect match when the first indexed row holding
+        its `combo` key has identical S, E, O and C and no earlier row claimed
+        it; a row is new when none of its 10 keys exists.
+
+        Args:
+            encoded: Result of encode()
+            combo: Key combination used to find the perfect-match candidate
+
+        Returns:
+            list: (row_position, indexed_row_position) pairs in row order; the
+                  indexed position is None for new rows. Rows not listed are
+                  left for PASS 2.
+        """
+        candidates = self.first_positions(combo, encoded[combo])
+        found = candidates >= 0
+        perfect = found.copy()
+        for field in KEY_FIELDS:
+            curr_codes = np.asarray(encoded[field], dtype=np.int64)
+            perfect[found] &= self._codes[field][candidates[found]] == curr_codes[found]
+
+        # Only the first row claiming a candidate gets it (later ones see it marked)
+        matched_positions = np.flatnonzero(perfect)
+        _, first_claims = np.unique(candidates[matched_positions], return_index=True)
+        matched_positions = np.sort(matched_positions[first_claims])
+
+        any_key = np.zeros(len(candidates), dtype=bool)
+        for key_combo in TEN_KEYS:
+            any_key |= self.isin(key_combo, encoded[key_combo])
+
+        certainties = dict.fromkeys(np.flatnonzero(~any_key).tolist())
+        certainties.update(zip(matched_positions.tolist(), candidates[matched_positions].tolist()))
+        return sorted(certainties.items())
+
+    def field_codes(self, field):
+        """Return the per-row codes of a key field (S, E, O or C)."""
+        return self._codes[field]
+
+    def is_perfect_match(self, label, encoded, pos):
+        """
+        Check that indexed row `label` has the same S, E, O and C as encoded row `pos`.
+
+        Args:
+            label: DataFrame index label of the indexed row
+            encoded: Result of encode()
+            pos: Row position in the encoded DataFrame
+
+        Returns:
+            bool: True if all four key fields are identical
+        """
+        row = self.position(label)
+        return all(self._codes[field][row] == encoded[field][pos] for field in KEY_FIELDS)
+
+    def position(self, label):
+        """Row position of a DataFrame index label."""
+        if self._label_positions is None:
+            return label
+        return self._label_positions[label]
+
+    def unique_count(self, combo="SE"):
+        """Number of distinct keys for a combination."""
+        return len(self._keys[combo])
+
+    def to_dict(self, combo):
+        """
+        Export one combination as a plain {key tuple: DataFrame index} dict.
+
+        Args:
+            combo: Key combination name
+
+        Returns:
+            dict: Mapping of value tuples to first-occurrence index labels
+        """
+        result = {}
+        for pos in self._first[combo].values():
+            key = tuple(self._vocab[field][self._codes[field][pos]] for field in combo)
+            result[key] = self.labels[pos]
+        return result
+
+
+def _column_values(df, col):
+    """Key column values as clean strings ("" if the column is missing)."""
+    if col in df.columns:
+        return safe_str_series(df[col].to_numpy(dtype=object)).to_numpy(dtype=object)
+    return np.full(len(df), "", dtype=object)
 
 
 def build_lookups(df):
     """
-    Build 10 lookup dictionaries for comprehensive matching (10-Key System).
+    Build the 10-key lookup index for comprehensive matching (10-Key System).
 
-    Creates fast lookup dictionaries for the raw VRS check process using
-    all possible 2-field and 3-field key combinations to precisely identify
+    Creates a fast lookup index for the raw VRS check process using all
+    possible 2-field and 3-field key combinations to precisely identify
     what changed between previous and current files.
 
-    TWO-PASS ALGORITHM: Lookups now store DataFrame INDEX only (not full rows).
+    TWO-PASS ALGORITHM: The index stores DataFrame INDEX only (not full rows).
     This prevents 1-to-many matching issues with duplicate StrOrigin/CastingKey.
 
     Args:
         df: DataFrame to build lookups from
 
     Returns:
-        tuple: (lookup_se, lookup_so, lookup_sc, lookup_eo, lookup_ec,
-                lookup_oc, lookup_seo, lookup_sec, lookup_soc, lookup_eoc) where:
-            - Each lookup maps keys to DataFrame INDEX (int)
-            - Use df.loc[index] to retrieve row when needed
+        TenKeyIndex: Index mapping each key to its first DataFrame INDEX
     """
-    # Initialize all 10 lookups (2-key combinations)
-    lookup_se = {}   # (Sequence, Event) → DataFrame index
-    lookup_so = {}   # (Sequence, StrOrigin) → DataFrame index
-    lookup_sc = {}   # (Sequence, CastingKey) → DataFrame index
-    lookup_eo = {}   # (Event, StrOrigin) → DataFrame index
-    lookup_ec = {}   # (Event, CastingKey) → DataFrame index
-    lookup_oc = {}   # (StrOrigin, CastingKey) → DataFrame index
-
-    # 3-key combinations
-    lookup_seo = {}  # (Sequence, Event, StrOrigin) → DataFrame index
-    lookup_sec = {}  # (Sequence, Event, CastingKey) → DataFrame index
-    lookup_soc = {}  # (Sequence, StrOrigin, CastingKey) → DataFrame index
-    lookup_eoc = {}  # (Event, StrOrigin, CastingKey) → DataFrame index
-
-    total = len(df)
-    progress_count = 0
-
-    for df_idx, row in df.iterrows():
-        S = safe_str(row.get(COL_SEQUENCE, ""))
-        E = safe_str(row.get(COL_EVENTNAME, ""))
-        O = safe_str(row.get(COL_STRORIGIN, ""))
-        C = safe_str(row.get(COL_CASTINGKEY, ""))
-
-        # Generate all 10 keys
-        key_se = (S, E)
-        key_so = (S, O)
-        key_sc = (S, C)
-        key_eo = (E, O)
-        key_ec = (E, C)
-        key_oc = (O, C)
-        key_seo = (S, E, O)
-        key_sec = (S, E, C)
-        key_soc = (S, O, C)
-        key_eoc = (E, O, C)
-
-        # Store DataFrame INDEX in each lookup (first occurrence only)
-        if key_se not in lookup_se:
-            lookup_se[key_se] = df_idx
-        if key_so not in lookup_so:
-            lookup_so[key_so] = df_idx
-        if key_sc not in lookup_sc:
-            lookup_sc[key_sc] = df_idx
-        if key_eo not in lookup_eo:
-            lookup_eo[key_eo] = df_idx
-        if key_ec not in lookup_ec:
-            lookup_ec[key_ec] = df_idx
-        if key_oc not in lookup_oc:
-            lookup_oc[key_oc] = df_idx
-        if key_seo not in lookup_seo:
-            lookup_seo[key_seo] = df_idx
-        if key_sec not in lookup_sec:
-            lookup_sec[key_sec] = df_idx
-        if key_soc not in lookup_soc:
-            lookup_soc[key_soc] = df_idx
-        if key_eoc not in lookup_eoc:
-            lookup_eoc[key_eoc] = df_idx
-
-        progress_count += 1
-        if progress_count % 500 == 0 or progress_count == total:
-            print_progress(progress_count, total, "Building 10-key lookups")
-
-    finalize_progress()
-    return (lookup_se, lookup_so, lookup_sc, lookup_eo, lookup_ec,
-            lookup_oc, lookup_seo, lookup_sec, lookup_soc, lookup_eoc)
+    return TenKeyIndex(df)
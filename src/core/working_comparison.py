@@ -5,25 +5,28 @@ This module handles the comparison logic specific to the Working VRS Check,
 including data import and PreviousData generation using the TWO-PASS 10-key system.
 """
 
-import pandas as pd
+from collections import Counter
+
+import numpy as np
 from src.config import (
-    COL_SEQUENCE, COL_EVENTNAME, COL_STRORIGIN, COL_CASTINGKEY,
-    COL_TEXT, COL_STATUS, COL_FREEMEMO, COL_PREVIOUSDATA, COL_MAINLINE_TRANSLATION,
-    COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY, COL_DESC, COL_STARTFRAME,
-    COL_DIALOGTYPE, COL_GROUP,
-    COL_CHANGES, COL_DETAILED_CHANGES, COL_PREVIOUS_EVENTNAME, COL_PREVIOUS_TEXT
+    COL_STRORIGIN, COL_CASTINGKEY,
+    COL_TEXT, COL_PREVIOUSDATA, COL_MAINLINE_TRANSLATION,
+    COL_DESC, COL_STARTFRAME,
+    COL_DIALOGTYPE, COL_GROUP
 )
-from src.utils.helpers import safe_str, contains_korean, log, generate_previous_data
+from src.utils.helpers import safe_str_series, contains_korean, log
 from src.utils.progress import print_progress, finalize_progress
-from src.core.casting import generate_casting_key
-from src.core.import_logic import apply_import_logic
-from src.core.change_detection import detect_all_field_changes, get_changed_char_cols, get_priority_change
-from src.settings import get_use_priority_change, get_v5_enabled_columns
+from src.utils.profiling import profile_stage
+from src.core.casting import generate_casting_keys
+from src.core.import_logic import (
+    WORKING_IMPORT_RULES, apply_import_rules, previous_values, previous_data_values, add_change_columns
+)
+from src.core.change_detection import RowComparator
+from src.core.lookups import PASS2_KEY_ORDER, KOREAN_FILTER_KEYS
+from src.settings import get_use_priority_change, get_v5_enabled_columns, get_settings_snapshot
 
 
-def process_working_comparison(df_curr, df_prev, prev_lookup_se, prev_lookup_so, prev_lookup_sc,
-                                prev_lookup_eo, prev_lookup_ec, prev_lookup_oc,
-                                prev_lookup_seo, prev_lookup_sec, prev_lookup_soc, prev_lookup_eoc):
+def process_working_comparison(df_curr, df_prev, prev_index, settings=None):
     """
     Compare current data with previous using TWO-PASS 10-key system for Working Process.
 
@@ -37,16 +40,8 @@ def process_working_comparison(df_curr, df_prev, prev_lookup_se, prev_lookup_so,
     Args:
         df_curr: Current DataFrame
         df_prev: Previous DataFrame (needed to retrieve rows by index)
-        prev_lookup_se: Previous lookup for (Sequence, Event) → DataFrame index
-        prev_lookup_so: Previous lookup for (Sequence, StrOrigin) → DataFrame index
-        prev_lookup_sc: Previous lookup for (Sequence, CastingKey) → DataFrame index
-        prev_lookup_eo: Previous lookup for (Event, StrOrigin) → DataFrame index
-        prev_lookup_ec: Previous lookup for (Event, CastingKey) → DataFrame index
-        prev_lookup_oc: Previous lookup for (StrOrigin, CastingKey) → DataFrame index
-        prev_lookup_seo: Previous lookup for (Sequence, Event, StrOrigin) → DataFrame index
-        prev_lookup_sec: Previous lookup for (Sequence, Event, CastingKey) → DataFrame index
-        prev_lookup_soc: Previous lookup for (Sequence, StrOrigin, CastingKey) → DataFrame index
-        prev_lookup_eoc: Previous lookup for (Event, StrOrigin, CastingKey) → DataFrame index
+        prev_index: TenKeyIndex of df_prev (from build_working_lookups)
+        settings: Optional SettingsSnapshot of the run (default: current snapshot)
 
     Returns:
         tuple: (df_result, counter, marked_prev_indices, pass1_results) where:
@@ -60,365 +55,138 @@ def process_working_comparison(df_curr, df_prev, prev_lookup_se, prev_lookup_so,
     marked_prev_indices = set()
     total_rows = len(df_curr)
 
+    # Encode all 10 keys of every current row once and extract the compared
+    # columns of both files, so rows are accessed by integer position
+    curr_keys = prev_index.encode(df_curr)
+    comparator = RowComparator(df_curr, df_prev)
+    curr_strorigins = comparator.curr_column(COL_STRORIGIN)
+    prev_strorigin_values = comparator.prev_column(COL_STRORIGIN)
+    curr_labels = df_curr.index.tolist()
+
     # ========================================
     # PASS 1: Detect No Change and New rows
     # ========================================
     pass1_results = {}  # curr_idx → (change_type, prev_idx_or_none)
 
-    progress_count = 0
-    for curr_idx, curr_row in df_curr.iterrows():
-        S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-        E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-        O = safe_str(curr_row.get(COL_STRORIGIN, ""))
-        C = safe_str(curr_row.get(COL_CASTINGKEY, ""))
-
-        # Defensive check: ensure all values are strings
-        if isinstance(S, dict) or isinstance(E, dict) or isinstance(O, dict) or isinstance(C, dict):
-            log(f"ERROR at row {curr_idx}: Found dict value in keys!")
-            if isinstance(S, dict):
-                log(f"  SequenceName is dict: {S}")
-            if isinstance(E, dict):
-                log(f"  EventName is dict: {E}")
-            if isinstance(O, dict):
-                log(f"  StrOrigin is dict: {O}")
-            if isinstance(C, dict):
-                log(f"  CastingKey is dict: {C}")
-            raise TypeError(f"Row {curr_idx} contains dict value in key columns. Check Excel file for corrupted data.")
-
-        # Generate all 10 keys
-        key_se = (S, E)
-        key_so = (S, O)
-        key_sc = (S, C)
-        key_eo = (E, O)
-        key_ec = (E, C)
-        key_oc = (O, C)
-        key_seo = (S, E, O)
-        key_sec = (S, E, C)
-        key_soc = (S, O, C)
-        key_eoc = (E, O, C)
-
-        # Check for perfect 4-key match (No Change)
-        if key_seo in prev_lookup_seo:
-            prev_idx = prev_lookup_seo[key_seo]
-            if prev_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[prev_idx]
-                prev_S = safe_str(prev_row.get(COL_SEQUENCE, ""))
-                prev_E = safe_str(prev_row.get(COL_EVENTNAME, ""))
-                prev_O = safe_str(prev_row.get(COL_STRORIGIN, ""))
-                prev_C = safe_str(prev_row.get(COL_CASTINGKEY, ""))
-                prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
-
-                # Perfect match: All 4 keys identical
-                if S == prev_S and E == prev_E and O == prev_O and C == prev_C:
-                    # Use universal detection for consistent labeling
-                    change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                    changed_char_cols = get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
-
-                    marked_prev_indices.add(prev_idx)
-                    pass1_results[curr_idx] = (change_type, prev_idx, prev_strorigin, changed_char_cols)
-
-        # Check if NEW row (all 10 keys missing)
-        if curr_idx not in pass1_results:
-            if (key_se not in prev_lookup_se) and \
-               (key_so not in prev_lookup_so) and \
-               (key_sc not in prev_lookup_sc) and \
-               (key_eo not in prev_lookup_eo) and \
-               (key_ec not in prev_lookup_ec) and \
-               (key_oc not in prev_lookup_oc) and \
-               (key_seo not in prev_lookup_seo) and \
-               (key_sec not in prev_lookup_sec) and \
-               (key_soc not in prev_lookup_soc) and \
-               (key_eoc not in prev_lookup_eoc):
+    with profile_stage("PASS 1"):
+        # Perfect 4-key matches and rows with all 10 keys missing, vectorized
+        certainties = prev_index.match_certainties(curr_keys)
+        matched = [(curr_pos, prev_pos) for curr_pos, prev_pos in certainties if prev_pos is not None]
+        # Use universal detection for consistent labeling (one batch for all matches)
+        labels, char_col_lists = comparator.compare_batch(
+            [curr_pos for curr_pos, _ in matched], [prev_pos for _, prev_pos in matched]
+        )
+        detections = dict(zip((curr_pos for curr_pos, _ in matched), zip(labels, char_col_lists)))
+
+        for curr_pos, prev_pos in certainties:
+            curr_idx = curr_labels[curr_pos]
+            if prev_pos is None:
                 pass1_results[curr_idx] = ("New Row", None, "", [])
+                continue
+
+            prev_idx = prev_index.labels[prev_pos]
+            change_type, changed_char_cols = detections[curr_pos]
 
-        progress_count += 1
-        if progress_count % 500 == 0 or progress_count == total_rows:
-            print_progress(progress_count, total_rows, "PASS 1: Detecting certainties")
+            marked_prev_indices.add(prev_idx)
+            pass1_results[curr_idx] = (change_type, prev_idx, prev_strorigin_values[prev_pos], changed_char_cols)
 
-    finalize_progress()
+        print_progress(total_rows, total_rows, "PASS 1: Detecting certainties")
+        finalize_progress()
 
     # ========================================
     # PASS 2: Detect partial changes using UNMARKED rows
     # ========================================
-    progress_count = 0
-    for curr_idx, curr_row in df_curr.iterrows():
-        # Skip if already classified in PASS 1
-        if curr_idx in pass1_results:
-            progress_count += 1
-            if progress_count % 500 == 0 or progress_count == total_rows:
-                print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
-            continue
-
-        S = safe_str(curr_row.get(COL_SEQUENCE, ""))
-        E = safe_str(curr_row.get(COL_EVENTNAME, ""))
-        O = safe_str(curr_row.get(COL_STRORIGIN, ""))
-        C = safe_str(curr_row.get(COL_CASTINGKEY, ""))
-
-        # Defensive check: ensure all values are strings
-        if isinstance(S, dict) or isinstance(E, dict) or isinstance(O, dict) or isinstance(C, dict):
-            log(f"ERROR at row {curr_idx}: Found dict value in keys!")
-            if isinstance(S, dict):
-                log(f"  SequenceName is dict: {S}")
-            if isinstance(E, dict):
-                log(f"  EventName is dict: {E}")
-            if isinstance(O, dict):
-                log(f"  StrOrigin is dict: {O}")
-            if isinstance(C, dict):
-                log(f"  CastingKey is dict: {C}")
-            raise TypeError(f"Row {curr_idx} contains dict value in key columns. Check Excel file for corrupted data.")
-
-        # Generate all 10 keys
-        key_se = (S, E)
-        key_so = (S, O)
-        key_sc = (S, C)
-        key_eo = (E, O)
-        key_ec = (E, C)
-        key_oc = (O, C)
-        key_seo = (S, E, O)
-        key_sec = (S, E, C)
-        key_soc = (S, O, C)
-        key_eoc = (E, O, C)
-
-        matched = False
-        change_type = None
-        prev_idx = None
-
-        # ========================================
-        # LEVEL 1: 3-Key Matches (One core field changed)
-        # ========================================
-
-        # SEO Match: Same Sequence + Event + StrOrigin
-        if not matched and key_seo in prev_lookup_seo:
-            candidate_idx = prev_lookup_seo[key_seo]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SEC Match: Same Sequence + Event + CastingKey
-        if not matched and key_sec in prev_lookup_sec:
-            candidate_idx = prev_lookup_sec[key_sec]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SOC Match: Same Sequence + StrOrigin + CastingKey
-        if not matched and key_soc in prev_lookup_soc:
-            candidate_idx = prev_lookup_soc[key_soc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection with Korean relevance filter
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korean=O)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # EOC Match: Same Event + StrOrigin + CastingKey
-        if not matched and key_eoc in prev_lookup_eoc:
-            candidate_idx = prev_lookup_eoc[key_eoc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # ========================================
-        # LEVEL 2: 2-Key Matches (Two+ core fields changed)
-        # ========================================
-
-        # SE Match: Same Sequence + Event
-        if not matched and key_se in prev_lookup_se:
-            candidate_idx = prev_lookup_se[key_se]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # OC Match: Same StrOrigin + CastingKey
-        if not matched and key_oc in prev_lookup_oc:
-            candidate_idx = prev_lookup_oc[key_oc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # EC Match: Same Event + CastingKey
-        if not matched and key_ec in prev_lookup_ec:
-            candidate_idx = prev_lookup_ec[key_ec]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SC Match: Same Sequence + CastingKey
-        if not matched and key_sc in prev_lookup_sc:
-            candidate_idx = prev_lookup_sc[key_sc]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # SO Match: Same Sequence + StrOrigin
-        if not matched and key_so in prev_lookup_so:
-            candidate_idx = prev_lookup_so[key_so]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection with Korean relevance filter
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korean=O)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # EO Match: Same Event + StrOrigin
-        if not matched and key_eo in prev_lookup_eo:
-            candidate_idx = prev_lookup_eo[key_eo]
-            if candidate_idx not in marked_prev_indices:
-                prev_row = df_prev.loc[candidate_idx]
-                # Use universal detection
-                change_type = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev)
-                prev_idx = candidate_idx
-                marked_prev_indices.add(candidate_idx)
-                matched = True
-
-        # If no match found in PASS 2, it's a NEW row
-        if not matched:
+    with profile_stage("PASS 2"):
+        progress_count = 0
+        for curr_pos, curr_idx in enumerate(curr_labels):
+            # Skip if already classified in PASS 1
+            if curr_idx in pass1_results:
+                progress_count += 1
+                if progress_count % 500 == 0 or progress_count == total_rows:
+                    print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
+                continue
+
+            O = curr_strorigins[curr_pos]
+
+            # 3-key matches first (one core field changed), then 2-key matches
             change_type = "New Row"
             prev_idx = None
             prev_strorigin = ""
-        else:
-            # Extract previous StrOrigin from matched row
-            prev_row = df_prev.loc[prev_idx]
-            prev_strorigin = safe_str(prev_row.get(COL_STRORIGIN, ""))
+            for key_name in PASS2_KEY_ORDER:
+                candidate_idx = prev_index.first_unmarked(key_name, curr_keys[key_name][curr_pos], marked_prev_indices)
+                if candidate_idx is None:
+                    continue
+                prev_pos = prev_index.position(candidate_idx)
+                # Use universal detection (StrOrigin-based matches need Korean relevance)
+                require_korean = O if key_name in KOREAN_FILTER_KEYS else None
+                change_type = comparator.detect(curr_pos, prev_pos, require_korean=require_korean)
+                prev_idx = candidate_idx
+                prev_strorigin = prev_strorigin_values[prev_pos]
+                marked_prev_indices.add(candidate_idx)
+                break
 
-        # Store PASS 2 result
-        pass1_results[curr_idx] = (change_type, prev_idx, prev_strorigin, [])
+            # Store PASS 2 result (no match found → New Row)
+            pass1_results[curr_idx] = (change_type, prev_idx, prev_strorigin, [])
 
-        progress_count += 1
-        if progress_count % 500 == 0 or progress_count == total_rows:
-            print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
+            progress_count += 1
+            if progress_count % 500 == 0 or progress_count == total_rows:
+                print_progress(progress_count, total_rows, "PASS 2: Detecting changes")
 
-    finalize_progress()
+        finalize_progress()
 
     # ========================================
     # Apply import logic to all rows
     # ========================================
     log("Applying import logic...")
-    results = []
-    counter = {}
-    previous_strorigins = []
 
-    # V5: Get user-selected PREVIOUS columns once (outside loop for performance)
-    v5_cols = get_v5_enabled_columns()
+    # V5: Get user-selected PREVIOUS columns once
+    if settings is None:
+        settings = get_settings_snapshot()
+    use_priority_change = get_use_priority_change(settings)
+    v5_cols = get_v5_enabled_columns(settings)
     selected_previous_cols = v5_cols.get("previous", [])  # Already has Previous_ prefix
     if selected_previous_cols:
         log(f"V5: Extracting {len(selected_previous_cols)} PREVIOUS columns via KEY-matching")
 
-    for curr_idx, curr_row in df_curr.iterrows():
-        curr_dict = curr_row.to_dict()
-
-        # Get detection result
-        if curr_idx in pass1_results:
-            change_type, prev_idx, prev_strorigin, _ = pass1_results[curr_idx]
-            previous_strorigins.append(prev_strorigin)
-        else:
-            # Shouldn't happen
-            change_type = "ERROR: Missing Classification"
-            prev_idx = None
-            prev_strorigin = ""
-            previous_strorigins.append(prev_strorigin)
-
-        # Get previous row if matched
-        prev_row_dict = df_prev.loc[prev_idx].to_dict() if prev_idx is not None else None
-
-        # Save mainline translation before import
-        mainline_translation = safe_str(curr_dict.get(COL_TEXT, ""))
-
-        # Apply import logic
-        import_data = apply_import_logic(curr_dict, prev_row_dict, change_type)
-
-        for col, value in import_data.items():
-            curr_dict[col] = value
-
-        # Generate CastingKey
-        curr_dict[COL_CASTINGKEY] = generate_casting_key(
-            curr_dict.get(COL_CHARACTERKEY, ""),
-            curr_dict.get(COL_DIALOGVOICE, ""),
-            curr_dict.get(COL_SPEAKER_GROUPKEY, ""),
-            curr_dict.get("DialogType", "")
-        )
-
-        # Generate PreviousData
-        curr_dict[COL_PREVIOUSDATA] = generate_previous_data(
-            prev_row_dict, COL_TEXT, COL_STATUS, COL_FREEMEMO
-        )
-
-        # NOTE: DialogType/Group detection is now handled by detect_all_field_changes()
-        # The old "safety net" code here was removed as it's now redundant
-
-        # Set special columns
-        curr_dict[COL_MAINLINE_TRANSLATION] = mainline_translation
-
-        # Phase 4: CHANGES = priority label or full composite based on setting
-        curr_dict[COL_DETAILED_CHANGES] = change_type
-        if get_use_priority_change():
-            curr_dict[COL_CHANGES] = get_priority_change(change_type)
-        else:
-            curr_dict[COL_CHANGES] = change_type  # Legacy mode: show full composite
-
-        # Phase 4.1: PreviousEventName - only when EventName changed
-        if prev_row_dict and "EventName" in change_type:
-            curr_dict[COL_PREVIOUS_EVENTNAME] = safe_str(prev_row_dict.get(COL_EVENTNAME, ""))
-        else:
-            curr_dict[COL_PREVIOUS_EVENTNAME] = ""
-
-        # Phase 4.3: PreviousText - always for matched rows (not New Row)
-        if prev_row_dict and change_type != "New Row":
-            curr_dict[COL_PREVIOUS_TEXT] = safe_str(prev_row_dict.get(COL_TEXT, ""))
-        else:
-            curr_dict[COL_PREVIOUS_TEXT] = ""
-
-        # V5: Extract user-selected PREVIOUS columns using KEY-based matching
-        # These columns are pulled from the matched PREVIOUS row (not by index)
-        # Note: Prefix is only added for CONFLICTS (same column in both files)
-        for col in selected_previous_cols:
-            if col.startswith("Previous_"):
-                # CONFLICT case: column selected from BOTH files
-                # Output column has prefix, extract from original column name
-                original_col = col[9:]  # len("Previous_") = 9
-                if prev_row_dict and change_type != "New Row":
-                    curr_dict[col] = safe_str(prev_row_dict.get(original_col, ""))
-                else:
-                    curr_dict[col] = ""
-            else:
-                # NO CONFLICT case: column only from PREVIOUS file
-                # Output column has same name, extract directly
-                if prev_row_dict and change_type != "New Row":
-                    curr_dict[col] = safe_str(prev_row_dict.get(col, ""))
-                else:
-                    curr_dict[col] = ""
-
-        results.append(curr_dict)
-        counter[change_type] = counter.get(change_type, 0) + 1
-
-    return pd.DataFrame(results), counter, marked_prev_indices, pass1_results, previous_strorigins
+    # Detection result of every row, and the position of its matched previous row
+    row_results = [pass1_results.get(curr_idx, ("ERROR: Missing Classification", None, "", []))
+                   for curr_idx in curr_labels]
+    change_types = [change_type for change_type, _, _, _ in row_results]
+    previous_strorigins = [prev_strorigin for _, _, prev_strorigin, _ in row_results]
+    prev_positions = np.array([-1 if prev_idx is None else prev_index.position(prev_idx)
+                               for _, prev_idx, _, _ in row_results], dtype=np.int64)
+
+    # Save mainline translation before import
+    mainline_translations = (safe_str_series(df_curr[COL_TEXT]).to_numpy(dtype=object)
+                             if COL_TEXT in df_curr.columns else "")
+
+    # Build the result column by column, starting from the current rows
+    df_result = df_curr.reset_index(drop=True)
+    apply_import_rules(df_result, change_types, df_prev, prev_positions, WORKING_IMPORT_RULES)
+
+    # Import logic never touches CastingKey source columns
+    df_result[COL_CASTINGKEY] = generate_casting_keys(df_curr)
+    df_result[COL_PREVIOUSDATA] = previous_data_values(df_prev, prev_positions)
+
+    # NOTE: DialogType/Group detection is now handled by detect_all_field_changes()
+    # The old "safety net" code here was removed as it's now redundant
+
+    # Set special columns
+    df_result[COL_MAINLINE_TRANSLATION] = mainline_translations
+
+    # Phase 4: CHANGES = priority label or full composite based on setting,
+    # Phase 4.1/4.3: PreviousEventName and PreviousText
+    add_change_columns(df_result, change_types, df_prev, prev_positions, use_priority_change)
+
+    # V5: Extract user-selected PREVIOUS columns using KEY-based matching
+    # These columns are pulled from the matched PREVIOUS row (not by index)
+    # Note: Prefix is only added for CONFLICTS (same column in both files)
+    matched_rows = (prev_positions >= 0) & np.array([change != "New Row" for change in change_types], dtype=bool)
+    for col in selected_previous_cols:
+        # CONFLICT case: column selected from BOTH files, output column has
+        # the prefix; NO CONFLICT case: column only from PREVIOUS file
+        original_col = col[9:] if col.startswith("Previous_") else col  # len("Previous_") = 9
+        df_result[col] = np.where(matched_rows, previous_values(df_prev, prev_positions, original_col), "")
+
+    counter = dict(Counter(change_types))
+    return df_result, counter, marked_prev_indices, pass1_results, previous_strorigins
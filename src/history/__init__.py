@@ -6,6 +6,9 @@ from src.history.history_manager import (
     get_history_file_path,
     load_update_history,
     save_update_history,
+    set_history_lock,
+    append_update_record,
+    update_update_record,
     add_working_update_record,
     add_alllang_update_record,
     add_master_file_update_record,
@@ -17,6 +20,9 @@ __all__ = [
     'get_history_file_path',
     'load_update_history',
     'save_update_history',
+    'set_history_lock',
+    'append_update_record',
+    'update_update_record',
     'add_working_update_record',
     'add_alllang_update_record',
     'add_master_file_update_record',
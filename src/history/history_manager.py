@@ -7,6 +7,7 @@ for different VRS Manager processes (Working, AllLang, Master).
 
 import os
 import json
+from contextlib import nullcontext
 from datetime import datetime
 
 from src.config import (
@@ -77,6 +78,62 @@ def save_update_history(history, process_type="master"):
         log(f"Warning: Could not save {process_type} history file: {e}")
 
 
+# Lock shared by processes that update history concurrently (batch scheduler
+# workers); None when a single process owns the history files
+_history_lock = None
+
+
+def set_history_lock(lock):
+    """
+    Serialize history updates across processes.
+
+    Args:
+        lock: multiprocessing Lock shared by all writers (None to disable)
+    """
+    global _history_lock
+    _history_lock = lock
+
+
+def append_update_record(record, process_type="master"):
+    """
+    Append a record to a history file (load → append → save as one step).
+
+    Args:
+        record: Record dictionary
+        process_type: Type of process ("working", "alllang", or "master")
+    """
+    with _history_lock or nullcontext():
+        history = load_update_history(process_type)
+        history["updates"].append(record)
+        save_update_history(history, process_type)
+
+
+def update_update_record(record, process_type="master", **fields):
+    """
+    Add fields to a record already appended to a history file.
+
+    The record is found by its timestamp and output file (newest first).
+
+    Args:
+        record: Record dictionary returned by an add_*_update_record function
+        process_type: Type of process ("working", "alllang", or "master")
+        **fields: Keys to set on the record (e.g. performance=...)
+
+    Returns:
+        bool: True if the record was found and updated
+    """
+    with _history_lock or nullcontext():
+        history = load_update_history(process_type)
+        for stored in reversed(history["updates"]):
+            if (stored.get("timestamp") == record.get("timestamp")
+                    and stored.get("output_file") == record.get("output_file")):
+                stored.update(fields)
+                record.update(fields)
+                save_update_history(history, process_type)
+                return True
+    return False
+
+
 def add_working_update_record(output_filename, prev_path, curr_path, counter, total_rows):
     """
     Add a new update record for the Working process.
@@ -91,8 +148,6 @@ def add_working_update_record(output_filename, prev_path, curr_path, counter, to
     Returns:
         dict: The created record
     """
-    history = load_update_history("working")
-
     record = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "process_type": "Working",
@@ -105,8 +160,7 @@ def add_working_update_record(output_filename, prev_path, curr_path, counter, to
         }
     }
 
-    history["updates"].append(record)
-    save_update_history(history, "working")
+    append_update_record(record, "working")
     return record
 
 
@@ -129,8 +183,6 @@ def add_alllang_update_record(output_filename, prev_kr, prev_en, prev_cn, curr_k
     Returns:
         dict: The created record
     """
-    history = load_update_history("alllang")
-
     record = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "process_type": "AllLanguage",
@@ -156,8 +208,7 @@ def add_alllang_update_record(output_filename, prev_kr, prev_en, prev_cn, curr_k
         }
     }
 
-    history["updates"].append(record)
-    save_update_history(history, "alllang")
+    append_update_record(record, "alllang")
     return record
 
 
@@ -175,8 +226,6 @@ def add_master_file_update_record(output_filename, source_path, target_path, cou
     Returns:
         dict: The created record
     """
-    history = load_update_history("master")
-
     record = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "process_type": "MasterFileUpdate",
@@ -189,8 +238,7 @@ def add_master_file_update_record(output_filename, source_path, target_path, cou
         }
     }
 
-    history["updates"].append(record)
-    save_update_history(history, "master")
+    append_update_record(record, "master")
     return record
 
 
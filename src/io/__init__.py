@@ -4,11 +4,16 @@ Input/Output modules for VRS Manager.
 
 from src.io.excel_reader import (
     safe_read_excel,
+    iter_excel_rows,
     normalize_dataframe_status,
     find_status_column,
     normalize_status,
     is_after_recording_status
 )
+from src.io.frame_cache import FrameCache, get_frame_cache, load_vrs_frame, load_vrs_frames
+from src.io.embedding_cache import EmbeddingCache
+from src.io.data_export import parse_output_formats, write_data_files
+from src.io.styles import get_fill, get_font, get_alignment, get_border, intern_style
 from src.utils.data_processing import filter_output_columns
 from src.io.formatters import (
     apply_direct_coloring,
@@ -20,10 +25,27 @@ from src.io.formatters import (
 __all__ = [
     # Excel reader
     'safe_read_excel',
+    'iter_excel_rows',
     'normalize_dataframe_status',
     'find_status_column',
     'normalize_status',
     'is_after_recording_status',
+    # Frame cache
+    'FrameCache',
+    'get_frame_cache',
+    'load_vrs_frame',
+    'load_vrs_frames',
+    # Embedding cache
+    'EmbeddingCache',
+    # Data outputs
+    'parse_output_formats',
+    'write_data_files',
+    # Style registry
+    'get_fill',
+    'get_font',
+    'get_alignment',
+    'get_border',
+    'intern_style',
     # Excel writer
     'filter_output_columns',
     # Formatters
@@ -0,0 +1,132 @@
+"""
+Plain data outputs (Parquet / CSV / JSONL).
+
+Besides (or instead of) the formatted xlsx workbook, a run can write each of
+its result frames (Comparison, Deleted Rows, Summary Report, Super Group Word
+Analysis, ...) to a data file that dashboards and pipelines read directly,
+without any openpyxl formatting:
+
+    curr_diff_comparison.parquet
+    curr_diff_deleted_rows.parquet
+    curr_diff_summary_report.parquet
+
+Formats are chosen per run (see parse_output_formats()).
+"""
+
+import importlib.util
+import os
+import re
+
+from src.config import OUTPUT_FORMATS, DEFAULT_OUTPUT_FORMATS
+
+PARQUET_AVAILABLE = any(
+    importlib.util.find_spec(engine) is not None for engine in ("pyarrow", "fastparquet")
+)
+
+DATA_FILE_EXTENSIONS = {"parquet": ".parquet", "csv": ".csv", "jsonl": ".jsonl"}
+
+
+def parse_output_formats(value):
+    """
+    Validate a run's output formats.
+
+    Args:
+        value: Comma-separated string ("xlsx,parquet") or list of format
+               names; empty/None selects DEFAULT_OUTPUT_FORMATS
+
+    Returns:
+        tuple: Lowercase format names, duplicates removed, in the given order
+
+    Raises:
+        ValueError: If a format is unknown, or Parquet is requested without
+                    a Parquet engine installed
+    """
+    if not value:
+        return DEFAULT_OUTPUT_FORMATS
+    if isinstance(value, str):
+        value = value.split(",")
+    formats = tuple(dict.fromkeys(str(name).strip().lower() for name in value if str(name).strip()))
+    if not formats:
+        return DEFAULT_OUTPUT_FORMATS
+
+    unknown = [name for name in formats if name not in OUTPUT_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown output format: {', '.join(unknown)} (expected {', '.join(OUTPUT_FORMATS)})")
+    if "parquet" in formats and not PARQUET_AVAILABLE:
+        raise ValueError("Parquet output needs pyarrow or fastparquet (pip install pyarrow)")
+    return formats
+
+
+def data_file_name(base_name, frame_name, output_format):
+    """
+    File name of one frame's data file.
+
+    Args:
+        base_name: Output name without extension (e.g. "curr_diff")
+        frame_name: Frame/sheet name (e.g. "Deleted Rows")
+        output_format: "parquet", "csv" or "jsonl"
+
+    Returns:
+        str: e.g. "curr_diff_deleted_rows.csv"
+    """
+    slug = re.sub(r"[^0-9a-z]+", "_", frame_name.lower()).strip("_")
+    return f"{base_name}_{slug}{DATA_FILE_EXTENSIONS[output_format]}"
+
+
+def _parquet_frame(df):
+    """
+    Copy of df that Parquet can store.
+
+    Object columns may mix numbers and text (e.g. the Summary Report's Value
+    column), so they are stored as strings; missing values stay missing.
+    """
+    df = df.copy()
+    df.columns = [str(name) for name in df.columns]
+    for name in df.columns[df.dtypes == object]:
+        df[name] = df[name].astype("string")
+    return df
+
+
+def write_data_file(df, path, output_format):
+    """
+    Write one DataFrame to a data file.
+
+    Args:
+        df: DataFrame to write (the index is not written)
+        path: Output path
+        output_format: "parquet", "csv" or "jsonl"
+    """
+    if output_format == "parquet":
+        _parquet_frame(df).to_parquet(path, index=False)
+    elif output_format == "csv":
+        df.to_csv(path, index=False, encoding="utf-8")
+    elif output_format == "jsonl":
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        raise ValueError(f"Not a data file format: {output_format}")
+
+
+def write_data_files(frames, output_dir, base_name, formats):
+    """
+    Write result frames as data files.
+
+    Args:
+        frames: Frame name → DataFrame (None or empty frames are skipped)
+        output_dir: Directory for the files
+        base_name: Output name without extension (e.g. "curr_diff")
+        formats: Output formats; "xlsx" is ignored here
+
+    Returns:
+        list: Paths of the written files
+    """
+    paths = []
+    for output_format in formats:
+        if output_format not in DATA_FILE_EXTENSIONS:
+            continue
+        for frame_name, df in frames.items():
+            if df is None or df.empty:
+                continue
+            path = os.path.join(output_dir, data_file_name(base_name, frame_name, output_format))
+            write_data_file(df, path, output_format)
+            paths.append(path)
+    return paths
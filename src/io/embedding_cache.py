@@ -0,0 +1,254 @@
+"""
+On-disk cache of StrOrigin sentence embeddings.
+
+Most StrOrigin texts are unchanged from one VRS drop to the next, so their
+BERT embeddings are stored and reused across runs instead of being
+recomputed. Each model gets its own folder holding:
+
+- vectors.f16: memory-mapped float16 matrix, one embedding per row
+- index.json: text hash → (row, last use), free rows and a use clock
+
+Texts are keyed by a hash of their normalized form (Unicode NFC, collapsed
+whitespace - differences the BERT tokenizer ignores anyway). Least recently
+used rows are recycled once the matrix reaches its size cap.
+
+Writers take a lock file for the duration of each lookup/store; a process
+that cannot get the lock (e.g. a parallel batch worker) simply computes its
+embeddings without the cache.
+"""
+
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from contextlib import contextmanager
+
+import numpy as np
+
+from src.config import FRAME_CACHE_DIR, EMBEDDING_CACHE_MAX_MB
+from src.utils.helpers import log, get_script_dir
+
+LOCK_STALE_SECONDS = 600  # A lock older than this was left by a crashed process
+INITIAL_CAPACITY = 1024
+
+
+def embedding_text_key(text):
+    """
+    Hash of a text's normalized form.
+
+    Args:
+        text: StrOrigin text
+
+    Returns:
+        str: Hex digest identifying the text
+    """
+    normalized = unicodedata.normalize("NFC", " ".join(text.split()))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Size-capped, persistent float16 embedding store for one model.
+    """
+
+    def __init__(self, model_id, cache_dir=None, max_bytes=None, enabled=True):
+        """
+        Initialize the cache.
+
+        Args:
+            model_id: Model identity (bundled model path or Hugging Face name)
+            cache_dir: Root folder for embedding caches (default: embeddings/
+                       inside FRAME_CACHE_DIR next to the application)
+            max_bytes: Size cap of the embedding matrix (default: EMBEDDING_CACHE_MAX_MB)
+            enabled: If False, every lookup misses and nothing is stored
+        """
+        root = cache_dir or os.path.join(get_script_dir(), FRAME_CACHE_DIR, "embeddings")
+        self.model_id = model_id
+        self.cache_dir = os.path.join(root, hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:16])
+        self.max_bytes = max_bytes if max_bytes is not None else EMBEDDING_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = enabled and self.max_bytes > 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.cache_dir, "vectors.f16")
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    @property
+    def _lock_path(self):
+        return os.path.join(self.cache_dir, "lock")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cache lock; yields False if another process holds it."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self._lock_path) > LOCK_STALE_SECONDS:
+                        os.remove(self._lock_path)
+                        continue
+                except OSError:
+                    continue
+                yield False
+                return
+        else:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            os.close(fd)
+            try:
+                os.remove(self._lock_path)
+            except OSError:
+                pass
+
+    def _load_index(self):
+        """Read the index (empty index if missing or unreadable)."""
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("model_id") == self.model_id and os.path.exists(self._vectors_path):
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"model_id": self.model_id, "dim": None, "capacity": 0, "clock": 0, "rows": {}, "free": []}
+
+    def _save_index(self, index):
+        """Write the index atomically."""
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _open_vectors(self, index, mode):
+        """Memory-map the embedding matrix."""
+        return np.memmap(self._vectors_path, dtype=np.float16, mode=mode,
+                         shape=(index["capacity"], index["dim"]))
+
+    def get_many(self, texts):
+        """
+        Look up embeddings.
+
+        Args:
+            texts: Iterable of texts
+
+        Returns:
+            dict: text → float32 embedding for every cached text
+        """
+        texts = list(texts)
+        found = {}
+        if not self.enabled or not texts:
+            self.misses += len(texts)
+            return found
+
+        with self._locked() as acquired:
+            if acquired:
+                index = self._load_index()
+                rows = index["rows"]
+                hits = [(text, rows[key]) for text, key in ((t, embedding_text_key(t)) for t in texts) if key in rows]
+                if hits:
+                    vectors = self._open_vectors(index, "r")
+                    positions = [entry[0] for _, entry in hits]
+                    embeddings = np.asarray(vectors[positions], dtype=np.float32)
+                    del vectors
+                    index["clock"] += 1
+                    for (text, entry), embedding in zip(hits, embeddings):
+                        entry[1] = index["clock"]
+                        found[text] = embedding
+                    self._save_index(index)
+
+        self.hits += len(found)
+        self.misses += len(texts) - len(found)
+        return found
+
+    def put_many(self, texts, embeddings):
+        """
+        Store embeddings, recycling least recently used rows beyond the size cap.
+
+        Args:
+            texts: List of texts
+            embeddings: Array of shape (len(texts), dim)
+        """
+        if not self.enabled or len(texts) == 0:
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float16)
+        dim = embeddings.shape[1]
+        max_rows = max(1, self.max_bytes // (dim * 2))
+        if len(texts) > max_rows:
+            texts, embeddings = texts[-max_rows:], embeddings[-max_rows:]
+
+        with self._locked() as acquired:
+            if not acquired:
+                return
+            try:
+                self._put_locked(list(texts), embeddings, dim, max_rows)
+            except OSError as e:
+                log(f"  ⚠️  Could not update embedding cache: {e}")
+
+    def _put_locked(self, texts, embeddings, dim, max_rows):
+        """Store embeddings while holding the lock."""
+        index = self._load_index()
+        if index["dim"] != dim:
+            # New cache, or the model's embedding size changed: start over
+            index = {"model_id": self.model_id, "dim": dim, "capacity": 0, "clock": 0, "rows": {}, "free": []}
+            if os.path.exists(self._vectors_path):
+                os.remove(self._vectors_path)
+
+        rows = index["rows"]
+        new_items = {}
+        for text, embedding in zip(texts, embeddings):
+            key = embedding_text_key(text)
+            if key not in rows:
+                new_items[key] = embedding
+        if not new_items:
+            return
+
+        # Evict least recently used rows until the new ones fit
+        overflow = len(rows) + len(new_items) - max_rows
+        if overflow > 0:
+            for key, entry in sorted(rows.items(), key=lambda item: item[1][1])[:overflow]:
+                index["free"].append(entry[0])
+                del rows[key]
+
+        # Rows to fill: recycled rows first, then rows past the current end
+        used_count = len(rows) + len(index["free"])
+        needed = len(new_items) - len(index["free"])
+        targets = index["free"][:len(new_items)]
+        index["free"] = index["free"][len(targets):]
+        if needed > 0:
+            targets += list(range(used_count, used_count + needed))
+
+        capacity_needed = used_count + max(needed, 0)
+        if capacity_needed > index["capacity"]:
+            capacity = max(capacity_needed, min(max(index["capacity"] * 2, INITIAL_CAPACITY), max_rows))
+            with open(self._vectors_path, 'ab') as f:
+                f.truncate(capacity * dim * 2)
+            index["capacity"] = capacity
+
+        vectors = self._open_vectors(index, "r+")
+        vectors[targets] = np.stack(list(new_items.values()))
+        vectors.flush()
+        del vectors
+
+        index["clock"] += 1
+        for key, row in zip(new_items, targets):
+            rows[key] = [row, index["clock"]]
+        self._save_index(index)
+
+    def clear(self):
+        """Remove all cached embeddings of this model."""
+        for path in (self._vectors_path, self._index_path):
+            if os.path.exists(path):
+                os.remove(path)
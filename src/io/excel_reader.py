@@ -5,12 +5,21 @@ This module provides functionality to safely read Excel files and
 normalize dataframe content, particularly status columns.
 """
 
+from itertools import islice
+
+import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
 
-from src.config import AFTER_RECORDING_STATUSES
+from src.config import AFTER_RECORDING_STATUSES, COL_STARTFRAME, COL_ENDFRAME
 from src.utils.helpers import safe_str
 
+# Values treated as empty by clean_dataframe_none_values (compared uppercased)
+NULL_TOKENS = ["NONE", "NAN", ""]
+
+# Rows moved into per-column lists at a time by safe_read_excel
+READ_CHUNK_ROWS = 10000
+
 
 def find_status_column(columns):
     """
@@ -96,13 +105,85 @@ def clean_dataframe_none_values(df):
     return df
 
 
+def iter_excel_rows(filepath):
+    """
+    Stream the rows of the active sheet of an Excel file as value tuples.
+
+    The workbook is opened in read-only mode, so openpyxl parses the sheet
+    XML row by row instead of building a Cell object for every cell. The
+    sheet's stored dimensions are ignored (some exporters write incorrect
+    ones) and trailing rows without any cells are dropped, which yields the
+    same rows as a full in-memory load.
+
+    Args:
+        filepath: Path to the Excel file
+
+    Yields:
+        tuple: Cell values of one row (may be shorter than the widest row)
+    """
+    wb = load_workbook(filepath, data_only=True, read_only=True)
+    try:
+        sheet = wb.active
+        sheet.reset_dimensions()
+        pending_empty = 0
+        for row in sheet.iter_rows(values_only=True):
+            if not row:
+                pending_empty += 1
+                continue
+            for _ in range(pending_empty):
+                yield ()
+            pending_empty = 0
+            yield row
+    finally:
+        wb.close()
+
+
+def normalize_column_values(series, strip_trailing_zeros=False):
+    """
+    Normalize one raw column to clean strings in a single batch.
+
+    Produces exactly what safe_str, clean_numeric_columns and
+    clean_dataframe_none_values produce when applied cell by cell:
+    values are stringified and stripped, and None/NaN/"NONE"/"NAN"
+    become empty strings.
+
+    Args:
+        series: Raw column as read from the workbook
+        strip_trailing_zeros: If True, also strip trailing zeros and decimal
+                              point (StartFrame/EndFrame handling)
+
+    Returns:
+        list: Normalized string values
+    """
+    values = series.to_numpy(dtype=object)
+    if series.dtype.kind in "mM":
+        # safe_str only treats None/float NaN as missing, so NaT stays "NaT"
+        missing = np.zeros(len(values), dtype=bool)
+    else:
+        missing = pd.isna(values)
+
+    text = pd.Series([str(v) for v in values], dtype=object).str.strip()
+    if strip_trailing_zeros:
+        dotted = text.str.contains(".", regex=False).to_numpy(dtype=bool)
+        if dotted.any():
+            text[dotted] = text[dotted].str.rstrip("0").str.rstrip(".").str.strip()
+
+    blank = missing | text.str.upper().isin(NULL_TOKENS).to_numpy(dtype=bool)
+    text[blank] = ""
+    return text.tolist()
+
+
 def safe_read_excel(filepath, header=0, dtype=str):
     """
     Safely read an Excel file, converting all values to strings and cleaning data.
 
-    This function uses openpyxl to read Excel files with data_only=True to get
-    formula values, then converts to pandas DataFrame with all string types.
-    It also cleans numeric columns and None values.
+    Rows are streamed from a read-only workbook (data_only=True to get formula
+    values) into per-column lists, a chunk of rows at a time, and each column
+    is then normalized in one batch, instead of building the full openpyxl
+    cell model and cleaning cell by cell. Besides the column lists, only one
+    chunk of rows is held in memory. The result is identical: an all-string
+    DataFrame with numeric frame columns cleaned and None values replaced by
+    empty strings.
 
     Args:
         filepath: Path to the Excel file
@@ -115,23 +196,39 @@ def safe_read_excel(filepath, header=0, dtype=str):
     Raises:
         ValueError: If the Excel file is empty
     """
-    wb = load_workbook(filepath, data_only=True, read_only=False)
-    sheet = wb.active
-    data = []
-    for row in sheet.iter_rows(values_only=True):
-        data.append(row)
-    wb.close()
-
-    if len(data) > 0:
-        df = pd.DataFrame(data[1:], columns=data[0])
-        for col in df.columns:
-            df[col] = df[col].apply(safe_str)
-        df = clean_numeric_columns(df)
-        df = clean_dataframe_none_values(df)
-        return df
-    else:
+    rows = iter_excel_rows(filepath)
+    header_row = next(rows, None)
+    if header_row is None:
         raise ValueError("Excel file is empty")
 
+    # Rows are padded with None to the widest row seen so far; a column first
+    # seen in a later chunk is back-filled with None for the earlier rows
+    columns = [[] for _ in header_row]
+    length = 0
+    while True:
+        chunk = list(islice(rows, READ_CHUNK_ROWS))
+        if not chunk:
+            break
+        width = max(len(columns), max(len(row) for row in chunk))
+        columns.extend([None] * length for _ in range(width - len(columns)))
+        padded = [row if len(row) == width else tuple(row) + (None,) * (width - len(row)) for row in chunk]
+        for values, chunk_values in zip(columns, zip(*padded)):
+            values.extend(chunk_values)
+        length += len(chunk)
+        del chunk, padded
+    header_row = tuple(header_row) + (None,) * (len(columns) - len(header_row))
+
+    # pd.Series infers each column's dtype exactly as pd.DataFrame(rows) did
+    numeric_cols = {COL_STARTFRAME, COL_ENDFRAME}
+    normalized = {}
+    for pos, name in enumerate(header_row):
+        normalized[pos] = normalize_column_values(pd.Series(columns[pos]), strip_trailing_zeros=name in numeric_cols)
+        columns[pos] = None  # Release the raw values as soon as they are normalized
+
+    df = pd.DataFrame(normalized, index=pd.RangeIndex(length))
+    df.columns = list(header_row)
+    return df
+
 
 def normalize_dataframe_status(df):
     """
@@ -6,9 +6,10 @@ including conditional formatting, column widths, and color coding.
 """
 
 import pandas as pd
-from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils.dataframe import dataframe_to_rows
 
+from src.io.styles import get_fill, get_font, get_alignment, get_border
+
 
 def write_group_word_analysis(writer, df_group_analysis, sheet_name="Group Word Analysis"):
     """
@@ -51,9 +52,9 @@ def write_group_word_analysis(writer, df_group_analysis, sheet_name="Group Word
         worksheet.column_dimensions[col].width = width
 
     # Apply header formatting
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_font = get_font(bold=True, color="FFFFFF", size=11)
+    header_fill = get_fill("4472C4", "4472C4")
+    header_alignment = get_alignment(horizontal="center", vertical="center", wrap_text=True)
 
     for cell in worksheet[1]:
         cell.font = header_font
@@ -66,41 +67,40 @@ def write_group_word_analysis(writer, df_group_analysis, sheet_name="Group Word
         for col in ['B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']:
             cell = worksheet[f"{col}{row_num}"]
             cell.number_format = '#,##0'
-            cell.alignment = Alignment(horizontal="right")
+            cell.alignment = get_alignment(horizontal="right")
 
         # Net Change with color coding and signed format
         net_cell = worksheet[f"J{row_num}"]
         net_cell.number_format = '+#,##0;[Red]-#,##0;0'
-        net_cell.alignment = Alignment(horizontal="right")
+        net_cell.alignment = get_alignment(horizontal="right")
 
         # Apply color to Net Change
         if net_cell.value and isinstance(net_cell.value, (int, float)):
             if net_cell.value > 0:
-                net_cell.font = Font(color="00B050", bold=True)  # Green
+                net_cell.font = get_font(color="00B050", bold=True)  # Green
             elif net_cell.value < 0:
-                net_cell.font = Font(color="FF0000", bold=True)  # Red
+                net_cell.font = get_font(color="FF0000", bold=True)  # Red
 
         # % Change alignment
         pct_cell = worksheet[f"K{row_num}"]
-        pct_cell.alignment = Alignment(horizontal="right")
+        pct_cell.alignment = get_alignment(horizontal="right")
 
     # Add summary row
     summary_row = len(df_group_analysis) + 3
     worksheet[f"A{summary_row}"] = "TOTAL"
-    worksheet[f"A{summary_row}"].font = Font(bold=True, size=11)
+    worksheet[f"A{summary_row}"].font = get_font(bold=True, size=11)
 
     # Sum columns B through J
     for col_letter, col_idx in [('B', 2), ('C', 3), ('D', 4), ('E', 5),
                                   ('F', 6), ('G', 7), ('H', 8), ('I', 9), ('J', 10)]:
         cell = worksheet[f"{col_letter}{summary_row}"]
         cell.value = f"=SUM({col_letter}2:{col_letter}{len(df_group_analysis)+1})"
-        cell.font = Font(bold=True, size=11)
+        cell.font = get_font(bold=True, size=11)
         cell.number_format = '#,##0'
-        cell.alignment = Alignment(horizontal="right")
+        cell.alignment = get_alignment(horizontal="right")
 
     # Add border to summary row
-    from openpyxl.styles import Border, Side
-    thin_border = Border(top=Side(style='thin'))
+    thin_border = get_border(top="thin")
     for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K']:
         worksheet[f"{col}{summary_row}"].border = thin_border
 
@@ -108,24 +108,16 @@ def write_group_word_analysis(writer, df_group_analysis, sheet_name="Group Word
     worksheet.freeze_panes = worksheet['A2']
 
 
-def write_super_group_word_analysis(writer, super_group_analysis, migration_details=None, sheet_name="Super Group Word Analysis"):
+def build_super_group_analysis_frame(super_group_analysis):
     """
-    Write super group-level word count analysis to Excel sheet with translation tracking.
-
-    Creates a formatted sheet showing word count statistics for each super group,
-    including translation progress metrics.
+    Build the Super Group Word Analysis table.
 
     Args:
-        writer: ExcelWriter object
         super_group_analysis: Dictionary with super group statistics (including translation metrics)
-        migration_details: List of tuples (source_group, dest_group, word_count) or None
-        sheet_name: Name of sheet to create (default: "Super Group Word Analysis")
-    """
-    if not super_group_analysis:
-        # No super group data to write
-        return
 
-    # Convert super_group_analysis dict to DataFrame (custom order)
+    Returns:
+        DataFrame: One row per super group, in the fixed super group order
+    """
     super_group_order = [
         "Main Chapters", "Faction 1", "Faction 2", "Faction 3",
         "AI Dialog", "Quest Dialog", "Narration Dialog", "Other", "Everything Else"
@@ -188,7 +180,27 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
             "Words Unchanged": stats["unchanged_words"]
         })
 
-    df_super_group_analysis = pd.DataFrame(rows)
+    return pd.DataFrame(rows)
+
+
+def write_super_group_word_analysis(writer, super_group_analysis, migration_details=None, sheet_name="Super Group Word Analysis"):
+    """
+    Write super group-level word count analysis to Excel sheet with translation tracking.
+
+    Creates a formatted sheet showing word count statistics for each super group,
+    including translation progress metrics.
+
+    Args:
+        writer: ExcelWriter object
+        super_group_analysis: Dictionary with super group statistics (including translation metrics)
+        migration_details: List of tuples (source_group, dest_group, word_count) or None
+        sheet_name: Name of sheet to create (default: "Super Group Word Analysis")
+    """
+    if not super_group_analysis:
+        # No super group data to write
+        return
+
+    df_super_group_analysis = build_super_group_analysis_frame(super_group_analysis)
 
     # Write to Excel
     df_super_group_analysis.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -218,9 +230,9 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
         worksheet.column_dimensions[col].width = width
 
     # Apply header formatting
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_font = get_font(bold=True, color="FFFFFF", size=11)
+    header_fill = get_fill("4472C4", "4472C4")
+    header_alignment = get_alignment(horizontal="center", vertical="center", wrap_text=True)
 
     for cell in worksheet[1]:
         cell.font = header_font
@@ -233,43 +245,42 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
         for col in ['B', 'C', 'F', 'G', 'K', 'L', 'M', 'N']:
             cell = worksheet[f"{col}{row_num}"]
             cell.number_format = '#,##0'
-            cell.alignment = Alignment(horizontal="right")
+            cell.alignment = get_alignment(horizontal="right")
 
         # Net Change (D) with color coding and signed format
         net_cell = worksheet[f"D{row_num}"]
         net_cell.number_format = '+#,##0;[Red]-#,##0;0'
-        net_cell.alignment = Alignment(horizontal="right")
+        net_cell.alignment = get_alignment(horizontal="right")
 
         # Apply color to Net Change
         if net_cell.value and isinstance(net_cell.value, (int, float)):
             if net_cell.value > 0:
-                net_cell.font = Font(color="00B050", bold=True)  # Green
+                net_cell.font = get_font(color="00B050", bold=True)  # Green
             elif net_cell.value < 0:
-                net_cell.font = Font(color="FF0000", bold=True)  # Red
+                net_cell.font = get_font(color="FF0000", bold=True)  # Red
 
     # Add summary row
     summary_row = len(df_super_group_analysis) + 3
     worksheet[f"A{summary_row}"] = "TOTAL"
-    worksheet[f"A{summary_row}"].font = Font(bold=True, size=11)
+    worksheet[f"A{summary_row}"].font = get_font(bold=True, size=11)
 
     # Sum columns: B, C, D, F, G, K, L, M, N (numeric columns only)
     for col_letter in ['B', 'C', 'D', 'F', 'G', 'K', 'L', 'M', 'N']:
         cell = worksheet[f"{col_letter}{summary_row}"]
         cell.value = f"=SUM({col_letter}2:{col_letter}{len(df_super_group_analysis)+1})"
-        cell.font = Font(bold=True, size=11)
+        cell.font = get_font(bold=True, size=11)
         cell.number_format = '#,##0'
-        cell.alignment = Alignment(horizontal="right")
+        cell.alignment = get_alignment(horizontal="right")
 
     # Add border to summary row
-    from openpyxl.styles import Border, Side
-    thin_border = Border(top=Side(style='thin'))
+    thin_border = get_border(top="thin")
     for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L', 'M', 'N']:
         worksheet[f"{col}{summary_row}"].border = thin_border
 
     # Add explanatory notes below the table
     note_row = summary_row + 2
     worksheet[f"A{note_row}"] = "Notes:"
-    worksheet[f"A{note_row}"].font = Font(bold=True, size=10, italic=True)
+    worksheet[f"A{note_row}"].font = get_font(bold=True, size=10, italic=True)
 
     # Note 1: NET CHANGE explanation
     note_text_row_1 = note_row + 1
@@ -278,8 +289,8 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
         'Positive (+) = words added to the project. Negative (-) = words removed from the project.'
     )
     worksheet[f"A{note_text_row_1}"] = note_text_1
-    worksheet[f"A{note_text_row_1}"].font = Font(size=9, italic=True, color="666666")
-    worksheet[f"A{note_text_row_1}"].alignment = Alignment(wrap_text=True, vertical="top")
+    worksheet[f"A{note_text_row_1}"].font = get_font(size=9, italic=True, color="666666")
+    worksheet[f"A{note_text_row_1}"].alignment = get_alignment(wrap_text=True, vertical="top")
     worksheet.merge_cells(f"A{note_text_row_1}:G{note_text_row_1}")
     worksheet.row_dimensions[note_text_row_1].height = 30
 
@@ -290,8 +301,8 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
         'This super group aggregates all main story dialogue.'
     )
     worksheet[f"A{note_text_row_2}"] = note_text_2
-    worksheet[f"A{note_text_row_2}"].font = Font(size=9, italic=True, color="666666")
-    worksheet[f"A{note_text_row_2}"].alignment = Alignment(wrap_text=True, vertical="top")
+    worksheet[f"A{note_text_row_2}"].font = get_font(size=9, italic=True, color="666666")
+    worksheet[f"A{note_text_row_2}"].alignment = get_alignment(wrap_text=True, vertical="top")
     worksheet.merge_cells(f"A{note_text_row_2}:G{note_text_row_2}")
     worksheet.row_dimensions[note_text_row_2].height = 30
 
@@ -302,8 +313,8 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
         'Quest Groups (Hernand, Demeniss, Delesyia), faction_etc, Item. This super group aggregates system/feature dialogue.'
     )
     worksheet[f"A{note_text_row_3}"] = note_text_3
-    worksheet[f"A{note_text_row_3}"].font = Font(size=9, italic=True, color="666666")
-    worksheet[f"A{note_text_row_3}"].alignment = Alignment(wrap_text=True, vertical="top")
+    worksheet[f"A{note_text_row_3}"].font = get_font(size=9, italic=True, color="666666")
+    worksheet[f"A{note_text_row_3}"].alignment = get_alignment(wrap_text=True, vertical="top")
     worksheet.merge_cells(f"A{note_text_row_3}:G{note_text_row_3}")
     worksheet.row_dimensions[note_text_row_3].height = 30
 
@@ -315,8 +326,8 @@ def write_super_group_word_analysis(writer, super_group_analysis, migration_deta
         'AI Dialog, Narration Dialog, or Other.'
     )
     worksheet[f"A{note_text_row_4}"] = note_text_4
-    worksheet[f"A{note_text_row_4}"].font = Font(size=9, italic=True, color="666666")
-    worksheet[f"A{note_text_row_4}"].alignment = Alignment(wrap_text=True, vertical="top")
+    worksheet[f"A{note_text_row_4}"].font = get_font(size=9, italic=True, color="666666")
+    worksheet[f"A{note_text_row_4}"].alignment = get_alignment(wrap_text=True, vertical="top")
     worksheet.merge_cells(f"A{note_text_row_4}:G{note_text_row_4}")
     worksheet.row_dimensions[note_text_row_4].height = 30
 
@@ -351,7 +362,7 @@ def write_super_group_migration_details(worksheet, migration_details, start_row)
     # Create migration table
     # Header row
     worksheet[f"A{start_row}"] = "Super Group Migrations"
-    worksheet[f"A{start_row}"].font = Font(bold=True, size=12)
+    worksheet[f"A{start_row}"].font = get_font(bold=True, size=12)
 
     # Column headers
     header_row = start_row + 2
@@ -360,12 +371,11 @@ def write_super_group_migration_details(worksheet, migration_details, start_row)
     worksheet[f"C{header_row}"] = "Words Migrated"
 
     # Apply header formatting
-    from openpyxl.styles import Border, Side
     for col in ['A', 'B', 'C']:
         cell = worksheet[f"{col}{header_row}"]
-        cell.font = Font(bold=True, color="FFFFFF")
-        cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        cell.alignment = Alignment(horizontal="center")
+        cell.font = get_font(bold=True, color="FFFFFF")
+        cell.fill = get_fill("4472C4", "4472C4")
+        cell.alignment = get_alignment(horizontal="center")
 
     # Data rows
     data_row = header_row + 1
@@ -375,7 +385,7 @@ def write_super_group_migration_details(worksheet, migration_details, start_row)
         worksheet[f"B{data_row}"] = dest
         worksheet[f"C{data_row}"] = word_count
         worksheet[f"C{data_row}"].number_format = '#,##0'
-        worksheet[f"C{data_row}"].alignment = Alignment(horizontal="right")
+        worksheet[f"C{data_row}"].alignment = get_alignment(horizontal="right")
         data_row += 1
 
     # Set column widths
@@ -386,13 +396,13 @@ def write_super_group_migration_details(worksheet, migration_details, start_row)
     # Add total row
     total_row = data_row + 1
     worksheet[f"A{total_row}"] = "TOTAL MIGRATIONS"
-    worksheet[f"A{total_row}"].font = Font(bold=True)
+    worksheet[f"A{total_row}"].font = get_font(bold=True)
     worksheet[f"C{total_row}"] = f"=SUM(C{header_row+1}:C{data_row-1})"
-    worksheet[f"C{total_row}"].font = Font(bold=True)
+    worksheet[f"C{total_row}"].font = get_font(bold=True)
     worksheet[f"C{total_row}"].number_format = '#,##0'
-    worksheet[f"C{total_row}"].alignment = Alignment(horizontal="right")
+    worksheet[f"C{total_row}"].alignment = get_alignment(horizontal="right")
 
     # Add border to total row
-    thin_border = Border(top=Side(style='thin'))
+    thin_border = get_border(top="thin")
     for col in ['A', 'B', 'C']:
         worksheet[f"{col}{total_row}"].border = thin_border
@@ -5,10 +5,100 @@ This module provides functionality to apply colors, styles, and formatting
 to Excel worksheets for VRS Manager output files.
 """
 
-from openpyxl.styles import PatternFill, Font, Alignment
+from functools import lru_cache
+
 from openpyxl.utils import get_column_letter
 
 from src.config import CHAR_GROUP_COLS
+from src.io.styles import get_fill, get_font, get_alignment
+
+# Fill colors (hex, without #) of CHANGES values and STATUS values; other
+# values get a color from generate_color_for_value()
+CHANGE_COLORS = {
+    # Pure changes
+    "StrOrigin Change": "FFD580",
+    "Desc Change": "E1D5FF",
+    "TimeFrame Change": "FF9999",
+    "EventName Change": "FFFF99",
+    "SequenceName Change": "B3E5FC",
+    "CastingKey Change": "FFB347",  # Orange
+
+    # Stage 1 composites (without EventName/SequenceName)
+    "StrOrigin+Desc Change": "FFA07A",
+    "StrOrigin+TimeFrame Change": "FFB6C1",
+    "Desc+TimeFrame Change": "DDA0DD",
+    "StrOrigin+Desc+TimeFrame Change": "F08080",
+    "CastingKey+StrOrigin Change": "FFAA7F",
+    "CastingKey+Desc Change": "F0C8FF",
+    "CastingKey+TimeFrame Change": "FFB3CC",
+    "CastingKey+StrOrigin+Desc Change": "FF9F8F",
+    "CastingKey+StrOrigin+TimeFrame Change": "FFC0CB",
+    "CastingKey+Desc+TimeFrame Change": "E6C3E6",
+    "CastingKey+StrOrigin+Desc+TimeFrame Change": "FF9999",
+
+    # EventName composites (Stage 2)
+    "EventName+Desc Change": "F0E68C",
+    "EventName+TimeFrame Change": "FFDAB9",
+    "EventName+Desc+TimeFrame Change": "FFD8A8",
+    "EventName+CastingKey Change": "FFD966",  # Yellow-orange
+    "EventName+CastingKey+Desc Change": "FFCC66",
+    "EventName+CastingKey+TimeFrame Change": "FFC966",
+    "EventName+CastingKey+Desc+TimeFrame Change": "FFB84D",
+
+    # SequenceName composites (Stage 3)
+    "SequenceName+CastingKey Change": "A0D9FF",  # Light blue
+    "SequenceName+Desc Change": "C4E5FF",
+    "SequenceName+TimeFrame Change": "B3D9FF",
+    "SequenceName+CastingKey+Desc Change": "99D6FF",
+    "SequenceName+CastingKey+TimeFrame Change": "8CD3FF",
+    "SequenceName+Desc+TimeFrame Change": "B8DBFF",
+    "SequenceName+CastingKey+Desc+TimeFrame Change": "7FCCFF",
+
+    # Special cases
+    "CharacterGroup Change": "87CEFA",
+    "New Row": "90EE90",
+    "No Relevant Change": "D3D3D3",
+    "No Change": "E8E8E8",
+}
+
+
+STATUS_COLORS = {
+    "RECORDED": "90EE90",
+    "POLISHED": "E6D5FF",
+    "RE-RECORD": "FFB3B3",
+    "RERECORD": "FFB3B3",
+    "RE-RECORDED": "C5E8C5",
+    "RERECORDED": "C5E8C5",
+    "PREVIOUSLY RECORDED": "FFFFE0",
+    "FINAL": "87CEEB",
+    "SHIPPED": "87CEEB",
+    "SPEC-OUT": "FFC0CB",
+    "CHECK": "FFE4B5",
+    "전달 완료": "FFFFE0",
+    "녹음 완료": "90EE90",
+    "재녹음 필요": "FFB3B3",
+    "재녹음 완료": "C5E8C5",
+    "준비 중": "E6D5FF",
+    "확인 필요": "FFE4B5",
+    "已传达": "FFFFE0",
+    "已录音": "90EE90",
+    "需补录": "FFB3B3",
+    "已补录": "C5E8C5",
+    "准备中": "E6D5FF",
+    "需要确认": "FFE4B5",
+}
+
+HEADER_COLOR = "ADD8E6"
+CHAR_GROUP_CHANGE_COLOR = "FFD700"  # Changed CharacterGroup cells (Tribe, Age, ...)
+
+# Column widths of the StrOrigin Change Analysis sheet
+STRORIGIN_ANALYSIS_COLUMN_WIDTHS = {
+    "Previous StrOrigin": 25,
+    "Current StrOrigin": 25,
+    "StrOrigin Analysis": 20,
+    "Diff Detail": 35,  # Wider for [old→new] display
+    "CHANGES": 25,
+}
 
 
 def generate_color_for_value(value):
@@ -20,16 +110,23 @@ def generate_color_for_value(value):
     2. Using golden ratio distribution for better hue spread
     3. Keeping saturation and lightness in visually pleasant ranges
 
+    Colors are cached per label, so each distinct value is hashed once per process.
+
     Args:
         value: Any value to generate a color for
 
     Returns:
         str: Hex color code (without #)
     """
+    return _generate_color(str(value))
+
+
+@lru_cache(maxsize=None)
+def _generate_color(value_str):
+    """Color of a label (see generate_color_for_value)."""
     import hashlib
 
     # Use hashlib for consistent hashing across Python sessions
-    value_str = str(value)
     hash_bytes = hashlib.md5(value_str.encode()).digest()
 
     # Extract 3 bytes for H, S, L components
@@ -77,6 +174,41 @@ def generate_color_for_value(value):
     return f"{r:02X}{g:02X}{b:02X}"
 
 
+def get_change_color(value):
+    """
+    Fill color of a CHANGES value.
+
+    Args:
+        value: CHANGES cell value
+
+    Returns:
+        str or None: Hex color, or None if the value is not colored
+    """
+    if value in CHANGE_COLORS:
+        return CHANGE_COLORS[value]
+    if value and str(value).strip() and "Change" in str(value):
+        # Unlisted composite changes
+        return generate_color_for_value(value)
+    return None
+
+
+def get_status_color(value):
+    """
+    Fill color of a STATUS value.
+
+    Args:
+        value: STATUS cell value
+
+    Returns:
+        str or None: Hex color, or None for empty values
+    """
+    if value and str(value).strip():
+        if value in STATUS_COLORS:
+            return STATUS_COLORS[value]
+        return generate_color_for_value(value)
+    return None
+
+
 def apply_direct_coloring(ws, is_master=False, changed_columns_map=None):
     """
     Apply direct coloring to worksheet cells based on change types and status values.
@@ -109,82 +241,8 @@ def apply_direct_coloring(ws, is_master=False, changed_columns_map=None):
         if cell.value in CHAR_GROUP_COLS:
             char_group_col_indices[cell.value] = idx
 
-    changes_fills = {
-        # Pure changes
-        "StrOrigin Change": PatternFill(start_color="FFD580", fill_type="solid"),
-        "Desc Change": PatternFill(start_color="E1D5FF", fill_type="solid"),
-        "TimeFrame Change": PatternFill(start_color="FF9999", fill_type="solid"),
-        "EventName Change": PatternFill(start_color="FFFF99", fill_type="solid"),
-        "SequenceName Change": PatternFill(start_color="B3E5FC", fill_type="solid"),
-        "CastingKey Change": PatternFill(start_color="FFB347", fill_type="solid"),  # Orange
-
-        # Stage 1 composites (without EventName/SequenceName)
-        "StrOrigin+Desc Change": PatternFill(start_color="FFA07A", fill_type="solid"),
-        "StrOrigin+TimeFrame Change": PatternFill(start_color="FFB6C1", fill_type="solid"),
-        "Desc+TimeFrame Change": PatternFill(start_color="DDA0DD", fill_type="solid"),
-        "StrOrigin+Desc+TimeFrame Change": PatternFill(start_color="F08080", fill_type="solid"),
-        "CastingKey+StrOrigin Change": PatternFill(start_color="FFAA7F", fill_type="solid"),
-        "CastingKey+Desc Change": PatternFill(start_color="F0C8FF", fill_type="solid"),
-        "CastingKey+TimeFrame Change": PatternFill(start_color="FFB3CC", fill_type="solid"),
-        "CastingKey+StrOrigin+Desc Change": PatternFill(start_color="FF9F8F", fill_type="solid"),
-        "CastingKey+StrOrigin+TimeFrame Change": PatternFill(start_color="FFC0CB", fill_type="solid"),
-        "CastingKey+Desc+TimeFrame Change": PatternFill(start_color="E6C3E6", fill_type="solid"),
-        "CastingKey+StrOrigin+Desc+TimeFrame Change": PatternFill(start_color="FF9999", fill_type="solid"),
-
-        # EventName composites (Stage 2)
-        "EventName+Desc Change": PatternFill(start_color="F0E68C", fill_type="solid"),
-        "EventName+TimeFrame Change": PatternFill(start_color="FFDAB9", fill_type="solid"),
-        "EventName+Desc+TimeFrame Change": PatternFill(start_color="FFD8A8", fill_type="solid"),
-        "EventName+CastingKey Change": PatternFill(start_color="FFD966", fill_type="solid"),  # Yellow-orange
-        "EventName+CastingKey+Desc Change": PatternFill(start_color="FFCC66", fill_type="solid"),
-        "EventName+CastingKey+TimeFrame Change": PatternFill(start_color="FFC966", fill_type="solid"),
-        "EventName+CastingKey+Desc+TimeFrame Change": PatternFill(start_color="FFB84D", fill_type="solid"),
-
-        # SequenceName composites (Stage 3)
-        "SequenceName+CastingKey Change": PatternFill(start_color="A0D9FF", fill_type="solid"),  # Light blue
-        "SequenceName+Desc Change": PatternFill(start_color="C4E5FF", fill_type="solid"),
-        "SequenceName+TimeFrame Change": PatternFill(start_color="B3D9FF", fill_type="solid"),
-        "SequenceName+CastingKey+Desc Change": PatternFill(start_color="99D6FF", fill_type="solid"),
-        "SequenceName+CastingKey+TimeFrame Change": PatternFill(start_color="8CD3FF", fill_type="solid"),
-        "SequenceName+Desc+TimeFrame Change": PatternFill(start_color="B8DBFF", fill_type="solid"),
-        "SequenceName+CastingKey+Desc+TimeFrame Change": PatternFill(start_color="7FCCFF", fill_type="solid"),
-
-        # Special cases
-        "CharacterGroup Change": PatternFill(start_color="87CEFA", fill_type="solid"),
-        "New Row": PatternFill(start_color="90EE90", fill_type="solid"),
-        "No Relevant Change": PatternFill(start_color="D3D3D3", fill_type="solid"),
-        "No Change": PatternFill(start_color="E8E8E8", fill_type="solid"),
-    }
-
-    char_group_change_fill = PatternFill(start_color="FFD700", fill_type="solid")
-
-    status_fills = {
-        "RECORDED": PatternFill(start_color="90EE90", fill_type="solid"),
-        "POLISHED": PatternFill(start_color="E6D5FF", fill_type="solid"),
-        "RE-RECORD": PatternFill(start_color="FFB3B3", fill_type="solid"),
-        "RERECORD": PatternFill(start_color="FFB3B3", fill_type="solid"),
-        "RE-RECORDED": PatternFill(start_color="C5E8C5", fill_type="solid"),
-        "RERECORDED": PatternFill(start_color="C5E8C5", fill_type="solid"),
-        "PREVIOUSLY RECORDED": PatternFill(start_color="FFFFE0", fill_type="solid"),
-        "FINAL": PatternFill(start_color="87CEEB", fill_type="solid"),
-        "SHIPPED": PatternFill(start_color="87CEEB", fill_type="solid"),
-        "SPEC-OUT": PatternFill(start_color="FFC0CB", fill_type="solid"),
-        "CHECK": PatternFill(start_color="FFE4B5", fill_type="solid"),
-        "전달 완료": PatternFill(start_color="FFFFE0", fill_type="solid"),
-        "녹음 완료": PatternFill(start_color="90EE90", fill_type="solid"),
-        "재녹음 필요": PatternFill(start_color="FFB3B3", fill_type="solid"),
-        "재녹음 완료": PatternFill(start_color="C5E8C5", fill_type="solid"),
-        "준비 중": PatternFill(start_color="E6D5FF", fill_type="solid"),
-        "확인 필요": PatternFill(start_color="FFE4B5", fill_type="solid"),
-        "已传达": PatternFill(start_color="FFFFE0", fill_type="solid"),
-        "已录音": PatternFill(start_color="90EE90", fill_type="solid"),
-        "需补录": PatternFill(start_color="FFB3B3", fill_type="solid"),
-        "已补录": PatternFill(start_color="C5E8C5", fill_type="solid"),
-        "准备中": PatternFill(start_color="E6D5FF", fill_type="solid"),
-        "需要确认": PatternFill(start_color="FFE4B5", fill_type="solid"),
-    }
-
-    header_fill = PatternFill(start_color="ADD8E6", fill_type="solid")
+    char_group_change_fill = get_fill(CHAR_GROUP_CHANGE_COLOR)
+    header_fill = get_fill(HEADER_COLOR)
 
     for cell in ws[1]:
         cell.fill = header_fill
@@ -196,15 +254,10 @@ def apply_direct_coloring(ws, is_master=False, changed_columns_map=None):
                                 min_col=changes_col_idx, max_col=changes_col_idx), start=0):
             cell = row[0]
             cell_value = cell.value
-            if cell_value in changes_fills:
-                cell.fill = changes_fills[cell_value]
-                colored_count += 1
-            elif cell_value and str(cell_value).strip() and "Change" in str(cell_value):
-                # Fallback: Auto-generate color for unlisted composite changes
-                cell.fill = PatternFill(
-                    start_color=generate_color_for_value(cell_value),
-                    fill_type="solid"
-                )
+            # Listed change types, or a generated color for unlisted composites
+            color = get_change_color(cell_value)
+            if color:
+                cell.fill = get_fill(color)
                 colored_count += 1
 
             # Highlight specific CharacterGroup columns (works for standalone and composite)
@@ -221,25 +274,14 @@ def apply_direct_coloring(ws, is_master=False, changed_columns_map=None):
 
     for status_col_name, status_col_idx in status_col_indices.items():
         colored_count = 0
-        unknown_statuses = {}
 
         for row in ws.iter_rows(min_row=2, max_row=ws.max_row,
                                 min_col=status_col_idx, max_col=status_col_idx):
             cell = row[0]
-            cell_value = cell.value
-
-            if cell_value and str(cell_value).strip():
-                if cell_value in status_fills:
-                    cell.fill = status_fills[cell_value]
-                    colored_count += 1
-                else:
-                    if cell_value not in unknown_statuses:
-                        unknown_statuses[cell_value] = PatternFill(
-                            start_color=generate_color_for_value(cell_value),
-                            fill_type="solid"
-                        )
-                    cell.fill = unknown_statuses[cell_value]
-                    colored_count += 1
+            color = get_status_color(cell.value)
+            if color:
+                cell.fill = get_fill(color)
+                colored_count += 1
 
         ws.column_dimensions[get_column_letter(status_col_idx)].width = 25
 
@@ -273,21 +315,21 @@ def format_update_history_sheet(ws):
 
     for row in ws.iter_rows(min_row=1, max_row=ws.max_row):
         for cell in row:
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
+            cell.alignment = get_alignment(vertical='top', wrap_text=True)
 
             if cell.value:
                 content = str(cell.value)
 
                 if "UPDATE HISTORY" in content or "LATEST UPDATE" in content:
-                    cell.font = Font(bold=True, size=14, color="000080")
-                    cell.fill = PatternFill(start_color="FFFFCC", fill_type="solid")
+                    cell.font = get_font(bold=True, size=14, color="000080")
+                    cell.fill = get_fill("FFFFCC")
 
                 elif "✓ UPDATED" in content:
-                    cell.font = Font(bold=True, color="006600")
-                    cell.fill = PatternFill(start_color="CCFFCC", fill_type="solid")
+                    cell.font = get_font(bold=True, color="006600")
+                    cell.fill = get_fill("CCFFCC")
 
                 elif "○ Preserved" in content:
-                    cell.font = Font(italic=True, color="666666")
-                    cell.fill = PatternFill(start_color="F0F0F0", fill_type="solid")
+                    cell.font = get_font(italic=True, color="666666")
+                    cell.fill = get_fill("F0F0F0")
 
     ws.sheet_view.showGridLines = False
@@ -0,0 +1,289 @@
+"""
+On-disk cache of parsed VRS workbooks.
+
+Reading a large VRS workbook (parsing, STATUS normalization, duplicate removal
+and CastingKey generation) dominates the read phase, and the same PREVIOUS
+file is typically compared against many CURRENT drops. This module stores the
+fully normalized DataFrame in a Feather (Arrow) file so later runs can skip
+parsing entirely. Without pyarrow the cache is disabled. Entries are never
+pickled: unpickling a file from the cache folder could run arbitrary code.
+
+Entries are keyed by the file's content hash, its modification time, the
+VRS Manager version and a variant tag, and are evicted least-recently-used
+first once the cache exceeds its size cap.
+
+load_vrs_frames() reads several workbooks at once (e.g. the six inputs of an
+All Language Check), parsing the cache misses in a process pool.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from src.config import FRAME_CACHE_DIR, FRAME_CACHE_MAX_MB, VERSION, COL_CASTINGKEY
+from src.io.excel_reader import safe_read_excel
+from src.utils.data_processing import normalize_dataframe_status, remove_full_duplicates
+from src.utils.helpers import log, get_script_dir, default_worker_count
+
+try:
+    import pyarrow  # noqa: F401
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(filepath):
+    """
+    Compute the SHA-256 hash of a file's contents.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FrameCache:
+    """
+    Size-capped LRU cache of normalized DataFrames on disk.
+
+    Each entry is a single file in the cache directory. An entry's file
+    modification time records its last use, so eviction simply removes the
+    oldest files until the cache fits under the size cap again.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None, enabled=True):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (default: FRAME_CACHE_DIR
+                       next to the application)
+            max_bytes: Size cap in bytes (default: FRAME_CACHE_MAX_MB)
+            enabled: If False (always without pyarrow), every lookup misses and
+                     nothing is stored
+        """
+        self.cache_dir = cache_dir or os.path.join(get_script_dir(), FRAME_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else FRAME_CACHE_MAX_MB * 1024 * 1024
+        self.enabled = enabled and FEATHER_AVAILABLE
+
+    def make_key(self, filepath, variant=""):
+        """
+        Build the cache key for a source file.
+
+        Args:
+            filepath: Path to the source workbook
+            variant: Tag describing how the frame was prepared
+
+        Returns:
+            str: Cache key (hex digest)
+        """
+        mtime_ns = os.stat(filepath).st_mtime_ns
+        parts = [file_content_hash(filepath), str(mtime_ns), VERSION, variant]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        """Return the on-disk path of an entry."""
+        return os.path.join(self.cache_dir, key + ".feather")
+
+    def get(self, key):
+        """
+        Load a cached DataFrame.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            DataFrame or None: Cached frame, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            df = pd.read_feather(path)
+            os.utime(path)  # Mark as most recently used
+            return df
+        except Exception as e:
+            log(f"  ⚠️  Ignoring unreadable cache entry: {e}")
+            return None
+
+    def put(self, key, df):
+        """
+        Store a DataFrame and evict old entries if over the size cap.
+
+        Feather requires unique string column names and a default index;
+        frames that do not meet this are not cached.
+
+        Args:
+            key: Cache key from make_key()
+            df: DataFrame to store
+        """
+        if not self.enabled:
+            return
+
+        if not (all(isinstance(col, str) for col in df.columns)
+                and df.columns.is_unique
+                and df.index.equals(pd.RangeIndex(len(df)))):
+            return
+
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"  # Unique per process (parallel batch workers)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            df.to_feather(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log(f"  ⚠️  Could not write cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size cap."""
+        try:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                # .pkl: pickle entries of earlier versions (never loaded, evicted first by age)
+                if not name.endswith((".feather", ".pkl")):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove all cache entries."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith((".feather", ".pkl", ".tmp")):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+_frame_cache = None
+
+
+def get_frame_cache():
+    """
+    Get the shared frame cache instance.
+
+    Returns:
+        FrameCache: Process-wide cache
+    """
+    global _frame_cache
+    if _frame_cache is None:
+        _frame_cache = FrameCache()
+    return _frame_cache
+
+
+def load_vrs_frame(filepath, label, with_casting_key=False, cache=None):
+    """
+    Read a VRS workbook into a normalized DataFrame, using the frame cache.
+
+    On a miss the workbook is read with safe_read_excel, its STATUS column is
+    normalized and full duplicate rows are removed. With with_casting_key the
+    CastingKey column is generated from the file's own columns; PREVIOUS files
+    must not use this because their CastingKey depends on CURRENT's
+    Speaker|CharacterGroupKey.
+
+    Args:
+        filepath: Path to the workbook
+        label: Label for logging (e.g., "PREVIOUS", "KR CURRENT")
+        with_casting_key: Also generate the CastingKey column
+        cache: FrameCache to use (default: shared cache)
+
+    Returns:
+        DataFrame: Normalized DataFrame
+    """
+    return load_vrs_frames([(filepath, label, with_casting_key)], cache=cache, workers=1)[0]
+
+
+def _parse_vrs_frame(filepath, label, with_casting_key):
+    """Parse and normalize a workbook (cache miss; runs in a worker process for batches)."""
+    df = safe_read_excel(filepath, header=0, dtype=str)
+    df = normalize_dataframe_status(df)
+    df = remove_full_duplicates(df, label)
+
+    if with_casting_key:
+        from src.core.casting import generate_casting_keys
+        df[COL_CASTINGKEY] = generate_casting_keys(df)
+    return df
+
+
+def load_vrs_frames(requests, cache=None, workers=None):
+    """
+    Read several VRS workbooks, parsing them concurrently.
+
+    Cached frames are loaded in this process. The remaining workbooks are
+    parsed in a process pool (one file per task) when there are at least two
+    of them, so reading takes about as long as the slowest file; the parsed
+    frames are then stored in the cache here. Without a pool (one worker, or
+    a pool that cannot start) they are parsed one after another.
+
+    Args:
+        requests: List of (filepath, label, with_casting_key) tuples, as for
+                  load_vrs_frame()
+        cache: FrameCache to use (default: shared cache)
+        workers: Number of processes (default: default_worker_count())
+
+    Returns:
+        list: Normalized DataFrames in request order
+    """
+    cache = cache or get_frame_cache()
+    frames = [None] * len(requests)
+    keys = [None] * len(requests)
+    misses = []
+    for number, (filepath, label, with_casting_key) in enumerate(requests):
+        if cache.enabled:
+            keys[number] = cache.make_key(filepath, "castingkey" if with_casting_key else "normalized")
+            df = cache.get(keys[number])
+            if df is not None:
+                log(f"  → Loaded {label} from cache")
+                frames[number] = df
+                continue
+        misses.append(number)
+
+    workers = default_worker_count() if workers is None else workers
+    parsed = None
+    if workers > 1 and len(misses) > 1:
+        args = zip(*(requests[number] for number in misses))
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(misses))) as pool:
+                parsed = list(pool.map(_parse_vrs_frame, *args))
+        except (OSError, BrokenProcessPool) as e:
+            log(f"  ⚠️  Parallel reading unavailable ({e}) - reading files one by one")
+    if parsed is None:
+        parsed = [_parse_vrs_frame(*requests[number]) for number in misses]
+
+    for number, df in zip(misses, parsed):
+        frames[number] = df
+        if keys[number] is not None:
+            cache.put(keys[number], df)
+    return frames
@@ -0,0 +1,262 @@
+"""
+Streaming Excel output.
+
+Large result sheets (Comparison / Work Transform / All Language Transform,
+Deleted Rows, StrOrigin Change Analysis) are streamed row by row into an
+openpyxl write-only workbook instead of being built cell by cell in memory
+and formatted afterwards.
+
+CHANGES and STATUS colors are written as conditional formatting: one rule per
+distinct value in the column, with the same colors as apply_direct_coloring().
+Only the header row and changed CharacterGroup cells carry cell styles.
+
+Small formatted sheets (Summary Report, Update History, Super Group Word
+Analysis) are still written with pandas + the in-memory formatters into a
+staging workbook, then copied into the output workbook in their original
+sheet order.
+"""
+
+import io
+from copy import copy
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.utils import get_column_letter
+
+from src.config import CHAR_GROUP_COLS
+from src.io.formatters import (
+    get_change_color, get_status_color, HEADER_COLOR, CHAR_GROUP_CHANGE_COLOR
+)
+from src.io.styles import get_fill, intern_style
+
+CHANGES_COLUMN_WIDTH = 40
+STATUS_COLUMN_WIDTH = 25
+
+
+def _column_values(series):
+    """Column values as Python objects, missing values as None."""
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _exact_match_rule(column_letter, value, color):
+    """Conditional formatting rule coloring cells equal (case-sensitive) to value."""
+    text = str(value).replace('"', '""')
+    return FormulaRule(
+        formula=[f'EXACT(${column_letter}2,"{text}")'],
+        fill=get_fill(color, color),
+        stopIfTrue=True,
+    )
+
+
+def _coloring_columns(columns, is_master):
+    """
+    Find the columns colored by apply_direct_coloring().
+
+    Args:
+        columns: Column names of the sheet
+        is_master: If True, STATUS_KR/EN/CN are the status columns
+
+    Returns:
+        tuple: (CHANGES column index or None, {status name: index},
+        {CharacterGroup column: index}); indices are 0-based
+    """
+    changes_idx = None
+    status_indices = {}
+    char_group_indices = {}
+    for idx, name in enumerate(columns):
+        if name == "CHANGES":
+            changes_idx = idx
+        elif is_master:
+            if name in ["STATUS_KR", "STATUS_EN", "STATUS_CN"]:
+                status_indices[name] = idx
+        elif isinstance(name, str) and name.upper() == "STATUS":
+            status_indices["STATUS"] = idx
+
+        if name in CHAR_GROUP_COLS:
+            char_group_indices[name] = idx
+    return changes_idx, status_indices, char_group_indices
+
+
+class StreamingExcelWriter:
+    """
+    Write-only workbook with colored, streamed DataFrame sheets.
+
+    Use as a context manager; the file is saved when the block completes.
+
+        with StreamingExcelWriter(path) as writer:
+            writer.write_dataframe(df_result, "Comparison", colored=True)
+            writer.write_formatted(df_summary, "Summary Report", formatter=widen_summary_columns)
+            write_super_group_word_analysis(writer.staging, analysis)
+    """
+
+    def __init__(self, path):
+        """
+        Create the writer.
+
+        Args:
+            path: Output .xlsx path
+        """
+        self.path = path
+        self.book = Workbook(write_only=True)
+        # pandas writer for small sheets formatted in memory (never saved itself)
+        self.staging = pd.ExcelWriter(io.BytesIO(), engine="openpyxl")
+        self._staged = {}  # sheet name → output sheet to copy it into
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.save()
+        return False
+
+    def _reserve_staged_sheets(self):
+        """Create output sheets for staged sheets, keeping the sheet order."""
+        for name in self.staging.book.sheetnames:
+            if name not in self._staged:
+                self._staged[name] = self.book.create_sheet(name)
+
+    def write_dataframe(self, df, sheet_name, colored=False, is_master=False,
+                        changed_columns_map=None, column_widths=None):
+        """
+        Stream a DataFrame into a new sheet.
+
+        Args:
+            df: DataFrame to write (header row + one row per record, no index)
+            sheet_name: Sheet name
+            colored: Color header, CHANGES and STATUS columns like apply_direct_coloring()
+            is_master: If True, STATUS_KR/EN/CN are the status columns
+            changed_columns_map: Row position → changed column names, for
+                                 highlighting changed CharacterGroup cells
+            column_widths: Column name → width (applied after the coloring widths)
+        """
+        self._reserve_staged_sheets()
+        ws = self.book.create_sheet(sheet_name)
+        columns = list(df.columns)
+        letters = [get_column_letter(idx) for idx in range(1, len(columns) + 1)]
+
+        changes_idx, status_indices, char_group_indices = (None, {}, {})
+        widths = {}
+        if colored:
+            changes_idx, status_indices, char_group_indices = _coloring_columns(columns, is_master)
+            if changes_idx is not None:
+                widths[changes_idx] = CHANGES_COLUMN_WIDTH
+            for status_idx in status_indices.values():
+                widths[status_idx] = STATUS_COLUMN_WIDTH
+        for idx, name in enumerate(columns):
+            if column_widths and name in column_widths:
+                widths[idx] = column_widths[name]
+        # Column widths must be set before the first row is streamed
+        for idx, width in sorted(widths.items()):
+            ws.column_dimensions[letters[idx]].width = width
+
+        if colored:
+            header_fill = get_fill(HEADER_COLOR)
+            header = []
+            for name in columns:
+                cell = WriteOnlyCell(ws, value=name)
+                cell.fill = header_fill
+                header.append(cell)
+            ws.append(header)
+        else:
+            ws.append(columns)
+
+        values = [_column_values(df.iloc[:, idx]) for idx in range(len(columns))]
+        highlights = {}
+        if colored and changes_idx is not None and changed_columns_map and char_group_indices:
+            changes = values[changes_idx]
+            for row_pos, changed_cols in changed_columns_map.items():
+                if 0 <= row_pos < len(df) and "CharacterGroup" in str(changes[row_pos]):
+                    cols = [char_group_indices[name] for name in changed_cols if name in char_group_indices]
+                    if cols:
+                        highlights[row_pos] = cols
+
+        char_group_fill = get_fill(CHAR_GROUP_CHANGE_COLOR)
+        for row_pos, row in enumerate(zip(*values)):
+            if row_pos in highlights:
+                row = list(row)
+                for idx in highlights[row_pos]:
+                    cell = WriteOnlyCell(ws, value=row[idx])
+                    cell.fill = char_group_fill
+                    row[idx] = cell
+            ws.append(row)
+
+        if colored:
+            last_row = len(df) + 1
+            if last_row > 1:
+                rules = []
+                if changes_idx is not None:
+                    rules.append((changes_idx, get_change_color))
+                rules.extend((status_idx, get_status_color) for status_idx in status_indices.values())
+                for idx, get_color in rules:
+                    letter = letters[idx]
+                    cell_range = f"{letter}2:{letter}{last_row}"
+                    for value in dict.fromkeys(v for v in values[idx] if v is not None):
+                        color = get_color(value)
+                        if color:
+                            ws.conditional_formatting.add(cell_range, _exact_match_rule(letter, value, color))
+            if columns:
+                ws.auto_filter.ref = f"A1:{letters[-1]}{last_row}"
+            ws.sheet_view.showGridLines = True
+        return ws
+
+    def write_formatted(self, df, sheet_name, header=True, formatter=None):
+        """
+        Write a small DataFrame sheet formatted in memory.
+
+        Args:
+            df: DataFrame to write (no index)
+            sheet_name: Sheet name
+            header: Write the column names as first row
+            formatter: Function applied to the openpyxl worksheet (e.g. widen_summary_columns)
+        """
+        df.to_excel(self.staging, sheet_name=sheet_name, index=False, header=header)
+        if formatter:
+            formatter(self.staging.sheets[sheet_name])
+        self._reserve_staged_sheets()
+
+    def save(self):
+        """Copy staged sheets into the output workbook and save it."""
+        self._reserve_staged_sheets()
+        for name, target in self._staged.items():
+            copy_worksheet(self.staging.book[name], target)
+        self.book.save(self.path)
+
+
+def copy_worksheet(source, target):
+    """
+    Copy an in-memory worksheet (values, styles, layout) into a write-only sheet.
+
+    Args:
+        source: openpyxl worksheet
+        target: Empty write-only worksheet (of another workbook)
+    """
+    for key, dimension in source.column_dimensions.items():
+        if dimension.width:
+            target.column_dimensions[key].width = dimension.width
+    for idx, dimension in source.row_dimensions.items():
+        if dimension.height:
+            target.row_dimensions[idx].height = dimension.height
+    for merged in source.merged_cells.ranges:
+        target.merged_cells.add(merged.coord)
+    target.freeze_panes = source.freeze_panes
+    target.sheet_view.showGridLines = source.sheet_view.showGridLines
+    target.auto_filter.ref = source.auto_filter.ref
+
+    for row in source.iter_rows():
+        values = []
+        for cell in row:
+            if cell.value is None and not cell.has_style:
+                values.append(None)
+                continue
+            out = WriteOnlyCell(target, value=cell.value)
+            if cell.has_style:
+                out.font = intern_style(copy(cell.font))
+                out.fill = intern_style(copy(cell.fill))
+                out.border = intern_style(copy(cell.border))
+                out.alignment = intern_style(copy(cell.alignment))
+                out.number_format = cell.number_format
+            values.append(out)
+        target.append(values)
@@ -0,0 +1,110 @@
+"""
+Shared registry of openpyxl style objects.
+
+Fills, fonts, alignments and borders are created once per distinct key and
+shared by every formatter, so formatting a sheet creates a number of style
+objects bounded by the number of distinct labels/colors rather than by rows.
+Arguments mirror the openpyxl constructors; omitted arguments keep the
+openpyxl defaults.
+"""
+
+from functools import lru_cache
+
+from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+
+_interned = {}
+
+
+def get_fill(start_color, end_color=None):
+    """
+    Shared solid fill.
+
+    Args:
+        start_color: Hex color (without #)
+        end_color: Optional background color
+
+    Returns:
+        PatternFill: Solid fill
+    """
+    return _fill(start_color, end_color)
+
+
+@lru_cache(maxsize=None)
+def _fill(start_color, end_color):
+    return PatternFill(start_color=start_color, end_color=end_color, fill_type="solid")
+
+
+def get_font(bold=None, italic=None, size=None, color=None):
+    """
+    Shared font.
+
+    Args:
+        bold: Bold text
+        italic: Italic text
+        size: Font size
+        color: Hex color (without #)
+
+    Returns:
+        Font: Font with the given attributes
+    """
+    return _font(bold, italic, size, color)
+
+
+@lru_cache(maxsize=None)
+def _font(bold, italic, size, color):
+    return Font(bold=bold, italic=italic, size=size, color=color)
+
+
+def get_alignment(horizontal=None, vertical=None, wrap_text=None):
+    """
+    Shared alignment.
+
+    Args:
+        horizontal: Horizontal alignment ("left", "center", "right", ...)
+        vertical: Vertical alignment ("top", "center", ...)
+        wrap_text: Wrap long text
+
+    Returns:
+        Alignment: Alignment with the given attributes
+    """
+    return _alignment(horizontal, vertical, wrap_text)
+
+
+@lru_cache(maxsize=None)
+def _alignment(horizontal, vertical, wrap_text):
+    return Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+
+
+def get_border(top=None, bottom=None, left=None, right=None):
+    """
+    Shared border.
+
+    Args:
+        top, bottom, left, right: Side style ("thin", "medium", ...) or None
+
+    Returns:
+        Border: Border with the given sides
+    """
+    return _border(top, bottom, left, right)
+
+
+@lru_cache(maxsize=None)
+def _border(top, bottom, left, right):
+    sides = {"top": top, "bottom": bottom, "left": left, "right": right}
+    return Border(**{name: Side(style=style) for name, style in sides.items() if style})
+
+
+def intern_style(style):
+    """
+    Shared instance equal to a style object.
+
+    Used for styles copied from another workbook (e.g. the Master File
+    header), which are not built from a key.
+
+    Args:
+        style: Font, PatternFill, Border or Alignment (not a cell's StyleProxy)
+
+    Returns:
+        The registered object equal to style
+    """
+    return _interned.setdefault(style, style)
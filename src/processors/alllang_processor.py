@@ -9,27 +9,24 @@ import os
 import pandas as pd
 from datetime import datetime
 
-# Conditional tkinter import for headless testing
-if os.environ.get('HEADLESS', '').lower() not in ('1', 'true', 'yes'):
-    from tkinter import messagebox
-else:
-    messagebox = None
-
 from src.processors.base_processor import BaseProcessor
-from src.io.excel_reader import safe_read_excel
-from src.io.formatters import apply_direct_coloring, widen_summary_columns, format_update_history_sheet
-from src.utils.data_processing import normalize_dataframe_status, filter_output_columns, remove_full_duplicates
-from src.utils.helpers import log, get_script_dir, safe_str
-from src.config import OUTPUT_COLUMNS_MASTER, COL_CASTINGKEY, COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY, COL_SEQUENCE, COL_EVENTNAME
+from src.io.frame_cache import load_vrs_frames
+from src.io.formatters import widen_summary_columns, format_update_history_sheet
+from src.io.streaming_writer import StreamingExcelWriter
+from src.utils.data_processing import filter_output_columns
+from src.utils.helpers import log
+from src.config import OUTPUT_COLUMNS_MASTER, COL_CASTINGKEY
 from src.core.alllang_helpers import (
     find_alllang_files,
+    current_file_requests,
     merge_current_files,
     process_alllang_comparison_twopass as process_alllang_comparison
 )
 from src.core.working_helpers import build_working_lookups, find_working_deleted_rows
-from src.core.casting import generate_casting_key
+from src.core.casting import build_speaker_group_lookup, generate_casting_keys
 from src.io.summary import create_alllang_summary, create_alllang_update_history_sheet
 from src.history.history_manager import add_alllang_update_record
+from src.utils.profiling import profile_stage
 
 
 class AllLangProcessor(BaseProcessor):
@@ -43,6 +40,7 @@ class AllLangProcessor(BaseProcessor):
     def __init__(self):
         """Initialize the all language processor."""
         super().__init__()
+        self.history_type = "alllang"
         self.curr_kr = None
         self.curr_en = None
         self.curr_cn = None
@@ -52,22 +50,11 @@ class AllLangProcessor(BaseProcessor):
         self.has_kr = False
         self.has_en = False
         self.has_cn = False
+        self.input_dir = None  # Folder holding Previous/ and Current/ (default: script directory)
         self.df_curr = None
         self.df_kr = None  # Store KR previous DataFrame for TWO-PASS
-        # 10-key lookups for KR (baseline)
-        self.prev_lookup_se = None
-        self.prev_lookup_so = None
-        self.prev_lookup_sc = None
-        self.prev_lookup_eo = None
-        self.prev_lookup_ec = None
-        self.prev_lookup_oc = None
-        self.prev_lookup_seo = None
-        self.prev_lookup_sec = None
-        self.prev_lookup_soc = None
-        self.prev_lookup_eoc = None
-        # Simple SE lookups for EN/CN
-        self.lookup_en = {}
-        self.lookup_cn = {}
+        # 10-key index for KR (baseline)
+        self.prev_index = None
 
     def get_process_name(self):
         """Get the process name."""
@@ -76,8 +63,17 @@ class AllLangProcessor(BaseProcessor):
     def select_files(self):
         """Auto-detect files from Previous/ and Current/ folders."""
         try:
-            log("Auto-detecting files from Previous/ and Current/ folders...")
-            self.curr_kr, self.curr_en, self.curr_cn, self.prev_kr, self.prev_en, self.prev_cn = find_alllang_files()
+            if self.headless and self.curr_kr and self.curr_en and self.curr_cn:
+                # Headless run with explicit files (previous files are optional)
+                inputs = {"curr_kr": self.curr_kr, "curr_en": self.curr_en, "curr_cn": self.curr_cn}
+                for name, path in (("prev_kr", self.prev_kr), ("prev_en", self.prev_en), ("prev_cn", self.prev_cn)):
+                    if path:
+                        inputs[name] = path
+                if not self._require_inputs(**inputs):
+                    return False
+            else:
+                log("Auto-detecting files from Previous/ and Current/ folders...")
+                self.curr_kr, self.curr_en, self.curr_cn, self.prev_kr, self.prev_en, self.prev_cn = find_alllang_files(self.input_dir)
 
             log("\nCURRENT FILES (complete base - required):")
             log(f"  ✓ KR: {os.path.basename(self.curr_kr)}")
@@ -97,98 +93,40 @@ class AllLangProcessor(BaseProcessor):
 
         except Exception as e:
             log(f"Error detecting files: {e}")
-            messagebox.showerror("Error", f"Failed to detect files:\n\n{e}")
+            self._show_error("Error", f"Failed to detect files:\n\n{e}")
             return False
 
     def read_files(self):
         """Read and merge current files, then read previous files."""
         try:
+            # Parse the CURRENT workbooks and KR PREVIOUS concurrently. EN/CN
+            # PREVIOUS rows are never imported: those files only switch their
+            # language's update on (has_en/has_cn), so they are not read.
+            requests = current_file_requests(self.curr_kr, self.curr_en, self.curr_cn)
+            if self.has_kr:
+                requests.append((self.prev_kr, "KR PREVIOUS", False))
+            log(f"\nReading {len(requests)} workbooks...")
+            frames = load_vrs_frames(requests)
+
             # Merge current files
-            self.df_curr = merge_current_files(self.curr_kr, self.curr_en, self.curr_cn)
-
-            # Build Speaker|CharacterGroupKey lookup from CURRENT (used for ALL PREVIOUS files)
-            log("\nBuilding Speaker|CharacterGroupKey lookup from CURRENT...")
-            speaker_gk_lookup = {}
-            for idx, row in self.df_curr.iterrows():
-                key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                speaker_gk_lookup[key] = safe_str(row.get(COL_SPEAKER_GROUPKEY, ""))
-            log(f"  → Indexed {len(speaker_gk_lookup):,} Speaker|CharacterGroupKey values from CURRENT")
-            log("  → This will be used for ALL PREVIOUS files (KR/EN/CN)")
-
-            # Read previous files and build lookups
+            self.df_curr = merge_current_files(self.curr_kr, self.curr_en, self.curr_cn, current_frames=frames[:3])
+
+            # Resolve CastingKey and build the 10-key index for KR
             if self.has_kr:
-                log(f"\nReading KR Previous: {os.path.basename(self.prev_kr)}")
-                df_kr = safe_read_excel(self.prev_kr, header=0, dtype=str)
-                df_kr = normalize_dataframe_status(df_kr)
-                log(f"  → {len(df_kr):,} rows")
-                df_kr = remove_full_duplicates(df_kr, "KR PREVIOUS")
-                log(f"  → After cleanup: {len(df_kr):,} rows")
-                log("  → Generating CastingKey for KR Previous (using CURRENT's Speaker|CharacterGroupKey)...")
-                casting_keys_kr = []
-                for idx, row in df_kr.iterrows():
-                    # Look up Speaker|CharacterGroupKey from CURRENT
-                    key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                    speaker_gk_from_curr = speaker_gk_lookup.get(key, "")
-                    casting_key = generate_casting_key(
-                        row.get(COL_CHARACTERKEY, ""),
-                        row.get(COL_DIALOGVOICE, ""),
-                        speaker_gk_from_curr,  # From CURRENT, not PREVIOUS
-                        row.get("DialogType", "")
-                    )
-                    casting_keys_kr.append(casting_key)
-                df_kr[COL_CASTINGKEY] = casting_keys_kr
-                self.df_kr = df_kr  # Store for TWO-PASS algorithm
-                (self.prev_lookup_se, self.prev_lookup_so, self.prev_lookup_sc, self.prev_lookup_eo,
-                 self.prev_lookup_ec, self.prev_lookup_oc, self.prev_lookup_seo, self.prev_lookup_sec,
-                 self.prev_lookup_soc, self.prev_lookup_eoc) = build_working_lookups(self.df_kr, "KR PREVIOUS")
-
-            if self.has_en:
-                log(f"\nReading EN Previous: {os.path.basename(self.prev_en)}")
-                df_en = safe_read_excel(self.prev_en, header=0, dtype=str)
-                df_en = normalize_dataframe_status(df_en)
-                log(f"  → {len(df_en):,} rows")
-                df_en = remove_full_duplicates(df_en, "EN PREVIOUS")
-                log(f"  → After cleanup: {len(df_en):,} rows")
-                log("  → Generating CastingKey for EN Previous (using CURRENT's Speaker|CharacterGroupKey)...")
-                casting_keys_en = []
-                for idx, row in df_en.iterrows():
-                    # Look up Speaker|CharacterGroupKey from CURRENT
-                    key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                    speaker_gk_from_curr = speaker_gk_lookup.get(key, "")
-                    casting_key = generate_casting_key(
-                        row.get(COL_CHARACTERKEY, ""),
-                        row.get(COL_DIALOGVOICE, ""),
-                        speaker_gk_from_curr,  # From CURRENT, not PREVIOUS
-                        row.get("DialogType", "")
-                    )
-                    casting_keys_en.append(casting_key)
-                df_en[COL_CASTINGKEY] = casting_keys_en
-                # For EN, we only need the primary SE lookup, discard the rest
-                self.lookup_en = build_working_lookups(df_en, "EN PREVIOUS")[0]
-
-            if self.has_cn:
-                log(f"\nReading CN Previous: {os.path.basename(self.prev_cn)}")
-                df_cn = safe_read_excel(self.prev_cn, header=0, dtype=str)
-                df_cn = normalize_dataframe_status(df_cn)
-                log(f"  → {len(df_cn):,} rows")
-                df_cn = remove_full_duplicates(df_cn, "CN PREVIOUS")
-                log(f"  → After cleanup: {len(df_cn):,} rows")
-                log("  → Generating CastingKey for CN Previous (using CURRENT's Speaker|CharacterGroupKey)...")
-                casting_keys_cn = []
-                for idx, row in df_cn.iterrows():
-                    # Look up Speaker|CharacterGroupKey from CURRENT
-                    key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                    speaker_gk_from_curr = speaker_gk_lookup.get(key, "")
-                    casting_key = generate_casting_key(
-                        row.get(COL_CHARACTERKEY, ""),
-                        row.get(COL_DIALOGVOICE, ""),
-                        speaker_gk_from_curr,  # From CURRENT, not PREVIOUS
-                        row.get("DialogType", "")
-                    )
-                    casting_keys_cn.append(casting_key)
-                df_cn[COL_CASTINGKEY] = casting_keys_cn
-                # For CN, we only need the primary SE lookup, discard the rest
-                self.lookup_cn = build_working_lookups(df_cn, "CN PREVIOUS")[0]
+                self.df_kr = frames[3]  # Store for TWO-PASS algorithm
+                log(f"\nKR Previous: {os.path.basename(self.prev_kr)} → {len(self.df_kr):,} rows")
+                with profile_stage("CastingKey resolution"):
+                    log("Building Speaker|CharacterGroupKey lookup from CURRENT...")
+                    speaker_gk_lookup = build_speaker_group_lookup(self.df_curr)
+                    log(f"  → Indexed {len(speaker_gk_lookup):,} Speaker|CharacterGroupKey values from CURRENT")
+                    self.df_kr[COL_CASTINGKEY] = generate_casting_keys(self.df_kr, speaker_gk_lookup)
+                    log(f"  → KR Previous: CastingKey generated for {len(self.df_kr):,} rows")
+                with profile_stage("lookup build"):
+                    self.prev_index = build_working_lookups(self.df_kr, "KR PREVIOUS")
+
+            for lang, path in (("EN", self.prev_en), ("CN", self.prev_cn)):
+                if path:
+                    log(f"\n{lang} Previous: {os.path.basename(path)} → {lang} update enabled (file not read)")
 
             return True
 
@@ -205,19 +143,17 @@ class AllLangProcessor(BaseProcessor):
             self.df_result, self.counter, marked_prev_indices = process_alllang_comparison(
                 self.df_curr,
                 self.df_kr,  # Pass KR previous DataFrame for TWO-PASS
-                self.prev_lookup_se, self.prev_lookup_so, self.prev_lookup_sc,
-                self.prev_lookup_eo, self.prev_lookup_ec, self.prev_lookup_oc,
-                self.prev_lookup_seo, self.prev_lookup_sec, self.prev_lookup_soc, self.prev_lookup_eoc,
-                self.lookup_en,
-                self.lookup_cn,
+                self.prev_index,
                 self.has_kr,
                 self.has_en,
-                self.has_cn
+                self.has_cn,
+                settings=self.settings
             )
 
             # Find deleted rows (only if KR was updated) - TWO-PASS algorithm
             if self.has_kr:
-                self.df_deleted = find_working_deleted_rows(self.df_kr, self.df_curr, marked_prev_indices)
+                with profile_stage("deleted-row scan"):
+                    self.df_deleted = find_working_deleted_rows(self.df_kr, self.df_curr, marked_prev_indices)
                 if not self.df_deleted.empty:
                     self.counter["Deleted Rows"] = len(self.df_deleted)
             else:
@@ -225,7 +161,7 @@ class AllLangProcessor(BaseProcessor):
 
             # Filter output columns
             log("\nFiltering output columns...")
-            self.df_result = filter_output_columns(self.df_result, OUTPUT_COLUMNS_MASTER)
+            self.df_result = filter_output_columns(self.df_result, OUTPUT_COLUMNS_MASTER, settings=self.settings)
             log(f"  → Output contains {len(self.df_result.columns)} columns")
 
             # Create summary
@@ -245,38 +181,48 @@ class AllLangProcessor(BaseProcessor):
             return False
 
     def write_output(self):
-        """Write results to Excel file with formatting."""
+        """Write results to Excel file with formatting, and/or as data files."""
         try:
-            script_dir = get_script_dir()
-            out_filename = "AllLanguage_VRS_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".xlsx"
-            self.output_path = os.path.join(script_dir, out_filename)
-            log(f"\nWriting results to: {out_filename}")
+            script_dir = self._get_output_dir()
+            base_name = "AllLanguage_VRS_" + datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.output_paths = []
 
-            with pd.ExcelWriter(self.output_path, engine="openpyxl") as writer:
-                self.df_result.to_excel(writer, sheet_name="All Language Transform", index=False)
+            df_deleted_filtered = None
+            if not self.df_deleted.empty:
+                df_deleted_filtered = filter_output_columns(self.df_deleted, OUTPUT_COLUMNS_MASTER, settings=self.settings)
 
-                self.df_history.to_excel(writer, sheet_name="📅 Update History", index=False, header=False)
+            if self._writes_xlsx():
+                self.output_path = os.path.join(script_dir, base_name + ".xlsx")
+                log(f"\nWriting results to: {os.path.basename(self.output_path)}")
 
-                if not self.df_deleted.empty:
-                    df_deleted_filtered = filter_output_columns(self.df_deleted, OUTPUT_COLUMNS_MASTER)
-                    df_deleted_filtered.to_excel(writer, sheet_name="Deleted Rows", index=False)
-                    log(f"  → Created 'Deleted Rows' sheet with {len(self.df_deleted)} rows")
+                with profile_stage("formatting"), StreamingExcelWriter(self.output_path) as writer:
+                    writer.write_dataframe(self.df_result, "All Language Transform", colored=True, is_master=True)
+
+                    writer.write_formatted(self.df_history, "📅 Update History", header=False,
+                                           formatter=format_update_history_sheet)
+
+                    if df_deleted_filtered is not None:
+                        writer.write_dataframe(df_deleted_filtered, "Deleted Rows")
+                        log(f"  → Created 'Deleted Rows' sheet with {len(self.df_deleted)} rows")
 
-                self.df_summary.to_excel(writer, sheet_name="Summary Report", index=False, header=True)
+                    writer.write_formatted(self.df_summary, "Summary Report", formatter=widen_summary_columns)
 
-                wb = writer.book
-                apply_direct_coloring(wb["All Language Transform"], is_master=True)
-                format_update_history_sheet(wb["📅 Update History"])
-                widen_summary_columns(wb["Summary Report"])
+                self.output_paths.append(self.output_path)
+                log(f"✓ File saved: {self.output_path}")
+
+            self._write_data_outputs(base_name, {
+                "All Language Transform": self.df_result,
+                "Deleted Rows": df_deleted_filtered,
+                "Summary Report": self.df_summary,
+            })
+            self.output_path = self.output_paths[0]
 
             # Add to history
-            add_alllang_update_record(
-                out_filename, self.prev_kr, self.prev_en, self.prev_cn,
+            self.history_record = add_alllang_update_record(
+                os.path.basename(self.output_path), self.prev_kr, self.prev_en, self.prev_cn,
                 self.curr_kr, self.curr_en, self.curr_cn,
                 self.counter, len(self.df_result)
             )
-
-            log(f"✓ File saved: {self.output_path}")
             return True
 
         except Exception as e:
@@ -288,7 +234,7 @@ class AllLangProcessor(BaseProcessor):
     def show_summary(self):
         """Display completion message with summary."""
         summary_msg = "Process completed successfully!\n\n"
-        summary_msg += f"Output file:\n{self.output_path}\n\n"
+        summary_msg += f"Output file:\n{self._output_files_text()}\n\n"
         summary_msg += "Languages Updated:\n"
         summary_msg += f"  KR: {'✓ UPDATED' if self.has_kr else '○ Preserved'}\n"
         summary_msg += f"  EN: {'✓ UPDATED' if self.has_en else '○ Preserved'}\n"
@@ -297,4 +243,4 @@ class AllLangProcessor(BaseProcessor):
         for change_type, count in sorted(self.counter.items()):
             summary_msg += f"  {change_type}: {count:,}\n"
 
-        messagebox.showinfo("ALL LANGUAGE CHECK Complete", summary_msg)
+        self._show_info("ALL LANGUAGE CHECK Complete", summary_msg)
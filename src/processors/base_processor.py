@@ -22,6 +22,11 @@ else:
 
 from src.utils.helpers import log, get_script_dir
 from src.utils.data_processing import normalize_dataframe_status
+from src.settings import get_settings_snapshot
+from src.config import DEFAULT_OUTPUT_FORMATS
+from src.io.data_export import write_data_files
+from src.history.history_manager import update_update_record
+from src.utils.profiling import start_run_profile, stop_run_profile, profile_stage
 
 
 class BaseProcessor(ABC):
@@ -39,10 +44,19 @@ class BaseProcessor(ABC):
         self.source_file = None
         self.target_file = None
         self.output_path = None
+        self.output_paths = []  # Every file written by write_output()
+        self.output_formats = DEFAULT_OUTPUT_FORMATS  # "xlsx", "parquet", "csv", "jsonl"
         self.df_result = None
         self.df_deleted = None
         self.df_summary = None
         self.counter = {}
+        self.settings = None  # SettingsSnapshot frozen for the current run
+        self.output_dir = None  # Output directory (default: script directory)
+        self.headless = False  # Inputs are preset: no dialogs, no message boxes
+        self.profile = None  # RunProfile of the current run (stage timings)
+        self.trace_dir = None  # Directory for a JSON trace of the stage timings (None: no trace)
+        self.history_record = None  # History record written by write_output(), if any
+        self.history_type = None  # Its history file ("working", "alllang" or "master")
 
     @abstractmethod
     def get_process_name(self):
@@ -112,33 +126,38 @@ class BaseProcessor(ABC):
         Returns:
             bool: True if processing completed successfully, False otherwise
         """
+        self.profile = start_run_profile(self.get_process_name())
+        self.history_record = None
         try:
             log("\n" + "=" * 70)
             log(self.get_process_name())
             log("=" * 70)
 
+            # Freeze settings once for the whole run
+            self.settings = get_settings_snapshot()
+
             # Step 1: Select files
-            if not self.select_files():
-                log("User cancelled - exiting.")
+            if not self._run_step("select files", self.select_files):
+                log("Invalid inputs - exiting." if self.headless else "User cancelled - exiting.")
                 return False
 
             # Step 2: Read files
-            if not self.read_files():
+            if not self._run_step("read files", self.read_files):
                 log("Failed to read files - exiting.")
                 return False
 
             # Step 3: Process data
-            if not self.process_data():
+            if not self._run_step("process data", self.process_data):
                 log("Failed to process data - exiting.")
                 return False
 
             # Step 4: Write output
-            if not self.write_output():
+            if not self._run_step("write output", self.write_output):
                 log("Failed to write output - exiting.")
                 return False
 
             # Step 5: Show summary
-            self.show_summary()
+            self._run_step("show summary", self.show_summary)
 
             log("=" * 70)
             return True
@@ -147,9 +166,72 @@ class BaseProcessor(ABC):
             log(f"FATAL ERROR: {exc}")
             import traceback
             traceback.print_exc()
-            messagebox.showerror("Error", f"Something went wrong:\n\n{exc}")
+            self._show_error("Error", f"Something went wrong:\n\n{exc}")
             return False
 
+        finally:
+            stop_run_profile()
+            self._save_profile()
+
+    def _run_step(self, name, step):
+        """
+        Run one template step as a timed stage.
+
+        Args:
+            name: Stage name
+            step: Bound method to call
+
+        Returns:
+            The step's return value
+        """
+        with profile_stage(name):
+            return step()
+
+    def _save_profile(self):
+        """
+        Report the run's stage timings.
+
+        Logs them, adds them to the run's history record (if write_output()
+        created one) and writes the JSON trace file if trace_dir is set.
+        Reporting problems never fail the run.
+        """
+        try:
+            self.profile.log_summary()
+            performance = self.profile.to_dict()["stages"]
+            if self.history_record is not None:
+                update_update_record(self.history_record, self.history_type, performance=performance)
+            if self.trace_dir:
+                os.makedirs(self.trace_dir, exist_ok=True)
+                if self.output_path:
+                    trace_name = os.path.splitext(os.path.basename(self.output_path))[0]
+                else:
+                    process = type(self).__name__.replace("Processor", "")
+                    trace_name = process + "_" + datetime.now().strftime("%Y%m%d_%H%M%S")
+                trace_path = os.path.join(self.trace_dir, trace_name + "_trace.json")
+                self.profile.write_trace(trace_path)
+                log(f"✓ Trace saved: {trace_path}")
+        except Exception as e:
+            log(f"Warning: Could not save stage timings: {e}")
+
+    def _require_inputs(self, **paths):
+        """
+        Check the preset input files of a headless run.
+
+        Args:
+            **paths: Input name → file path
+
+        Returns:
+            bool: True if every path is set and exists
+        """
+        for name, path in paths.items():
+            if not path:
+                log(f"Missing input: {name}")
+                return False
+            if not os.path.isfile(path):
+                log(f"Input file not found ({name}): {path}")
+                return False
+        return True
+
     def _select_single_file(self, title):
         """
         Helper method to select a single Excel file.
@@ -171,7 +253,7 @@ class BaseProcessor(ABC):
 
     def _generate_output_path(self, base_filename, suffix):
         """
-        Generate output file path in script directory.
+        Generate output file path in the output directory.
 
         Args:
             base_filename: Base name for the output file
@@ -180,9 +262,81 @@ class BaseProcessor(ABC):
         Returns:
             str: Full output file path
         """
-        script_dir = get_script_dir()
         out_filename = os.path.splitext(os.path.basename(base_filename))[0] + suffix
-        return os.path.join(script_dir, out_filename)
+        return os.path.join(self._get_output_dir(), out_filename)
+
+    def _writes_xlsx(self):
+        """
+        Check whether this run writes the formatted workbook.
+
+        Returns:
+            bool: True if "xlsx" is one of the output formats
+        """
+        return "xlsx" in self.output_formats
+
+    def _write_data_outputs(self, base_name, frames):
+        """
+        Write result frames in the run's data formats (Parquet/CSV/JSONL).
+
+        Args:
+            base_name: Output name without extension (e.g. "curr_diff")
+            frames: Frame name → DataFrame
+
+        Returns:
+            list: Paths of the written files (also added to output_paths)
+        """
+        if set(self.output_formats) <= {"xlsx"}:
+            return []
+        with profile_stage("data files"):
+            paths = write_data_files(frames, self._get_output_dir(), base_name, self.output_formats)
+        for path in paths:
+            log(f"✓ File saved: {path}")
+        self.output_paths.extend(paths)
+        return paths
+
+    def _output_files_text(self):
+        """
+        List the files written by write_output() for the completion message.
+
+        Returns:
+            str: One path per line
+        """
+        return "\n".join(self.output_paths or [self.output_path])
+
+    def _get_output_dir(self):
+        """
+        Get the directory output files are written to.
+
+        Returns:
+            str: output_dir if set, otherwise the script directory
+        """
+        return self.output_dir or get_script_dir()
+
+    def _show_info(self, title, message):
+        """
+        Show an information message (logged instead in headless runs).
+
+        Args:
+            title: Message box title
+            message: Message text
+        """
+        if self.headless or messagebox is None:
+            log(f"{title}\n{message}")
+        else:
+            messagebox.showinfo(title, message)
+
+    def _show_error(self, title, message):
+        """
+        Show an error message (logged instead in headless runs).
+
+        Args:
+            title: Message box title
+            message: Message text
+        """
+        if self.headless or messagebox is None:
+            log(f"{title}: {message}")
+        else:
+            messagebox.showerror(title, message)
 
     def _log_file_read(self, filepath, df):
         """
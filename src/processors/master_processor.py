@@ -13,12 +13,6 @@ import os
 import pandas as pd
 from datetime import datetime
 
-# Conditional tkinter import for headless testing
-if os.environ.get('HEADLESS', '').lower() not in ('1', 'true', 'yes'):
-    from tkinter import messagebox
-else:
-    messagebox = None
-
 from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 from copy import copy
@@ -26,16 +20,18 @@ from copy import copy
 from src.processors.base_processor import BaseProcessor
 from src.io.excel_reader import safe_read_excel
 from src.io.formatters import apply_direct_coloring, widen_summary_columns, format_update_history_sheet
+from src.io.styles import intern_style
 from src.utils.data_processing import normalize_dataframe_status, remove_full_duplicates
-from src.utils.helpers import log, get_script_dir, safe_str
+from src.utils.helpers import log, safe_str
 from src.config import (
     COL_SEQUENCE, COL_EVENTNAME, COL_STRORIGIN, COL_CASTINGKEY,
-    COL_IMPORTANCE, COL_STARTFRAME, COL_ENDFRAME,
-    COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY
+    COL_IMPORTANCE, COL_STARTFRAME, COL_ENDFRAME
 )
-from src.core.casting import generate_casting_key
+from src.core.casting import generate_casting_keys
+from src.core.lookups import TenKeyIndex
 from src.io.summary import create_master_file_update_history_sheet
 from src.history.history_manager import add_master_file_update_record
+from src.utils.profiling import profile_stage
 
 
 class MasterProcessor(BaseProcessor):
@@ -49,6 +45,7 @@ class MasterProcessor(BaseProcessor):
     def __init__(self):
         """Initialize the master processor."""
         super().__init__()
+        self.history_type = "master"
         self.df_source = None
         self.df_target = None
         self.df_high = None
@@ -69,6 +66,9 @@ class MasterProcessor(BaseProcessor):
 
     def select_files(self):
         """Prompt user to select source and target files."""
+        if self.headless:
+            return self._require_inputs(source=self.source_file, target=self.target_file)
+
         self.source_file = self._select_single_file(
             "MASTER FILE UPDATE: Select SOURCE (Working Process output)"
         )
@@ -120,30 +120,12 @@ class MasterProcessor(BaseProcessor):
                 self.df_source[COL_IMPORTANCE] = "High"
 
             log("Generating CastingKey column for SOURCE...")
-            casting_keys_source = []
-            for idx, row in self.df_source.iterrows():
-                casting_key = generate_casting_key(
-                    row.get(COL_CHARACTERKEY, ""),
-                    row.get(COL_DIALOGVOICE, ""),
-                    row.get(COL_SPEAKER_GROUPKEY, ""),
-                    row.get("DialogType", "")
-                )
-                casting_keys_source.append(casting_key)
-            self.df_source[COL_CASTINGKEY] = casting_keys_source
-            log(f"  → Generated CastingKey for {len(casting_keys_source):,} source rows")
+            self.df_source[COL_CASTINGKEY] = generate_casting_keys(self.df_source)
+            log(f"  → Generated CastingKey for {len(self.df_source):,} source rows")
 
             log("Generating CastingKey column for TARGET...")
-            casting_keys_target = []
-            for idx, row in self.df_target.iterrows():
-                casting_key = generate_casting_key(
-                    row.get(COL_CHARACTERKEY, ""),
-                    row.get(COL_DIALOGVOICE, ""),
-                    row.get(COL_SPEAKER_GROUPKEY, ""),
-                    row.get("DialogType", "")
-                )
-                casting_keys_target.append(casting_key)
-            self.df_target[COL_CASTINGKEY] = casting_keys_target
-            log(f"  → Generated CastingKey for {len(casting_keys_target):,} target rows")
+            self.df_target[COL_CASTINGKEY] = generate_casting_keys(self.df_target)
+            log(f"  → Generated CastingKey for {len(self.df_target):,} target rows")
 
             return True
 
@@ -165,15 +147,16 @@ class MasterProcessor(BaseProcessor):
 
             # Build simple EventName lookups
             log("\nBuilding EventName lookups...")
-            source_high_lookup = {}
-            for idx, row in self.df_high.iterrows():
-                event_name = safe_str(row.get(COL_EVENTNAME, ""))
-                source_high_lookup[event_name] = row
+            with profile_stage("lookup build"):
+                source_high_lookup = {}
+                for idx, row in self.df_high.iterrows():
+                    event_name = safe_str(row.get(COL_EVENTNAME, ""))
+                    source_high_lookup[event_name] = row
 
-            target_lookup = {}
-            for idx, row in self.df_target.iterrows():
-                event_name = safe_str(row.get(COL_EVENTNAME, ""))
-                target_lookup[event_name] = row
+                target_lookup = {}
+                for idx, row in self.df_target.iterrows():
+                    event_name = safe_str(row.get(COL_EVENTNAME, ""))
+                    target_lookup[event_name] = row
 
             log(f"  → SOURCE HIGH: {len(source_high_lookup):,} EventNames")
             log(f"  → TARGET: {len(target_lookup):,} EventNames")
@@ -192,9 +175,10 @@ class MasterProcessor(BaseProcessor):
 
             # Find deleted rows
             log("\nMarking deleted rows...")
-            deleted_rows, deleted_count = self._find_deleted_rows(
-                target_lookup, source_high_lookup
-            )
+            with profile_stage("deleted-row scan"):
+                deleted_rows, deleted_count = self._find_deleted_rows(
+                    target_lookup, source_high_lookup
+                )
             log(f"  → Marked {deleted_count:,} deleted rows")
 
             # Combine HIGH + DELETED into single output
@@ -227,61 +211,26 @@ class MasterProcessor(BaseProcessor):
             return False
 
     def write_output(self):
-        """Write results to Excel file with formatting."""
+        """Write results to Excel file with formatting, and/or as data files."""
         try:
-            script_dir = get_script_dir()
-            out_filename = "MasterFile_Updated_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".xlsx"
-            self.output_path = os.path.join(script_dir, out_filename)
-            log(f"\nWriting results to: {out_filename}")
-
-            # Load target workbook for formatting
-            log("Loading TARGET workbook for formatting...")
-            wb_target = load_workbook(self.target_file)
-            ws_target = wb_target.active
-
-            with pd.ExcelWriter(self.output_path, engine="openpyxl") as writer:
-                self.df_high_output.to_excel(writer, sheet_name="Main Sheet", index=False)
-                self.df_history.to_excel(writer, sheet_name="📅 Update History", index=False, header=False)
-                self.df_summary.to_excel(writer, sheet_name="Summary Report", index=False, header=True)
-
-                wb = writer.book
-
-                # Apply formatting to main sheet
-                ws = wb["Main Sheet"]
-                log("Applying formatting to Main Sheet...")
-
-                # Copy column widths
-                for col_idx in range(1, min(ws_target.max_column + 1, ws.max_column + 1)):
-                    col_letter = get_column_letter(col_idx)
-                    if col_letter in ws_target.column_dimensions:
-                        ws.column_dimensions[col_letter].width = ws_target.column_dimensions[col_letter].width
-
-                # Copy header row formatting
-                for col_idx in range(1, min(ws_target.max_column + 1, ws.max_column + 1)):
-                    source_cell = ws_target.cell(row=1, column=col_idx)
-                    target_cell = ws.cell(row=1, column=col_idx)
-
-                    if source_cell.has_style:
-                        target_cell.font = copy(source_cell.font)
-                        target_cell.border = copy(source_cell.border)
-                        target_cell.fill = copy(source_cell.fill)
-                        target_cell.alignment = copy(source_cell.alignment)
-
-                # Apply CHANGES column coloring
-                apply_direct_coloring(ws, is_master=False)
+            script_dir = self._get_output_dir()
+            base_name = "MasterFile_Updated_" + datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.output_paths = []
 
-                format_update_history_sheet(wb["📅 Update History"])
-                widen_summary_columns(wb["Summary Report"])
+            if self._writes_xlsx():
+                self._write_master_workbook(os.path.join(script_dir, base_name + ".xlsx"))
 
-            wb_target.close()
+            self._write_data_outputs(base_name, {
+                "Main Sheet": self.df_high_output,
+                "Summary Report": self.df_summary,
+            })
+            self.output_path = self.output_paths[0]
 
             # Add to history
-            add_master_file_update_record(
-                out_filename, self.source_file, self.target_file,
+            self.history_record = add_master_file_update_record(
+                os.path.basename(self.output_path), self.source_file, self.target_file,
                 self.total_counter, len(self.df_high_output)
             )
-
-            log(f"✓ File saved: {self.output_path}")
             return True
 
         except Exception as e:
@@ -290,81 +239,83 @@ class MasterProcessor(BaseProcessor):
             traceback.print_exc()
             return False
 
+    def _write_master_workbook(self, output_path):
+        """
+        Write the formatted Master File workbook.
+
+        Args:
+            output_path: Output .xlsx path
+        """
+        self.output_path = output_path
+        log(f"\nWriting results to: {os.path.basename(output_path)}")
+
+        # Load target workbook for formatting
+        log("Loading TARGET workbook for formatting...")
+        wb_target = load_workbook(self.target_file)
+        ws_target = wb_target.active
+
+        with profile_stage("formatting"), pd.ExcelWriter(self.output_path, engine="openpyxl") as writer:
+            self.df_high_output.to_excel(writer, sheet_name="Main Sheet", index=False)
+            self.df_history.to_excel(writer, sheet_name="📅 Update History", index=False, header=False)
+            self.df_summary.to_excel(writer, sheet_name="Summary Report", index=False, header=True)
+
+            wb = writer.book
+
+            # Apply formatting to main sheet
+            ws = wb["Main Sheet"]
+            log("Applying formatting to Main Sheet...")
+
+            # Copy column widths
+            for col_idx in range(1, min(ws_target.max_column + 1, ws.max_column + 1)):
+                col_letter = get_column_letter(col_idx)
+                if col_letter in ws_target.column_dimensions:
+                    ws.column_dimensions[col_letter].width = ws_target.column_dimensions[col_letter].width
+
+            # Copy header row formatting
+            for col_idx in range(1, min(ws_target.max_column + 1, ws.max_column + 1)):
+                source_cell = ws_target.cell(row=1, column=col_idx)
+                target_cell = ws.cell(row=1, column=col_idx)
+
+                if source_cell.has_style:
+                    target_cell.font = intern_style(copy(source_cell.font))
+                    target_cell.border = intern_style(copy(source_cell.border))
+                    target_cell.fill = intern_style(copy(source_cell.fill))
+                    target_cell.alignment = intern_style(copy(source_cell.alignment))
+
+            # Apply CHANGES column coloring
+            apply_direct_coloring(ws, is_master=False)
+
+            format_update_history_sheet(wb["📅 Update History"])
+            widen_summary_columns(wb["Summary Report"])
+
+        wb_target.close()
+
+        self.output_paths.append(self.output_path)
+        log(f"✓ File saved: {self.output_path}")
+
     def show_summary(self):
         """Display completion message with summary."""
         summary_msg = "Master File Update completed successfully!\n\n"
-        summary_msg += f"Output file:\n{self.output_path}\n\n"
+        summary_msg += f"Output file:\n{self._output_files_text()}\n\n"
         summary_msg += "Results:\n"
         summary_msg += f"  Main Sheet: {len(self.df_high_output):,} rows (HIGH + DELETED)\n\n"
         summary_msg += "Change Summary:\n"
         for change_type, count in sorted(self.total_counter.items()):
             summary_msg += f"  {change_type}: {count:,}\n"
 
-        messagebox.showinfo("MASTER FILE UPDATE Complete", summary_msg)
+        self._show_info("MASTER FILE UPDATE Complete", summary_msg)
 
     # Helper methods
     def _build_lookups(self, df, label):
         """
-        Build 10-key lookup dictionaries (TWO-PASS algorithm).
+        Build the 10-key lookup index (TWO-PASS algorithm).
 
-        Lookups store DataFrame INDEX only (not full rows).
+        The index stores DataFrame INDEX only (not full rows).
         Use df.loc[index] to retrieve row when needed.
         """
-        lookup_se = {}
-        lookup_so = {}
-        lookup_sc = {}
-        lookup_eo = {}
-        lookup_ec = {}
-        lookup_oc = {}
-        lookup_seo = {}
-        lookup_sec = {}
-        lookup_soc = {}
-        lookup_eoc = {}
-
-        for df_idx, row in df.iterrows():
-            S = row[COL_SEQUENCE]
-            E = row[COL_EVENTNAME]
-            O = row[COL_STRORIGIN]
-            C = row[COL_CASTINGKEY]
-
-            # 2-key combinations
-            key_se = (S, E)
-            key_so = (S, O)
-            key_sc = (S, C)
-            key_eo = (E, O)
-            key_ec = (E, C)
-            key_oc = (O, C)
-            # 3-key combinations
-            key_seo = (S, E, O)
-            key_sec = (S, E, C)
-            key_soc = (S, O, C)
-            key_eoc = (E, O, C)
-
-            # Store DataFrame INDEX in each lookup (first occurrence only)
-            if key_se not in lookup_se:
-                lookup_se[key_se] = df_idx
-            if key_so not in lookup_so:
-                lookup_so[key_so] = df_idx
-            if key_sc not in lookup_sc:
-                lookup_sc[key_sc] = df_idx
-            if key_eo not in lookup_eo:
-                lookup_eo[key_eo] = df_idx
-            if key_ec not in lookup_ec:
-                lookup_ec[key_ec] = df_idx
-            if key_oc not in lookup_oc:
-                lookup_oc[key_oc] = df_idx
-            if key_seo not in lookup_seo:
-                lookup_seo[key_seo] = df_idx
-            if key_sec not in lookup_sec:
-                lookup_sec[key_sec] = df_idx
-            if key_soc not in lookup_soc:
-                lookup_soc[key_soc] = df_idx
-            if key_eoc not in lookup_eoc:
-                lookup_eoc[key_eoc] = df_idx
-
-        log(f"  → {label} indexed: {len(lookup_se):,} rows")
-        return (lookup_se, lookup_so, lookup_sc, lookup_eo, lookup_ec,
-                lookup_oc, lookup_seo, lookup_sec, lookup_soc, lookup_eoc)
+        index = TenKeyIndex(df)
+        log(f"  → {label} indexed: {index.unique_count('SE'):,} rows")
+        return index
 
     def _process_high_importance(self, df_high, target_lookup):
         """
@@ -430,9 +381,7 @@ class MasterProcessor(BaseProcessor):
         df_output = pd.DataFrame(output_rows, columns=self.output_structure)
         return df_output, counter
 
-    def _process_low_importance(self, df_low,
-                                 t_lookup_se, t_lookup_so, t_lookup_sc, t_lookup_eo, t_lookup_ec,
-                                 t_lookup_oc, t_lookup_seo, t_lookup_sec, t_lookup_soc, t_lookup_eoc):
+    def _process_low_importance(self, df_low, target_index):
         """
         Process low importance rows using TWO-PASS algorithm.
 
@@ -442,59 +391,26 @@ class MasterProcessor(BaseProcessor):
         pass1_results = {}
         counter = {}
 
-        # PASS 1: Detect No Change (perfect 4-key match) and New rows
-        for src_idx, source_row in df_low.iterrows():
-            S = source_row[COL_SEQUENCE]
-            E = source_row[COL_EVENTNAME]
-            O = source_row[COL_STRORIGIN]
-            C = source_row[COL_CASTINGKEY]
+        # Encode all 10 keys of every source row once
+        source_keys = target_index.encode(df_low)
 
-            # Generate all 10 keys
-            key_se = (S, E)
-            key_so = (S, O)
-            key_sc = (S, C)
-            key_eo = (E, O)
-            key_ec = (E, C)
-            key_oc = (O, C)
-            key_seo = (S, E, O)
-            key_sec = (S, E, C)
-            key_soc = (S, O, C)
-            key_eoc = (E, O, C)
-
-            # Check for perfect 4-key match (No Change)
-            if key_sec in t_lookup_sec:
-                target_idx = t_lookup_sec[key_sec]
-                if target_idx not in marked_target_indices:
-                    target_row = self.df_target.loc[target_idx]
-                    target_S = target_row[COL_SEQUENCE]
-                    target_E = target_row[COL_EVENTNAME]
-                    target_O = target_row[COL_STRORIGIN]
-                    target_C = target_row[COL_CASTINGKEY]
-
-                    # Verify all 4 keys match
-                    if S == target_S and E == target_E and O == target_O and C == target_C:
-                        marked_target_indices.add(target_idx)
-                        change_type = safe_str(source_row.get("CHANGES", "No Change"))
-                        pass1_results[src_idx] = (change_type, target_idx)
-                        counter[change_type] = counter.get(change_type, 0) + 1
-                        continue
-
-            # Check if NEW row (all 10 keys missing)
-            if (key_se not in t_lookup_se) and \
-               (key_so not in t_lookup_so) and \
-               (key_sc not in t_lookup_sc) and \
-               (key_eo not in t_lookup_eo) and \
-               (key_ec not in t_lookup_ec) and \
-               (key_oc not in t_lookup_oc) and \
-               (key_seo not in t_lookup_seo) and \
-               (key_sec not in t_lookup_sec) and \
-               (key_soc not in t_lookup_soc) and \
-               (key_eoc not in t_lookup_eoc):
+        # PASS 1: Detect No Change (perfect 4-key match) and New rows, vectorized
+        source_labels = df_low.index.tolist()
+        for src_pos, target_pos in target_index.match_certainties(source_keys, combo="SEC"):
+            src_idx = source_labels[src_pos]
+            if target_pos is None:
                 pass1_results[src_idx] = ("New Row", None)
                 counter["New Row"] = counter.get("New Row", 0) + 1
+                continue
+
+            target_idx = target_index.labels[target_pos]
+            marked_target_indices.add(target_idx)
+            change_type = safe_str(df_low.iloc[src_pos].get("CHANGES", "No Change"))
+            pass1_results[src_idx] = (change_type, target_idx)
+            counter[change_type] = counter.get(change_type, 0) + 1
 
         # PASS 2: Pattern matching using UNMARKED TARGET rows
-        for src_idx, source_row in df_low.iterrows():
+        for src_pos, (src_idx, source_row) in enumerate(df_low.iterrows()):
             if src_idx in pass1_results:
                 continue  # Already processed in PASS 1
 
@@ -503,34 +419,22 @@ class MasterProcessor(BaseProcessor):
             O = source_row[COL_STRORIGIN]
             C = source_row[COL_CASTINGKEY]
 
-            # Generate all 10 keys
-            key_se = (S, E)
-            key_so = (S, O)
-            key_sc = (S, C)
-            key_eo = (E, O)
-            key_ec = (E, C)
-            key_oc = (O, C)
-            key_seo = (S, E, O)
-            key_sec = (S, E, C)
-            key_soc = (S, O, C)
-            key_eoc = (E, O, C)
-
             change_type = None
             target_idx = None
             matched = False
 
             # LEVEL 1: 3-Key Matches (check if unmarked)
-            if not matched and key_seo in t_lookup_seo:
-                candidate_idx = t_lookup_seo[key_seo]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("SEO", source_keys["SEO"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     change_type = "CastingKey Change"
                     target_idx = candidate_idx
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_sec in t_lookup_sec:
-                candidate_idx = t_lookup_sec[key_sec]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("SEC", source_keys["SEC"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     target_row = self.df_target.loc[candidate_idx]
                     if O != target_row[COL_STRORIGIN]:
                         change_type = "StrOrigin Change"
@@ -540,26 +444,26 @@ class MasterProcessor(BaseProcessor):
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_soc in t_lookup_soc:
-                candidate_idx = t_lookup_soc[key_soc]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("SOC", source_keys["SOC"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     change_type = "EventName Change"
                     target_idx = candidate_idx
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_eoc in t_lookup_eoc:
-                candidate_idx = t_lookup_eoc[key_eoc]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("EOC", source_keys["EOC"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     change_type = "SequenceName Change"
                     target_idx = candidate_idx
                     marked_target_indices.add(target_idx)
                     matched = True
 
             # LEVEL 2: 2-Key Matches (check if unmarked)
-            if not matched and key_se in t_lookup_se:
-                candidate_idx = t_lookup_se[key_se]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("SE", source_keys["SE"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     target_row = self.df_target.loc[candidate_idx]
                     changes = []
                     if O != target_row[COL_STRORIGIN]:
@@ -575,9 +479,9 @@ class MasterProcessor(BaseProcessor):
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_oc in t_lookup_oc:
-                candidate_idx = t_lookup_oc[key_oc]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("OC", source_keys["OC"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     target_row = self.df_target.loc[candidate_idx]
                     changes = []
                     if S != target_row[COL_SEQUENCE]:
@@ -589,9 +493,9 @@ class MasterProcessor(BaseProcessor):
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_ec in t_lookup_ec:
-                candidate_idx = t_lookup_ec[key_ec]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("EC", source_keys["EC"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     target_row = self.df_target.loc[candidate_idx]
                     changes = []
                     if S != target_row[COL_SEQUENCE]:
@@ -603,23 +507,23 @@ class MasterProcessor(BaseProcessor):
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_sc in t_lookup_sc:
-                candidate_idx = t_lookup_sc[key_sc]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("SC", source_keys["SC"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     change_type = "EventName+StrOrigin Change"
                     target_idx = candidate_idx
                     marked_target_indices.add(target_idx)
                     matched = True
 
-            if not matched and key_so in t_lookup_so:
-                candidate_idx = t_lookup_so[key_so]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("SO", source_keys["SO"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     target_row = self.df_target.loc[candidate_idx]
                     old_eventname = target_row[COL_EVENTNAME]
 
                     # Check if (S, old_eventname) exists
-                    if (S, old_eventname) in t_lookup_se:
-                        se_idx = t_lookup_se[(S, old_eventname)]
+                    se_idx = target_index.first("SE", target_index.encode_values("SE", (S, old_eventname)))
+                    if se_idx is not None:
                         if se_idx not in marked_target_indices:
                             target_row = self.df_target.loc[se_idx]
                             changes = []
@@ -637,9 +541,9 @@ class MasterProcessor(BaseProcessor):
                         marked_target_indices.add(target_idx)
                         matched = True
 
-            if not matched and key_eo in t_lookup_eo:
-                candidate_idx = t_lookup_eo[key_eo]
-                if candidate_idx not in marked_target_indices:
+            if not matched:
+                candidate_idx = target_index.first_unmarked("EO", source_keys["EO"][src_pos], marked_target_indices)
+                if candidate_idx is not None:
                     change_type = "SequenceName Change"
                     target_idx = candidate_idx
                     marked_target_indices.add(target_idx)
@@ -6,27 +6,21 @@ identifying changes and generating a comparison report.
 """
 
 import os
-import pandas as pd
-
-# Conditional tkinter import for headless testing
-if os.environ.get('HEADLESS', '').lower() not in ('1', 'true', 'yes'):
-    from tkinter import messagebox
-else:
-    messagebox = None
 
 from src.processors.base_processor import BaseProcessor
-from src.io.excel_reader import safe_read_excel
-from src.io.formatters import apply_direct_coloring, widen_summary_columns
-from src.io.excel_writer import write_super_group_word_analysis
-from src.utils.data_processing import normalize_dataframe_status, filter_output_columns, remove_full_duplicates
-from src.utils.helpers import log, get_script_dir, safe_str
+from src.io.frame_cache import load_vrs_frame
+from src.io.formatters import widen_summary_columns, STRORIGIN_ANALYSIS_COLUMN_WIDTHS
+from src.io.streaming_writer import StreamingExcelWriter
+from src.io.excel_writer import write_super_group_word_analysis, build_super_group_analysis_frame
+from src.utils.data_processing import filter_output_columns
+from src.utils.helpers import log, safe_str
 from src.utils.super_groups import aggregate_to_super_groups
 from src.core.lookups import build_lookups
 from src.core.comparison import compare_rows, find_deleted_rows
-from src.core.casting import generate_casting_key, validate_castingkey_columns
+from src.core.casting import build_speaker_group_lookup, generate_casting_keys, validate_castingkey_columns
 from src.config import (
     OUTPUT_COLUMNS_RAW,
-    COL_CASTINGKEY, COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY,
+    COL_CASTINGKEY,
     COL_STRORIGIN, COL_PREVIOUS_STRORIGIN, COL_EVENTNAME, COL_TEXT,
     COL_CHANGES, COL_DETAILED_CHANGES, COL_PREVIOUS_EVENTNAME, COL_PREVIOUS_TEXT,
     COL_PREVIOUSDATA
@@ -34,7 +28,8 @@ from src.config import (
 from src.core.change_detection import get_priority_change
 from src.settings import get_use_priority_change
 from src.io.summary import create_raw_summary
-from src.utils.strorigin_analysis import StrOriginAnalyzer
+from src.utils.profiling import profile_stage
+from src.utils.strorigin_analysis import get_strorigin_analyzer, warm_up_strorigin_analyzer
 
 
 class RawProcessor(BaseProcessor):
@@ -54,6 +49,7 @@ class RawProcessor(BaseProcessor):
         self.prev_lookup_cg = None
         self.prev_lookup_es = None
         self.prev_lookup_cs = None
+        self.prev_index = None
         self.changed_columns_map = None
         self.castingkey_valid_prev = True
         self.castingkey_valid_curr = True
@@ -64,6 +60,9 @@ class RawProcessor(BaseProcessor):
 
     def select_files(self):
         """Prompt user to select previous and current files."""
+        if self.headless:
+            return self._require_inputs(previous=self.prev_file, current=self.curr_file)
+
         self.prev_file = self._select_single_file("RAW CHECK: Select PREVIOUS Excel file")
         if not self.prev_file:
             return False
@@ -77,22 +76,17 @@ class RawProcessor(BaseProcessor):
     def read_files(self):
         """Read and normalize the selected files."""
         try:
+            # Load the BERT model in the background while files are read and compared
+            warm_up_strorigin_analyzer()
+
             log(f"Reading PREVIOUS: {os.path.basename(self.prev_file)}")
-            self.df_prev = safe_read_excel(self.prev_file, header=0, dtype=str)
+            self.df_prev = load_vrs_frame(self.prev_file, "PREVIOUS")
             log(f"  → {len(self.df_prev):,} rows, {self.df_prev.shape[1]} columns")
 
             log(f"Reading CURRENT: {os.path.basename(self.curr_file)}")
-            self.df_curr = safe_read_excel(self.curr_file, header=0, dtype=str)
+            self.df_curr = load_vrs_frame(self.curr_file, "CURRENT", with_casting_key=True)
             log(f"  → {len(self.df_curr):,} rows, {self.df_curr.shape[1]} columns")
 
-            log("Normalizing STATUS columns...")
-            self.df_prev = normalize_dataframe_status(self.df_prev)
-            self.df_curr = normalize_dataframe_status(self.df_curr)
-
-            log("Removing full duplicate rows...")
-            self.df_prev = remove_full_duplicates(self.df_prev, "PREVIOUS")
-            self.df_curr = remove_full_duplicates(self.df_curr, "CURRENT")
-
             # Validate CastingKey source columns
             # Note: Speaker|CharacterGroupKey only needed in CURRENT (used for BOTH)
             log("Validating CastingKey source columns...")
@@ -108,41 +102,12 @@ class RawProcessor(BaseProcessor):
             # Build Speaker|CharacterGroupKey lookup from CURRENT
             # (Speaker|CharacterGroupKey from CURRENT is used for BOTH files)
             log("Building Speaker|CharacterGroupKey lookup from CURRENT...")
-            from src.config import COL_SEQUENCE, COL_EVENTNAME
-            speaker_gk_lookup = {}
-            for idx, row in self.df_curr.iterrows():
-                key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                speaker_gk_lookup[key] = safe_str(row.get(COL_SPEAKER_GROUPKEY, ""))
+            speaker_gk_lookup = build_speaker_group_lookup(self.df_curr)
             log(f"  → Indexed {len(speaker_gk_lookup):,} Speaker|CharacterGroupKey values from CURRENT")
 
             log("Generating CastingKey column for PREVIOUS (using CURRENT's Speaker|CharacterGroupKey)...")
-            casting_keys_prev = []
-            for idx, row in self.df_prev.iterrows():
-                # Look up Speaker|CharacterGroupKey from CURRENT by (Sequence, EventName)
-                key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                speaker_gk_from_curr = speaker_gk_lookup.get(key, "")
-                casting_key = generate_casting_key(
-                    row.get(COL_CHARACTERKEY, ""),
-                    row.get(COL_DIALOGVOICE, ""),
-                    speaker_gk_from_curr,  # From CURRENT, not PREVIOUS
-                    row.get("DialogType", "")
-                )
-                casting_keys_prev.append(casting_key)
-            self.df_prev[COL_CASTINGKEY] = casting_keys_prev
-            log(f"  → Generated CastingKey for {len(casting_keys_prev):,} previous rows")
-
-            log("Generating CastingKey column for CURRENT...")
-            casting_keys_curr = []
-            for idx, row in self.df_curr.iterrows():
-                casting_key = generate_casting_key(
-                    row.get(COL_CHARACTERKEY, ""),
-                    row.get(COL_DIALOGVOICE, ""),
-                    row.get(COL_SPEAKER_GROUPKEY, ""),
-                    row.get("DialogType", "")
-                )
-                casting_keys_curr.append(casting_key)
-            self.df_curr[COL_CASTINGKEY] = casting_keys_curr
-            log(f"  → Generated CastingKey for {len(casting_keys_curr):,} current rows")
+            self.df_prev[COL_CASTINGKEY] = generate_casting_keys(self.df_prev, speaker_gk_lookup)
+            log(f"  → Generated CastingKey for {len(self.df_prev):,} previous rows")
 
             return True
 
@@ -154,22 +119,20 @@ class RawProcessor(BaseProcessor):
         """Process the data using 10-key matching system."""
         try:
             log("Building lookup dictionaries with 10-key system...")
-            (self.prev_lookup_se, self.prev_lookup_so, self.prev_lookup_sc, self.prev_lookup_eo,
-             self.prev_lookup_ec, self.prev_lookup_oc, self.prev_lookup_seo, self.prev_lookup_sec,
-             self.prev_lookup_soc, self.prev_lookup_eoc) = build_lookups(self.df_prev)
-            log(f"  → Indexed {len(self.prev_lookup_se):,} unique previous rows")
+            with profile_stage("lookup build"):
+                self.prev_index = build_lookups(self.df_prev)
+            log(f"  → Indexed {self.prev_index.unique_count('SE'):,} unique previous rows")
 
             log("Comparing rows (TWO-PASS algorithm)...")
             changes, previous_strorigins, self.changed_columns_map, self.counter, marked_prev_indices, group_analysis, pass1_results = compare_rows(
-                self.df_curr, self.df_prev, self.prev_lookup_se, self.prev_lookup_so, self.prev_lookup_sc,
-                self.prev_lookup_eo, self.prev_lookup_ec, self.prev_lookup_oc,
-                self.prev_lookup_seo, self.prev_lookup_sec, self.prev_lookup_soc, self.prev_lookup_eoc
+                self.df_curr, self.df_prev, self.prev_index
             )
             self.group_analysis = group_analysis  # Store for later use
             self.pass1_results = pass1_results  # Store for super group aggregation
 
             log("Finding deleted rows (TWO-PASS algorithm)...")
-            self.df_deleted = find_deleted_rows(self.df_prev, self.df_curr, marked_prev_indices)
+            with profile_stage("deleted-row scan"):
+                self.df_deleted = find_deleted_rows(self.df_prev, self.df_curr, marked_prev_indices)
             self.counter["Deleted Rows"] = len(self.df_deleted)
             log(f"  → Found {len(self.df_deleted):,} deleted rows")
 
@@ -188,6 +151,7 @@ class RawProcessor(BaseProcessor):
 
             # Check if CastingKey validation failed
             castingkey_invalid = not self.castingkey_valid_prev or not self.castingkey_valid_curr
+            use_priority_change = get_use_priority_change(self.settings)
 
             for curr_idx in self.df_result.index:
                 if curr_idx in pass1_results:
@@ -212,7 +176,7 @@ class RawProcessor(BaseProcessor):
                     detailed_changes.append(change_label)
 
                     # Priority label (extract highest priority from composite) - respects setting
-                    if get_use_priority_change():
+                    if use_priority_change:
                         priority_changes.append(get_priority_change(change_label))
                     else:
                         priority_changes.append(change_label)  # Legacy mode: show full composite
@@ -257,7 +221,7 @@ class RawProcessor(BaseProcessor):
             self.df_result[COL_PREVIOUS_STRORIGIN] = previous_strorigins
 
             log("Filtering output columns...")
-            self.df_result = filter_output_columns(self.df_result, OUTPUT_COLUMNS_RAW)
+            self.df_result = filter_output_columns(self.df_result, OUTPUT_COLUMNS_RAW, settings=self.settings)
 
             # Create summary
             self.df_summary = create_raw_summary(
@@ -296,8 +260,8 @@ class RawProcessor(BaseProcessor):
 
             log(f"  → Found {len(df_strorigin_changes)} rows with StrOrigin changes")
 
-            # Initialize analyzer (checks if BERT is available)
-            analyzer = StrOriginAnalyzer()
+            # Shared analyzer (checks if BERT is available, keeps the model loaded)
+            analyzer = get_strorigin_analyzer()
 
             # Log which version is being used
             if analyzer.bert_available:
@@ -306,43 +270,23 @@ class RawProcessor(BaseProcessor):
                 log("  → Running LIGHT analysis (Punctuation/Space + Content Change marker)...")
                 log("  ℹ️  BERT not available - similarity percentages will show 'Content Change'")
 
-            # Prepare data lists
-            prev_strorigins = []
-            curr_strorigins = []
-            analysis_results = []
-            diff_details = []
-
-            # Import progress tracking
-            from src.utils.progress import print_progress, finalize_progress
-            from src.utils.helpers import safe_str
-
             total_rows = len(df_strorigin_changes)
             log(f"  → Analyzing {total_rows} rows...")
 
-            # Analyze each row with progress tracking
-            for row_num, (idx, row) in enumerate(df_strorigin_changes.iterrows(), start=1):
-                curr_strorigin = safe_str(row.get(COL_STRORIGIN, ""))
-                prev_strorigin = safe_str(row.get(COL_PREVIOUS_STRORIGIN, ""))
-
-                # Store for columns
-                prev_strorigins.append(prev_strorigin)
-                curr_strorigins.append(curr_strorigin)
-
-                # If no previous data, can't analyze
-                if not prev_strorigin:
-                    analysis_results.append("N/A - No previous data")
-                    diff_details.append("")
-                else:
-                    # Analyze - returns tuple (analysis, diff_detail)
-                    analysis, diff = analyzer.analyze(prev_strorigin, curr_strorigin)
-                    analysis_results.append(analysis)
-                    diff_details.append(diff)
-
-                # Progress tracking (update every 5 rows or at end)
-                if row_num % 5 == 0 or row_num == total_rows:
-                    print_progress(row_num, total_rows, label="Analyzing")
+            prev_strorigins = [safe_str(value) for value in df_strorigin_changes.get(COL_PREVIOUS_STRORIGIN, [""] * total_rows)]
+            curr_strorigins = [safe_str(value) for value in df_strorigin_changes.get(COL_STRORIGIN, [""] * total_rows)]
 
-            finalize_progress()
+            # Rows without previous data can't be analyzed; all others go
+            # through one batch (shared BERT encoding of every distinct text)
+            analysis_results = ["N/A - No previous data"] * total_rows
+            diff_details = [""] * total_rows
+            analyzed_rows = [row_num for row_num, prev_strorigin in enumerate(prev_strorigins) if prev_strorigin]
+            batch_results = analyzer.analyze_batch(
+                [(prev_strorigins[row_num], curr_strorigins[row_num]) for row_num in analyzed_rows]
+            )
+            for row_num, (analysis, diff) in zip(analyzed_rows, batch_results):
+                analysis_results[row_num] = analysis
+                diff_details[row_num] = diff
 
             # Drop existing columns if they already exist (to avoid insert errors)
             cols_to_drop = ["Previous StrOrigin", "Current StrOrigin", "StrOrigin Analysis", "Diff Detail"]
@@ -369,69 +313,64 @@ class RawProcessor(BaseProcessor):
             return None
 
     def write_output(self):
-        """Write results to Excel file with formatting."""
+        """Write results to Excel file with formatting, and/or as data files."""
         try:
-            script_dir = get_script_dir()
-            out_filename = os.path.splitext(os.path.basename(self.curr_file))[0] + "_diff.xlsx"
-            self.output_path = os.path.join(script_dir, out_filename)
-            log(f"Writing results to: {os.path.basename(self.output_path)}")
-
-            with pd.ExcelWriter(self.output_path, engine="openpyxl") as writer:
-                self.df_result.to_excel(writer, sheet_name="Comparison", index=False)
-
-                if not self.df_deleted.empty:
-                    df_deleted_filtered = filter_output_columns(self.df_deleted, OUTPUT_COLUMNS_RAW)
-                    df_deleted_filtered.to_excel(writer, sheet_name="Deleted Rows", index=False)
-
-                self.df_summary.to_excel(writer, sheet_name="Summary Report", index=False, header=True)
-
-                # Write Super Group Word Analysis sheet
-                if hasattr(self, 'pass1_results'):
-                    log("Generating Super Group Word Analysis...")
-                    super_group_analysis, migration_details = aggregate_to_super_groups(
-                        self.df_curr,
-                        self.df_prev,
-                        self.pass1_results
-                    )
-                    write_super_group_word_analysis(writer, super_group_analysis, migration_details)
-                    log(f"  → {len(super_group_analysis)} super groups analyzed")
-                    if migration_details:
-                        log(f"  → {len(migration_details)} migrations detected")
+            script_dir = self._get_output_dir()
+            base_name = os.path.splitext(os.path.basename(self.curr_file))[0] + "_diff"
+            self.output_paths = []
+
+            df_deleted_filtered = None
+            if not self.df_deleted.empty:
+                df_deleted_filtered = filter_output_columns(self.df_deleted, OUTPUT_COLUMNS_RAW, settings=self.settings)
+
+            super_group_analysis, migration_details = {}, None
+            if hasattr(self, 'pass1_results'):
+                log("Generating Super Group Word Analysis...")
+                super_group_analysis, migration_details = aggregate_to_super_groups(
+                    self.df_curr,
+                    self.df_prev,
+                    self.pass1_results
+                )
+                log(f"  → {len(super_group_analysis)} super groups analyzed")
+                if migration_details:
+                    log(f"  → {len(migration_details)} migrations detected")
 
+            if self._writes_xlsx():
                 # Create StrOrigin Change Analysis sheet
                 log("Creating StrOrigin Change Analysis sheet...")
-                df_strorigin_analysis = self.create_strorigin_analysis_sheet()
-                if df_strorigin_analysis is not None:
-                    df_strorigin_analysis.to_excel(writer, sheet_name="StrOrigin Change Analysis", index=False)
-                    log(f"  → Created 'StrOrigin Change Analysis' sheet with {len(df_strorigin_analysis)} rows")
-
-                wb = writer.book
-                apply_direct_coloring(wb["Comparison"], is_master=False, changed_columns_map=self.changed_columns_map)
-                widen_summary_columns(wb["Summary Report"])
-
-                # Apply coloring and formatting to StrOrigin analysis sheet if it exists
-                if "StrOrigin Change Analysis" in wb.sheetnames:
-                    apply_direct_coloring(wb["StrOrigin Change Analysis"], is_master=False)
-
-                    # Set column widths for better readability
-                    ws_strorigin = wb["StrOrigin Change Analysis"]
-                    for column_cells in ws_strorigin.columns:
-                        col_letter = column_cells[0].column_letter
-                        col_name = column_cells[0].value
-
-                        # Set specific widths based on column name
-                        if col_name == "Previous StrOrigin":
-                            ws_strorigin.column_dimensions[col_letter].width = 25
-                        elif col_name == "Current StrOrigin":
-                            ws_strorigin.column_dimensions[col_letter].width = 25
-                        elif col_name == "StrOrigin Analysis":
-                            ws_strorigin.column_dimensions[col_letter].width = 20
-                        elif col_name == "Diff Detail":
-                            ws_strorigin.column_dimensions[col_letter].width = 35  # Wider for [old→new] display
-                        elif col_name == "CHANGES":
-                            ws_strorigin.column_dimensions[col_letter].width = 25
-
-            log(f"✓ File saved: {self.output_path}")
+                with profile_stage("StrOrigin analysis"):
+                    df_strorigin_analysis = self.create_strorigin_analysis_sheet()
+
+                self.output_path = os.path.join(script_dir, base_name + ".xlsx")
+                log(f"Writing results to: {os.path.basename(self.output_path)}")
+
+                with profile_stage("formatting"), StreamingExcelWriter(self.output_path) as writer:
+                    writer.write_dataframe(self.df_result, "Comparison", colored=True,
+                                           changed_columns_map=self.changed_columns_map)
+
+                    if df_deleted_filtered is not None:
+                        writer.write_dataframe(df_deleted_filtered, "Deleted Rows")
+
+                    writer.write_formatted(self.df_summary, "Summary Report", formatter=widen_summary_columns)
+
+                    # Write Super Group Word Analysis sheet
+                    write_super_group_word_analysis(writer.staging, super_group_analysis, migration_details)
+
+                    if df_strorigin_analysis is not None:
+                        writer.write_dataframe(df_strorigin_analysis, "StrOrigin Change Analysis", colored=True,
+                                               column_widths=STRORIGIN_ANALYSIS_COLUMN_WIDTHS)
+                        log(f"  → Created 'StrOrigin Change Analysis' sheet with {len(df_strorigin_analysis)} rows")
+
+                self.output_paths.append(self.output_path)
+                log(f"✓ File saved: {self.output_path}")
+
+            self._write_data_outputs(base_name, {
+                "Comparison": self.df_result,
+                "Deleted Rows": df_deleted_filtered,
+                "Summary Report": self.df_summary,
+                "Super Group Word Analysis": build_super_group_analysis_frame(super_group_analysis),
+            })
+            self.output_path = self.output_paths[0]
             return True
 
         except Exception as e:
@@ -442,7 +381,7 @@ class RawProcessor(BaseProcessor):
 
     def show_summary(self):
         """Display completion message with file path."""
-        messagebox.showinfo(
+        self._show_info(
             "RAW VRS CHECK Complete",
-            f"Process completed successfully!\n\nOutput file:\n{self.output_path}"
+            f"Process completed successfully!\n\nOutput file:\n{self._output_files_text()}"
         )
@@ -6,30 +6,25 @@ to current files using intelligent import logic and the 4-tier key matching syst
 """
 
 import os
-import pandas as pd
-
-# Conditional tkinter import for headless testing
-if os.environ.get('HEADLESS', '').lower() not in ('1', 'true', 'yes'):
-    from tkinter import messagebox
-else:
-    messagebox = None
 
 from src.processors.base_processor import BaseProcessor
-from src.io.excel_reader import safe_read_excel
-from src.io.formatters import apply_direct_coloring, widen_summary_columns, format_update_history_sheet
-from src.utils.data_processing import normalize_dataframe_status, filter_output_columns, remove_full_duplicates
-from src.utils.helpers import log, get_script_dir, safe_str
+from src.io.frame_cache import load_vrs_frame
+from src.io.formatters import widen_summary_columns, format_update_history_sheet, STRORIGIN_ANALYSIS_COLUMN_WIDTHS
+from src.io.streaming_writer import StreamingExcelWriter
+from src.utils.data_processing import filter_output_columns
+from src.utils.helpers import log, safe_str
 from src.core.working_helpers import build_working_lookups, find_working_deleted_rows
 from src.core.working_comparison import process_working_comparison
-from src.core.casting import generate_casting_key, validate_castingkey_columns
+from src.core.casting import build_speaker_group_lookup, generate_casting_keys, validate_castingkey_columns
 from src.io.summary import create_working_summary, create_working_update_history_sheet
 from src.history.history_manager import add_working_update_record
 from src.config import (
-    COL_CASTINGKEY, COL_CHARACTERKEY, COL_DIALOGVOICE, COL_SPEAKER_GROUPKEY,
+    COL_CASTINGKEY,
     COL_STRORIGIN, COL_PREVIOUSDATA, COL_PREVIOUS_STRORIGIN
 )
-from src.utils.strorigin_analysis import StrOriginAnalyzer
-from src.io.excel_writer import write_super_group_word_analysis
+from src.utils.profiling import profile_stage
+from src.utils.strorigin_analysis import get_strorigin_analyzer, warm_up_strorigin_analyzer
+from src.io.excel_writer import write_super_group_word_analysis, build_super_group_analysis_frame
 from src.utils.super_groups import aggregate_to_super_groups
 
 
@@ -43,12 +38,14 @@ class WorkingProcessor(BaseProcessor):
     def __init__(self):
         """Initialize the working processor."""
         super().__init__()
+        self.history_type = "working"
         self.df_prev = None
         self.df_curr = None
         self.prev_lookup_cw = None
         self.prev_lookup_cg = None
         self.prev_lookup_es = None
         self.prev_lookup_cs = None
+        self.prev_index = None
         self.castingkey_valid_prev = True
         self.castingkey_valid_curr = True
 
@@ -58,6 +55,9 @@ class WorkingProcessor(BaseProcessor):
 
     def select_files(self):
         """Prompt user to select previous and current files."""
+        if self.headless:
+            return self._require_inputs(previous=self.prev_file, current=self.curr_file)
+
         self.prev_file = self._select_single_file("WORKING CHECK: Select PREVIOUS Excel file")
         if not self.prev_file:
             return False
@@ -71,23 +71,17 @@ class WorkingProcessor(BaseProcessor):
     def read_files(self):
         """Read and normalize the selected files."""
         try:
+            # Load the BERT model in the background while files are read and compared
+            warm_up_strorigin_analyzer()
+
             log(f"Reading PREVIOUS: {os.path.basename(self.prev_file)}")
-            self.df_prev = safe_read_excel(self.prev_file, header=0, dtype=str)
+            self.df_prev = load_vrs_frame(self.prev_file, "PREVIOUS")
             log(f"  → {len(self.df_prev):,} rows, {self.df_prev.shape[1]} columns")
 
             log(f"Reading CURRENT: {os.path.basename(self.curr_file)}")
-            self.df_curr = safe_read_excel(self.curr_file, header=0, dtype=str)
+            self.df_curr = load_vrs_frame(self.curr_file, "CURRENT", with_casting_key=True)
             log(f"  → {len(self.df_curr):,} rows, {self.df_curr.shape[1]} columns")
 
-            log("Normalizing STATUS columns...")
-            self.df_prev = normalize_dataframe_status(self.df_prev)
-            self.df_curr = normalize_dataframe_status(self.df_curr)
-            log("  → STATUS columns normalized")
-
-            log("Removing full duplicate rows...")
-            self.df_prev = remove_full_duplicates(self.df_prev, "PREVIOUS")
-            self.df_curr = remove_full_duplicates(self.df_curr, "CURRENT")
-
             # Validate CastingKey source columns
             # Note: Speaker|CharacterGroupKey only needed in CURRENT (used for BOTH)
             log("Validating CastingKey source columns...")
@@ -103,41 +97,12 @@ class WorkingProcessor(BaseProcessor):
             # Build Speaker|CharacterGroupKey lookup from CURRENT
             # (Speaker|CharacterGroupKey from CURRENT is used for BOTH files)
             log("Building Speaker|CharacterGroupKey lookup from CURRENT...")
-            from src.config import COL_SEQUENCE, COL_EVENTNAME
-            speaker_gk_lookup = {}
-            for idx, row in self.df_curr.iterrows():
-                key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                speaker_gk_lookup[key] = safe_str(row.get(COL_SPEAKER_GROUPKEY, ""))
+            speaker_gk_lookup = build_speaker_group_lookup(self.df_curr)
             log(f"  → Indexed {len(speaker_gk_lookup):,} Speaker|CharacterGroupKey values from CURRENT")
 
             log("Generating CastingKey column for PREVIOUS (using CURRENT's Speaker|CharacterGroupKey)...")
-            casting_keys_prev = []
-            for idx, row in self.df_prev.iterrows():
-                # Look up Speaker|CharacterGroupKey from CURRENT by (Sequence, EventName)
-                key = (safe_str(row.get(COL_SEQUENCE, "")), safe_str(row.get(COL_EVENTNAME, "")))
-                speaker_gk_from_curr = speaker_gk_lookup.get(key, "")
-                casting_key = generate_casting_key(
-                    row.get(COL_CHARACTERKEY, ""),
-                    row.get(COL_DIALOGVOICE, ""),
-                    speaker_gk_from_curr,  # From CURRENT, not PREVIOUS
-                    row.get("DialogType", "")
-                )
-                casting_keys_prev.append(casting_key)
-            self.df_prev[COL_CASTINGKEY] = casting_keys_prev
-            log(f"  → Generated CastingKey for {len(casting_keys_prev):,} previous rows")
-
-            log("Generating CastingKey column for CURRENT...")
-            casting_keys_curr = []
-            for idx, row in self.df_curr.iterrows():
-                casting_key = generate_casting_key(
-                    row.get(COL_CHARACTERKEY, ""),
-                    row.get(COL_DIALOGVOICE, ""),
-                    row.get(COL_SPEAKER_GROUPKEY, ""),
-                    row.get("DialogType", "")
-                )
-                casting_keys_curr.append(casting_key)
-            self.df_curr[COL_CASTINGKEY] = casting_keys_curr
-            log(f"  → Generated CastingKey for {len(casting_keys_curr):,} current rows")
+            self.df_prev[COL_CASTINGKEY] = generate_casting_keys(self.df_prev, speaker_gk_lookup)
+            log(f"  → Generated CastingKey for {len(self.df_prev):,} previous rows")
 
             return True
 
@@ -151,16 +116,12 @@ class WorkingProcessor(BaseProcessor):
         """Process the data using 4-key matching system with import logic."""
         try:
             # Build lookups (10-key system)
-            (self.prev_lookup_se, self.prev_lookup_so, self.prev_lookup_sc, self.prev_lookup_eo,
-             self.prev_lookup_ec, self.prev_lookup_oc, self.prev_lookup_seo, self.prev_lookup_sec,
-             self.prev_lookup_soc, self.prev_lookup_eoc) = build_working_lookups(self.df_prev, "PREVIOUS")
+            with profile_stage("lookup build"):
+                self.prev_index = build_working_lookups(self.df_prev, "PREVIOUS")
 
             # Process comparison and import (TWO-PASS algorithm)
             self.df_result, self.counter, marked_prev_indices, self.pass1_results, previous_strorigins = process_working_comparison(
-                self.df_curr, self.df_prev,
-                self.prev_lookup_se, self.prev_lookup_so, self.prev_lookup_sc,
-                self.prev_lookup_eo, self.prev_lookup_ec, self.prev_lookup_oc,
-                self.prev_lookup_seo, self.prev_lookup_sec, self.prev_lookup_soc, self.prev_lookup_eoc
+                self.df_curr, self.df_prev, self.prev_index, settings=self.settings
             )
 
             # Add Previous StrOrigin column (like RAW processor)
@@ -187,20 +148,21 @@ class WorkingProcessor(BaseProcessor):
                     return "CastingKey Error"
 
                 self.df_result[COL_DETAILED_CHANGES] = self.df_result[COL_DETAILED_CHANGES].apply(fix_castingkey_label)
-                if get_use_priority_change():
+                if get_use_priority_change(self.settings):
                     self.df_result[COL_CHANGES] = self.df_result[COL_DETAILED_CHANGES].apply(get_priority_change)
                 else:
                     self.df_result[COL_CHANGES] = self.df_result[COL_DETAILED_CHANGES]  # Legacy mode
                 log("  → CastingKey labels converted to errors")
 
             # Find deleted rows (TWO-PASS algorithm)
-            self.df_deleted = find_working_deleted_rows(self.df_prev, self.df_curr, marked_prev_indices)
+            with profile_stage("deleted-row scan"):
+                self.df_deleted = find_working_deleted_rows(self.df_prev, self.df_curr, marked_prev_indices)
             if not self.df_deleted.empty:
                 self.counter["Deleted Rows"] = len(self.df_deleted)
 
             # Filter output columns
             log("Filtering output columns...")
-            self.df_result = filter_output_columns(self.df_result)
+            self.df_result = filter_output_columns(self.df_result, settings=self.settings)
             log(f"  → Output contains {len(self.df_result.columns)} columns")
 
             # Create summary
@@ -249,8 +211,8 @@ class WorkingProcessor(BaseProcessor):
 
             log(f"  → Found {len(df_strorigin_changes)} rows with StrOrigin changes")
 
-            # Initialize analyzer (checks if BERT is available)
-            analyzer = StrOriginAnalyzer()
+            # Shared analyzer (checks if BERT is available, keeps the model loaded)
+            analyzer = get_strorigin_analyzer()
 
             # Log which version is being used
             if analyzer.bert_available:
@@ -259,42 +221,23 @@ class WorkingProcessor(BaseProcessor):
                 log("  → Running LIGHT analysis (Punctuation/Space + Content Change marker)...")
                 log("  ℹ️  BERT not available - similarity percentages will show 'Content Change'")
 
-            # Prepare data lists
-            prev_strorigins = []
-            curr_strorigins = []
-            analysis_results = []
-            diff_details = []
-
-            # Import progress tracking
-            from src.utils.progress import print_progress, finalize_progress
-
             total_rows = len(df_strorigin_changes)
             log(f"  → Analyzing {total_rows} rows...")
 
-            # Analyze each row with progress tracking
-            for row_num, (idx, row) in enumerate(df_strorigin_changes.iterrows(), start=1):
-                curr_strorigin = safe_str(row.get(COL_STRORIGIN, ""))
-                prev_strorigin = safe_str(row.get(COL_PREVIOUS_STRORIGIN, ""))
+            prev_strorigins = [safe_str(value) for value in df_strorigin_changes.get(COL_PREVIOUS_STRORIGIN, [""] * total_rows)]
+            curr_strorigins = [safe_str(value) for value in df_strorigin_changes.get(COL_STRORIGIN, [""] * total_rows)]
 
-                # Store for columns
-                prev_strorigins.append(prev_strorigin)
-                curr_strorigins.append(curr_strorigin)
-
-                # If no previous data, can't analyze
-                if not prev_strorigin:
-                    analysis_results.append("N/A - No previous data")
-                    diff_details.append("")
-                else:
-                    # Analyze - returns tuple (analysis, diff_detail)
-                    analysis, diff = analyzer.analyze(prev_strorigin, curr_strorigin)
-                    analysis_results.append(analysis)
-                    diff_details.append(diff)
-
-                # Progress tracking (update every 5 rows or at end)
-                if row_num % 5 == 0 or row_num == total_rows:
-                    print_progress(row_num, total_rows, label="Analyzing")
-
-            finalize_progress()
+            # Rows without previous data can't be analyzed; all others go
+            # through one batch (shared BERT encoding of every distinct text)
+            analysis_results = ["N/A - No previous data"] * total_rows
+            diff_details = [""] * total_rows
+            analyzed_rows = [row_num for row_num, prev_strorigin in enumerate(prev_strorigins) if prev_strorigin]
+            batch_results = analyzer.analyze_batch(
+                [(prev_strorigins[row_num], curr_strorigins[row_num]) for row_num in analyzed_rows]
+            )
+            for row_num, (analysis, diff) in zip(analyzed_rows, batch_results):
+                analysis_results[row_num] = analysis
+                diff_details[row_num] = diff
 
             # Drop existing columns if they already exist (to avoid insert errors)
             cols_to_drop = ["Previous StrOrigin", "Current StrOrigin", "StrOrigin Analysis", "Diff Detail"]
@@ -321,78 +264,73 @@ class WorkingProcessor(BaseProcessor):
             return None
 
     def write_output(self):
-        """Write results to Excel file with formatting."""
+        """Write results to Excel file with formatting, and/or as data files."""
         try:
-            script_dir = get_script_dir()
-            out_filename = os.path.splitext(os.path.basename(self.curr_file))[0] + "_WorkTransform.xlsx"
-            self.output_path = os.path.join(script_dir, out_filename)
-            log(f"Writing results to: {out_filename}")
-
-            with pd.ExcelWriter(self.output_path, engine="openpyxl") as writer:
-                self.df_result.to_excel(writer, sheet_name="Work Transform", index=False)
-
-                self.df_history.to_excel(writer, sheet_name="📅 Update History", index=False, header=False)
-
-                if not self.df_deleted.empty:
-                    df_deleted_filtered = filter_output_columns(self.df_deleted)
-                    df_deleted_filtered.to_excel(writer, sheet_name="Deleted Rows", index=False)
-                    log(f"  → Created 'Deleted Rows' sheet with {len(self.df_deleted)} rows")
-
-                self.df_summary.to_excel(writer, sheet_name="Summary Report", index=False, header=True)
-
-                # Phase 3.1.3: Add Super Group Word Analysis (parity with RAW processor)
-                if hasattr(self, 'pass1_results'):
-                    log("Generating Super Group Word Analysis...")
-                    super_group_analysis, migration_details = aggregate_to_super_groups(
-                        self.df_curr,
-                        self.df_prev,
-                        self.pass1_results
-                    )
-                    write_super_group_word_analysis(writer, super_group_analysis, migration_details)
-                    log(f"  → {len(super_group_analysis)} super groups analyzed")
-                    if migration_details:
-                        log(f"  → {len(migration_details)} migrations detected")
+            script_dir = self._get_output_dir()
+            base_name = os.path.splitext(os.path.basename(self.curr_file))[0] + "_WorkTransform"
+            self.output_paths = []
 
+            df_deleted_filtered = None
+            if not self.df_deleted.empty:
+                df_deleted_filtered = filter_output_columns(self.df_deleted, settings=self.settings)
+
+            # Phase 3.1.3: Add Super Group Word Analysis (parity with RAW processor)
+            super_group_analysis, migration_details = {}, None
+            if hasattr(self, 'pass1_results'):
+                log("Generating Super Group Word Analysis...")
+                super_group_analysis, migration_details = aggregate_to_super_groups(
+                    self.df_curr,
+                    self.df_prev,
+                    self.pass1_results
+                )
+                log(f"  → {len(super_group_analysis)} super groups analyzed")
+                if migration_details:
+                    log(f"  → {len(migration_details)} migrations detected")
+
+            if self._writes_xlsx():
                 # Phase 2.3: Create StrOrigin Change Analysis sheet
                 log("Creating StrOrigin Change Analysis sheet...")
-                df_strorigin_analysis = self.create_strorigin_analysis_sheet()
-                if df_strorigin_analysis is not None:
-                    df_strorigin_analysis.to_excel(writer, sheet_name="StrOrigin Change Analysis", index=False)
-                    log(f"  → Created 'StrOrigin Change Analysis' sheet with {len(df_strorigin_analysis)} rows")
-
-                wb = writer.book
-                apply_direct_coloring(wb["Work Transform"], is_master=False)
-                format_update_history_sheet(wb["📅 Update History"])
-                widen_summary_columns(wb["Summary Report"])
-
-                # Apply coloring and formatting to StrOrigin analysis sheet if it exists
-                if "StrOrigin Change Analysis" in wb.sheetnames:
-                    apply_direct_coloring(wb["StrOrigin Change Analysis"], is_master=False)
-
-                    # Set column widths for better readability
-                    ws_strorigin = wb["StrOrigin Change Analysis"]
-                    for column_cells in ws_strorigin.columns:
-                        col_letter = column_cells[0].column_letter
-                        col_name = column_cells[0].value
-
-                        # Set specific widths based on column name
-                        if col_name == "Previous StrOrigin":
-                            ws_strorigin.column_dimensions[col_letter].width = 25
-                        elif col_name == "Current StrOrigin":
-                            ws_strorigin.column_dimensions[col_letter].width = 25
-                        elif col_name == "StrOrigin Analysis":
-                            ws_strorigin.column_dimensions[col_letter].width = 20
-                        elif col_name == "Diff Detail":
-                            ws_strorigin.column_dimensions[col_letter].width = 35  # Wider for [old→new] display
-                        elif col_name == "CHANGES":
-                            ws_strorigin.column_dimensions[col_letter].width = 25
+                with profile_stage("StrOrigin analysis"):
+                    df_strorigin_analysis = self.create_strorigin_analysis_sheet()
+
+                self.output_path = os.path.join(script_dir, base_name + ".xlsx")
+                log(f"Writing results to: {os.path.basename(self.output_path)}")
+
+                with profile_stage("formatting"), StreamingExcelWriter(self.output_path) as writer:
+                    writer.write_dataframe(self.df_result, "Work Transform", colored=True)
+
+                    writer.write_formatted(self.df_history, "📅 Update History", header=False,
+                                           formatter=format_update_history_sheet)
+
+                    if df_deleted_filtered is not None:
+                        writer.write_dataframe(df_deleted_filtered, "Deleted Rows")
+                        log(f"  → Created 'Deleted Rows' sheet with {len(self.df_deleted)} rows")
+
+                    writer.write_formatted(self.df_summary, "Summary Report", formatter=widen_summary_columns)
+
+                    write_super_group_word_analysis(writer.staging, super_group_analysis, migration_details)
+
+                    if df_strorigin_analysis is not None:
+                        writer.write_dataframe(df_strorigin_analysis, "StrOrigin Change Analysis", colored=True,
+                                               column_widths=STRORIGIN_ANALYSIS_COLUMN_WIDTHS)
+                        log(f"  → Created 'StrOrigin Change Analysis' sheet with {len(df_strorigin_analysis)} rows")
+
+                self.output_paths.append(self.output_path)
+                log(f"✓ File saved: {self.output_path}")
+
+            self._write_data_outputs(base_name, {
+                "Work Transform": self.df_result,
+                "Deleted Rows": df_deleted_filtered,
+                "Summary Report": self.df_summary,
+                "Super Group Word Analysis": build_super_group_analysis_frame(super_group_analysis),
+            })
+            self.output_path = self.output_paths[0]
 
             # Add to history
-            add_working_update_record(
-                out_filename, self.prev_file, self.curr_file, self.counter, len(self.df_result)
+            self.history_record = add_working_update_record(
+                os.path.basename(self.output_path), self.prev_file, self.curr_file,
+                self.counter, len(self.df_result)
             )
-
-            log(f"✓ File saved: {self.output_path}")
             return True
 
         except Exception as e:
@@ -404,9 +342,9 @@ class WorkingProcessor(BaseProcessor):
     def show_summary(self):
         """Display completion message with summary."""
         summary_msg = "Process completed successfully!\n\n"
-        summary_msg += f"Output file:\n{self.output_path}\n\n"
+        summary_msg += f"Output file:\n{self._output_files_text()}\n\n"
         summary_msg += "Change Summary:\n"
         for change_type, count in sorted(self.counter.items()):
             summary_msg += f"  {change_type}: {count:,}\n"
 
-        messagebox.showinfo("WORKING VRS CHECK Complete", summary_msg)
+        self._show_info("WORKING VRS CHECK Complete", summary_msg)
@@ -0,0 +1,354 @@
+"""
+Parallel scheduler for batches of VRS jobs.
+
+Runs independent jobs (see src/cli.py for the job format) in a process pool.
+Each job goes through the unchanged processor workflow (read_files →
+process_data → write_output) inside a worker process, with its log written
+to its own file.
+
+Memory-aware admission: every job gets a footprint estimate from the size of
+its input workbooks plus a fixed per-worker overhead and, for jobs that load
+it, the KR-SBERT model; a job is only started while the estimates of all
+running jobs fit the memory budget. Jobs are admitted in manifest order; a
+job larger than the whole budget still runs, but alone.
+
+After the batch, a consolidated JSON report is written and summarized in the
+log.
+"""
+
+import contextlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+from src.config import SCHEDULER_MEMORY_FACTOR, SCHEDULER_MEMORY_FRACTION, SCHEDULER_JOB_OVERHEAD_MB
+from src.utils.helpers import log, get_script_dir
+from src.utils.profiling import peak_rss_mb
+
+MB = 1024 * 1024
+
+# Processes whose jobs load the KR-SBERT model (StrOrigin analysis warm-up)
+BERT_PROCESSES = ("raw", "working")
+
+# ProcessPoolExecutor(max_tasks_per_child=...) is Python 3.11+; older versions
+# get their fresh worker per job from a single-worker executor per job
+POOL_RECYCLES_WORKERS = sys.version_info >= (3, 11)
+
+# Job keys naming input files (alllang input_dir is expanded separately)
+INPUT_FILE_KEYS = ("previous", "current", "source", "target",
+                   "curr_kr", "curr_en", "curr_cn", "prev_kr", "prev_en", "prev_cn")
+
+
+class OutputConflictError(ValueError):
+    """Raised when parallel jobs would write the same output file."""
+
+
+def available_memory_bytes():
+    """
+    Get the memory currently available to new processes.
+
+    Returns:
+        int: Available bytes, or None if it cannot be determined
+    """
+    try:
+        with open('/proc/meminfo', 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def job_input_files(job):
+    """
+    List the input workbooks of a job.
+
+    Args:
+        job: Job dictionary
+
+    Returns:
+        list: Paths of the job's input files
+    """
+    paths = [job[key] for key in INPUT_FILE_KEYS if job.get(key)]
+    if job["process"] == "alllang" and not job.get("curr_kr"):
+        base_dir = job.get("input_dir") or get_script_dir()
+        for folder in ("Previous", "Current"):
+            folder_path = os.path.join(base_dir, folder)
+            if os.path.isdir(folder_path):
+                paths.extend(
+                    os.path.join(folder_path, name) for name in sorted(os.listdir(folder_path))
+                    if name.endswith(('.xlsx', '.xlsm', '.xls'))
+                )
+    return paths
+
+
+@lru_cache(maxsize=None)
+def bert_model_bytes():
+    """
+    On-disk size of the KR-SBERT model a job loads.
+
+    Only checks that the packages are installed (without importing torch
+    in the scheduler process).
+
+    Returns:
+        int: Bytes of the bundled model directory, or 0 in the LIGHT build
+             (no torch / sentence-transformers) or without a bundled model
+    """
+    from src.utils.strorigin_analysis import DEFAULT_MODEL_PATH
+
+    if any(importlib.util.find_spec(name) is None for name in ("torch", "sentence_transformers")):
+        return 0
+    total = 0
+    for folder, _, names in os.walk(DEFAULT_MODEL_PATH):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(folder, name))
+            except OSError:
+                pass
+    return total
+
+
+def estimate_job_memory(job):
+    """
+    Estimate the peak memory of a job.
+
+    Input workbook sizes × SCHEDULER_MEMORY_FACTOR, plus the fixed worker
+    overhead (SCHEDULER_JOB_OVERHEAD_MB), plus the KR-SBERT model for jobs
+    that load it.
+
+    Args:
+        job: Job dictionary
+
+    Returns:
+        int: Estimated bytes (missing files count as 0)
+    """
+    total = 0
+    for path in job_input_files(job):
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    estimate = total * SCHEDULER_MEMORY_FACTOR + SCHEDULER_JOB_OVERHEAD_MB * MB
+    if job["process"] in BERT_PROCESSES:
+        estimate += bert_model_bytes()
+    return estimate
+
+
+def check_output_conflicts(jobs):
+    """
+    Reject batches where parallel jobs would overwrite each other's output.
+
+    RAW/WORKING outputs are named after the CURRENT file; ALL LANGUAGE and
+    MASTER outputs are timestamped to the second, so two of them must not
+    share an output directory.
+
+    Args:
+        jobs: List of job dictionaries
+
+    Raises:
+        OutputConflictError: If two jobs would write the same output file
+    """
+    seen = {}
+    suffixes = {"raw": "_diff.xlsx", "working": "_WorkTransform.xlsx"}
+    for number, job in enumerate(jobs, 1):
+        output_dir = os.path.abspath(job.get("output_dir") or get_script_dir())
+        if job["process"] in suffixes:
+            name = os.path.splitext(os.path.basename(job["current"]))[0] + suffixes[job["process"]]
+            key = (output_dir, name)
+        else:
+            key = (output_dir, job["process"])
+        if key in seen:
+            raise OutputConflictError(
+                f"Jobs {seen[key]} and {number} write the same output in {output_dir} "
+                f"- give them different output_dir values"
+            )
+        seen[key] = number
+
+
+def _init_worker(history_lock, use_cache):
+    """Worker process setup: headless mode, shared history lock, cache switch."""
+    os.environ['HEADLESS'] = '1'
+    from src.history.history_manager import set_history_lock
+    set_history_lock(history_lock)
+    if not use_cache:
+        from src.io.frame_cache import get_frame_cache
+        get_frame_cache().enabled = False
+
+
+def _run_job_in_worker(number, job, log_path):
+    """
+    Run one job in a worker process with its output captured in a log file.
+
+    Returns:
+        dict: success, output_path, seconds, peak_rss_mb, worker_pid, error
+    """
+    from src.cli import run_job
+
+    started = time.time()
+    result = {"success": False, "output_path": None, "error": None}
+    with open(log_path, 'w', encoding='utf-8') as log_file, \
+            contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+        try:
+            result["success"], result["output_path"] = run_job(job)
+            if not result["success"]:
+                result["error"] = "Process failed (see log)"
+        except Exception as e:
+            traceback.print_exc()
+            result["error"] = str(e)
+    result["seconds"] = round(time.time() - started, 2)
+    result["peak_rss_mb"] = peak_rss_mb()
+    result["worker_pid"] = os.getpid()
+    return result
+
+
+class JobScheduler:
+    """
+    Runs jobs in a process pool with memory-aware admission control.
+    """
+
+    def __init__(self, workers=None, memory_budget=None, use_cache=True):
+        """
+        Initialize the scheduler.
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            memory_budget: Bytes all running jobs may use together (default:
+                           SCHEDULER_MEMORY_FRACTION of available memory;
+                           unlimited if that cannot be determined)
+            use_cache: Use the frame cache in workers
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        if memory_budget is None:
+            available = available_memory_bytes()
+            memory_budget = int(available * SCHEDULER_MEMORY_FRACTION) if available else None
+        self.memory_budget = memory_budget
+        self.use_cache = use_cache
+
+    def _admits(self, estimate, reserved, running_count):
+        """Return True if a job with this estimate may start now."""
+        if running_count >= self.workers:
+            return False
+        if running_count == 0 or self.memory_budget is None:
+            return True
+        return reserved + estimate <= self.memory_budget
+
+    def run(self, jobs, report_dir=None):
+        """
+        Run all jobs and write the consolidated report.
+
+        Args:
+            jobs: List of validated job dictionaries
+            report_dir: Folder for the report and job logs (default: script directory)
+
+        Returns:
+            list: One result dictionary per job, in job order
+        """
+        check_output_conflicts(jobs)
+        report_dir = report_dir or get_script_dir()
+        os.makedirs(report_dir, exist_ok=True)
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        budget_text = f"{self.memory_budget / MB:,.0f} MB" if self.memory_budget else "unlimited"
+        log(f"Scheduling {len(jobs)} jobs on {self.workers} workers (memory budget: {budget_text})")
+
+        pending = deque()
+        results = []
+        for number, job in enumerate(jobs, 1):
+            if job.get("output_dir"):
+                os.makedirs(job["output_dir"], exist_ok=True)
+            log_path = os.path.join(report_dir, f"batch_{run_id}_job{number:03d}_{job['process']}.log")
+            results.append({
+                "job": number,
+                "process": job["process"],
+                "inputs": job_input_files(job),
+                "estimated_mb": round(estimate_job_memory(job) / MB, 1),
+                "log_file": log_path,
+            })
+            pending.append(number)
+
+        # max_tasks_per_child needs a non-fork start method
+        context = multiprocessing.get_context("spawn")
+        history_lock = context.Lock()
+        pool_options = {"mp_context": context, "initializer": _init_worker,
+                        "initargs": (history_lock, self.use_cache)}
+        started = time.time()
+        running = {}  # future → job number
+        job_pools = {}  # future → its own single-worker executor (Python < 3.11)
+        reserved = 0
+        # One fresh worker process per job: ru_maxrss (the reported peak) covers
+        # a process's whole life, and caches or models held by one job must not
+        # raise the memory of the next
+        with contextlib.ExitStack() as stack:
+            pool = None
+            if POOL_RECYCLES_WORKERS:
+                pool = stack.enter_context(ProcessPoolExecutor(
+                    max_workers=self.workers, max_tasks_per_child=1, **pool_options))
+            while pending or running:
+                # Admit jobs in order while workers and memory are free
+                while pending:
+                    result = results[pending[0] - 1]
+                    estimate = result["estimated_mb"] * MB
+                    if not self._admits(estimate, reserved, len(running)):
+                        break
+                    number = pending.popleft()
+                    args = (_run_job_in_worker, number, jobs[number - 1], result["log_file"])
+                    if pool is not None:
+                        future = pool.submit(*args)
+                    else:
+                        job_pool = stack.enter_context(ProcessPoolExecutor(max_workers=1, **pool_options))
+                        future = job_pool.submit(*args)
+                        job_pools[future] = job_pool
+                    running[future] = number
+                    reserved += estimate
+                    log(f"  → Started job {number} ({result['process']}, ~{result['estimated_mb']:,.0f} MB)")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number = running.pop(future)
+                    if future in job_pools:  # Release its worker process now
+                        job_pools.pop(future).shutdown()
+                    result = results[number - 1]
+                    reserved -= result["estimated_mb"] * MB
+                    try:
+                        result.update(future.result())
+                    except Exception as e:  # Worker crashed (e.g. killed by the OOM killer)
+                        result.update({"success": False, "output_path": None, "error": repr(e),
+                                       "seconds": None, "peak_rss_mb": None, "worker_pid": None})
+                    status = "✓" if result["success"] else "✗"
+                    log(f"  {status} Job {number} ({result['process']}) finished")
+
+        report = {
+            "run_id": run_id,
+            "workers": self.workers,
+            "memory_budget_mb": round(self.memory_budget / MB, 1) if self.memory_budget else None,
+            "total_seconds": round(time.time() - started, 2),
+            "succeeded": sum(1 for r in results if r["success"]),
+            "failed": sum(1 for r in results if not r["success"]),
+            "jobs": results,
+        }
+        report_path = os.path.join(report_dir, f"batch_report_{run_id}.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+        log("\n" + "=" * 70)
+        log("BATCH REPORT")
+        log("=" * 70)
+        for r in results:
+            status = f"✓ {r['output_path']}" if r["success"] else f"✗ {r['error']}"
+            log(f"  [{r['job']}] {r['process']}: {status} ({r['seconds']}s, peak {r['peak_rss_mb']} MB)")
+        log(f"  {report['succeeded']} succeeded, {report['failed']} failed in {report['total_seconds']}s")
+        log(f"✓ Report saved: {report_path}")
+
+        return results
@@ -5,8 +5,10 @@ This module provides functionality to save and load user preferences,
 including the Priority Change display toggle and column customization.
 """
 
+import copy
 import json
 import os
+from collections.abc import Mapping
 
 from src.config import AUTO_GENERATED_COLUMNS, OPTIONAL_COLUMNS, MANDATORY_COLUMNS, VRS_CONDITIONAL_COLUMNS
 
@@ -20,6 +22,7 @@ DEFAULT_OPTIONAL_SETTINGS = {col: {"enabled": True, "source": "CURRENT"} for col
 # Default settings
 DEFAULT_SETTINGS = {
     "use_priority_change": True,  # ON by default (new behavior)
+    "bert_backend": "torch",  # StrOrigin similarity inference: "torch", "int8" or "onnx"
     "output_columns": {
         "auto_generated": DEFAULT_AUTO_GENERATED_SETTINGS,
         "optional": DEFAULT_OPTIONAL_SETTINGS
@@ -75,6 +78,8 @@ def save_settings(settings):
     Args:
         settings: Dictionary of settings to save
     """
+    global _snapshot
+    _snapshot = None  # Next snapshot must see the new values
     try:
         with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
             json.dump(settings, f, indent=2)
@@ -82,15 +87,88 @@ def save_settings(settings):
         pass  # Silently fail if we can't save
 
 
-def get_use_priority_change():
+# ===========================================================================
+# SETTINGS SNAPSHOT (read once per run)
+# ===========================================================================
+
+class SettingsSnapshot(Mapping):
+    """
+    Read-only copy of all settings, frozen at one point in time.
+
+    A processing run takes one snapshot when it starts and passes it through
+    the pipeline, so the settings file is read once per run instead of once
+    per row. The getters below accept a snapshot through their `settings`
+    argument.
+    """
+
+    def __init__(self, settings, mtime_ns=None):
+        """
+        Freeze settings.
+
+        Args:
+            settings: Settings dictionary (deep-copied)
+            mtime_ns: Modification time of the settings file when read
+                      (None if the file did not exist)
+        """
+        self._settings = copy.deepcopy(settings)
+        self.mtime_ns = mtime_ns
+
+    def __getitem__(self, key):
+        return self._settings[key]
+
+    def __iter__(self):
+        return iter(self._settings)
+
+    def __len__(self):
+        return len(self._settings)
+
+    @property
+    def use_priority_change(self):
+        """Priority Change display setting."""
+        return get_use_priority_change(self)
+
+
+_snapshot = None
+
+
+def _settings_mtime():
+    """Modification time of the settings file, or None if it does not exist."""
+    try:
+        return os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_settings_snapshot():
+    """
+    Get a frozen snapshot of the current settings.
+
+    The snapshot is cached and only re-read when the settings file's
+    modification time changes or settings are saved.
+
+    Returns:
+        SettingsSnapshot: Read-only settings
+    """
+    global _snapshot
+    mtime_ns = _settings_mtime()
+    if _snapshot is None or _snapshot.mtime_ns != mtime_ns:
+        _snapshot = SettingsSnapshot(load_settings(), mtime_ns)
+    return _snapshot
+
+
+def get_use_priority_change(settings=None):
     """
     Get the Priority Change display setting.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         bool: True if Priority Change mode is enabled (new behavior),
               False for legacy DETAILED_CHANGES mode
     """
-    settings = load_settings()
+    if settings is None:
+        settings = load_settings()
     return settings.get("use_priority_change", True)
 
 
@@ -106,18 +184,52 @@ def set_use_priority_change(value):
     save_settings(settings)
 
 
+def get_bert_backend(settings=None):
+    """
+    Get the BERT inference backend setting.
+
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
+    Returns:
+        str: "torch" (default), "int8" or "onnx"
+    """
+    from src.utils.bert_backends import BERT_BACKENDS
+
+    if settings is None:
+        settings = load_settings()
+    backend = settings.get("bert_backend", "torch")
+    return backend if backend in BERT_BACKENDS else "torch"
+
+
+def set_bert_backend(value):
+    """
+    Set the BERT inference backend.
+
+    Args:
+        value: "torch", "int8" or "onnx"
+    """
+    settings = load_settings()
+    settings["bert_backend"] = value
+    save_settings(settings)
+
+
 # ===========================================================================
 # COLUMN SETTINGS
 # ===========================================================================
 
-def get_column_settings():
+def get_column_settings(settings=None):
     """
     Get the output column settings.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         dict: Column settings with 'auto_generated' and 'optional' keys
     """
-    settings = load_settings()
+    if settings is None:
+        settings = load_settings()
     return settings.get("output_columns", DEFAULT_SETTINGS["output_columns"])
 
 
@@ -133,16 +245,19 @@ def set_column_settings(column_settings):
     save_settings(settings)
 
 
-def get_enabled_columns():
+def get_enabled_columns(settings=None):
     """
     Get list of enabled columns based on current settings.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         tuple: (enabled_auto_generated, enabled_optional_with_source)
             - enabled_auto_generated: List of enabled auto-generated column names
             - enabled_optional_with_source: Dict of {column_name: source} for enabled optional columns
     """
-    col_settings = get_column_settings()
+    col_settings = get_column_settings(settings)
 
     # Auto-generated columns that are enabled
     enabled_auto = [
@@ -187,14 +302,18 @@ def reset_column_settings():
 # V2: ANALYZED COLUMNS (from file upload)
 # ===========================================================================
 
-def get_analyzed_columns():
+def get_analyzed_columns(settings=None):
     """
     Get the list of columns analyzed from uploaded file.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         list: List of column names from analyzed file
     """
-    settings = load_settings()
+    if settings is None:
+        settings = load_settings()
     return settings.get("analyzed_columns", [])
 
 
@@ -210,14 +329,17 @@ def set_analyzed_columns(columns):
     save_settings(settings)
 
 
-def get_selected_optional_columns():
+def get_selected_optional_columns(settings=None):
     """
     Get the list of selected optional columns.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         list: List of enabled optional column names
     """
-    col_settings = get_column_settings()
+    col_settings = get_column_settings(settings)
     return [
         col for col, cfg in col_settings.get("optional", {}).items()
         if cfg.get("enabled", True)
@@ -387,10 +509,13 @@ def clear_file_columns(file_type):
 # V5: DUAL-FILE COLUMN SELECTION (CURRENT + PREVIOUS with KEY matching)
 # ===========================================================================
 
-def get_v5_column_settings():
+def get_v5_column_settings(settings=None):
     """
     Get V5 column settings.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         dict: {
             "auto_generated": {col: bool, ...},
@@ -398,7 +523,8 @@ def get_v5_column_settings():
             "previous_file": {"filename": str, "columns": [], "selected": []}
         }
     """
-    settings = load_settings()
+    if settings is None:
+        settings = load_settings()
     return {
         "auto_generated": settings.get("v5_auto_generated", {col: True for col in AUTO_GENERATED_COLUMNS}),
         "current_file": settings.get("v5_current_file", {"filename": "", "columns": [], "selected": []}),
@@ -468,7 +594,7 @@ def reset_v5_all():
     save_settings(settings)
 
 
-def get_v5_enabled_columns():
+def get_v5_enabled_columns(settings=None):
     """
     Get all enabled columns for V5.
 
@@ -478,6 +604,9 @@ def get_v5_enabled_columns():
 
     If a column is only selected from PREVIOUS (not CURRENT), no prefix needed.
 
+    Args:
+        settings: Optional SettingsSnapshot (default: read the settings file)
+
     Returns:
         dict: {
             "auto_generated": [list of enabled auto-gen column names],
@@ -485,7 +614,7 @@ def get_v5_enabled_columns():
             "previous": [list of previous columns - prefixed only if conflict with current]
         }
     """
-    v5 = get_v5_column_settings()
+    v5 = get_v5_column_settings(settings)
 
     enabled_auto = [col for col, enabled in v5["auto_generated"].items() if enabled]
     enabled_current = set(v5["current_file"].get("selected", []))
@@ -0,0 +1,241 @@
+"""
+Inference backends for the KR-SBERT StrOrigin similarity model.
+
+- "torch": sentence-transformers on torch (reference path, always the fallback)
+- "int8":  torch with dynamic int8 quantization of every Linear layer
+- "onnx":  ONNX Runtime on a one-time ONNX export of the transformer,
+           followed by the model's mean pooling
+
+The backend is chosen with the "bert_backend" setting. A non-torch backend is
+only used after its similarity scores on a fixed validation set stay within
+BERT_BACKEND_TOLERANCE of the torch path. The ONNX export and its validation
+result are stored in the cache folder, so later runs load the ONNX model
+directly without loading torch at all.
+
+All backends expose the SentenceTransformer encode() interface used by
+calculate_semantic_similarity / calculate_semantic_similarities.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from src.config import BERT_BATCH_SIZE, BERT_BACKEND_TOLERANCE, FRAME_CACHE_DIR
+from src.utils.helpers import get_script_dir
+
+BERT_BACKENDS = ("torch", "int8", "onnx")
+
+# Sentence pairs scored by both backends before a faster backend is accepted
+VALIDATION_PAIRS = [
+    ("안녕하세요", "안녕하십니까"),
+    ("플레이어가 승리했습니다", "플레이어가 패배했습니다"),
+    ("플레이어가 승리했습니다", "적이 도망갔습니다"),
+    ("마을로 돌아가야 해", "마을로 돌아가자"),
+    ("이 검은 전설의 대장장이가 만들었다", "전설적인 대장장이가 이 검을 벼렸다"),
+    ("조심해! 뒤에 적이 있어!", "조심해, 뒤에 적이 있어"),
+    ("Hello world", "Hallo world"),
+    ("The player won the game", "The enemy lost the battle"),
+]
+
+
+class TorchBackend:
+    """Reference backend: the loaded SentenceTransformer model."""
+
+    name = "torch"
+
+    def __init__(self, model):
+        self.model = model
+
+    def encode(self, texts, batch_size=BERT_BATCH_SIZE, convert_to_numpy=True, show_progress_bar=False, **kwargs):
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=convert_to_numpy,
+                                 show_progress_bar=show_progress_bar, **kwargs)
+
+
+class Int8Backend(TorchBackend):
+    """Torch backend with dynamically int8-quantized Linear layers."""
+
+    name = "int8"
+
+    def __init__(self, model):
+        import copy
+        import torch
+        quantized = torch.quantization.quantize_dynamic(copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8)
+        super().__init__(quantized)
+
+
+class OnnxBackend:
+    """ONNX Runtime backend on an exported transformer plus mean pooling."""
+
+    name = "onnx"
+
+    def __init__(self, export_dir, max_length=512):
+        """
+        Load an exported model.
+
+        Args:
+            export_dir: Folder holding model.onnx and the saved tokenizer
+            max_length: Maximum number of tokens per text
+        """
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(export_dir, "model.onnx"), providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.input_names = [node.name for node in self.session.get_inputs()]
+        self.max_length = max_length
+
+    def encode(self, texts, batch_size=BERT_BATCH_SIZE, convert_to_numpy=True, show_progress_bar=False, **kwargs):
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(list(texts[start:start + batch_size]), padding=True, truncation=True,
+                                    max_length=self.max_length, return_tensors="np")
+            feeds = {name: np.asarray(tokens[name], dtype=np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens
+            mask = np.asarray(tokens["attention_mask"], dtype=np.float32)[..., None]
+            chunks.append((hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+        return np.vstack(chunks) if chunks else np.zeros((0, 0), dtype=np.float32)
+
+
+def get_export_dir(model_id):
+    """
+    Folder holding the ONNX export of a model.
+
+    Args:
+        model_id: Bundled model path or Hugging Face name
+
+    Returns:
+        str: Export folder inside the cache folder
+    """
+    model_hash = hashlib.sha256(model_id.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(get_script_dir(), FRAME_CACHE_DIR, "onnx", model_hash)
+
+
+def export_onnx(model, export_dir):
+    """
+    Export the transformer of a SentenceTransformer model to ONNX.
+
+    Args:
+        model: Loaded SentenceTransformer model
+        export_dir: Destination folder (model.onnx + tokenizer files)
+    """
+    import torch
+
+    os.makedirs(export_dir, exist_ok=True)
+    transformer = model[0].auto_model
+    tokenizer = model.tokenizer
+    sample = tokenizer(["샘플 문장입니다"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    transformer.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(sample[name] for name in input_names),
+            os.path.join(export_dir, "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    tokenizer.save_pretrained(export_dir)
+
+
+def validate_backend(candidate, reference, pairs=VALIDATION_PAIRS):
+    """
+    Compare similarity scores of a candidate backend with the reference.
+
+    Args:
+        candidate: Backend to validate
+        reference: Reference backend (torch)
+        pairs: Validation sentence pairs
+
+    Returns:
+        float: Largest absolute similarity difference (0.0 - 1.0 scale)
+    """
+    from src.utils.strorigin_analysis import calculate_semantic_similarities
+
+    expected = calculate_semantic_similarities(pairs, reference)
+    actual = calculate_semantic_similarities(pairs, candidate)
+    return float(np.max(np.abs(expected - actual)))
+
+
+def load_validated_onnx(model_id):
+    """
+    Load a previously exported and validated ONNX model.
+
+    Skips loading the SentenceTransformer model and re-exporting it. torch
+    is still imported by StrOriginAnalyzer's availability check.
+
+    Args:
+        model_id: Bundled model path or Hugging Face name
+
+    Returns:
+        OnnxBackend or None: None if there is no validated export (or
+        onnxruntime is not installed)
+    """
+    export_dir = get_export_dir(model_id)
+    try:
+        with open(os.path.join(export_dir, "validation.json"), 'r', encoding='utf-8') as f:
+            validation = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if validation.get("model_id") != model_id or validation.get("max_diff", 1.0) > BERT_BACKEND_TOLERANCE:
+        return None
+    try:
+        return OnnxBackend(export_dir)
+    except Exception as e:
+        print(f"  ⚠️  Could not load ONNX model: {e}")
+        return None
+
+
+def create_backend(name, model, model_id):
+    """
+    Wrap a loaded model in the requested backend, falling back to torch.
+
+    Args:
+        name: Backend name (see BERT_BACKENDS)
+        model: Loaded SentenceTransformer model
+        model_id: Bundled model path or Hugging Face name
+
+    Returns:
+        Backend: The requested backend if available and validated, else TorchBackend
+    """
+    reference = TorchBackend(model)
+    if name == "torch":
+        return reference
+
+    try:
+        if name == "int8":
+            candidate = Int8Backend(model)
+        elif name == "onnx":
+            export_dir = get_export_dir(model_id)
+            print("  → Exporting BERT model to ONNX (one time)...")
+            export_onnx(model, export_dir)
+            candidate = OnnxBackend(export_dir)
+        else:
+            print(f"  ⚠️  Unknown BERT backend '{name}' - using torch")
+            return reference
+
+        max_diff = validate_backend(candidate, reference)
+    except Exception as e:
+        print(f"  ⚠️  {name} backend unavailable ({e}) - using torch")
+        return reference
+
+    if max_diff > BERT_BACKEND_TOLERANCE:
+        print(f"  ⚠️  {name} backend differs from torch by {max_diff:.4f} "
+              f"(tolerance {BERT_BACKEND_TOLERANCE}) - using torch")
+        return reference
+
+    if name == "onnx":
+        with open(os.path.join(export_dir, "validation.json"), 'w', encoding='utf-8') as f:
+            json.dump({"model_id": model_id, "max_diff": max_diff}, f)
+    print(f"  ✓ Using {name} backend (max similarity difference vs torch: {max_diff:.4f})")
+    return candidate
@@ -8,7 +8,10 @@ including status normalization, column filtering, and dataframe cleaning.
 import pandas as pd
 from src.config import OUTPUT_COLUMNS, MANDATORY_COLUMNS, AUTO_GENERATED_COLUMNS, OPTIONAL_COLUMNS, VRS_CONDITIONAL_COLUMNS
 from src.utils.helpers import safe_str
-from src.settings import get_enabled_columns, get_selected_optional_columns, get_analyzed_columns, get_v5_enabled_columns
+from src.settings import (
+    get_enabled_columns, get_selected_optional_columns, get_analyzed_columns, get_v5_enabled_columns,
+    get_settings_snapshot
+)
 
 
 def find_status_column(columns):
@@ -61,7 +64,7 @@ def normalize_dataframe_status(df):
     return df
 
 
-def filter_output_columns(df, column_list=OUTPUT_COLUMNS, use_settings=True):
+def filter_output_columns(df, column_list=OUTPUT_COLUMNS, use_settings=True, settings=None):
     """
     Filter DataFrame to only include columns based on settings and column list.
 
@@ -73,6 +76,7 @@ def filter_output_columns(df, column_list=OUTPUT_COLUMNS, use_settings=True):
         df: DataFrame to filter
         column_list: List of desired output columns (defines order)
         use_settings: If True, apply user column settings. If False, use all columns.
+        settings: Optional SettingsSnapshot of the run (default: current snapshot)
 
     Returns:
         DataFrame: Filtered DataFrame
@@ -83,7 +87,9 @@ def filter_output_columns(df, column_list=OUTPUT_COLUMNS, use_settings=True):
         return df[available_cols]
 
     # Get user settings for enabled columns
-    enabled_auto, enabled_optional = get_enabled_columns()
+    if settings is None:
+        settings = get_settings_snapshot()
+    enabled_auto, enabled_optional = get_enabled_columns(settings)
 
     # Build list of columns to include
     enabled_columns = set(MANDATORY_COLUMNS)  # Always include mandatory
@@ -92,11 +98,11 @@ def filter_output_columns(df, column_list=OUTPUT_COLUMNS, use_settings=True):
     enabled_columns.update(enabled_optional.keys())  # Add enabled optional (from old V1 settings)
 
     # V2: Also include selected optional columns from file analysis
-    selected_optional = get_selected_optional_columns()
+    selected_optional = get_selected_optional_columns(settings)
     enabled_columns.update(selected_optional)
 
     # V5: Include columns from dual-file selection (CURRENT + PREVIOUS)
-    v5_cols = get_v5_enabled_columns()
+    v5_cols = get_v5_enabled_columns(settings)
     v5_auto_generated = v5_cols.get("auto_generated", [])
     v5_current = v5_cols.get("current", [])
     v5_previous = v5_cols.get("previous", [])  # Already has Previous_ prefix
@@ -107,7 +113,7 @@ def filter_output_columns(df, column_list=OUTPUT_COLUMNS, use_settings=True):
     enabled_columns.update(v5_previous)
 
     # V2/V5: Build extended column list including analyzed columns
-    analyzed_cols = get_analyzed_columns()
+    analyzed_cols = get_analyzed_columns(settings)
     extended_column_list = list(column_list)
 
     # Add analyzed columns (V2)
@@ -1,8 +1,10 @@
 """
 Utility helper functions for VRS Manager
 """
+import multiprocessing
 import os
 import sys
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from src.config import (
@@ -16,6 +18,19 @@ def log(msg):
     print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
 
 
+def default_worker_count():
+    """
+    Number of processes for a process pool.
+
+    Returns:
+        int: CPU count, or 1 inside a worker process (e.g. a batch scheduler
+        job) so pools are not nested
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return os.cpu_count() or 1
+
+
 def get_script_dir():
     """
     Get the directory where the script is running from.
@@ -48,6 +63,30 @@ def safe_str(value):
     return str(value).strip()
 
 
+# Every case spelling of "nan" (what safe_str treats as missing)
+_NAN_SPELLINGS = [a + b + c for a in "nN" for b in "aA" for c in "nN"]
+
+
+def safe_str_series(values):
+    """
+    Column-wise safe_str: convert an array of values to clean strings.
+
+    Gives exactly the same result as applying safe_str to every element,
+    using vectorized string operations when all values are already strings.
+
+    Args:
+        values: Sequence, array or Series of values
+
+    Returns:
+        Series: Object Series of stripped strings (positional index)
+    """
+    arr = np.asarray(values, dtype=object)
+    if pd.api.types.infer_dtype(arr, skipna=False) == "string":
+        text = pd.Series(arr, dtype=object).str.strip()
+        return text.mask(text.isin(_NAN_SPELLINGS), "")
+    return pd.Series([safe_str(v) for v in arr], dtype=object)
+
+
 def normalize_status(status_value):
     """Normalize status to uppercase"""
     clean_val = safe_str(status_value)
@@ -0,0 +1,173 @@
+"""
+Per-stage instrumentation of processor runs.
+
+BaseProcessor.process() starts a RunProfile for every run and times each
+template step (select files → read files → process data → write output →
+show summary). Key sub-stages (lookup build, PASS 1, PASS 2, deleted-row
+scan, StrOrigin analysis, formatting) are timed where they run with
+profile_stage(), which records into the active run's profile and does
+nothing outside a run:
+
+    with profile_stage("PASS 1"):
+        ...
+
+Each stage records:
+- wall_seconds: elapsed time
+- cpu_seconds: CPU time of this process plus its finished worker processes
+- peak_rss_mb: peak resident memory of the process when the stage ended
+- peak_rss_growth_mb: how much the stage raised that peak
+
+Peak RSS comes from the resource module and is None where it is unavailable
+(Windows).
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.utils.helpers import log
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None if unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (MB if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+def _cpu_seconds():
+    """CPU time used by this process and its finished child processes."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class RunProfile:
+    """
+    Timings of one processor run, one record per stage in start order.
+    """
+
+    def __init__(self, process_name):
+        """
+        Start a profile.
+
+        Args:
+            process_name: Name of the process (e.g. "PROCESS RAW VRS CHECK")
+        """
+        self.process_name = process_name
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.stages = []
+        self._open = []  # Names of the stages currently running (outermost first)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Time a stage (stages may be nested).
+
+        Args:
+            name: Stage name
+
+        Yields:
+            dict: The stage record (filled in when the stage ends)
+        """
+        record = {"stage": "/".join(self._open + [name]), "depth": len(self._open)}
+        self.stages.append(record)
+        self._open.append(name)
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        peak_start = peak_rss_mb()
+        try:
+            yield record
+        finally:
+            self._open.pop()
+            peak = peak_rss_mb()
+            record["wall_seconds"] = round(time.perf_counter() - wall_start, 3)
+            record["cpu_seconds"] = round(_cpu_seconds() - cpu_start, 3)
+            record["peak_rss_mb"] = peak
+            record["peak_rss_growth_mb"] = round(peak - peak_start, 1) if peak is not None else None
+
+    def to_dict(self):
+        """
+        Profile as a JSON-serializable dictionary.
+
+        Returns:
+            dict: process, started, stages
+        """
+        return {
+            "process": self.process_name,
+            "started": self.started,
+            "stages": [dict(record) for record in self.stages],
+        }
+
+    def log_summary(self):
+        """Log one line per stage: wall time, CPU time and peak memory."""
+        log("Stage timings:")
+        for record in self.stages:
+            if "wall_seconds" not in record:
+                continue
+            name = "  " * record["depth"] + record["stage"].rsplit("/", 1)[-1]
+            peak = f"{record['peak_rss_mb']:,.0f} MB" if record["peak_rss_mb"] is not None else "n/a"
+            log(f"  {name:<32} {record['wall_seconds']:>9.2f}s wall {record['cpu_seconds']:>9.2f}s CPU  peak {peak}")
+
+    def write_trace(self, path):
+        """
+        Write the profile to a JSON trace file.
+
+        Args:
+            path: Trace file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+# Profile of the run in progress in this process (None outside a run)
+_active_profile = None
+
+
+def start_run_profile(process_name):
+    """
+    Start profiling a run; later profile_stage() calls record into it.
+
+    Args:
+        process_name: Name of the process
+
+    Returns:
+        RunProfile: The new active profile
+    """
+    global _active_profile
+    _active_profile = RunProfile(process_name)
+    return _active_profile
+
+
+def stop_run_profile():
+    """Stop recording into the active profile."""
+    global _active_profile
+    _active_profile = None
+
+
+@contextmanager
+def profile_stage(name):
+    """
+    Time a stage of the active run (no-op outside a run).
+
+    Args:
+        name: Stage name
+
+    Yields:
+        dict or None: The stage record, or None outside a run
+    """
+    if _active_profile is None:
+        yield None
+        return
+    with _active_profile.stage(name) as record:
+        yield record
@@ -10,13 +10,24 @@ Author: Neil Schmitt
 Version: 1121.0
 """
 
-import re
-import unicodedata
+import threading
 import os
 import numpy as np
-from difflib import SequenceMatcher
 from typing import Optional, Tuple
 
+from src.config import BERT_BATCH_SIZE
+from src.utils.progress import print_progress, finalize_progress
+from src.utils.text_normalization import normalize_text, punctuation_space_change_mask
+from src.utils.word_diff import word_diff, compute_word_diffs
+
+# Hugging Face name of the bundled KR-SBERT model (online fallback)
+KR_SBERT_MODEL_NAME = 'snunlp/KR-SBERT-V40K-klueNLI-augSTS'
+
+# Bundled model folder (models/kr-sbert under the project root)
+DEFAULT_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'models', 'kr-sbert'
+)
+
 
 def normalize_text_for_comparison(text: str) -> str:
     """
@@ -38,18 +49,9 @@ def normalize_text_for_comparison(text: str) -> str:
         >>> normalize_text_for_comparison("Hello, world!")
         'helloworld'
     """
-    if not isinstance(text, str):
-        return ""
-
-    # Remove all whitespace
-    text = re.sub(r'\s+', '', text)
-
-    # Remove all punctuation (including Korean, Japanese, Chinese punctuation)
-    # Unicode categories starting with 'P' are punctuation
-    text = ''.join(char for char in text if not unicodedata.category(char).startswith('P'))
-
-    # Case-insensitive comparison
-    return text.lower()
+    # Whitespace and Unicode punctuation (categories P*) are removed with one
+    # precomputed translation table, then lowercased
+    return normalize_text(text)
 
 
 def is_punctuation_space_change_only(prev_text: str, curr_text: str) -> bool:
@@ -77,7 +79,8 @@ def is_punctuation_space_change_only(prev_text: str, curr_text: str) -> bool:
 
 def extract_differences(text1: str, text2: str, max_length: int = 80) -> str:
     """
-    Extract WORD-LEVEL differences between two texts using difflib.
+    Extract WORD-LEVEL differences between two texts using difflib
+    (memoized - see src/utils/word_diff.py).
 
     Shows exactly what changed in WinMerge style with automatic chunking:
     - [old words→new words] for replacements (consecutive words grouped)
@@ -105,36 +108,7 @@ def extract_differences(text1: str, text2: str, max_length: int = 80) -> str:
     if not text1 or not text2:
         return ""
 
-    # Split into words (preserves Korean and English spacing)
-    words1 = text1.split()
-    words2 = text2.split()
-
-    # Word-level diff (automatic chunking of consecutive changes)
-    matcher = SequenceMatcher(None, words1, words2)
-    changes = []
-
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        if tag == 'replace':
-            old_words = ' '.join(words1[i1:i2])
-            new_words = ' '.join(words2[j1:j2])
-            changes.append(f"[{old_words}→{new_words}]")
-        elif tag == 'delete':
-            deleted_words = ' '.join(words1[i1:i2])
-            changes.append(f"[-{deleted_words}]")
-        elif tag == 'insert':
-            added_words = ' '.join(words2[j1:j2])
-            changes.append(f"[+{added_words}]")
-
-    if not changes:
-        return ""
-
-    diff_str = ' '.join(changes)
-
-    # Truncate if too long (avoid huge Excel cells)
-    if len(diff_str) > max_length:
-        diff_str = diff_str[:max_length-3] + "..."
-
-    return diff_str
+    return word_diff(text1, text2, "→", max_length)
 
 
 def calculate_semantic_similarity(text1: str, text2: str, model) -> float:
@@ -183,6 +157,74 @@ def calculate_semantic_similarity(text1: str, text2: str, model) -> float:
     return similarity
 
 
+def calculate_semantic_similarities(text_pairs: list, model, batch_size: int = BERT_BATCH_SIZE,
+                                    cache=None) -> np.ndarray:
+    """
+    Calculate semantic similarities for many text pairs at once.
+
+    Batch version of calculate_semantic_similarity: every distinct text is
+    encoded exactly once, in length-sorted batches (little padding, few large
+    forward passes), and all cosine similarities are computed as one array
+    operation.
+
+    With an EmbeddingCache, only texts missing from the cache are encoded.
+    Texts encoded in this run use the model's full-precision embeddings, so
+    a first run gives the same scores as an uncached one. The cache stores
+    embeddings as float16: texts read back from it in a later run can score
+    slightly differently (about ±0.1 in the "XX.X% similar" label).
+
+    Args:
+        text_pairs: List of (text1, text2) tuples
+        model: Loaded SentenceTransformer model
+        batch_size: Number of texts per forward pass
+        cache: Optional EmbeddingCache for the model
+
+    Returns:
+        Array of similarity scores between 0.0 and 1.0, one per pair
+        (0.0 for pairs with an empty text)
+    """
+    similarities = np.zeros(len(text_pairs), dtype=np.float64)
+    valid = [i for i, (text1, text2) in enumerate(text_pairs) if text1 and text2]
+    if not valid:
+        return similarities
+
+    # Deduplicate, then sort by length so each batch holds similar lengths
+    unique_texts = sorted({text for i in valid for text in text_pairs[i]}, key=lambda text: (len(text), text))
+    cached = cache.get_many(unique_texts) if cache is not None else {}
+    missing_texts = [text for text in unique_texts if text not in cached]
+
+    chunks = []
+    for start in range(0, len(missing_texts), batch_size):
+        chunk = missing_texts[start:start + batch_size]
+        chunks.append(model.encode(chunk, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False))
+        print_progress(min(start + batch_size, len(missing_texts)), len(missing_texts), label="Encoding")
+    if chunks:
+        finalize_progress()
+
+    if cache is None:
+        embeddings = np.vstack(chunks)
+        text_rows = {text: row for row, text in enumerate(missing_texts)}
+    else:
+        if chunks:
+            new_embeddings = np.vstack(chunks)
+            cache.put_many(missing_texts, new_embeddings)
+            cached.update(zip(missing_texts, new_embeddings))
+        embeddings = np.stack([cached[text] for text in unique_texts])
+        text_rows = {text: row for row, text in enumerate(unique_texts)}
+
+    # Cosine similarity of all pairs in one operation
+    emb1 = embeddings[[text_rows[text_pairs[i][0]] for i in valid]]
+    emb2 = embeddings[[text_rows[text_pairs[i][1]] for i in valid]]
+    dot_products = np.einsum('ij,ij->i', emb1, emb2)
+    norms = np.linalg.norm(emb1, axis=1) * np.linalg.norm(emb2, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(norms == 0, 0.0, dot_products / norms)
+
+    # Clamp to [0, 1] range (cosine similarity can theoretically be negative)
+    similarities[valid] = np.clip(scores, 0.0, 1.0)
+    return similarities
+
+
 class StrOriginAnalyzer:
     """
     Analyzer for StrOrigin changes combining punctuation detection and BERT similarity.
@@ -195,26 +237,30 @@ class StrOriginAnalyzer:
     1. First Pass: Check if change is punctuation/space only (both versions)
     2. Second Pass: Calculate semantic similarity using BERT (FULL version only)
 
-    The model is loaded lazily (only when first needed) for performance.
+    The model is loaded lazily (only when first needed) for performance, or
+    ahead of time in the background by warm_up_strorigin_analyzer().
     """
 
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None, backend: Optional[str] = None):
         """
         Initialize the analyzer.
 
         Args:
             model_path: Path to BERT model directory. If None, uses default project path.
+            backend: Inference backend ("torch", "int8", "onnx"). If None, uses the
+                     bert_backend setting when the model is loaded.
         """
         self.model = None
+        self.model_id = None  # Path or name the model was loaded from (+ backend)
+        self.backend = backend
+        self._load_lock = threading.Lock()  # Background warm-up and analysis share one load
+        self.embedding_cache = None
         self.model_path = model_path or self._get_default_model_path()
         self.bert_available = self._check_bert_available()
 
     def _get_default_model_path(self) -> str:
         """Get default model path relative to project root"""
-        # Get project root (assuming this file is in src/utils/)
-        current_file = os.path.abspath(__file__)
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
-        return os.path.join(project_root, 'models', 'kr-sbert')
+        return DEFAULT_MODEL_PATH
 
     def _check_bert_available(self) -> bool:
         """
@@ -235,26 +281,63 @@ class StrOriginAnalyzer:
         """
         Lazy load the BERT model (only when first needed).
 
+        The model is wrapped in the configured inference backend (see
+        src/utils/bert_backends.py); torch is used if the backend is
+        unavailable or fails validation. A validated ONNX export is loaded
+        directly, without loading the SentenceTransformer model.
+        """
+        if self.model is not None:
+            return
+        with self._load_lock:
+            # A background warm-up may have finished loading while we waited
+            if self.model is None:
+                self._load_backend()
+
+    def _load_backend(self):
+        """Load the model in the configured backend (caller holds the load lock)."""
+        from src.settings import get_bert_backend
+        from src.utils.bert_backends import create_backend, load_validated_onnx
+
+        backend = self.backend or get_bert_backend()
+
+        # A validated ONNX export skips loading the SentenceTransformer model
+        if backend == "onnx":
+            for model_id in (self.model_path, KR_SBERT_MODEL_NAME):
+                onnx_model = load_validated_onnx(model_id)
+                if onnx_model is not None:
+                    self.model = onnx_model
+                    self.model_id = f"{model_id}|onnx"
+                    print(f"  ✓ ONNX model loaded from export of: {model_id}")
+                    return
+
+        model, model_id = self._load_sentence_transformer()
+        self.model = create_backend(backend, model, model_id)
+        self.model_id = model_id if self.model.name == "torch" else f"{model_id}|{self.model.name}"
+
+    def _load_sentence_transformer(self):
+        """
+        Load the SentenceTransformer model (torch).
+
         Attempts to load in this order:
         1. Offline from bundled model (for FULL version .exe) - PRIORITY
         2. Online from Hugging Face (fallback if bundled not found)
         3. Raises FileNotFoundError if both fail
-        """
-        if self.model is not None:
-            return
 
+        Returns:
+            tuple: (model, model_id) - model_id is the path or name it was loaded from
+        """
         from sentence_transformers import SentenceTransformer
 
-        model_name = 'snunlp/KR-SBERT-V40K-klueNLI-augSTS'
+        model_name = KR_SBERT_MODEL_NAME
 
         # Try 1: Load from bundled local path (offline mode - PRIORITY)
         # This ensures the FULL version .exe works 100% offline
         if os.path.exists(self.model_path):
             try:
                 print(f"  → Loading BERT model from bundled path (offline mode)...")
-                self.model = SentenceTransformer(self.model_path)
+                model = SentenceTransformer(self.model_path)
                 print(f"  ✓ Model loaded successfully from: {self.model_path}")
-                return
+                return model, self.model_path
             except Exception as e:
                 print(f"  ⚠️  Failed to load bundled model: {e}")
                 print(f"  → Trying online fallback...")
@@ -263,9 +346,9 @@ class StrOriginAnalyzer:
         # Only if bundled model not found (e.g., running from source code)
         try:
             print(f"  → Attempting to load BERT model from Hugging Face (online mode)...")
-            self.model = SentenceTransformer(model_name)
+            model = SentenceTransformer(model_name)
             print(f"  ✓ Model loaded successfully from Hugging Face")
-            return
+            return model, model_name
         except Exception as e:
             print(f"  ℹ️  Online mode unavailable: {str(e)[:100]}")
 
@@ -277,6 +360,13 @@ class StrOriginAnalyzer:
             f"\nFor offline use, run: python scripts/download_bert_model.py"
         )
 
+    def _get_embedding_cache(self):
+        """Persistent embedding cache of the loaded model (created on first use)."""
+        if self.embedding_cache is None:
+            from src.io.embedding_cache import EmbeddingCache
+            self.embedding_cache = EmbeddingCache(self.model_id or self.model_path)
+        return self.embedding_cache
+
     def analyze(self, prev_text: str, curr_text: str) -> Tuple[str, str]:
         """
         Analyze the difference between previous and current StrOrigin texts.
@@ -322,16 +412,97 @@ class StrOriginAnalyzer:
         """
         Analyze multiple text pairs efficiently.
 
+        Gives the same results as calling analyze() on every pair, but
+        duplicate pairs are analyzed once and all BERT similarities are
+        computed in one batched pass (calculate_semantic_similarities).
+
         Args:
             text_pairs: List of (prev_text, curr_text) tuples
 
         Returns:
             List of (analysis, diff_detail) tuples
         """
-        results = []
+        unique_pairs = list(dict.fromkeys(text_pairs))
+
+        # First Pass: punctuation/space only + word-level differences
+        results = {}
+        content_pairs = []
+        punctuation_only = punctuation_space_change_mask(
+            [prev_text for prev_text, _ in unique_pairs], [curr_text for _, curr_text in unique_pairs]
+        )
+        for pair, is_punctuation_only in zip(unique_pairs, punctuation_only):
+            if is_punctuation_only:
+                results[pair] = ("Punctuation/Space Change", "")
+            else:
+                content_pairs.append(pair)
+
+        # Second Pass: BERT semantic similarity (FULL version only)
+        if content_pairs and self.bert_available:
+            self._load_model()  # Lazy load
+            cache = self._get_embedding_cache()
+            if cache.enabled:
+                hits_before, misses_before = cache.hits, cache.misses
+                similarities = calculate_semantic_similarities(content_pairs, self.model, cache=cache)
+                print(f"  → Embedding cache: {cache.hits - hits_before:,} reused, "
+                      f"{cache.misses - misses_before:,} encoded")
+            else:
+                similarities = calculate_semantic_similarities(content_pairs, self.model)
+        else:
+            similarities = None
+
+        # Word-level differences, in parallel for large batches
+        diff_pairs = [pair for pair in content_pairs if pair[0] and pair[1]]
+        diffs = dict(zip(diff_pairs, compute_word_diffs(diff_pairs)))
+        for number, pair in enumerate(content_pairs):
+            analysis = f"{similarities[number] * 100:.1f}% similar" if similarities is not None else "Content Change"
+            results[pair] = (analysis, diffs.get(pair, ""))
+
+        return [results[pair] for pair in text_pairs]
+
 
-        for prev_text, curr_text in text_pairs:
-            analysis, diff_detail = self.analyze(prev_text, curr_text)
-            results.append((analysis, diff_detail))
+_shared_analyzer = None
+_shared_analyzer_lock = threading.Lock()
 
-        return results
+
+def get_strorigin_analyzer() -> StrOriginAnalyzer:
+    """
+    Get the shared analyzer instance.
+
+    The BERT model is loaded at most once per process, so consecutive runs
+    (e.g. a batch manifest) reuse it.
+
+    Returns:
+        StrOriginAnalyzer: Process-wide analyzer
+    """
+    global _shared_analyzer
+    with _shared_analyzer_lock:
+        if _shared_analyzer is None:
+            _shared_analyzer = StrOriginAnalyzer()
+    return _shared_analyzer
+
+
+def _warm_up():
+    """Create the shared analyzer and load its model (FULL version only)."""
+    try:
+        analyzer = get_strorigin_analyzer()
+        if analyzer.bert_available:
+            analyzer._load_model()
+    except Exception as e:
+        # The analysis stage loads again and reports the error there
+        print(f"  ⚠️  BERT warm-up failed: {e}")
+
+
+def warm_up_strorigin_analyzer() -> threading.Thread:
+    """
+    Start loading the shared analyzer's BERT model in a background thread.
+
+    Called as soon as input files are selected, so the model load overlaps
+    file parsing and comparison. The analysis stage then finds the model
+    ready, or waits for the load in progress.
+
+    Returns:
+        threading.Thread: The (daemon) warm-up thread
+    """
+    thread = threading.Thread(target=_warm_up, name="bert-warm-up", daemon=True)
+    thread.start()
+    return thread
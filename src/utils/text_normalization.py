@@ -0,0 +1,100 @@
+"""
+Punctuation/space normalization for StrOrigin comparison.
+
+Texts are compared after removing all whitespace and all Unicode punctuation
+(categories P*, which covers Korean, Japanese and Chinese punctuation) and
+lowercasing. The removal uses one str.translate() call with a deletion
+table that looks up each codepoint in the Unicode database the first time
+it is seen and caches the answer.
+"""
+
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+
+class _DeletionTable(dict):
+    """
+    str.translate() table filled in lazily, one codepoint at a time.
+
+    Whitespace is what re's \\s matches (str.isspace()); punctuation is every
+    codepoint whose Unicode category starts with 'P'. Both map to None
+    (deleted); every other codepoint maps to itself.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        value = None if char.isspace() or unicodedata.category(char).startswith('P') else codepoint
+        self[codepoint] = value
+        return value
+
+
+@lru_cache(maxsize=None)
+def get_deletion_table() -> dict:
+    """
+    Translation table deleting every whitespace and punctuation codepoint.
+
+    Only the codepoints of texts actually translated are ever classified,
+    instead of all 1.1M codepoints up front.
+
+    Returns:
+        dict: codepoint → None (delete) or itself, for str.translate()
+    """
+    return _DeletionTable()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Remove all spaces and punctuation and lowercase.
+
+    Args:
+        text: Input text (non-strings normalize to "")
+
+    Returns:
+        Normalized text
+    """
+    if not isinstance(text, str):
+        return ""
+    return text.translate(get_deletion_table()).lower()
+
+
+def normalize_texts(texts) -> list:
+    """
+    normalize_text() for a whole column, normalizing each distinct text once.
+
+    Args:
+        texts: Iterable of texts (e.g. a DataFrame column)
+
+    Returns:
+        list: Normalized texts in input order
+    """
+    table = get_deletion_table()
+    normalized = {}
+    result = []
+    for text in texts:
+        if not isinstance(text, str):
+            result.append("")
+            continue
+        value = normalized.get(text)
+        if value is None:
+            value = normalized[text] = text.translate(table).lower()
+        result.append(value)
+    return result
+
+
+def punctuation_space_change_mask(prev_texts, curr_texts) -> np.ndarray:
+    """
+    Vectorized punctuation/space-only check for many text pairs.
+
+    Args:
+        prev_texts: Previous texts
+        curr_texts: Current texts (same length)
+
+    Returns:
+        np.ndarray: Boolean array, True where the pair is identical after
+        removing spaces/punctuation
+    """
+    normalized_prev = np.array(normalize_texts(prev_texts), dtype=object)
+    normalized_curr = np.array(normalize_texts(curr_texts), dtype=object)
+    return np.asarray(normalized_prev == normalized_curr, dtype=bool)
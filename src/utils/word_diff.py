@@ -0,0 +1,162 @@
+"""
+Word-level diff engine for StrOrigin / Text change details.
+
+Produces WinMerge-style change strings:
+- [old words→new words] for replacements (consecutive words grouped)
+- [-deleted words] for deletions
+- [+added words] for additions
+
+Single diffs are memoized, and compute_word_diffs() runs large batches of
+distinct pairs across a process pool in chunks. Words only added to or
+removed from the start/end of a line skip difflib entirely (same output).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from difflib import SequenceMatcher
+from functools import lru_cache
+from itertools import repeat
+
+from src.config import WORD_DIFF_PARALLEL_MIN_PAIRS, WORD_DIFF_CHUNK_SIZE, WORD_DIFF_MEMO_SIZE
+from src.utils.helpers import log, default_worker_count
+
+# SequenceMatcher ignores "popular" words of sequences this long (autojunk),
+# which the end fast path would not reproduce
+AUTOJUNK_MIN_WORDS = 200
+
+
+def _end_change(words1, words2):
+    """
+    Fast path: words added or removed only at the start or end of a line.
+
+    Gives the same result as SequenceMatcher: the unchanged line must match
+    at its earliest position in the longer one.
+
+    Args:
+        words1: Previous words
+        words2: Current words
+
+    Returns:
+        tuple or None: ('+' or '-', changed words), or None if the fast path
+        does not apply
+    """
+    if len(words1) == len(words2) or len(words2) >= AUTOJUNK_MIN_WORDS:
+        return None
+    if len(words1) < len(words2):
+        short, long, sign = words1, words2, '+'
+    else:
+        short, long, sign = words2, words1, '-'
+
+    size = len(short)
+    extra = len(long) - size
+    if long[:size] == short:
+        return sign, long[size:]
+    if long[extra:] == short:
+        first = short[0]
+        if not any(long[j] == first and long[j:j + size] == short for j in range(1, extra)):
+            return sign, long[:extra]
+    return None
+
+
+@lru_cache(maxsize=WORD_DIFF_MEMO_SIZE)
+def word_diff(text1: str, text2: str, arrow: str = "→", max_length: int = 80) -> str:
+    """
+    Word-level differences between two texts (memoized).
+
+    Args:
+        text1: Previous text
+        text2: Current text
+        arrow: Separator between old and new words of a replacement
+        max_length: Maximum length for diff output (truncate if longer)
+
+    Returns:
+        Diff string showing changes, or empty string if no changes
+    """
+    # Split into words (preserves Korean and English spacing)
+    words1 = text1.split()
+    words2 = text2.split()
+
+    end_change = _end_change(words1, words2)
+    if end_change is not None:
+        sign, words = end_change
+        diff_str = f"[{sign}{' '.join(words)}]"
+    else:
+        # Word-level diff (automatic chunking of consecutive changes)
+        matcher = SequenceMatcher(None, words1, words2)
+        changes = []
+
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'replace':
+                old_words = ' '.join(words1[i1:i2])
+                new_words = ' '.join(words2[j1:j2])
+                changes.append(f"[{old_words}{arrow}{new_words}]")
+            elif tag == 'delete':
+                deleted_words = ' '.join(words1[i1:i2])
+                changes.append(f"[-{deleted_words}]")
+            elif tag == 'insert':
+                added_words = ' '.join(words2[j1:j2])
+                changes.append(f"[+{added_words}]")
+
+        if not changes:
+            return ""
+
+        diff_str = ' '.join(changes)
+
+    # Truncate if too long (avoid huge Excel cells)
+    if len(diff_str) > max_length:
+        diff_str = diff_str[:max_length - 3] + "..."
+
+    return diff_str
+
+
+def _diff_chunk(text_pairs, arrow, max_length):
+    """Diff a chunk of pairs (runs in a worker process)."""
+    return [word_diff(text1, text2, arrow, max_length) for text1, text2 in text_pairs]
+
+
+def default_diff_workers() -> int:
+    """
+    Number of processes for batch diffs.
+
+    Returns:
+        int: See default_worker_count()
+    """
+    return default_worker_count()
+
+
+def compute_word_diffs(text_pairs: list, arrow: str = "→", max_length: int = 80, workers: int = None) -> list:
+    """
+    Word-level differences for many text pairs.
+
+    Identical pairs are diffed once. Batches of at least
+    WORD_DIFF_PARALLEL_MIN_PAIRS distinct pairs are split into chunks of
+    WORD_DIFF_CHUNK_SIZE and diffed in a process pool; smaller batches (or a
+    pool that cannot start) run in this process.
+
+    Args:
+        text_pairs: List of (prev_text, curr_text) tuples
+        arrow: Separator between old and new words of a replacement
+        max_length: Maximum length of each diff string
+        workers: Number of processes (default: default_diff_workers())
+
+    Returns:
+        List of diff strings, one per pair
+    """
+    unique_pairs = list(dict.fromkeys(text_pairs))
+    workers = default_diff_workers() if workers is None else workers
+
+    diffs = None
+    if workers > 1 and len(unique_pairs) >= WORD_DIFF_PARALLEL_MIN_PAIRS:
+        chunks = [unique_pairs[start:start + WORD_DIFF_CHUNK_SIZE]
+                  for start in range(0, len(unique_pairs), WORD_DIFF_CHUNK_SIZE)]
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                diffs = [diff for chunk_diffs in pool.map(_diff_chunk, chunks, repeat(arrow), repeat(max_length))
+                         for diff in chunk_diffs]
+        except (OSError, BrokenProcessPool) as e:
+            log(f"  ⚠️  Parallel diff unavailable ({e}) - diffing in this process")
+    if diffs is None:
+        diffs = _diff_chunk(unique_pairs, arrow, max_length)
+
+    results = dict(zip(unique_pairs, diffs))
+    return [results[pair] for pair in text_pairs]
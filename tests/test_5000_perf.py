@@ -42,7 +42,7 @@ def test_raw():
     print(f"Lookups: {time.time()-start:.2f}s")
     
     changes, prev_origins, cols, counter, marked, groups, pass1 = compare_rows(
-        df_curr, df_prev, *lookups)
+        df_curr, df_prev, lookups)
     print(f"Comparison: {time.time()-start:.2f}s")
     
     deleted = find_deleted_rows(df_prev, df_curr, marked)
@@ -77,7 +77,7 @@ def test_working():
     lookups = build_working_lookups(df_prev, "PREVIOUS")
     print(f"Lookups: {time.time()-start:.2f}s")
     
-    result, counter, marked, pass1_results, previous_strorigins = process_working_comparison(df_curr, df_prev, *lookups)
+    result, counter, marked, pass1_results, previous_strorigins = process_working_comparison(df_curr, df_prev, lookups)
     total = time.time()-start
     print(f"✓ DONE: {total:.2f}s ({len(result)/total:.0f} rows/sec)")
     print(f"  Counter: {dict(counter)}")
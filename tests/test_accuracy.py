@@ -52,7 +52,7 @@ def verify_raw_accuracy():
     # Build lookups and process
     lookups = build_lookups(df_prev)
     changes, prev_origins, cols_map, counter, marked, group_analysis, pass1 = compare_rows(
-        df_curr, df_prev, *lookups)
+        df_curr, df_prev, lookups)
     deleted = find_deleted_rows(df_prev, df_curr, marked)
 
     print("\n" + "="*70)
@@ -157,7 +157,7 @@ def verify_working_accuracy():
 
     # Build lookups and process
     lookups = build_working_lookups(df_prev, "PREVIOUS")
-    result, counter, marked, pass1_results, previous_strorigins = process_working_comparison(df_curr, df_prev, *lookups)
+    result, counter, marked, pass1_results, previous_strorigins = process_working_comparison(df_curr, df_prev, lookups)
 
     # Find deleted rows
     from src.core.working_helpers import find_working_deleted_rows
@@ -0,0 +1,91 @@
+"""
+Test the tri-lingual merge of the All Language CURRENT files.
+
+Verifies the KR/EN/CN columns are renamed and cleaned, that duplicate
+EN/CN keys keep their last row, that unmatched or missing columns become
+empty strings, and that KR rows keep their order.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.alllang_helpers import merge_current_files
+from src.utils.helpers import safe_str_series, safe_str
+
+
+def merge(df_kr, df_en, df_cn):
+    """Merge already-read CURRENT frames."""
+    return merge_current_files("KR.xlsx", "EN.xlsx", "CN.xlsx", current_frames=(df_kr, df_en, df_cn))
+
+
+def test_columns_renamed_per_language():
+    """Per-language columns move to the end with a language suffix"""
+    df_kr = pd.DataFrame({
+        "SequenceName": ["S1", "S2"], "EventName": ["E1", "E2"], "Text": [" 안녕 ", "nan"],
+        "STATUS": ["FINAL", None], "FREEMEMO": ["memo", ""], "CharacterName": ["Kim", "Lee"],
+        "StrOrigin": ["orig1", "orig2"],
+    })
+    df_en = pd.DataFrame({
+        "SequenceName": ["S2", "S1"], "EventName": ["E2", "E1"], "Text": ["Bye", "Hello"],
+        "STATUS": ["RECORDED", "FINAL"], "FREEMEMO": ["", "en memo"], "CharacterName": ["Lee", "Kim"],
+    })
+    df_cn = pd.DataFrame({"SequenceName": ["S1"], "EventName": ["E1"], "Text": ["你好"]})
+
+    df = merge(df_kr, df_en, df_cn)
+
+    assert list(df.columns) == [
+        "SequenceName", "EventName", "StrOrigin",
+        "Text_KR", "FREEMEMO_KR", "STATUS_KR", "CharacterName_KR",
+        "Text_EN", "FREEMEMO_EN", "STATUS_EN", "CharacterName_EN",
+        "Text_CN", "FREEMEMO_CN", "STATUS_CN", "CharacterName_CN",
+    ]
+    assert list(df.index) == [0, 1]
+    assert list(df["Text_KR"]) == ["안녕", ""]
+    assert list(df["STATUS_KR"]) == ["FINAL", ""]
+    assert list(df["Text_EN"]) == ["Hello", "Bye"]
+    assert list(df["FREEMEMO_EN"]) == ["en memo", ""]
+    # CN has no STATUS column and no S2/E2 row
+    assert list(df["Text_CN"]) == ["你好", ""]
+    assert list(df["STATUS_CN"]) == ["", ""]
+
+
+def test_duplicate_keys_keep_last_row():
+    """Duplicate EN/CN keys resolve to their last row; KR rows are all kept"""
+    df_kr = pd.DataFrame({
+        "SequenceName": ["S1", "S1", "S1"], "EventName": ["E1", "E2", "E1"], "Text": ["a", "b", "c"],
+    }, index=[10, 20, 30])
+    df_en = pd.DataFrame({"SequenceName": ["S1", "S1"], "EventName": ["E1", "E1"], "Text": ["first", "last"]})
+    df_cn = pd.DataFrame({"SequenceName": ["S1"], "EventName": ["E2"], "Text": ["二"]})
+
+    df = merge(df_kr, df_en, df_cn)
+
+    assert list(df.index) == [0, 1, 2]
+    assert list(df["Text_KR"]) == ["a", "b", "c"]
+    assert list(df["Text_EN"]) == ["last", "", "last"]
+    assert list(df["Text_CN"]) == ["", "二", ""]
+
+
+def test_safe_str_series_matches_safe_str():
+    """safe_str_series cleans every "nan" spelling like safe_str"""
+    values = ["nan", "NaN", " NAN ", "nAn", "naan", " x ", "", "Nan."]
+    assert list(safe_str_series(values)) == [safe_str(v) for v in values]
+    mixed = ["nan", np.nan, None, 1.5, " y "]
+    assert list(safe_str_series(mixed)) == [safe_str(v) for v in mixed]
+
+
+def main():
+    """Run all tests"""
+    test_columns_renamed_per_language()
+    test_duplicate_keys_keep_last_row()
+    test_safe_str_series_matches_safe_str()
+    print("✅ All All Language merge tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
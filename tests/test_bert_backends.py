@@ -0,0 +1,93 @@
+"""
+Test the pluggable BERT inference backends.
+
+Faster backends are only accepted when their similarity scores match the
+torch path within tolerance; otherwise (or when their packages are missing)
+the analyzer falls back to torch.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import BERT_BACKEND_TOLERANCE
+from src.settings import get_bert_backend
+from src.utils.bert_backends import OnnxBackend, TorchBackend, create_backend, validate_backend
+from tests.test_strorigin_batch import FakeModel
+
+
+class NoisyBackend(TorchBackend):
+    """Backend whose embeddings deviate from the reference by `noise`."""
+
+    name = "noisy"
+
+    def __init__(self, model, noise):
+        super().__init__(model)
+        self.noise = noise
+
+    def encode(self, texts, **kwargs):
+        embeddings = self.model.encode(texts)
+        embeddings[:, 0] += self.noise
+        return embeddings
+
+
+def test_setting_defaults_to_torch():
+    """Missing or unknown settings select torch."""
+    assert get_bert_backend({}) == "torch"
+    assert get_bert_backend({"bert_backend": "onnx"}) == "onnx"
+    assert get_bert_backend({"bert_backend": "tpu"}) == "torch"
+
+
+def test_validation_tolerance():
+    """Identical backends agree; perturbed embeddings exceed the tolerance."""
+    reference = TorchBackend(FakeModel())
+    assert validate_backend(TorchBackend(FakeModel()), reference) == 0.0
+    assert validate_backend(NoisyBackend(FakeModel(), 5.0), reference) > BERT_BACKEND_TOLERANCE
+
+
+def test_fallback_to_torch():
+    """Unknown or unusable backends fall back to the torch reference."""
+    model = FakeModel()
+    assert create_backend("torch", model, "fake").name == "torch"
+    assert create_backend("bogus", model, "fake").name == "torch"
+    # FakeModel cannot be quantized or exported (and torch may be missing)
+    assert create_backend("int8", model, "fake").name == "torch"
+    assert create_backend("onnx", model, "fake").name == "torch"
+
+
+def test_onnx_mean_pooling():
+    """ONNX outputs are mean-pooled over non-padding tokens."""
+
+    class FakeSession:
+        def run(self, outputs, feeds):
+            ids = feeds["input_ids"].astype(np.float32)
+            return [np.stack([ids, ids * 2], axis=-1)]
+
+    def fake_tokenizer(texts, **kwargs):
+        ids = np.array([[1, 2, 3], [4, 0, 0]])
+        return {"input_ids": ids, "attention_mask": (ids > 0).astype(np.int64)}
+
+    backend = OnnxBackend.__new__(OnnxBackend)
+    backend.session = FakeSession()
+    backend.tokenizer = fake_tokenizer
+    backend.input_names = ["input_ids", "attention_mask"]
+    backend.max_length = 512
+
+    np.testing.assert_allclose(backend.encode(["a b c", "d"]), [[2.0, 4.0], [4.0, 8.0]])
+
+
+def main():
+    """Run all tests"""
+    test_setting_defaults_to_torch()
+    test_validation_tolerance()
+    test_fallback_to_torch()
+    test_onnx_mean_pooling()
+    print("✅ All BERT backend tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
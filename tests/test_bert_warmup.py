@@ -0,0 +1,93 @@
+"""
+Test the background warm-up of the StrOrigin BERT model.
+
+The model starts loading while files are read and compared; the analysis
+stage must then reuse that load (or wait for it) instead of loading twice.
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.utils.strorigin_analysis as strorigin_analysis
+from src.io.embedding_cache import EmbeddingCache
+from src.utils.strorigin_analysis import StrOriginAnalyzer, warm_up_strorigin_analyzer
+from tests.test_strorigin_batch import FakeModel, PAIRS
+
+
+class SlowAnalyzer(StrOriginAnalyzer):
+    """Analyzer whose model load takes a while and is counted."""
+
+    def __init__(self):
+        super().__init__(model_path="fake-model")
+        self.bert_available = True
+        self.embedding_cache = EmbeddingCache("fake-model", enabled=False)
+        self.load_count = 0
+
+    def _load_backend(self):
+        time.sleep(0.2)
+        self.load_count += 1
+        self.model = FakeModel()
+        self.model_id = "fake-model"
+
+
+def test_concurrent_loads_share_one_model():
+    """Analysis during a warm-up waits for it and reuses the loaded model."""
+    analyzer = SlowAnalyzer()
+    warm_up = threading.Thread(target=analyzer._load_model)
+    warm_up.start()
+    time.sleep(0.05)
+
+    results = analyzer.analyze_batch(PAIRS)
+    warm_up.join()
+
+    assert analyzer.load_count == 1
+    assert len(results) == len(PAIRS)
+
+
+def test_warm_up_loads_shared_analyzer():
+    """warm_up_strorigin_analyzer() loads the shared analyzer's model in the background."""
+    original = strorigin_analysis._shared_analyzer
+    analyzer = SlowAnalyzer()
+    strorigin_analysis._shared_analyzer = analyzer
+    try:
+        thread = warm_up_strorigin_analyzer()
+        assert thread.daemon
+        thread.join(timeout=5)
+        assert analyzer.model is not None
+        assert analyzer.load_count == 1
+
+        # Later analysis finds the model ready
+        analyzer.analyze_batch(PAIRS)
+        assert analyzer.load_count == 1
+    finally:
+        strorigin_analysis._shared_analyzer = original
+
+
+def test_warm_up_skipped_without_bert():
+    """LIGHT version: warm-up does not try to load a model."""
+    original = strorigin_analysis._shared_analyzer
+    analyzer = SlowAnalyzer()
+    analyzer.bert_available = False
+    strorigin_analysis._shared_analyzer = analyzer
+    try:
+        warm_up_strorigin_analyzer().join(timeout=5)
+        assert analyzer.load_count == 0
+    finally:
+        strorigin_analysis._shared_analyzer = original
+
+
+def main():
+    """Run all tests"""
+    test_concurrent_loads_share_one_model()
+    test_warm_up_loads_shared_analyzer()
+    test_warm_up_skipped_without_bert()
+    print("✅ All BERT warm-up tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,7 +18,10 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.core.casting import generate_casting_key, validate_castingkey_columns
+from src.core.casting import (
+    generate_casting_key, generate_casting_key_column, generate_casting_keys,
+    build_speaker_group_lookup, validate_castingkey_columns
+)
 from src.utils.helpers import safe_str
 
 
@@ -192,6 +195,67 @@ def test_previous_row_not_in_current():
     print("✓ test_previous_row_not_in_current")
 
 
+def test_column_api_matches_reference():
+    """Column-wise generation is identical to the per-row reference function."""
+    import itertools
+    import numpy as np
+
+    char_keys = ['CharA', 'chara', '  CharB ', '', None, float('nan'), 'nan', 'Unique_X', 7]
+    voices = ['Voice1', 'UNIQUE_voice', ' unique_lower ', '', None, 'NaN', 'aVoice']
+    groups = ['GroupCharA', 'GROUP_CHARB_X', '', None, 'nan', 'charaa']
+    types = ['aidialog', ' QuestDialog ', 'normal', '', None, 'NAN']
+
+    rows = list(itertools.product(char_keys, voices, groups, types))
+    expected = [generate_casting_key(c, v, g, t) for c, v, g, t in rows]
+    actual = generate_casting_key_column(*[list(col) for col in zip(*rows)])
+    assert actual == expected
+
+    # All-string columns take the vectorized path
+    str_rows = [r for r in rows if all(isinstance(v, str) for v in r)]
+    expected = [generate_casting_key(c, v, g, t) for c, v, g, t in str_rows]
+    actual = generate_casting_key_column(*[np.array(col, dtype=object) for col in zip(*str_rows)])
+    assert actual == expected
+    print("✓ test_column_api_matches_reference")
+
+
+def test_generate_casting_keys_with_current_lookup():
+    """DataFrame API uses CURRENT's Speaker|CharacterGroupKey when given a lookup."""
+    df_prev = pd.DataFrame({
+        'SequenceName': ['Seq1', 'Seq2'],
+        'EventName': ['E1', 'E2'],
+        'CharacterKey': ['CharA', 'CharB'],
+        'DialogVoice': ['Voice1', 'Voice2'],
+        'DialogType': ['normal', 'normal'],
+        'Speaker|CharacterGroupKey': ['Ignored_CharA', 'Ignored_CharB'],
+    })
+    lookup = {('Seq1', 'E1'): 'GroupCharA'}
+
+    assert generate_casting_keys(df_prev, lookup) == ['groupchara', 'charb']
+    assert generate_casting_keys(df_prev) == ['ignored_chara', 'ignored_charb']
+    assert generate_casting_keys(df_prev[['CharacterKey']]) == ['chara', 'charb']
+    print("✓ test_generate_casting_keys_with_current_lookup")
+
+
+def test_speaker_group_lookup_matches_row_loop():
+    """Speaker|CharacterGroupKey lookup matches a row-by-row build (last row wins)."""
+    df_curr = pd.DataFrame({
+        'SequenceName': [' Seq1 ', 'Seq1', 'Seq2', None],
+        'EventName': ['E1', 'E1', 'E2', 'E3'],
+        'Speaker|CharacterGroupKey': ['First', ' Last ', None, 'nan'],
+    })
+    expected = {}
+    for _, row in df_curr.iterrows():
+        key = (safe_str(row.get('SequenceName', '')), safe_str(row.get('EventName', '')))
+        expected[key] = safe_str(row.get('Speaker|CharacterGroupKey', ''))
+
+    assert build_speaker_group_lookup(df_curr) == expected
+    assert build_speaker_group_lookup(df_curr)[('Seq1', 'E1')] == 'Last'
+    assert build_speaker_group_lookup(df_curr[['SequenceName', 'EventName']]) == {
+        ('Seq1', 'E1'): '', ('Seq2', 'E2'): '', ('', 'E3'): ''
+    }
+    print("✓ test_speaker_group_lookup_matches_row_loop")
+
+
 if __name__ == "__main__":
     print("="*70)
     print("CastingKey Speaker|CharacterGroupKey Tests (Phase 4.5.3)")
@@ -204,6 +268,9 @@ if __name__ == "__main__":
     test_castingkey_same_for_both_files()
     test_castingkey_lowercase()
     test_previous_row_not_in_current()
+    test_column_api_matches_reference()
+    test_generate_casting_keys_with_current_lookup()
+    test_speaker_group_lookup_matches_row_loop()
 
     print()
     print("="*70)
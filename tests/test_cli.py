@@ -0,0 +1,114 @@
+"""
+Test the headless command-line runner.
+
+Covers argument/manifest validation and exit codes, and runs a RAW check
+end to end without any tkinter dialog or message box.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cli import main, load_manifest, ManifestError, EXIT_OK, EXIT_FAILED, EXIT_USAGE
+from src.io.frame_cache import get_frame_cache
+
+
+HEADER = ["SequenceName", "EventName", "StrOrigin", "CharacterKey", "DialogVoice",
+          "DialogType", "Group", "STATUS", "Text", "Desc", "StartFrame", "EndFrame"]
+
+
+def write_workbook(path, rows):
+    """Write a header plus rows to an Excel workbook."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(HEADER)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+def write_pair(folder):
+    """Write a PREVIOUS/CURRENT pair and return their paths."""
+    prev_path = os.path.join(folder, "prev.xlsx")
+    curr_path = os.path.join(folder, "curr.xlsx")
+    write_workbook(prev_path, [
+        ["Seq1", "E1", "안녕", "Char1", "Voice1", "", "G1", "POLISHED", "Hello", "", "10", "20"],
+        ["Seq1", "E2", "잘가", "Char2", "Voice2", "", "G1", "RECORDED", "Bye", "", "30", "40"],
+    ])
+    write_workbook(curr_path, [
+        ["Seq1", "E1", "안녕", "Char1", "Voice1", "", "G1", "", "", "", "10", "20"],
+        ["Seq1", "E2", "잘가요", "Char2", "Voice2", "", "G1", "", "", "", "30", "40"],
+        ["Seq1", "E3", "새로운", "Char3", "Voice3", "", "G1", "", "", "", "50", "60"],
+    ])
+    return prev_path, curr_path
+
+
+def test_manifest_validation():
+    """Invalid manifests are rejected; paths resolve against the manifest folder."""
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_path = os.path.join(tmp, "jobs.json")
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({"output_dir": "out", "jobs": [
+                {"process": "raw", "previous": "p.xlsx", "current": "c.xlsx"},
+                {"process": "alllang"},
+            ]}, f)
+        jobs = load_manifest(manifest_path)
+        assert jobs[0]["previous"] == os.path.join(tmp, "p.xlsx")
+        assert jobs[0]["output_dir"] == os.path.join(tmp, "out")
+        assert jobs[1]["process"] == "alllang"
+
+        for bad_jobs in ([{"process": "unknown"}],
+                         [{"process": "master", "source": "s.xlsx"}],
+                         [{"process": "alllang", "curr_kr": "a_KR.xlsx"}],
+                         [{"process": "raw", "previous": "p", "current": "c", "typo": 1}]):
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(bad_jobs, f)
+            try:
+                load_manifest(manifest_path)
+                assert False, bad_jobs
+            except ManifestError:
+                pass
+
+        assert main(["manifest", manifest_path]) == EXIT_USAGE
+
+
+def test_raw_run_and_exit_codes():
+    """A RAW check runs headless; a missing input file fails with exit code 1 and no "cancelled" log."""
+    cache = get_frame_cache()
+    cache_enabled = cache.enabled
+    cache.enabled = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            prev_path, curr_path = write_pair(tmp)
+            out_dir = os.path.join(tmp, "out")
+
+            assert main(["raw", "--previous", prev_path, "--current", curr_path, "-o", out_dir]) == EXIT_OK
+            assert os.listdir(out_dir) == ["curr_diff.xlsx"]
+
+            missing = os.path.join(tmp, "missing.xlsx")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                assert main(["raw", "--previous", missing, "--current", curr_path, "-o", out_dir]) == EXIT_FAILED
+            assert "Invalid inputs - exiting." in output.getvalue()
+            assert "User cancelled" not in output.getvalue()
+    finally:
+        cache.enabled = cache_enabled
+
+
+def main_tests():
+    """Run all tests"""
+    test_manifest_validation()
+    test_raw_run_and_exit_codes()
+    print("✅ All CLI tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_tests())
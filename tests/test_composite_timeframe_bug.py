@@ -185,7 +185,7 @@ def test_raw_composite_timeframe():
     # Build lookups and run comparison
     lookups = build_lookups(df_prev)
     changes, prev_strorigins, changed_cols_map, counter, marked, group_analysis, pass1_results = compare_rows(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     detected_change = changes[0] if changes else "NOTHING"
@@ -229,7 +229,7 @@ def test_working_composite_timeframe():
     # Build lookups and run comparison
     lookups = build_working_lookups(df_prev, "PREVIOUS")
     result, counter, marked, pass1_results, prev_strorigins = process_working_comparison(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     detected_change = result.iloc[0]["CHANGES"] if len(result) > 0 else "NOTHING"
@@ -272,7 +272,7 @@ def test_extended_scenarios():
     # Test RAW processor
     print("\n--- RAW PROCESSOR ---")
     lookups = build_lookups(df_prev)
-    changes, _, _, counter, _, _, _ = compare_rows(df_curr, df_prev, *lookups)
+    changes, _, _, counter, _, _, _ = compare_rows(df_curr, df_prev, lookups)
 
     for i, (idx, row) in enumerate(df_curr.iterrows()):
         seq = row["SequenceName"]
@@ -295,7 +295,7 @@ def test_extended_scenarios():
     # Test WORKING processor
     print("\n--- WORKING PROCESSOR ---")
     lookups_w = build_working_lookups(df_prev, "PREVIOUS")
-    result_w, counter_w, _, _, _ = process_working_comparison(df_curr, df_prev, *lookups_w)
+    result_w, counter_w, _, _, _ = process_working_comparison(df_curr, df_prev, lookups_w)
 
     for idx, row in result_w.iterrows():
         seq = row["SequenceName"]
@@ -0,0 +1,103 @@
+"""
+Test the Parquet/CSV/JSONL data outputs.
+
+Covers format validation and a headless RAW check that writes data files
+instead of the formatted workbook.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cli import main, EXIT_OK, EXIT_USAGE
+from src.io.data_export import parse_output_formats, write_data_files, data_file_name, PARQUET_AVAILABLE
+from src.io.frame_cache import get_frame_cache
+from tests.test_cli import write_pair
+
+
+def test_parse_output_formats():
+    """Formats are normalized, deduplicated and validated."""
+    assert parse_output_formats(None) == ("xlsx",)
+    assert parse_output_formats("") == ("xlsx",)
+    assert parse_output_formats(" CSV, jsonl,csv ") == ("csv", "jsonl")
+    assert parse_output_formats(["xlsx", "jsonl"]) == ("xlsx", "jsonl")
+    for bad in ("xls", "csv,html"):
+        try:
+            parse_output_formats(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    if not PARQUET_AVAILABLE:
+        try:
+            parse_output_formats("parquet")
+            assert False, "parquet without engine"
+        except ValueError:
+            pass
+
+
+def test_write_data_files():
+    """One file per non-empty frame and data format; values round-trip."""
+    df_summary = pd.DataFrame([["Generated", "2025-01-01"], ["New Row", 3]], columns=["Metric", "Value"])
+    frames = {"Comparison": pd.DataFrame({"CHANGES": ["New Row"], "StrOrigin": ["새로운"]}),
+              "Deleted Rows": pd.DataFrame(),
+              "Summary Report": df_summary}
+    formats = ("xlsx", "csv", "jsonl") + (("parquet",) if PARQUET_AVAILABLE else ())
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_data_files(frames, tmp, "curr_diff", formats)
+        assert len(paths) == 2 * (len(formats) - 1)
+        assert data_file_name("curr_diff", "Super Group Word Analysis", "csv") == \
+            "curr_diff_super_group_word_analysis.csv"
+
+        df_csv = pd.read_csv(os.path.join(tmp, "curr_diff_comparison.csv"))
+        assert df_csv["StrOrigin"].tolist() == ["새로운"]
+        with open(os.path.join(tmp, "curr_diff_summary_report.jsonl"), encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert records == [{"Metric": "Generated", "Value": "2025-01-01"}, {"Metric": "New Row", "Value": 3}]
+        if PARQUET_AVAILABLE:
+            df_parquet = pd.read_parquet(os.path.join(tmp, "curr_diff_summary_report.parquet"))
+            assert df_parquet["Value"].tolist() == ["2025-01-01", "3"]
+
+
+def test_raw_run_data_only():
+    """--formats without xlsx skips the workbook and writes the result frames."""
+    cache = get_frame_cache()
+    cache_enabled = cache.enabled
+    cache.enabled = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            prev_path, curr_path = write_pair(tmp)
+            out_dir = os.path.join(tmp, "out")
+
+            args = ["raw", "--previous", prev_path, "--current", curr_path, "-o", out_dir]
+            assert main(["--formats", "csv,jsonl"] + args) == EXIT_OK
+            written = sorted(os.listdir(out_dir))
+            assert "curr_diff.xlsx" not in written
+            assert "curr_diff_comparison.csv" in written
+            assert "curr_diff_summary_report.jsonl" in written
+            assert "curr_diff_super_group_word_analysis.csv" in written
+
+            df_result = pd.read_csv(os.path.join(out_dir, "curr_diff_comparison.csv"))
+            assert len(df_result) == 3
+            assert "CHANGES" in df_result.columns
+
+            assert main(["--formats", "pdf"] + args) == EXIT_USAGE
+    finally:
+        cache.enabled = cache_enabled
+
+
+def main_tests():
+    """Run all tests"""
+    test_parse_output_formats()
+    test_write_data_files()
+    test_raw_run_data_only()
+    print("✅ All data export tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_tests())
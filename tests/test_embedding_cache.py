@@ -0,0 +1,111 @@
+"""
+Test the persistent StrOrigin embedding cache.
+
+A repeat analysis over unchanged texts must not run the model again, the
+embedding matrix must stay under its size cap, and a busy lock must only
+disable the cache, never fail the analysis.
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.embedding_cache import EmbeddingCache, embedding_text_key
+from src.utils.strorigin_analysis import StrOriginAnalyzer, calculate_semantic_similarities
+from tests.test_strorigin_batch import FakeModel, PAIRS
+
+DIM = 8
+
+
+def make_analyzer(model, cache):
+    """Analyzer in FULL mode using the fake model and the given cache."""
+    analyzer = StrOriginAnalyzer()
+    analyzer.bert_available = True
+    analyzer.model = model
+    analyzer.embedding_cache = cache
+    return analyzer
+
+
+def test_repeat_run_skips_inference():
+    """The second run reuses every embedding and gives identical results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        first_model = FakeModel()
+        first = make_analyzer(first_model, EmbeddingCache("fake", cache_dir=tmp)).analyze_batch(PAIRS)
+        assert first_model.calls
+
+        second_model = FakeModel()
+        cache = EmbeddingCache("fake", cache_dir=tmp)
+        second = make_analyzer(second_model, cache).analyze_batch(PAIRS)
+        assert second == first
+        assert second_model.calls == []
+        assert cache.misses == 0 and cache.hits > 0
+
+        # Another model never sees these embeddings
+        assert EmbeddingCache("other-model", cache_dir=tmp).get_many(["abc"]) == {}
+
+
+class FractionalModel(FakeModel):
+    """FakeModel whose embeddings are not exactly representable in float16."""
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        return super().encode(texts, **kwargs) / np.float32(3.0) + np.float32(1e-4)
+
+
+def test_first_run_uses_full_precision():
+    """Freshly encoded texts are not rounded to the cache's float16."""
+    with tempfile.TemporaryDirectory() as tmp:
+        uncached = calculate_semantic_similarities(PAIRS, FractionalModel())
+        first = calculate_semantic_similarities(PAIRS, FractionalModel(), cache=EmbeddingCache("fake", cache_dir=tmp))
+        np.testing.assert_array_equal(first, uncached)
+
+        second = calculate_semantic_similarities(PAIRS, FractionalModel(), cache=EmbeddingCache("fake", cache_dir=tmp))
+        np.testing.assert_allclose(second, uncached, atol=1e-3)
+
+
+def test_size_cap_evicts_least_recently_used():
+    """The matrix never exceeds the cap; recently used texts survive."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache("fake", cache_dir=tmp, max_bytes=4 * DIM * 2)  # 4 rows
+        vectors = np.eye(DIM, dtype=np.float32)
+
+        cache.put_many(["a", "b", "c", "d"], vectors[:4])
+        assert set(cache.get_many(["a"])) == {"a"}  # "a" is now most recent
+        cache.put_many(["e", "f"], vectors[4:6])
+
+        found = cache.get_many(["a", "b", "c", "d", "e", "f"])
+        assert set(found) == {"a", "d", "e", "f"}
+        np.testing.assert_array_equal(found["e"], vectors[4])
+        assert os.path.getsize(cache._vectors_path) <= 4 * DIM * 2
+
+
+def test_normalized_keys_and_busy_lock():
+    """Whitespace variants share a key; a held lock disables the cache."""
+    assert embedding_text_key("안녕  하세요 ") == embedding_text_key("안녕 하세요")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache("fake", cache_dir=tmp)
+        cache.put_many(["x"], np.ones((1, DIM)))
+        with open(cache._lock_path, 'w') as f:
+            f.write("busy")
+        assert cache.get_many(["x"]) == {}
+        cache.put_many(["y"], np.ones((1, DIM)))
+        os.remove(cache._lock_path)
+        assert set(cache.get_many(["x", "y"])) == {"x"}
+
+
+def main():
+    """Run all tests"""
+    test_repeat_run_skips_inference()
+    test_first_run_uses_full_precision()
+    test_size_cap_evicts_least_recently_used()
+    test_normalized_keys_and_busy_lock()
+    print("✅ All embedding cache tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -181,18 +181,13 @@ def approach_b_10key_matching(df_prev, df_curr):
         df[COL_CASTINGKEY] = casting_keys
 
     # Build lookups
-    (prev_lookup_se, prev_lookup_so, prev_lookup_sc, prev_lookup_eo,
-     prev_lookup_ec, prev_lookup_oc, prev_lookup_seo, prev_lookup_sec,
-     prev_lookup_soc, prev_lookup_eoc) = build_lookups(df_prev)
+    prev_index = build_lookups(df_prev)
 
-    print(f"  → Built 10-key lookups for {len(prev_lookup_se)} unique PREVIOUS rows")
+    print(f"  → Built 10-key lookups for {prev_index.unique_count('SE')} unique PREVIOUS rows")
 
     # Run TWO-PASS comparison
     changes, previous_strorigins, changed_columns_map, counter, marked_prev_indices, group_analysis, pass1_results = compare_rows(
-        df_curr, df_prev,
-        prev_lookup_se, prev_lookup_so, prev_lookup_sc,
-        prev_lookup_eo, prev_lookup_ec, prev_lookup_oc,
-        prev_lookup_seo, prev_lookup_sec, prev_lookup_soc, prev_lookup_eoc
+        df_curr, df_prev, prev_index
     )
 
     print(f"  → Matched {len(marked_prev_indices)} rows using 10-key system")
@@ -0,0 +1,144 @@
+"""
+Test streaming Excel ingestion in safe_read_excel.
+
+The read-only streaming reader with batched column normalization must
+produce exactly the same DataFrame as a full workbook load followed by
+cell-by-cell cleaning with safe_str.
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.io.excel_reader as excel_reader
+from src.io.excel_reader import safe_read_excel
+from src.utils.helpers import safe_str
+
+
+def reference_read_excel(filepath):
+    """Full in-memory load with per-cell cleaning (previous implementation)."""
+    wb = load_workbook(filepath, data_only=True)
+    data = list(wb.active.values)
+    wb.close()
+    df = pd.DataFrame(data[1:], columns=data[0])
+    for col in df.columns:
+        df[col] = df[col].apply(safe_str)
+    for col in ["StartFrame", "EndFrame"]:
+        if col in df.columns:
+            df[col] = df[col].apply(
+                lambda x: x.rstrip("0").rstrip(".").strip() if "." in x else x
+            )
+    for col in df.columns:
+        df[col] = df[col].apply(lambda x: "" if safe_str(x).upper() in ["NONE", "NAN", ""] else safe_str(x))
+    return df
+
+
+def write_workbook(rows):
+    """Write rows to a temporary workbook and return its path."""
+    wb = Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    handle, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(handle)
+    wb.save(path)
+    return path
+
+
+def test_streaming_matches_reference():
+    """Mixed value types normalize identically to the cell-by-cell path."""
+    rows = [
+        ["SequenceName", "EventName", "StrOrigin", "StartFrame", "EndFrame", "Text"],
+        ["Seq1", "E1", "  안녕하세요 ", 100, 200.50, "Hello"],
+        ["Seq1", "E2", None, 7, None, "nan"],
+        ["Seq2", 12345, "None", 10.0, "30.000", True],
+        ["Seq2", "E4", "NaN", None, 5, datetime(2024, 1, 2, 3, 4, 5)],
+        [None, None, None, None, None, None],
+        ["Seq3", "E5", "text", "", " 42 ", "   "],
+    ]
+    path = write_workbook(rows)
+    try:
+        actual = safe_read_excel(path)
+        expected = reference_read_excel(path)
+    finally:
+        os.remove(path)
+
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.shape == expected.shape
+    assert actual.values.tolist() == expected.values.tolist()
+    assert actual.loc[0, "EndFrame"] == "200.5"
+    assert actual.loc[1, "Text"] == ""
+
+
+def test_ragged_rows_are_padded():
+    """Rows shorter than the header are padded with empty strings."""
+    path = write_workbook([
+        ["SequenceName", "EventName", "StrOrigin"],
+        ["Seq1"],
+        ["Seq1", "E2", "text"],
+    ])
+    try:
+        df = safe_read_excel(path)
+    finally:
+        os.remove(path)
+
+    assert df.shape == (2, 3)
+    assert df.iloc[0].tolist() == ["Seq1", "", ""]
+
+
+def test_chunk_boundaries_do_not_change_result():
+    """Small chunks (columns widened and types mixed across chunks) match one chunk."""
+    path = write_workbook([
+        ["SequenceName", "EventName", "StartFrame"],
+        ["Seq1", "E1", 100],
+        ["Seq1", "E2", None],
+        ["Seq2", 7, 10.0],
+        ["Seq2", "E4", None, "extra", 3],
+        [None],
+        ["Seq3", "E5", datetime(2024, 1, 2), None, 4.5],
+    ])
+    chunk_rows = excel_reader.READ_CHUNK_ROWS
+    try:
+        expected = safe_read_excel(path)
+        excel_reader.READ_CHUNK_ROWS = 2
+        actual = safe_read_excel(path)
+    finally:
+        excel_reader.READ_CHUNK_ROWS = chunk_rows
+        os.remove(path)
+
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual.shape == (6, 5)
+    assert actual.iloc[0].tolist() == ["Seq1", "E1", "100", "", ""]
+    assert actual.iloc[3].tolist() == ["Seq2", "E4", "", "extra", "3.0"]  # Column inferred as float (4.5)
+
+
+def test_header_only_file():
+    """A file with only a header row yields an empty frame with columns."""
+    path = write_workbook([["SequenceName", "EventName"]])
+    try:
+        df = safe_read_excel(path)
+    finally:
+        os.remove(path)
+
+    assert list(df.columns) == ["SequenceName", "EventName"]
+    assert len(df) == 0
+
+
+def main():
+    """Run all tests"""
+    test_streaming_matches_reference()
+    test_ragged_rows_are_padded()
+    test_chunk_boundaries_do_not_change_result()
+    test_header_only_file()
+    print("✅ All excel reader tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Test the on-disk frame cache for parsed VRS workbooks.
+
+Verifies cache hits return the same DataFrame as a fresh parse, that keys
+change when the source file changes, that LRU eviction honours the size cap,
+and that batches of workbooks read concurrently match one-by-one reads.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.frame_cache import FrameCache, load_vrs_frame, load_vrs_frames
+
+
+def write_workbook(path, rows):
+    """Write rows to an Excel workbook."""
+    wb = Workbook()
+    ws = wb.active
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+SAMPLE_ROWS = [
+    ["SequenceName", "EventName", "StrOrigin", "CharacterKey", "DialogVoice",
+     "Speaker|CharacterGroupKey", "DialogType", "Status"],
+    ["Seq1", "E1", "안녕", "Char1", "Voice1", "group_char1", "", "polished"],
+    ["Seq1", "E1", "안녕", "Char1", "Voice1", "group_char1", "", "polished"],
+    ["Seq1", "E2", "잘가", "Char2", "Voice2", "", "aidialog", "recorded"],
+]
+
+
+def test_cache_hit_matches_fresh_read():
+    """A cached frame is identical to the frame built on a miss."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vrs.xlsx")
+        write_workbook(path, SAMPLE_ROWS)
+        cache = FrameCache(cache_dir=os.path.join(tmp, "cache"))
+
+        fresh = load_vrs_frame(path, "TEST", with_casting_key=True, cache=cache)
+        cached = load_vrs_frame(path, "TEST", with_casting_key=True, cache=cache)
+
+        pd.testing.assert_frame_equal(fresh, cached)
+        assert len(fresh) == 2  # Full duplicate removed
+        assert "STATUS" in fresh.columns
+        assert fresh["CastingKey"].tolist() == ["group_char1", "voice2"]
+
+
+def test_variants_and_content_change_use_different_keys():
+    """Different variants and modified files never share a cache entry."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vrs.xlsx")
+        write_workbook(path, SAMPLE_ROWS)
+        cache = FrameCache(cache_dir=os.path.join(tmp, "cache"))
+
+        key_normalized = cache.make_key(path, "normalized")
+        key_casting = cache.make_key(path, "castingkey")
+        assert key_normalized != key_casting
+        assert cache.make_key(path, "normalized") == key_normalized
+
+        write_workbook(path, SAMPLE_ROWS[:2])
+        assert cache.make_key(path, "normalized") != key_normalized
+
+
+def test_lru_eviction_respects_size_cap():
+    """The least recently used entry is evicted first."""
+    with tempfile.TemporaryDirectory() as tmp:
+        df = pd.DataFrame({"A": ["x" * 100] * 200})
+        cache = FrameCache(cache_dir=tmp, max_bytes=10 ** 9)
+        cache.put("first", df)
+        cache.put("second", df)
+        entry_size = max(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+
+        # Age both entries, then read "first" so "second" is least recently used
+        past = time.time() - 3600
+        for name in os.listdir(tmp):
+            os.utime(os.path.join(tmp, name), (past, past))
+        assert cache.get("first") is not None
+
+        cache.max_bytes = entry_size * 2
+        cache.put("third", df)
+
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
+
+
+def test_disabled_cache_never_stores():
+    """A disabled cache always misses and writes nothing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FrameCache(cache_dir=tmp, enabled=False)
+        cache.put("key", pd.DataFrame({"A": ["1"]}))
+        assert cache.get("key") is None
+        assert os.listdir(tmp) == []
+
+
+def test_never_pickles():
+    """Frames Feather cannot store are not cached; pickle files are never loaded."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FrameCache(cache_dir=tmp)
+        cache.put("indexed", pd.DataFrame({"A": ["1", "2"]}, index=[5, 7]))
+        assert os.listdir(tmp) == []
+
+        pd.DataFrame({"A": ["1"]}).to_pickle(os.path.join(tmp, "planted.pkl"))
+        assert cache.get("planted") is None
+
+
+def test_concurrent_batch_matches_single_reads():
+    """A parallel batch returns the same frames, in order, and fills the cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for number in range(3):
+            path = os.path.join(tmp, f"vrs{number}.xlsx")
+            write_workbook(path, SAMPLE_ROWS[:2 + number])
+            paths.append(path)
+        requests = [(paths[0], "A", True), (paths[1], "B", False), (paths[2], "C", True)]
+        cache = FrameCache(cache_dir=os.path.join(tmp, "cache"))
+
+        expected = [load_vrs_frame(path, label, with_casting_key=casting, cache=FrameCache(enabled=False))
+                    for path, label, casting in requests]
+        parallel = load_vrs_frames(requests, cache=cache, workers=3)
+        for df_expected, df_parallel in zip(expected, parallel):
+            pd.testing.assert_frame_equal(df_expected, df_parallel)
+        assert len(os.listdir(os.path.join(tmp, "cache"))) == 3
+
+        cached = load_vrs_frames(requests, cache=cache, workers=3)
+        for df_expected, df_cached in zip(expected, cached):
+            pd.testing.assert_frame_equal(df_expected, df_cached)
+
+
+def main():
+    """Run all tests"""
+    test_cache_hit_matches_fresh_read()
+    test_variants_and_content_change_use_different_keys()
+    test_lru_eviction_respects_size_cap()
+    test_disabled_cache_never_stores()
+    test_never_pickles()
+    test_concurrent_batch_matches_single_reads()
+    print("✅ All frame cache tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Test the column-wise import rule tables.
+
+apply_import_rules() must give every row exactly what the per-row import
+logic gives it: same imported columns and values, and untouched columns
+where a row's rule imports nothing.
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.import_logic import (
+    WORKING_IMPORT_RULES, ALLLANG_IMPORT_RULES, apply_import_logic, apply_import_rules,
+    previous_data_values, add_change_columns
+)
+from src.utils.helpers import safe_str, generate_previous_data
+
+CHANGE_TYPES = [
+    "New Row", "No Change", "No Relevant Change", "StrOrigin Change", "EventName+StrOrigin Change",
+    "Desc Change", "Desc+TimeFrame Change", "TimeFrame Change", "EventName Change", "CastingKey Change",
+]
+
+
+def alllang_reference(curr_row, prev_row, change_type, lang_suffix):
+    """Per-row All Language import logic (previous implementation)."""
+    result = {}
+    text_col = f"Text_{lang_suffix}"
+    status_col = f"STATUS_{lang_suffix}"
+    freememo_col = f"FREEMEMO_{lang_suffix}"
+    if prev_row:
+        result[freememo_col] = safe_str(prev_row.get("FREEMEMO", ""))
+    if change_type == "New Row":
+        return result
+    prev_status = safe_str(prev_row.get("STATUS", "")) if prev_row else ""
+    if "StrOrigin" in change_type:
+        if prev_status:
+            result[text_col] = safe_str(prev_row.get("Text", "")) if prev_row else ""
+            result[status_col] = prev_status
+            result["StrOrigin"] = safe_str(prev_row.get("StrOrigin", "")) if prev_row else ""
+        else:
+            result[text_col] = safe_str(curr_row.get(text_col, ""))
+    else:
+        result[text_col] = safe_str(prev_row.get("Text", "")) if prev_row else ""
+        result[status_col] = prev_status
+    return result
+
+
+def make_cases():
+    """Every change type against previous rows with/without status and NO TRANSLATION, plus no match."""
+    prev_rows = [
+        {"Text": " old text ", "Desc": "old desc", "STATUS": "FINAL", "StrOrigin": "옛날", "FREEMEMO": "memo",
+         "StartFrame": "10"},
+        {"Text": "old text", "Desc": None, "STATUS": "", "StrOrigin": "옛날", "FREEMEMO": np.nan, "StartFrame": "1"},
+        {"Text": "NO TRANSLATION", "Desc": "d", "STATUS": "RECORDED", "StrOrigin": "x", "FREEMEMO": "m",
+         "StartFrame": ""},
+        None,
+    ]
+    cases = list(itertools.product(CHANGE_TYPES, range(len(prev_rows))))
+    df_curr = pd.DataFrame({
+        "Text": [" new text " if i % 2 else np.nan for i in range(len(cases))],
+        "Text_KR": ["현재 " for _ in cases],
+        "Desc": ["new desc"] * len(cases),
+        "STATUS": [None] * len(cases),
+        "StrOrigin": ["새로운"] * len(cases),
+        "FREEMEMO": ["current memo"] * len(cases),
+        "STATUS_KR": ["POLISHED"] * len(cases),
+        "FREEMEMO_KR": [""] * len(cases),
+    })
+    df_prev = pd.DataFrame([row for row in prev_rows if row is not None], index=[7, 8, 9])
+    positions = np.array([-1 if prev_rows[i] is None else i for _, i in cases], dtype=np.int64)
+    changes = [change for change, _ in cases]
+    prev_dicts = [prev_rows[i] for _, i in cases]
+    return df_curr, df_prev, changes, positions, prev_dicts
+
+
+def expected_frame(df_curr, changes, prev_dicts, apply_row):
+    """Result of applying per-row import logic to every row."""
+    rows = []
+    for curr_row, change, prev_row in zip(df_curr.to_dict("records"), changes, prev_dicts):
+        row = dict(curr_row)
+        row.update(apply_row(curr_row, prev_row, change))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def test_working_rules_match_per_row_logic():
+    """WORKING_IMPORT_RULES reproduce apply_import_logic"""
+    df_curr, df_prev, changes, positions, prev_dicts = make_cases()
+    expected = expected_frame(df_curr, changes, prev_dicts, apply_import_logic)
+
+    actual = df_curr.copy()
+    apply_import_rules(actual, changes, df_prev, positions, WORKING_IMPORT_RULES)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_alllang_rules_match_per_row_logic():
+    """ALLLANG_IMPORT_RULES reproduce the per-language All Language logic"""
+    df_curr, df_prev, changes, positions, prev_dicts = make_cases()
+    expected = expected_frame(df_curr, changes, prev_dicts,
+                              lambda curr, prev, change: alllang_reference(curr, prev, change, "KR"))
+
+    actual = df_curr.copy()
+    apply_import_rules(actual, changes, df_prev, positions, ALLLANG_IMPORT_RULES,
+                       {"Text": "Text_KR", "STATUS": "STATUS_KR", "FREEMEMO": "FREEMEMO_KR"})
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_missing_columns_only_created_when_imported():
+    """A field missing from the result frame is added only if some row imports it"""
+    df_curr = pd.DataFrame({"Text": ["a", "b"], "StrOrigin": ["o", "o"]})
+    df_prev = pd.DataFrame({"Text": ["old"], "STATUS": ["FINAL"], "Desc": ["d"]})
+
+    new_rows = df_curr.copy()
+    apply_import_rules(new_rows, ["New Row", "New Row"], df_prev, [-1, -1], WORKING_IMPORT_RULES)
+    assert list(new_rows.columns) == ["Text", "StrOrigin"]
+
+    matched = df_curr.copy()
+    apply_import_rules(matched, ["No Change", "New Row"], df_prev, [0, -1], WORKING_IMPORT_RULES)
+    assert matched["Desc"].iloc[0] == "d" and pd.isna(matched["Desc"].iloc[1])
+    assert matched["FREEMEMO"].iloc[0] == "" and pd.isna(matched["FREEMEMO"].iloc[1])
+
+
+def test_source_frame_not_modified():
+    """Importing into a copy of a frame leaves the original untouched"""
+    df_curr = pd.DataFrame({"Text": ["current"], "STATUS": ["NEW"], "FREEMEMO": ["memo"]}, dtype=str)
+    original = df_curr.copy(deep=True)
+    df_prev = pd.DataFrame({"Text": ["previous"], "STATUS": ["FINAL"], "FREEMEMO": ["old memo"]}, dtype=str)
+
+    result = df_curr.reset_index(drop=True)
+    apply_import_rules(result, ["No Change"], df_prev, [0], WORKING_IMPORT_RULES)
+    assert result["Text"].iloc[0] == "previous"
+    pd.testing.assert_frame_equal(df_curr, original)
+
+
+def test_previous_data_values_match_per_row():
+    """previous_data_values matches generate_previous_data"""
+    _, df_prev, _, positions, prev_dicts = make_cases()
+    expected = [generate_previous_data(row, "Text", "STATUS", "FREEMEMO") for row in prev_dicts]
+    assert previous_data_values(df_prev, positions).tolist() == expected
+    assert previous_data_values(None, [-1, -1]).tolist() == ["", ""]
+
+
+def test_change_columns():
+    """Change columns: priority label, PreviousEventName on EventName changes, PreviousText on matches"""
+    df_prev = pd.DataFrame({"EventName": ["OldEvent", "E2"], "Text": [" old ", "other"]})
+    changes = ["EventName+StrOrigin Change", "No Change", "New Row"]
+    df = pd.DataFrame({"Text": ["a", "b", "c"]})
+
+    add_change_columns(df, changes, df_prev, [0, 1, -1], use_priority_change=True)
+    assert list(df["DETAILED_CHANGES"]) == changes
+    assert list(df["CHANGES"]) == ["StrOrigin Change", "No Change", "New Row"]
+    assert list(df["PreviousEventName"]) == ["OldEvent", "", ""]
+    assert list(df["PreviousText"]) == ["old", "other", ""]
+
+    add_change_columns(df, changes, df_prev, [0, 1, -1], use_priority_change=False)
+    assert list(df["CHANGES"]) == changes
+
+
+def main():
+    """Run all tests"""
+    test_working_rules_match_per_row_logic()
+    test_alllang_rules_match_per_row_logic()
+    test_missing_columns_only_created_when_imported()
+    test_source_frame_not_modified()
+    test_previous_data_values_match_per_row()
+    test_change_columns()
+    print("✅ All import rule tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
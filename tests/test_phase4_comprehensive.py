@@ -402,7 +402,7 @@ def test_working_processor_phase4():
     # Build lookups and run WORKING processor
     lookups = build_working_lookups(df_prev, "PREVIOUS")
     df_result, counter, marked, pass1_results, prev_strorigins = process_working_comparison(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     # Validate results
@@ -563,7 +563,7 @@ def test_all_standalone_types():
 
     lookups = build_working_lookups(df_prev, "PREVIOUS")
     df_result, counter, marked, pass1_results, prev_strorigins = process_working_comparison(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     passed = 0
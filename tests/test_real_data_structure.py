@@ -247,7 +247,7 @@ def test_working_processor_with_real_structure():
     # Process comparison
     print("\n3. Running Working comparison (TWO-PASS)...")
     result, counter, marked, pass1_results, previous_strorigins = process_working_comparison(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     print(f"   Result rows: {len(result)}")
@@ -335,7 +335,7 @@ def test_raw_processor_with_real_structure():
     # Process comparison
     print("\n3. Running RAW comparison (TWO-PASS)...")
     changes, previous_strorigins, changed_cols_map, counter, marked, group_analysis, pass1_results = compare_rows(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     print(f"   Changes returned: {len(changes)}")
@@ -0,0 +1,105 @@
+"""
+Test positional and batch row comparison.
+
+RowComparator must return exactly the labels and changed character group
+columns that detect_all_field_changes / get_changed_char_cols return for the
+same pair of rows, both pair by pair and through the batch bitmask engine.
+"""
+
+import itertools
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.change_detection import (
+    RowComparator, CHANGE_LABELS, detect_all_field_changes, get_changed_char_cols
+)
+
+
+def make_frames():
+    """Current/previous frames with differing core, metadata and group columns."""
+    df_curr = pd.DataFrame({
+        "SequenceName": ["Seq1", "Seq1", "Seq2", "Seq3"],
+        "EventName": ["E1", "E2", "E3", "E4"],
+        "StrOrigin": ["안녕", "hello", "잘가 ", "nan"],
+        "CastingKey": ["c1", "c2", "c3", "c4"],
+        "Desc": ["d", "", "d2", ""],
+        "StartFrame": ["10", "20", "30", "40"],
+        "Tribe": ["Human", "Elf", "", "Orc"],
+        "Age": ["Adult", "", "Child", ""],
+        "CurrentOnly": ["x", "y", "z", "w"],
+    }, index=[5, 6, 7, 8])
+    df_prev = pd.DataFrame({
+        "SequenceName": ["Seq1", "Seq9", "Seq2"],
+        "EventName": ["E1", "E2", "E30"],
+        "StrOrigin": ["안녕", "hello", "잘가"],
+        "CastingKey": ["c1", "c9", "c3"],
+        "Desc": ["d", "x", "d2"],
+        "StartFrame": ["10", "21", "30"],
+        "Tribe": ["Human", "Dwarf", ""],
+        "Age": ["Adult", "", "Elder"],
+    })
+    return df_curr, df_prev
+
+
+def test_matches_row_based_detection():
+    """Every current/previous pair gives the same label and char columns."""
+    df_curr, df_prev = make_frames()
+    comparator = RowComparator(df_curr, df_prev)
+
+    for curr_pos, prev_pos in itertools.product(range(len(df_curr)), range(len(df_prev))):
+        curr_row = df_curr.iloc[curr_pos]
+        prev_row = df_prev.iloc[prev_pos]
+        for require_korean in (None, curr_row["StrOrigin"]):
+            expected = detect_all_field_changes(curr_row, prev_row, df_curr, df_prev, require_korean=require_korean)
+            actual = comparator.detect(curr_pos, prev_pos, require_korean=require_korean)
+            assert actual == expected, (curr_pos, prev_pos, actual, expected)
+        assert comparator.changed_char_cols(curr_pos, prev_pos) == \
+            get_changed_char_cols(curr_row, prev_row, df_curr, df_prev)
+
+
+def test_batch_matches_pairwise():
+    """compare_batch over all aligned pairs equals pair-by-pair detection."""
+    df_curr, df_prev = make_frames()
+    comparator = RowComparator(df_curr, df_prev)
+    pairs = list(itertools.product(range(len(df_curr)), range(len(df_prev))))
+
+    labels, char_lists = comparator.compare_batch([c for c, _ in pairs], [p for _, p in pairs])
+    assert labels == [comparator.detect(c, p) for c, p in pairs]
+    assert char_lists == [comparator.changed_char_cols(c, p) for c, p in pairs]
+    assert comparator.compare_batch([], []) == ([], [])
+
+
+def test_label_table():
+    """The label table follows the canonical composite order."""
+    assert CHANGE_LABELS[0] == "No Change"
+    assert CHANGE_LABELS[1] == "CharacterGroup Change"
+    assert CHANGE_LABELS[2 | 4 | 64] == "EventName+StrOrigin+TimeFrame Change"
+
+
+def test_clean_columns():
+    """Columns are cleaned like safe_str, with a default for missing columns."""
+    df_curr, df_prev = make_frames()
+    comparator = RowComparator(df_curr, df_prev)
+
+    assert comparator.curr_column("StrOrigin") == ["안녕", "hello", "잘가", ""]
+    assert comparator.curr_column("CurrentOnly") == ["x", "y", "z", "w"]
+    assert comparator.prev_column("Group", "Unknown") == ["Unknown"] * 3
+    assert comparator.detect(0, 0) == "No Change"
+
+
+def main():
+    """Run all tests"""
+    test_matches_row_based_detection()
+    test_batch_matches_pairwise()
+    test_label_table()
+    test_clean_columns()
+    print("✅ All row comparator tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
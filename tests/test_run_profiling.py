@@ -0,0 +1,116 @@
+"""
+Test the per-stage run instrumentation.
+
+Covers nested stage records, the no-op outside a run, the JSON trace of a
+headless RAW check and attaching timings to a history record.
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cli import main, EXIT_OK
+from src.history import history_manager
+from src.io.frame_cache import get_frame_cache
+from src.utils.profiling import RunProfile, profile_stage, start_run_profile, stop_run_profile
+from tests.test_cli import write_pair
+
+
+def test_nested_stages():
+    """Stages are recorded in start order with their parent path."""
+    profile = RunProfile("TEST")
+    with profile.stage("process data"):
+        with profile.stage("PASS 1"):
+            sum(range(10000))
+    stages = profile.to_dict()["stages"]
+    assert [s["stage"] for s in stages] == ["process data", "process data/PASS 1"]
+    assert [s["depth"] for s in stages] == [0, 1]
+    for record in stages:
+        assert record["wall_seconds"] >= 0
+        assert record["cpu_seconds"] >= 0
+    assert stages[0]["wall_seconds"] >= stages[1]["wall_seconds"]
+
+
+def test_profile_stage_outside_run():
+    """profile_stage() records into the active run only."""
+    with profile_stage("ignored") as record:
+        assert record is None
+
+    profile = start_run_profile("TEST")
+    try:
+        with profile_stage("lookup build") as record:
+            assert record is not None
+    finally:
+        stop_run_profile()
+    with profile_stage("ignored"):
+        pass
+    assert [s["stage"] for s in profile.stages] == ["lookup build"]
+
+
+def test_raw_run_trace():
+    """A headless RAW check writes a trace covering every step and sub-stage."""
+    cache = get_frame_cache()
+    cache_enabled = cache.enabled
+    cache.enabled = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            prev_path, curr_path = write_pair(tmp)
+            out_dir = os.path.join(tmp, "out")
+            trace_dir = os.path.join(tmp, "traces")
+
+            assert main(["--trace-dir", trace_dir, "raw", "--previous", prev_path,
+                         "--current", curr_path, "-o", out_dir]) == EXIT_OK
+            assert os.listdir(trace_dir) == ["curr_diff_trace.json"]
+            with open(os.path.join(trace_dir, "curr_diff_trace.json"), encoding="utf-8") as f:
+                trace = json.load(f)
+
+            stages = [s["stage"] for s in trace["stages"]]
+            for stage in ("select files", "read files", "process data", "write output", "show summary",
+                          "process data/lookup build", "process data/PASS 1", "process data/PASS 2",
+                          "process data/deleted-row scan", "write output/StrOrigin analysis",
+                          "write output/formatting"):
+                assert stage in stages, stage
+            assert all("wall_seconds" in s and "peak_rss_mb" in s for s in trace["stages"])
+    finally:
+        cache.enabled = cache_enabled
+
+
+def test_history_record_update():
+    """Timings are added to the matching history record."""
+    get_history_file_path = history_manager.get_history_file_path
+    with tempfile.TemporaryDirectory() as tmp:
+        history_manager.get_history_file_path = lambda process_type="master": os.path.join(tmp, "history.json")
+        try:
+            older = {"timestamp": "2025-01-01 10:00:00", "output_file": "a.xlsx"}
+            record = {"timestamp": "2025-01-01 11:00:00", "output_file": "b.xlsx"}
+            history_manager.append_update_record(dict(older), "working")
+            history_manager.append_update_record(dict(record), "working")
+
+            stages = [{"stage": "read files", "wall_seconds": 1.5}]
+            assert history_manager.update_update_record(record, "working", performance=stages)
+            updates = history_manager.load_update_history("working")["updates"]
+            assert "performance" not in updates[0]
+            assert updates[1]["performance"] == stages
+            assert record["performance"] == stages
+
+            missing = {"timestamp": "2025-01-01 12:00:00", "output_file": "c.xlsx"}
+            assert not history_manager.update_update_record(missing, "working", performance=stages)
+        finally:
+            history_manager.get_history_file_path = get_history_file_path
+
+
+def main_tests():
+    """Run all tests"""
+    test_nested_stages()
+    test_profile_stage_outside_run()
+    test_raw_run_trace()
+    test_history_record_update()
+    print("✅ All run profiling tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_tests())
@@ -0,0 +1,134 @@
+"""
+Test the parallel batch scheduler.
+
+Covers memory estimates, admission control, output conflict detection and a
+parallel run of two RAW checks with its consolidated report.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import SCHEDULER_MEMORY_FACTOR, SCHEDULER_JOB_OVERHEAD_MB
+import src.scheduler as scheduler
+from src.scheduler import (
+    JobScheduler, OutputConflictError, bert_model_bytes, check_output_conflicts, estimate_job_memory, MB
+)
+from tests.test_cli import write_pair
+
+
+def test_memory_estimate():
+    """Estimates scale with input sizes on top of the worker and model overhead."""
+    overhead = SCHEDULER_JOB_OVERHEAD_MB * MB
+    with tempfile.TemporaryDirectory() as tmp:
+        prev_path, curr_path = write_pair(tmp)
+        job = {"process": "raw", "previous": prev_path, "current": curr_path}
+        inputs = (os.path.getsize(prev_path) + os.path.getsize(curr_path)) * SCHEDULER_MEMORY_FACTOR
+        assert estimate_job_memory(job) == inputs + overhead + bert_model_bytes()
+        # MASTER jobs never load the KR-SBERT model; missing files count as zero
+        assert estimate_job_memory({"process": "master", "source": "nope", "target": "nope"}) == overhead
+        assert estimate_job_memory({"process": "raw", "previous": "nope", "current": "nope"}) == (
+            overhead + bert_model_bytes()
+        )
+
+
+def test_model_size_without_importing_torch():
+    """Sizing the model for an estimate does not import torch in the scheduler process."""
+    code = "import sys; from src.scheduler import bert_model_bytes; bert_model_bytes(); print('torch' in sys.modules)"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    completed = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == "False"
+
+
+def test_admission_control():
+    """Jobs start only while workers and memory budget allow; one job always runs."""
+    scheduler = JobScheduler(workers=2, memory_budget=100)
+    assert scheduler._admits(500, 0, 0)        # Oversized job runs alone
+    assert not scheduler._admits(60, 50, 1)    # Would exceed the budget
+    assert scheduler._admits(50, 50, 1)
+    assert not scheduler._admits(1, 0, 2)      # No free worker
+    scheduler.memory_budget = None             # Unknown available memory: no limit
+    assert scheduler._admits(10 ** 12, 10 ** 12, 1)
+
+
+def test_output_conflicts():
+    """Parallel jobs may not write the same output file."""
+    jobs = [
+        {"process": "raw", "previous": "/a/p.xlsx", "current": "/a/c.xlsx", "output_dir": "/out"},
+        {"process": "working", "previous": "/a/p.xlsx", "current": "/a/c.xlsx", "output_dir": "/out"},
+    ]
+    check_output_conflicts(jobs)
+    for conflicting in (
+        jobs + [{"process": "raw", "previous": "/b/p.xlsx", "current": "/b/c.xlsx", "output_dir": "/out"}],
+        [{"process": "master", "source": "s", "target": "t", "output_dir": "/out"}] * 2,
+    ):
+        try:
+            check_output_conflicts(conflicting)
+            assert False, conflicting
+        except OutputConflictError:
+            pass
+
+
+def test_parallel_run_and_report():
+    """Two RAW checks run in worker processes; the report lists both."""
+    with tempfile.TemporaryDirectory() as tmp:
+        prev_path, curr_path = write_pair(tmp)
+        jobs = [
+            {"process": "raw", "previous": prev_path, "current": curr_path, "output_dir": os.path.join(tmp, "a")},
+            {"process": "raw", "previous": prev_path, "current": curr_path, "output_dir": os.path.join(tmp, "b")},
+        ]
+        results = JobScheduler(workers=2, use_cache=False).run(jobs, report_dir=tmp)
+
+        assert [r["success"] for r in results] == [True, True]
+        assert results[0]["output_path"] == os.path.join(tmp, "a", "curr_diff.xlsx")
+        assert all(os.path.exists(r["log_file"]) for r in results)
+
+        reports = [name for name in os.listdir(tmp) if name.startswith("batch_report_")]
+        assert len(reports) == 1
+        with open(os.path.join(tmp, reports[0]), 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        assert report["succeeded"] == 2 and report["failed"] == 0
+        assert [job["job"] for job in report["jobs"]] == [1, 2]
+
+
+def test_fresh_worker_per_job():
+    """Each job runs in its own worker process, so its peak memory is its own."""
+    recycles = scheduler.POOL_RECYCLES_WORKERS
+    # Shared pool with max_tasks_per_child (Python 3.11+) and one executor per job (older)
+    for mode in sorted({recycles, False}):
+        scheduler.POOL_RECYCLES_WORKERS = mode
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                prev_path, curr_path = write_pair(tmp)
+                jobs = [
+                    {"process": "raw", "previous": prev_path, "current": curr_path,
+                     "output_dir": os.path.join(tmp, "a")},
+                    {"process": "raw", "previous": prev_path, "current": curr_path,
+                     "output_dir": os.path.join(tmp, "b")},
+                ]
+                results = JobScheduler(workers=1, use_cache=False).run(jobs, report_dir=tmp)
+
+                assert [r["success"] for r in results] == [True, True], mode
+                assert results[0]["worker_pid"] != results[1]["worker_pid"], mode
+        finally:
+            scheduler.POOL_RECYCLES_WORKERS = recycles
+
+
+def main():
+    """Run all tests"""
+    test_memory_estimate()
+    test_model_size_without_importing_torch()
+    test_admission_control()
+    test_output_conflicts()
+    test_parallel_run_and_report()
+    test_fresh_worker_per_job()
+    print("✅ All scheduler tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
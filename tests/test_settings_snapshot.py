@@ -0,0 +1,96 @@
+"""
+Test the per-run settings snapshot.
+
+A snapshot is read once, cached while the settings file is unchanged, and
+re-read after the file is saved or modified. Getters must answer the same
+from a snapshot as from the file.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.settings as settings_module
+from src.settings import (
+    SettingsSnapshot, get_settings_snapshot, get_use_priority_change,
+    get_enabled_columns, save_settings, load_settings
+)
+
+
+def with_temp_settings(test):
+    """Run a test against a temporary settings file."""
+    original_file = settings_module.SETTINGS_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings_module.SETTINGS_FILE = os.path.join(tmp_dir, "settings.json")
+        settings_module._snapshot = None
+        try:
+            test()
+        finally:
+            settings_module.SETTINGS_FILE = original_file
+            settings_module._snapshot = None
+
+
+def _test_snapshot_is_cached():
+    save_settings({"use_priority_change": False})
+    snapshot = get_settings_snapshot()
+
+    assert isinstance(snapshot, SettingsSnapshot)
+    assert get_settings_snapshot() is snapshot
+    assert snapshot.use_priority_change is False
+    assert get_use_priority_change(snapshot) is False
+    assert get_enabled_columns(snapshot) == get_enabled_columns()
+
+
+def _test_snapshot_invalidated_on_save():
+    save_settings({"use_priority_change": False})
+    first = get_settings_snapshot()
+
+    settings = load_settings()
+    settings["use_priority_change"] = True
+    save_settings(settings)
+    second = get_settings_snapshot()
+
+    assert second is not first
+    assert second.use_priority_change is True
+    assert first.use_priority_change is False  # Frozen snapshot is unaffected
+
+
+def _test_snapshot_invalidated_on_external_edit():
+    save_settings({"use_priority_change": False})
+    first = get_settings_snapshot()
+
+    with open(settings_module.SETTINGS_FILE, 'w', encoding='utf-8') as f:
+        f.write('{"use_priority_change": true}')
+    os.utime(settings_module.SETTINGS_FILE, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+
+    assert get_settings_snapshot().use_priority_change is True
+
+
+def test_snapshot_is_cached():
+    """Repeated calls reuse the same snapshot."""
+    with_temp_settings(_test_snapshot_is_cached)
+
+
+def test_snapshot_invalidated_on_save():
+    """Saving settings produces a fresh snapshot."""
+    with_temp_settings(_test_snapshot_invalidated_on_save)
+
+
+def test_snapshot_invalidated_on_external_edit():
+    """A newer file modification time produces a fresh snapshot."""
+    with_temp_settings(_test_snapshot_invalidated_on_external_edit)
+
+
+def main():
+    """Run all tests"""
+    test_snapshot_is_cached()
+    test_snapshot_invalidated_on_save()
+    test_snapshot_invalidated_on_external_edit()
+    print("✅ All settings snapshot tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
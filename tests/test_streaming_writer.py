@@ -0,0 +1,119 @@
+"""
+Test the streaming (write-only) Excel writer.
+
+Values must round-trip like pandas.to_excel, and every colored cell must
+get the same color apply_direct_coloring() gives it - as a conditional
+formatting rule for CHANGES/STATUS, as a cell fill for headers and
+changed CharacterGroup cells.
+"""
+
+import os
+import re
+import sys
+import tempfile
+
+import pandas as pd
+from openpyxl import load_workbook
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.excel_writer import write_super_group_word_analysis
+from src.io.formatters import apply_direct_coloring, widen_summary_columns
+from src.io.streaming_writer import StreamingExcelWriter
+
+
+def make_frame():
+    """Result rows with listed, unlisted and empty CHANGES/STATUS values."""
+    return pd.DataFrame({
+        "EventName": ["E1", "E2", "E3", "E4", "E5"],
+        "Text": ["a \"quoted\" text", None, "c", float("nan"), "e"],
+        "Tribe": ["Human", "Elf", "Orc", "Orc", "Human"],
+        "STATUS": ["RECORDED", "Weird Status", None, "recorded", "CHECK"],
+        "CHANGES": ["New Row", "CharacterGroup Change", "Foo+Bar Change", "No Change", ""],
+        "Count": [1, 2, 3, 4, 5],
+    })
+
+
+def effective_colors(ws):
+    """(value, color) per cell; conditional formatting resolved per column."""
+    rules = {}
+    for cf_range in ws.conditional_formatting:
+        for rule in cf_range.rules:
+            match = re.match(r'EXACT\(\$([A-Z]+)2,"(.*)"\)$', rule.formula[0])
+            rules.setdefault(match.group(1), {})[match.group(2).replace('""', '"')] = rule.dxf.fill.fgColor.rgb
+    rows = []
+    for row in ws.iter_rows():
+        cells = []
+        for cell in row:
+            color = cell.fill.fgColor.rgb if cell.fill.fill_type else None
+            column_rules = rules.get(cell.column_letter, {})
+            if cell.row > 1 and cell.value is not None and str(cell.value) in column_rules:
+                assert color is None
+                color = column_rules[str(cell.value)]
+            cells.append((cell.value, color))
+        rows.append(cells)
+    return rows
+
+
+def test_matches_direct_coloring():
+    """Same values and colors as pandas + apply_direct_coloring."""
+    df = make_frame()
+    changed_columns_map = {1: ["Tribe"], 3: ["Tribe"]}
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.xlsx")
+        new_path = os.path.join(tmp, "new.xlsx")
+        with pd.ExcelWriter(old_path, engine="openpyxl") as writer:
+            df.to_excel(writer, sheet_name="Comparison", index=False)
+            apply_direct_coloring(writer.book["Comparison"], changed_columns_map=changed_columns_map)
+        with StreamingExcelWriter(new_path) as writer:
+            writer.write_dataframe(df, "Comparison", colored=True, changed_columns_map=changed_columns_map)
+
+        old_ws = load_workbook(old_path)["Comparison"]
+        new_ws = load_workbook(new_path)["Comparison"]
+        assert effective_colors(new_ws) == effective_colors(old_ws)
+        assert new_ws.auto_filter.ref == old_ws.auto_filter.ref
+        assert new_ws.column_dimensions["E"].width == 40
+        assert new_ws.column_dimensions["D"].width == 25
+        # Only header and CharacterGroup cells carry fills
+        filled = [cell.coordinate for row in new_ws.iter_rows(min_row=2) for cell in row if cell.fill.fill_type]
+        assert filled == ["C3"]
+
+
+def test_sheet_order_and_staged_sheets():
+    """Staged (in-memory formatted) sheets keep their position and formatting."""
+    df = make_frame()
+    summary = pd.DataFrame({"Metric": ["Total"], "Value": [5]})
+    analysis = {"Other": {"total_words_prev": 10, "total_words_curr": 12, "added_words": 2,
+                          "deleted_words": 0, "changed_words": 1, "unchanged_words": 9}}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.xlsx")
+        with StreamingExcelWriter(path) as writer:
+            writer.write_dataframe(df, "Comparison", colored=True)
+            writer.write_formatted(summary, "Summary Report", formatter=widen_summary_columns)
+            write_super_group_word_analysis(writer.staging, analysis)
+            writer.write_dataframe(df.head(2), "Deleted Rows")
+
+        wb = load_workbook(path)
+        assert wb.sheetnames == ["Comparison", "Summary Report", "Super Group Word Analysis", "Deleted Rows"]
+        assert wb["Summary Report"].column_dimensions["A"].width == 50
+        assert [cell.value for cell in wb["Summary Report"][2]] == ["Total", 5]
+        super_group = wb["Super Group Word Analysis"]
+        assert super_group["A2"].value == "Other"
+        assert super_group.freeze_panes == "A2"
+        assert super_group["A1"].fill.fgColor.rgb == "004472C4"
+        assert len(super_group.merged_cells.ranges) == 4
+        deleted = wb["Deleted Rows"]
+        assert deleted["A1"].fill.fill_type is None
+        assert [cell.value for cell in deleted[3]] == ["E2", None, "Elf", "Weird Status", "CharacterGroup Change", 2]
+
+
+def main():
+    """Run all tests"""
+    test_matches_direct_coloring()
+    test_sheet_order_and_staged_sheets()
+    print("✅ All streaming writer tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
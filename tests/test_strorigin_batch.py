@@ -0,0 +1,105 @@
+"""
+Test batched StrOrigin analysis.
+
+analyze_batch must return exactly what analyze() returns pair by pair, while
+encoding every distinct text only once in length-sorted batches.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.embedding_cache import EmbeddingCache
+from src.utils.strorigin_analysis import StrOriginAnalyzer, calculate_semantic_similarities
+
+
+class FakeModel:
+    """Deterministic stand-in for a SentenceTransformer (no torch needed)."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        self.calls.append(list(texts))
+        vectors = []
+        for text in texts:
+            vector = np.zeros(8, dtype=np.float32)
+            for char in text:
+                vector[ord(char) % 8] += 1.0
+            vectors.append(vector)
+        return np.array(vectors)
+
+
+def make_analyzer(model):
+    """Analyzer in FULL mode with the fake model already loaded."""
+    analyzer = StrOriginAnalyzer()
+    analyzer.bert_available = True
+    analyzer.model = model
+    analyzer.embedding_cache = EmbeddingCache("fake-model", enabled=False)
+    return analyzer
+
+
+PAIRS = [
+    ("Hello world", "Hello, world!"),
+    ("Hello world", "Hallo world"),
+    ("The player won the game", "The enemy lost the battle"),
+    ("안녕하세요", "안녕하십니까"),
+    ("Hello world", "Hallo world"),
+    ("abc", "xyz"),
+    ("", "text"),
+]
+
+
+def test_batch_matches_single():
+    """Batch results equal per-pair analyze() results (FULL and LIGHT)."""
+    model = FakeModel()
+    analyzer = make_analyzer(model)
+    assert analyzer.analyze_batch(PAIRS) == [analyzer.analyze(prev, curr) for prev, curr in PAIRS]
+
+    light = StrOriginAnalyzer()
+    light.bert_available = False
+    assert light.analyze_batch(PAIRS) == [light.analyze(prev, curr) for prev, curr in PAIRS]
+    assert analyzer.analyze_batch([]) == []
+
+
+def test_texts_encoded_once_sorted_by_length():
+    """Every distinct text is encoded once; batches are sorted by length."""
+    model = FakeModel()
+    make_analyzer(model).analyze_batch(PAIRS)
+
+    encoded = [text for call in model.calls for text in call]
+    assert len(encoded) == len(set(encoded))
+    assert "Hello world" in encoded and "Hello, world!" not in encoded  # Punctuation-only pair skipped
+    assert [len(text) for text in encoded] == sorted(len(text) for text in encoded)
+
+
+def test_similarities_match_pairwise_formula():
+    """Vectorized cosine similarities equal the per-pair computation."""
+    model = FakeModel()
+    pairs = [("abc", "abd"), ("aaaa", "bbbb"), ("", "x"), ("abc", "abc")]
+    similarities = calculate_semantic_similarities(pairs, model, batch_size=2)
+
+    for (text1, text2), similarity in zip(pairs, similarities):
+        if not text1 or not text2:
+            assert similarity == 0.0
+            continue
+        emb = model.encode([text1, text2])
+        expected = np.dot(emb[0], emb[1]) / (np.linalg.norm(emb[0]) * np.linalg.norm(emb[1]))
+        assert abs(similarity - max(0.0, min(1.0, expected))) < 1e-6
+    assert all(len(call) <= 2 for call in model.calls[:2])
+
+
+def main():
+    """Run all tests"""
+    test_batch_matches_single()
+    test_texts_encoded_once_sorted_by_length()
+    test_similarities_match_pairwise_formula()
+    print("✅ All StrOrigin batch tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Test the shared style registry.
+
+Formatting must reuse one style object per distinct color/label instead of
+creating new objects per cell, with unchanged colors.
+"""
+
+import os
+import sys
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.io.formatters import apply_direct_coloring, generate_color_for_value
+from src.io.styles import get_fill, get_font, intern_style
+
+
+def test_interned_objects():
+    """Equal keys give the same object, equal to a freshly built style."""
+    assert get_fill("FFD580") is get_fill("FFD580")
+    assert get_fill("FFD580") == PatternFill(start_color="FFD580", fill_type="solid")
+    assert get_font(bold=True, size=11) is get_font(size=11, bold=True)
+    assert get_font(bold=True, size=11) == Font(bold=True, size=11)
+    font = Font(italic=True, color="666666")
+    assert intern_style(Font(italic=True, color="666666")) is intern_style(font)
+
+
+def test_generated_colors_cached():
+    """Generated colors are stable and computed once per label."""
+    from src.io import formatters
+    formatters._generate_color.cache_clear()
+    first = generate_color_for_value("Foo+Bar Change")
+    assert generate_color_for_value("Foo+Bar Change") == first
+    info = formatters._generate_color.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_coloring_shares_fills():
+    """Every row of an unlisted composite gets the one shared fill object."""
+    ws = Workbook().active
+    ws.append(["CHANGES", "STATUS"])
+    for _ in range(50):
+        ws.append(["Foo+Bar Change", "Weird Status"])
+    apply_direct_coloring(ws)
+
+    change_fills = {id(ws.cell(row=row, column=1).fill._StyleProxy__target) for row in range(2, 52)}
+    assert len(change_fills) == 1
+    assert ws["A2"].fill.fgColor.rgb == "00" + generate_color_for_value("Foo+Bar Change")
+    assert ws["B2"].fill.fgColor.rgb == "00" + generate_color_for_value("Weird Status")
+
+
+def main():
+    """Run all tests"""
+    test_interned_objects()
+    test_generated_colors_cached()
+    test_coloring_shares_fills()
+    print("✅ All style registry tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Test the integer-encoded 10-key lookup index.
+
+The index must answer exactly like the ten first-occurrence lookup dicts it
+replaces: same keys, same DataFrame index per key, and unknown values on the
+query side must never match.
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.lookups import TenKeyIndex, TEN_KEYS, KEY_FIELDS, build_lookups
+from src.utils.helpers import safe_str
+
+
+def reference_lookups(df):
+    """Ten first-occurrence dicts built row by row (previous implementation)."""
+    lookups = {combo: {} for combo in TEN_KEYS}
+    for idx, row in df.iterrows():
+        values = {field: safe_str(row.get(col, "")) for field, col in KEY_FIELDS.items()}
+        for combo in TEN_KEYS:
+            key = tuple(values[field] for field in combo)
+            if key not in lookups[combo]:
+                lookups[combo][key] = idx
+    return lookups
+
+
+def make_prev():
+    """Previous rows with duplicates on several key combinations."""
+    return pd.DataFrame({
+        "SequenceName": ["Seq1", "Seq1", "Seq1", "Seq2", "Seq2", ""],
+        "EventName": ["E1", "E2", "E1", "E1", "E3", "E4"],
+        "StrOrigin": ["안녕", "안녕", "잘가", "안녕", "", "x"],
+        "CastingKey": ["c1", "c1", "c2", "c1", "c3", ""],
+    }, index=[10, 11, 12, 13, 14, 15])
+
+
+def test_matches_reference_dicts():
+    """Every combination exports the same first-occurrence dict."""
+    df = make_prev()
+    index = build_lookups(df)
+    expected = reference_lookups(df)
+
+    assert isinstance(index, TenKeyIndex)
+    assert len(index) == len(df)
+    for combo in TEN_KEYS:
+        assert index.to_dict(combo) == expected[combo], combo
+    assert index.unique_count("SE") == len(expected["SE"])
+
+
+def test_queries_against_other_frame():
+    """Encoded lookups find first occurrences and reject unknown values."""
+    df_prev = make_prev()
+    df_curr = pd.DataFrame({
+        "SequenceName": ["Seq1", "Seq9", "Seq2"],
+        "EventName": ["E1", "E1", "E3"],
+        "StrOrigin": ["안녕", "안녕", "new"],
+        "CastingKey": ["c1", "c1", "c3"],
+    })
+    index = TenKeyIndex(df_prev)
+    keys = index.encode(df_curr)
+    expected = reference_lookups(df_prev)
+
+    for pos, (_, row) in enumerate(df_curr.iterrows()):
+        values = {field: row[col] for field, col in KEY_FIELDS.items()}
+        for combo in TEN_KEYS:
+            key = tuple(values[field] for field in combo)
+            assert index.first(combo, keys[combo][pos]) == expected[combo].get(key), (pos, combo)
+
+    assert index.is_perfect_match(10, keys, 0)
+    assert not index.is_perfect_match(10, keys, 1)
+    assert not index.contains("SEO", keys["SEO"][1])  # Seq9 unknown
+    assert index.contains_any(keys, 1)  # (E, O) still known
+    assert index.first_unmarked("SEO", keys["SEO"][0], {10}) is None
+    assert index.first_positions("SE", keys["SE"]).tolist() == [0, -1, 4]
+    assert index.first("SE", index.encode_values("SE", ("Seq2", "E1"))) == 13
+
+
+def reference_certainties(index, encoded, count, combo="SEO"):
+    """PASS 1 walked row by row with a growing marked set."""
+    marked = set()
+    result = []
+    for pos in range(count):
+        label = index.first_unmarked(combo, encoded[combo][pos], marked)
+        if label is not None and index.is_perfect_match(label, encoded, pos):
+            marked.add(label)
+            result.append((pos, index.position(label)))
+        elif not index.contains_any(encoded, pos):
+            result.append((pos, None))
+    return result
+
+
+def test_vectorized_pass1_matches_loop():
+    """Duplicate current rows only claim the first-occurrence candidate once."""
+    df_prev = make_prev()
+    df_curr = pd.DataFrame({
+        "SequenceName": ["Seq1", "Seq1", "Seq1", "Seq7", "Seq2", "Seq1"],
+        "EventName": ["E1", "E1", "E1", "E7", "E1", "E2"],
+        "StrOrigin": ["안녕", "안녕", "안녕", "new", "안녕", "안녕"],
+        "CastingKey": ["c1", "c1", "c9", "c7", "c1", "c1"],
+    })
+    index = TenKeyIndex(df_prev)
+    encoded = index.encode(df_curr)
+
+    for combo in ("SEO", "SEC"):
+        expected = reference_certainties(index, encoded, len(df_curr), combo)
+        assert index.match_certainties(encoded, combo=combo) == expected, combo
+    assert index.match_certainties(encoded) == [(0, 0), (3, None), (4, 3), (5, 1)]
+
+
+def main():
+    """Run all tests"""
+    test_matches_reference_dicts()
+    test_queries_against_other_frame()
+    test_vectorized_pass1_matches_loop()
+    print("✅ All 10-key index tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
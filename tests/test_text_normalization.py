@@ -0,0 +1,92 @@
+"""
+Test the translation-table punctuation/space normalizer.
+
+It must give exactly the result of the previous regex + unicodedata
+implementation for Korean, CJK and Latin text.
+"""
+
+import os
+import random
+import re
+import sys
+import unicodedata
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.strorigin_analysis import is_punctuation_space_change_only, normalize_text_for_comparison
+from src.utils.text_normalization import normalize_text, normalize_texts, punctuation_space_change_mask
+
+
+def reference_normalize(text):
+    """Regex + per-character category check (implementation before the table)."""
+    if not isinstance(text, str):
+        return ""
+    text = re.sub(r'\s+', '', text)
+    text = ''.join(char for char in text if not unicodedata.category(char).startswith('P'))
+    return text.lower()
+
+
+def random_texts(count, seed=3):
+    """Texts mixing Hangul, CJK, kana, Latin, digits, punctuation and odd spaces."""
+    rng = random.Random(seed)
+    ranges = [(0x20, 0x7E), (0xA0, 0x17F), (0x2000, 0x206F), (0x3000, 0x30FF),
+              (0x4E00, 0x4E80), (0xAC00, 0xAD00), (0xFF00, 0xFFEF), (0x1F300, 0x1F320)]
+    texts = []
+    for _ in range(count):
+        chars = []
+        for _ in range(rng.randint(0, 30)):
+            low, high = rng.choice(ranges)
+            chars.append(chr(rng.randint(low, high)))
+        texts.append(''.join(chars))
+    return texts
+
+
+def test_examples():
+    """Docstring examples of the original functions."""
+    assert normalize_text_for_comparison("안녕하세요!") == '안녕하세요'
+    assert normalize_text_for_comparison("Hello, world!") == 'helloworld'
+    assert normalize_text_for_comparison(None) == ""
+    assert is_punctuation_space_change_only("안녕하세요", "안녕하세요!")
+    assert is_punctuation_space_change_only("「こんにちは」、世界。", "こんにちは 世界")
+    assert not is_punctuation_space_change_only("Hello", "Goodbye")
+
+
+def test_matches_reference():
+    """Identical results for random Korean/CJK/Latin texts."""
+    texts = random_texts(5000)
+    for text in texts:
+        assert normalize_text_for_comparison(text) == reference_normalize(text), repr(text)
+    assert normalize_texts(texts + [None, 3.5]) == [reference_normalize(text) for text in texts] + ["", ""]
+
+
+def test_every_codepoint():
+    """The lazily filled table deletes exactly the reference characters."""
+    text = ''.join(chr(codepoint) for codepoint in range(sys.maxunicode + 1))
+    assert normalize_text(text) == reference_normalize(text)
+    assert normalize_text(text) == reference_normalize(text)  # table now fully cached
+
+
+def test_mask():
+    """Column variant agrees with the per-pair check."""
+    prev_texts = random_texts(500, seed=5)
+    curr_texts = [text.replace(" ", "").replace(",", "、") if number % 2 else text + "x"
+                  for number, text in enumerate(prev_texts)]
+    mask = punctuation_space_change_mask(prev_texts, curr_texts)
+    assert mask.dtype == bool
+    expected = [reference_normalize(prev) == reference_normalize(curr) for prev, curr in zip(prev_texts, curr_texts)]
+    assert mask.tolist() == expected
+    assert len(punctuation_space_change_mask([], [])) == 0
+
+
+def main():
+    """Run all tests"""
+    test_examples()
+    test_matches_reference()
+    test_every_codepoint()
+    test_mask()
+    print("✅ All text normalization tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
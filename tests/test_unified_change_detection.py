@@ -468,7 +468,7 @@ def run_raw_processor(df_prev: pd.DataFrame, df_curr: pd.DataFrame) -> Tuple[pd.
     # Build lookups and run comparison
     lookups = build_lookups(df_prev)
     changes, prev_origins, cols, counter, marked, groups, pass1 = compare_rows(
-        df_curr, df_prev, *lookups)
+        df_curr, df_prev, lookups)
 
     # Add Phase 4 columns to result
     df_result = df_curr.copy()
@@ -497,7 +497,7 @@ def run_working_processor(df_prev: pd.DataFrame, df_curr: pd.DataFrame) -> Tuple
     # Build lookups and run comparison
     lookups = build_working_lookups(df_prev, "PREVIOUS")
     result, counter, marked, pass1_results, previous_strorigins = process_working_comparison(
-        df_curr, df_prev, *lookups)
+        df_curr, df_prev, lookups)
 
     # Result already has CHANGES column
     return result, counter
@@ -274,7 +274,7 @@ def run_comprehensive_test():
 
     lookups = build_lookups(df_prev)
     changes, prev_strorigins, changed_cols_map, counter, marked, group_analysis, pass1_results = compare_rows(
-        df_curr, df_prev, *lookups
+        df_curr, df_prev, lookups
     )
 
     # Verify results
@@ -343,7 +343,7 @@ def run_comprehensive_test():
 
     lookups_w = build_working_lookups(df_prev_work, "PREVIOUS")
     result_w, counter_w, marked_w, pass1_w, prev_stro_w = process_working_comparison(
-        df_curr_work, df_prev_work, *lookups_w
+        df_curr_work, df_prev_work, lookups_w
     )
 
     # Count results
@@ -0,0 +1,107 @@
+"""
+Test the word-level diff engine.
+
+The end fast path, memoization and the process pool must all give exactly
+the output of a plain difflib word diff.
+"""
+
+import os
+import random
+import sys
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import src.utils.word_diff as word_diff_module
+from src.utils.strorigin_analysis import extract_differences
+from src.utils.word_diff import compute_word_diffs, word_diff
+
+
+def reference_diff(text1, text2, arrow="→", max_length=80):
+    """Plain SequenceMatcher word diff (behavior before the diff engine)."""
+    words1, words2 = text1.split(), text2.split()
+    changes = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, words1, words2).get_opcodes():
+        if tag == 'replace':
+            changes.append(f"[{' '.join(words1[i1:i2])}{arrow}{' '.join(words2[j1:j2])}]")
+        elif tag == 'delete':
+            changes.append(f"[-{' '.join(words1[i1:i2])}]")
+        elif tag == 'insert':
+            changes.append(f"[+{' '.join(words2[j1:j2])}]")
+    diff_str = ' '.join(changes)
+    return diff_str[:max_length - 3] + "..." if len(diff_str) > max_length else diff_str
+
+
+def random_pairs(count, seed=7):
+    """Pairs with edits anywhere, mostly at the ends, over a tiny vocabulary (many repeats)."""
+    rng = random.Random(seed)
+    vocabulary = ["a", "b", "c", "플레이어", "승리", "!"]
+    pairs = []
+    for _ in range(count):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(0, 8))]
+        extra = [rng.choice(vocabulary) for _ in range(rng.randint(0, 4))]
+        other = [rng.choice(vocabulary) for _ in range(rng.randint(0, 8))]
+        pairs.append(rng.choice([
+            (words, words + extra), (words, extra + words),
+            (words + extra, words), (extra + words, words), (words, other),
+        ]))
+    return [(' '.join(words1), ' '.join(words2)) for words1, words2 in pairs]
+
+
+def test_docstring_examples():
+    """Replacement, deletion and insertion formats are unchanged."""
+    assert extract_differences("Hello world", "Hallo world") == "[Hello→Hallo]"
+    assert extract_differences("Press any button", "Press button") == "[-any]"
+    assert extract_differences("Loading", "Loading complete") == "[+complete]"
+    assert extract_differences("The player won the game", "The enemy lost the battle") == \
+        "[player won→enemy lost] [game→battle]"
+    assert extract_differences("", "Loading") == ""
+
+
+def test_matches_reference():
+    """Fast path and difflib path give the plain difflib output."""
+    for text1, text2 in random_pairs(3000):
+        assert word_diff(text1, text2) == reference_diff(text1, text2), (text1, text2)
+        assert word_diff(text1, text2, " ➜ ", 20) == reference_diff(text1, text2, " ➜ ", 20), (text1, text2)
+
+
+def test_end_fast_path_ambiguous_prefix():
+    """Added words are reported where difflib reports them when the line repeats."""
+    assert word_diff("a", "b a c a") == reference_diff("a", "b a c a") == "[+b] [+c a]"
+    assert word_diff("a b a", "a b a b a") == reference_diff("a b a", "a b a b a") == "[+b a]"
+
+
+def test_long_lines_use_difflib():
+    """Lines long enough for difflib's autojunk skip the fast path."""
+    text1 = ' '.join(["the"] * 150 + ["end"] * 60)
+    text2 = "start " + text1
+    assert word_diff(text1, text2, max_length=10 ** 6) == reference_diff(text1, text2, max_length=10 ** 6)
+
+
+def test_batch_parallel_and_serial():
+    """Pooled and in-process batches give identical results in pair order."""
+    pairs = random_pairs(400, seed=11) * 2
+    expected = [reference_diff(text1, text2) for text1, text2 in pairs]
+    assert compute_word_diffs(pairs, workers=1) == expected
+
+    original = (word_diff_module.WORD_DIFF_PARALLEL_MIN_PAIRS, word_diff_module.WORD_DIFF_CHUNK_SIZE)
+    word_diff_module.WORD_DIFF_PARALLEL_MIN_PAIRS, word_diff_module.WORD_DIFF_CHUNK_SIZE = 10, 50
+    try:
+        assert compute_word_diffs(pairs, workers=2) == expected
+    finally:
+        word_diff_module.WORD_DIFF_PARALLEL_MIN_PAIRS, word_diff_module.WORD_DIFF_CHUNK_SIZE = original
+
+
+def main():
+    """Run all tests"""
+    test_docstring_examples()
+    test_matches_reference()
+    test_end_fast_path_ambiguous_prefix()
+    test_long_lines_use_difflib()
+    test_batch_parallel_and_serial()
+    print("✅ All word diff tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
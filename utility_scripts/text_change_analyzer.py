@@ -1,13 +1,17 @@
 """
-Text Change Analyzer - Standalone Utility Script
+Text Change Analyzer - Utility Script
 
 Compares two Excel files (PREVIOUS and CURRENT) and detects text changes
 based on StrOrigin+EventName matching.
 
 Usage:
-    python text_change_analyzer.py
+    python utility_scripts/text_change_analyzer.py
     (Opens file dialogs to select PREVIOUS and CURRENT Excel files)
 
+    Must be run from a VRS Manager checkout: the word-level diff engine is
+    imported from src/utils/word_diff.py, so the script cannot be copied out
+    and run on its own.
+
 Output:
     Creates output file in same folder as CURRENT file with "_TextChanges" suffix.
 
@@ -16,7 +20,6 @@ Author: Neil Schmitt
 
 import os
 import sys
-from difflib import SequenceMatcher
 
 try:
     import pandas as pd
@@ -32,9 +35,15 @@ except ImportError:
     print("ERROR: openpyxl not installed. Run: pip install openpyxl")
     sys.exit(1)
 
+# Word-level diff engine shared with the main application. The repository root
+# is put on sys.path so "src" resolves when the script is run directly from
+# utility_scripts/ (Python only adds the script's own folder to the path).
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.utils.word_diff import word_diff, compute_word_diffs
+
 
 # =============================================================================
-# DIFF FUNCTIONS (based on strorigin_analysis.py pattern)
+# DIFF FUNCTIONS (src/utils/word_diff.py engine)
 # =============================================================================
 
 def extract_text_differences(text1: str, text2: str, max_length: int = 150) -> str:
@@ -61,39 +70,26 @@ def extract_text_differences(text1: str, text2: str, max_length: int = 150) -> s
             return f"[-{text1[:max_length]}]" if len(str(text1)) <= max_length else f"[-{text1[:max_length-3]}...]"
         return ""
 
-    text1 = str(text1)
-    text2 = str(text2)
-
-    # Split into words (preserves Korean and English spacing)
-    words1 = text1.split()
-    words2 = text2.split()
-
-    # Word-level diff (automatic chunking of consecutive changes)
-    matcher = SequenceMatcher(None, words1, words2)
-    changes = []
-
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        if tag == 'replace':
-            old_words = ' '.join(words1[i1:i2])
-            new_words = ' '.join(words2[j1:j2])
-            changes.append(f"[{old_words} ➜ {new_words}]")
-        elif tag == 'delete':
-            deleted_words = ' '.join(words1[i1:i2])
-            changes.append(f"[-{deleted_words}]")
-        elif tag == 'insert':
-            added_words = ' '.join(words2[j1:j2])
-            changes.append(f"[+{added_words}]")
-
-    if not changes:
-        return ""
+    return word_diff(str(text1), str(text2), " ➜ ", max_length)
+
+
+def extract_text_differences_batch(text_pairs: list, max_length: int = 150) -> list:
+    """
+    extract_text_differences() for many pairs.
 
-    diff_str = ' '.join(changes)
+    Identical pairs are diffed once; large batches run in a process pool.
 
-    # Truncate if too long (avoid huge Excel cells)
-    if len(diff_str) > max_length:
-        diff_str = diff_str[:max_length - 3] + "..."
+    Args:
+        text_pairs: List of (prev_text, curr_text) tuples
+        max_length: Maximum length for each diff output
 
-    return diff_str
+    Returns:
+        List of diff strings, one per pair
+    """
+    diff_pairs = [(text1, text2) for text1, text2 in text_pairs if text1 and text2]
+    diffs = dict(zip(diff_pairs, compute_word_diffs(diff_pairs, arrow=" ➜ ", max_length=max_length)))
+    return [diffs[pair] if pair in diffs else extract_text_differences(*pair, max_length=max_length)
+            for pair in text_pairs]
 
 
 def safe_str(value) -> str:
@@ -250,7 +246,7 @@ def analyze_text_changes(prev_df: pd.DataFrame, curr_df: pd.DataFrame) -> pd.Dat
 
     text_change_col = []
     prev_text_col = []
-    text_diff_col = []
+    changed_texts = []  # (prev_text, curr_text) of rows with a text change
 
     for _, row in curr_df.iterrows():
         str_origin = safe_str(row.get("StrOrigin", ""))
@@ -266,17 +262,19 @@ def analyze_text_changes(prev_df: pd.DataFrame, curr_df: pd.DataFrame) -> pd.Dat
                 # Text changed!
                 text_change_col.append("Text Change")
                 prev_text_col.append(prev_text)
-                text_diff_col.append(extract_text_differences(prev_text, curr_text))
+                changed_texts.append((prev_text, curr_text))
             else:
                 # Same text
                 text_change_col.append("")
                 prev_text_col.append("")
-                text_diff_col.append("")
         else:
             # Key not found in PREVIOUS (new row)
             text_change_col.append("")
             prev_text_col.append("")
-            text_diff_col.append("")
+
+    # Diff all changed texts in one batch
+    changed_diffs = iter(extract_text_differences_batch(changed_texts))
+    text_diff_col = [next(changed_diffs) if change else "" for change in text_change_col]
 
     # Add columns to result
     result_df["Text_Change"] = text_change_col
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+VRS Manager - Command-Line Entry Point
+
+Runs the RAW, WORKING, ALL LANGUAGE and MASTER processes headless (no GUI).
+See src/cli.py for usage, e.g.:
+
+    python vrsmanager.py raw --previous PREV.xlsx --current CURR.xlsx -o out
+    python vrsmanager.py manifest jobs.json
+"""
+
+import os
+import sys
+
+os.environ.setdefault('HEADLESS', '1')
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())